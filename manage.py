@@ -7,6 +7,9 @@ import sys
 def main():
     """Run administrative tasks."""
     os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'webVulcano.settings')
+    if sys.argv[1:2] == ['test']:
+        # Configuración de tests (ver TESTING en settings)
+        os.environ.setdefault('TESTING', 'True')
     try:
         from django.core.management import execute_from_command_line
     except ImportError as exc:
@@ -0,0 +1,205 @@
+"""
+Registro de actividad persistente con escritura por lotes.
+
+record_activity() no escribe en la base de datos: añade un ActivityEvent a un
+buffer del proceso. Un hilo del worker lo vuelca con un único bulk_create
+cada ACTIVITY_FLUSH_INTERVAL_MS milisegundos, o antes si se acumulan
+ACTIVITY_BUFFER_SIZE eventos, y al terminar el worker (atexit) se escribe lo
+pendiente. Así el login, la creación, edición y borrado de proyectos y el
+envío de mensajes no suman un INSERT síncrono a la petición.
+
+Con ACTIVITY_ASYNC = False (tests) cada evento se escribe al momento.
+
+La tabla se indexa por (usuario, fecha) y (proyecto, fecha) para las líneas
+de tiempo, y `manage.py prune_activity` elimina los meses anteriores a
+ACTIVITY_RETENTION_MONTHS.
+"""
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections
+from django.utils import timezone
+from datetime import datetime, timedelta
+import atexit
+import ipaddress
+import logging
+import os
+import threading
+
+logger = logging.getLogger('vulcano')
+
+
+def drop_missing_references(events):
+    """
+    Anula usuario y proyecto de los eventos cuyo registro se eliminó antes
+    de volcar el lote (p. ej. un proyecto borrado justo después de crearlo).
+    """
+    from .models import Project
+    from django.contrib.auth.models import User
+
+    for field, model in (('user_id', User), ('project_id', Project)):
+        ids = {getattr(event, field) for event in events} - {None}
+        existing = set(model.objects.filter(pk__in=ids).values_list('pk', flat=True))
+        for event in events:
+            if getattr(event, field) not in existing:
+                setattr(event, field, None)
+    return events
+
+
+def write_events(events):
+    """Escribe un lote de ActivityEvent con un solo INSERT."""
+    from .models import ActivityEvent
+
+    try:
+        ActivityEvent.objects.bulk_create(events)
+    except IntegrityError:
+        # Las claves foráneas se comprueban al confirmar: se reintenta sin las que faltan
+        ActivityEvent.objects.bulk_create(drop_missing_references(events))
+
+
+class ActivityBuffer:
+    """Eventos pendientes del proceso y el hilo que los vuelca."""
+
+    def __init__(self, writer, max_events, interval):
+        self.writer = writer
+        self.max_events = max_events
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.events = []
+        self.pid = os.getpid()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def add(self, event):
+        """Añade un evento; el hilo se arranca con el primero."""
+        with self.lock:
+            self.events.append(event)
+            full = len(self.events) >= self.max_events
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='vulcano-activity', daemon=True)
+                self._thread.start()
+        if full:
+            self._wakeup.set()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            if self._stopped.is_set():
+                # stop() escribe lo pendiente desde el hilo que apaga
+                break
+            if self.flush():
+                # La conexión de este hilo sigue CONN_MAX_AGE como la de una petición
+                close_old_connections()
+
+    def flush(self):
+        """
+        Escribe lo pendiente.
+
+        Returns:
+            int: Eventos escritos
+        """
+        with self.lock:
+            events, self.events = self.events, []
+        if not events:
+            return 0
+        try:
+            self.writer(events)
+        except Exception as e:
+            logger.error(f"Error al guardar {len(events)} eventos de actividad: {str(e)}")
+            return 0
+        return len(events)
+
+    def stop(self):
+        """Detiene el hilo y escribe lo pendiente."""
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self.flush()
+
+
+_buffer = None
+_buffer_lock = threading.Lock()
+
+
+def get_buffer():
+    """Buffer del proceso (uno nuevo en cada worker tras el fork)."""
+    global _buffer
+    if _buffer is None or _buffer.pid != os.getpid():
+        with _buffer_lock:
+            if _buffer is None or _buffer.pid != os.getpid():
+                _buffer = ActivityBuffer(
+                    write_events,
+                    settings.ACTIVITY_BUFFER_SIZE,
+                    settings.ACTIVITY_FLUSH_INTERVAL_MS / 1000
+                )
+    return _buffer
+
+
+def flush_activity():
+    """Detiene el buffer del proceso y escribe lo pendiente (apagado del worker)."""
+    global _buffer
+    with _buffer_lock:
+        written = 0
+        if _buffer is not None and _buffer.pid == os.getpid():
+            written = _buffer.stop()
+        _buffer = None
+    return written
+
+
+atexit.register(flush_activity)
+
+
+def record_activity(user, action, details='', project=None, ip_address=None):
+    """
+    Registra una acción de un usuario en el registro de auditoría.
+
+    Args:
+        user: Usuario que realiza la acción
+        action: Descripción de la acción
+        details: Detalles adicionales
+        project: Proyecto relacionado (opcional)
+        ip_address: IP del cliente (opcional)
+    """
+    from .models import ActivityEvent
+
+    try:
+        # Una IP inválida (X-Forwarded-For manipulado) haría fallar el lote entero
+        ip_address = str(ipaddress.ip_address(ip_address)) if ip_address else None
+    except ValueError:
+        ip_address = None
+    event = ActivityEvent(
+        user_id=user.pk,
+        username=user.get_username(),
+        action=action,
+        project_id=project.pk if project is not None else None,
+        details=details,
+        ip_address=ip_address,
+        created_at=timezone.now(),
+    )
+    if not settings.ACTIVITY_ASYNC:
+        write_events([event])
+        return
+    get_buffer().add(event)
+
+
+def prune_activity(months=None):
+    """
+    Elimina los meses completos anteriores a los últimos `months` (el mes
+    en curso cuenta como uno).
+
+    Returns:
+        int: Eventos eliminados
+    """
+    from .models import ActivityEvent
+
+    months = max(settings.ACTIVITY_RETENTION_MONTHS if months is None else months, 1)
+    start = timezone.localdate().replace(day=1)
+    for _ in range(months - 1):
+        start = (start - timedelta(days=1)).replace(day=1)
+    cutoff = timezone.make_aware(datetime(start.year, start.month, 1))
+    deleted, _ = ActivityEvent.objects.filter(created_at__lt=cutoff).delete()
+    if deleted:
+        logger.info(f"Eventos de actividad eliminados: {deleted}")
+    return deleted
@@ -8,7 +8,7 @@ from django.utils.html import format_html
 from django.db.models import Count
 from django.urls import reverse
 from django.utils.safestring import mark_safe
-from .models import UserProfile, Project, ProjectImage, Message
+from .models import UserProfile, Project, ProjectImage, Message, ActivityEvent, Conversation
 
 
 @admin.register(UserProfile)
@@ -24,6 +24,7 @@ class UserProfileAdmin(admin.ModelAdmin):
         'created_at',
     ]
     list_filter = ['role', 'created_at']
+    list_select_related = ['user']
     search_fields = [
         'user__username',
         'user__email',
@@ -107,6 +108,8 @@ class ProjectAdmin(admin.ModelAdmin):
         'is_featured',
         'created_at',
     ]
+    # arquitecto_link lee el arquitecto de cada fila
+    list_select_related = ['arquitecto']
     search_fields = [
         'title',
         'description',
@@ -238,6 +241,7 @@ class ProjectImageAdmin(admin.ModelAdmin):
         'uploaded_at',
     ]
     list_filter = ['is_main', 'uploaded_at']
+    list_select_related = ['project']
     search_fields = ['project__title', 'caption']
     readonly_fields = ['image_preview', 'uploaded_at']
     list_editable = ['is_main', 'order']
@@ -296,6 +300,7 @@ class MessageAdmin(admin.ModelAdmin):
         'created_at',
     ]
     list_filter = ['is_read', 'created_at']
+    list_select_related = ['sender', 'recipient', 'project']
     search_fields = [
         'subject',
         'body',
@@ -350,6 +355,41 @@ class MessageAdmin(admin.ModelAdmin):
     is_read_badge.short_description = 'Estado'
 
 
+@admin.register(ActivityEvent)
+class ActivityEventAdmin(admin.ModelAdmin):
+    """
+    Registro de auditoría (solo lectura).
+    """
+    list_display = ['created_at', 'username', 'action', 'project', 'ip_address']
+    list_filter = ['action', 'created_at']
+    list_select_related = ['project']
+    search_fields = ['username', 'action', 'details', 'project__title']
+    date_hierarchy = 'created_at'
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(Conversation)
+class ConversationAdmin(admin.ModelAdmin):
+    """
+    Conversaciones (solo lectura: se mantienen desde los mensajes).
+    """
+    list_display = ['last_subject', 'user_low', 'user_high', 'project', 'message_count', 'last_message_at']
+    list_select_related = ['user_low', 'user_high', 'project']
+    search_fields = ['last_subject', 'user_low__username', 'user_high__username', 'project__title']
+    date_hierarchy = 'last_message_at'
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
 # Personalización del sitio de administración
 admin.site.site_header = "Vulcano - Administración"
 admin.site.site_title = "Vulcano Admin"
@@ -17,6 +17,12 @@ class VulcanoConfig(AppConfig):
     def ready(self):
         """
         Se ejecuta cuando la aplicación está lista.
-        Importa las señales para que se registren automáticamente.
+        Importa las señales para que se registren automáticamente y, con
+        LOG_ASYNC, pasa los handlers de logging a un hilo propio.
         """
-        import vulcano.signals
\ No newline at end of file
+        from django.conf import settings
+        import vulcano.signals
+
+        if settings.LOG_ASYNC:
+            from .structured_logging import install_queue_logging
+            install_queue_logging()
\ No newline at end of file
@@ -0,0 +1,279 @@
+"""
+Espacios de nombres (namespaces) de caché con versiones generacionales.
+
+En lugar de borrar claves una a una, cada dato cacheado declara de qué
+namespaces depende y la invalidación solo sube la versión de esos
+namespaces:
+
+- `user:<id>`: datos del usuario (perfil, estadísticas) allí donde aparecen.
+- `project:<id>`: un proyecto (ficha, tarjeta, imágenes).
+- `category:<categoría>` y `category:all`: listados de proyectos.
+- `global`: datos de todo el sitio (conjunto de proyectos destacados).
+
+Las versiones salen de un reloj lógico compartido (`ns:clock`): bump()
+lo incrementa una vez de forma atómica y guarda ese valor como versión de
+todos los namespaces afectados. Un valor calculado en el instante lógico
+`clock` sigue siendo válido mientras ninguno de sus namespaces tenga una
+versión posterior (changed_since), y una clave puede incluir directamente
+las versiones actuales (versioned_key). Si la caché expulsa una versión, se
+recrea con el reloj actual, lo que invalida todo lo calculado antes.
+
+Las invalidaciones se acumulan y se aplican una sola vez: durante una
+petición (collect_invalidations, desde InvalidationCollectorMiddleware) al
+terminarla, y dentro de una transacción al confirmarla (on_commit). Un
+project_create con cinco imágenes cuesta así un único bump.
+"""
+
+from contextlib import contextmanager
+from django.core.cache import cache
+from django.db import transaction
+import threading
+import time
+
+CLOCK_KEY = 'ns:clock'
+
+# Campos de Project que no cambian lo que se cachea o que se invalidan por otra vía:
+# las visitas se toleran desfasadas hasta el TTL de cada entrada y la imagen
+# principal se invalida desde las señales de ProjectImage
+UNTRACKED_FIELDS = {'views_count', 'main_image', 'main_image_url', 'main_image_width', 'main_image_height'}
+
+# Campos que cambian qué proyectos aparecen en un listado o su orden
+LISTING_FIELDS = ('is_published', 'category', 'title', 'is_featured')
+
+
+def version_key(namespace):
+    return f"ns:{namespace}"
+
+
+def initial_clock():
+    """Valor inicial del reloj: milisegundos actuales, siempre mayor que un reloj perdido."""
+    return int(time.time() * 1000)
+
+
+def current_clock():
+    """Instante lógico actual (se toma antes de calcular un valor cacheable)."""
+    clock = cache.get(CLOCK_KEY)
+    if clock is None:
+        cache.add(CLOCK_KEY, initial_clock(), None)
+        clock = cache.get(CLOCK_KEY)
+    return clock
+
+
+def tick():
+    """Avanza el reloj lógico de forma atómica y retorna el nuevo instante."""
+    try:
+        return cache.incr(CLOCK_KEY)
+    except ValueError:
+        cache.add(CLOCK_KEY, initial_clock(), None)
+        return cache.incr(CLOCK_KEY)
+
+
+def get_versions(namespaces):
+    """
+    Versiones actuales de varios namespaces en una lectura.
+    Los que no tienen versión (nunca invalidados o expulsados) se crean con
+    el reloj actual.
+
+    Returns:
+        dict {namespace: versión}
+    """
+    keys = {version_key(namespace): namespace for namespace in namespaces}
+    found = cache.get_many(list(keys))
+    missing = [key for key in keys if key not in found]
+    if missing:
+        clock = current_clock()
+        for key in missing:
+            cache.add(key, clock, None)
+        found.update(cache.get_many(missing))
+    return {keys[key]: version for key, version in found.items()}
+
+
+def changed_since(namespaces, clock):
+    """Indica si alguno de los namespaces se invalidó después del instante `clock`."""
+    return any(version > clock for version in get_versions(namespaces).values())
+
+
+def versioned_key(base, *namespaces):
+    """
+    Clave que incluye las versiones actuales de sus namespaces: al invalidar
+    cualquiera de ellos la clave cambia y la entrada anterior deja de leerse.
+
+    Uso:
+        key = versioned_key('home_count', 'category:all')
+    """
+    versions = get_versions(namespaces)
+    return '|'.join([base] + [f"{namespace}={versions[namespace]}" for namespace in sorted(versions)])
+
+
+def apply_bump(namespaces):
+    """
+    Sube la versión de los namespaces ya mismo.
+    Cuesta un incremento atómico y una escritura, sin importar cuántos sean.
+    """
+    version = tick()
+    cache.set_many({version_key(namespace): version for namespace in namespaces}, None)
+
+
+# Invalidaciones pendientes del hilo: de la petición en curso y de la transacción abierta
+_local = threading.local()
+
+
+class InvalidationBatch(set):
+    """Namespaces pendientes de una transacción; se registra como callback on_commit."""
+
+    def __init__(self, block):
+        super().__init__()
+        self.block = block
+
+    def __call__(self):
+        if getattr(_local, 'batch', None) is self:
+            _local.batch = None
+        apply_bump(self)
+
+
+def outer_block():
+    """
+    Bloque atómico propio más externo (None en autocommit). Los de TestCase
+    no cuentan: ahí nada se confirma y los datos son visibles como en autocommit.
+    """
+    connection = transaction.get_connection()
+    for block in connection.atomic_blocks:
+        if not getattr(block, '_from_testcase', False):
+            return block
+    return None
+
+
+def transaction_batch(block):
+    """Lote de la transacción del bloque, registrado en on_commit una sola vez."""
+    connection = transaction.get_connection()
+    batch = getattr(_local, 'batch', None)
+    # Si un rollback descartó su callback o es de otra transacción, se empieza un lote nuevo
+    if batch is None or batch.block is not block or not any(
+        entry[1] is batch for entry in connection.run_on_commit
+    ):
+        batch = _local.batch = InvalidationBatch(block)
+        transaction.on_commit(batch)
+    return batch
+
+
+def bump(*namespaces):
+    """
+    Invalida namespaces. Dentro de una petición se acumulan hasta que
+    termina; dentro de una transacción, hasta que se confirma (lo calculado
+    con datos aún sin confirmar queda con un instante anterior). Fuera de
+    ambas se aplica en el momento.
+    """
+    namespaces = {namespace for namespace in namespaces if namespace}
+    if not namespaces:
+        return
+    collector = getattr(_local, 'collector', None)
+    if collector is not None:
+        collector.update(namespaces)
+        return
+    block = outer_block()
+    if block is not None:
+        transaction_batch(block).update(namespaces)
+    else:
+        apply_bump(namespaces)
+
+
+def pending(namespaces):
+    """Indica si alguno de los namespaces tiene una invalidación acumulada sin aplicar en este hilo."""
+    waiting = set(getattr(_local, 'collector', None) or ())
+    batch = getattr(_local, 'batch', None)
+    if batch is not None and outer_block() is batch.block:
+        waiting |= batch
+    return not waiting.isdisjoint(namespaces)
+
+
+@contextmanager
+def collect_invalidations():
+    """
+    Acumula, sin duplicados, las invalidaciones del bloque y las aplica al
+    salir (o al confirmar la transacción que siga abierta).
+
+    Uso:
+        with collect_invalidations():
+            project.save()
+            for image in images:
+                ProjectImage.objects.create(project=project, image=image)
+    """
+    if getattr(_local, 'collector', None) is not None:
+        yield _local.collector
+        return
+    collector = _local.collector = set()
+    try:
+        yield collector
+    finally:
+        _local.collector = None
+        bump(*collector)
+
+
+# ==================== PROYECTOS ====================
+
+def tracks_update(update_fields):
+    """Indica si un guardado con update_fields puede cambiar datos cacheados."""
+    return update_fields is None or bool(set(update_fields) - UNTRACKED_FIELDS)
+
+
+def read_listing_state(project_id):
+    """Valores actuales de LISTING_FIELDS en la base de datos (None si no existe)."""
+    from .models import Project
+
+    return Project.objects.filter(pk=project_id).values(*LISTING_FIELDS).first()
+
+
+def listing_state(project):
+    """Valores de LISTING_FIELDS de una instancia."""
+    return {field: getattr(project, field) for field in LISTING_FIELDS}
+
+
+def project_namespaces(project_id, previous, current):
+    """
+    Namespaces afectados por el cambio de un proyecto.
+
+    Args:
+        project_id: ID del proyecto
+        previous: listing_state antes del cambio (None si es nuevo)
+        current: listing_state después del cambio (None si se eliminó)
+    """
+    namespaces = {f"project:{project_id}"}
+    states = [state for state in (previous, current) if state]
+    listed = any(state['is_published'] for state in states)
+    if listed and previous != current:
+        namespaces.add('category:all')
+        namespaces.update(f"category:{state['category']}" for state in states)
+        if any(state['is_published'] and state['is_featured'] for state in states):
+            namespaces.add('global')
+    return namespaces
+
+
+def invalidate_project(project_id, previous, current):
+    """Invalida lo cacheado que depende del cambio de un proyecto."""
+    bump(*project_namespaces(project_id, previous, current))
+
+
+def invalidate_bulk_update(queryset, update):
+    """
+    Envuelve un queryset.update() de proyectos invalidando sus namespaces.
+    Lee el estado de listado de las filas antes y después de actualizar.
+
+    Args:
+        queryset: QuerySet de Project a actualizar
+        update: Función sin argumentos que ejecuta la actualización
+
+    Returns:
+        Resultado de update()
+    """
+    before = {row.pop('pk'): row for row in queryset.order_by().values('pk', *LISTING_FIELDS)}
+    rows = update()
+    after = {
+        row.pop('pk'): row
+        for row in queryset.model._base_manager.filter(pk__in=list(before)).values('pk', *LISTING_FIELDS)
+    }
+
+    namespaces = set()
+    for pk, previous in before.items():
+        namespaces |= project_namespaces(pk, previous, after.get(pk))
+    bump(*namespaces)
+    return rows
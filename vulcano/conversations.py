@@ -0,0 +1,295 @@
+"""
+Conversaciones: hilos de mensajes con el último mensaje desnormalizado.
+
+Cada Message pertenece a una Conversation identificada por sus dos
+participantes (ordenados por id) y el proyecto opcional. La conversación
+guarda el id, la fecha, el remitente, el asunto y un extracto del último
+mensaje, y cada ConversationParticipant su contador de no leídos y una copia
+de la fecha del último mensaje. Así la bandeja de entrada es una única
+consulta sobre el índice (user, -last_message_at) y el hilo se pagina por
+cursor sobre (conversation, -created_at).
+
+Se mantienen desde las señales de Message:
+
+- pre_save: se busca o crea la conversación del mensaje nuevo.
+- post_save: un UPDATE condicional del último mensaje (solo si es más
+  reciente) y otro de los participantes (fecha y no leídos del destinatario);
+  un cambio de estado de lectura ajusta el contador del destinatario.
+- post_delete: se recalcula la conversación desde sus mensajes.
+
+Al borrar un proyecto sus conversaciones pasan a la conversación directa
+del mismo par de usuarios. `manage.py rebuild_conversations` las recalcula
+todas (p. ej. tras un bulk_create de mensajes, que no emite señales).
+"""
+
+from collections import Counter
+from django.db import IntegrityError, transaction
+from django.db.models import Case, Count, F, Q, Value, When
+from django.db.models.functions import Greatest
+from django.utils import timezone
+from django.utils.text import Truncator
+from . import cache_namespaces, user_stats
+import logging
+
+logger = logging.getLogger('vulcano')
+
+SNIPPET_LENGTH = 140
+
+# Mensajes por página en el hilo
+THREAD_PAGE_SIZE = 30
+
+# Ids por UPDATE al asignar conversaciones en bloque
+BATCH_SIZE = 500
+
+
+def participants_key(sender_id, recipient_id):
+    """Par de participantes ordenado (user_low_id, user_high_id)."""
+    return min(sender_id, recipient_id), max(sender_id, recipient_id)
+
+
+def make_snippet(body):
+    """Primeros caracteres del cuerpo en una sola línea."""
+    return Truncator(' '.join(body.split())).chars(SNIPPET_LENGTH)
+
+
+def conversation_for(sender_id, recipient_id, project_id=None):
+    """
+    Retorna el id de la conversación del par y proyecto, creándola si no existe.
+
+    Returns:
+        int: Id de la conversación
+    """
+    from .models import Conversation, ConversationParticipant
+
+    user_low_id, user_high_id = participants_key(sender_id, recipient_id)
+    lookup = {'user_low_id': user_low_id, 'user_high_id': user_high_id, 'project_id': project_id}
+    conversation_id = Conversation.objects.filter(**lookup).values_list('pk', flat=True).first()
+    if conversation_id is not None:
+        return conversation_id
+
+    try:
+        with transaction.atomic():
+            conversation = Conversation.objects.create(**lookup)
+            ConversationParticipant.objects.bulk_create([
+                ConversationParticipant(conversation=conversation, user_id=user_id)
+                for user_id in {user_low_id, user_high_id}
+            ])
+    except IntegrityError:
+        # Otra petición creó la misma conversación a la vez
+        return Conversation.objects.filter(**lookup).values_list('pk', flat=True).get()
+    return conversation.pk
+
+
+def record_message(message):
+    """
+    Registra un mensaje nuevo en su conversación: último mensaje, total,
+    fecha de los participantes y no leídos del destinatario.
+    """
+    from .models import Conversation, ConversationParticipant
+
+    if message.conversation_id is None:
+        return
+    # Dos mensajes concurrentes pueden confirmarse en otro orden:
+    # el puntero solo avanza si este es más reciente
+    newer = Q(last_message_at__lte=message.created_at)
+
+    def latest(name, value):
+        field = Conversation._meta.get_field(name)
+        return Case(
+            When(newer, then=Value(value)),
+            default=F(name),
+            output_field=field.target_field if field.is_relation else field
+        )
+
+    Conversation.objects.filter(pk=message.conversation_id).update(
+        message_count=F('message_count') + 1,
+        last_message=latest('last_message', message.pk),
+        last_sender=latest('last_sender', message.sender_id),
+        last_subject=latest('last_subject', message.subject),
+        last_snippet=latest('last_snippet', make_snippet(message.body)),
+        last_message_at=latest('last_message_at', message.created_at),
+    )
+    update = {'last_message_at': Greatest(F('last_message_at'), Value(message.created_at))}
+    if not message.is_read:
+        update['unread_count'] = Case(
+            When(user_id=message.recipient_id, then=F('unread_count') + 1),
+            default=F('unread_count')
+        )
+    ConversationParticipant.objects.filter(conversation_id=message.conversation_id).update(**update)
+
+
+def record_read_change(message, previous):
+    """
+    Ajusta los no leídos del destinatario si cambió el estado de lectura.
+
+    Args:
+        message: Mensaje guardado
+        previous: (recipient_id, is_read) antes de guardarlo, o None
+    """
+    from .models import ConversationParticipant
+
+    if message.conversation_id is None or previous is None or previous[1] == message.is_read:
+        return
+    ConversationParticipant.objects.filter(
+        conversation_id=message.conversation_id, user_id=message.recipient_id
+    ).update(unread_count=F('unread_count') + (-1 if message.is_read else 1))
+
+
+def refresh_conversation(conversation_id):
+    """
+    Recalcula una conversación desde sus mensajes (tras borrar uno o al
+    fusionar conversaciones). Si no le quedan mensajes, se elimina.
+    """
+    from .models import Conversation, ConversationParticipant, Message
+
+    conversation = Conversation.objects.filter(pk=conversation_id).first()
+    if conversation is None:
+        return
+    messages = Message.objects.filter(conversation_id=conversation_id)
+    last = messages.order_by('-created_at', '-id').first()
+    if last is None:
+        conversation.delete()
+        return
+
+    conversation.last_message = last
+    conversation.last_sender_id = last.sender_id
+    conversation.last_subject = last.subject
+    conversation.last_snippet = make_snippet(last.body)
+    conversation.last_message_at = last.created_at
+    conversation.message_count = messages.count()
+    conversation.save()
+
+    unread = dict(
+        messages.filter(is_read=False).order_by().values_list('recipient_id').annotate(total=Count('id'))
+    )
+    participants = list(conversation.participants.all())
+    for participant in participants:
+        participant.unread_count = unread.get(participant.user_id, 0)
+        participant.last_message_at = last.created_at
+    ConversationParticipant.objects.bulk_update(participants, ['unread_count', 'last_message_at'])
+
+
+def detach_project(project_id):
+    """
+    Pasa las conversaciones de un proyecto que se va a eliminar a la
+    conversación directa de cada par (la restricción única no admite dos
+    conversaciones sin proyecto para el mismo par).
+    """
+    from .models import Conversation, Message
+
+    for conversation in Conversation.objects.filter(project_id=project_id):
+        target_id = Conversation.objects.filter(
+            user_low_id=conversation.user_low_id,
+            user_high_id=conversation.user_high_id,
+            project__isnull=True
+        ).values_list('pk', flat=True).first()
+        if target_id is None:
+            conversation.project = None
+            conversation.save(update_fields=['project'])
+            continue
+        Message.objects.filter(conversation=conversation).update(conversation_id=target_id)
+        conversation.delete()
+        refresh_conversation(target_id)
+
+
+def mark_conversation_read(conversation, user):
+    """
+    Marca como leídos los mensajes recibidos por `user` en la conversación.
+
+    Returns:
+        int: Mensajes marcados
+    """
+    from .models import ConversationParticipant, Message
+
+    with transaction.atomic():
+        # update() no emite señales: contadores y cachés se ajustan aquí
+        updated = Message.objects.filter(
+            conversation=conversation, recipient=user, is_read=False
+        ).update(is_read=True, read_at=timezone.now())
+        if updated:
+            ConversationParticipant.objects.filter(conversation=conversation, user=user).update(
+                unread_count=F('unread_count') - updated
+            )
+            deltas = user_stats.new_deltas()
+            deltas[user.pk]['unread_messages'] -= updated
+            user_stats.apply_deltas(deltas)
+            cache_namespaces.bump(f"user:{user.pk}")
+    return updated
+
+
+def build_conversations():
+    """
+    Crea las conversaciones de los mensajes que no tienen y las asigna.
+
+    Returns:
+        int: Conversaciones creadas
+    """
+    from .models import Conversation, ConversationParticipant, Message
+
+    threads = {}
+    rows = Message.objects.filter(conversation__isnull=True).order_by('created_at', 'id').values_list(
+        'id', 'sender_id', 'recipient_id', 'project_id', 'created_at', 'is_read'
+    )
+    for pk, sender_id, recipient_id, project_id, created_at, is_read in rows.iterator(chunk_size=2000):
+        key = participants_key(sender_id, recipient_id) + (project_id,)
+        thread = threads.setdefault(key, {'ids': [], 'unread': Counter()})
+        thread['ids'].append(pk)
+        thread['last'] = (pk, sender_id, created_at)
+        if not is_read:
+            thread['unread'][recipient_id] += 1
+    if not threads:
+        return 0
+
+    last_messages = Message.objects.only('subject', 'body').in_bulk(
+        [thread['last'][0] for thread in threads.values()]
+    )
+    conversations = []
+    for (user_low_id, user_high_id, project_id), thread in threads.items():
+        last_id, sender_id, created_at = thread['last']
+        last = last_messages[last_id]
+        conversations.append(Conversation(
+            user_low_id=user_low_id,
+            user_high_id=user_high_id,
+            project_id=project_id,
+            last_message_id=last_id,
+            last_sender_id=sender_id,
+            last_subject=last.subject,
+            last_snippet=make_snippet(last.body),
+            last_message_at=created_at,
+            message_count=len(thread['ids']),
+        ))
+    Conversation.objects.bulk_create(conversations)
+
+    participants = []
+    for conversation, thread in zip(conversations, threads.values()):
+        for user_id in {conversation.user_low_id, conversation.user_high_id}:
+            participants.append(ConversationParticipant(
+                conversation=conversation,
+                user_id=user_id,
+                unread_count=thread['unread'][user_id],
+                last_message_at=conversation.last_message_at,
+            ))
+        for start in range(0, len(thread['ids']), BATCH_SIZE):
+            Message.objects.filter(pk__in=thread['ids'][start:start + BATCH_SIZE]).update(
+                conversation=conversation
+            )
+    ConversationParticipant.objects.bulk_create(participants)
+    return len(conversations)
+
+
+def rebuild_conversations():
+    """
+    Recalcula todas las conversaciones desde los mensajes.
+
+    Returns:
+        int: Conversaciones
+    """
+    from .models import Conversation, ConversationParticipant, Message
+
+    with transaction.atomic():
+        Message.objects.exclude(conversation=None).update(conversation=None)
+        ConversationParticipant.objects.all().delete()
+        Conversation.objects.all().delete()
+        total = build_conversations()
+    logger.info(f"Conversaciones recalculadas: {total}")
+    return total
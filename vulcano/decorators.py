@@ -8,6 +8,8 @@ from django.shortcuts import redirect
 from django.contrib import messages
 from django.core.exceptions import PermissionDenied
 from django.http import JsonResponse
+from .identity_map import get_object
+from .structured_logging import log_event
 import logging
 
 logger = logging.getLogger('vulcano')
@@ -36,15 +38,15 @@ def role_required(*roles):
             
             try:
                 if not hasattr(request.user, 'profile'):
-                    logger.error(f"Usuario {request.user.username} no tiene perfil")
+                    log_event(logger, 'auth.missing_profile', logging.ERROR, user=request.user.username)
                     messages.error(request, 'Error: Perfil de usuario no encontrado.')
                     return redirect('vulcano:home')
                 
                 user_role = request.user.profile.role
                 if user_role not in roles:
-                    logger.warning(
-                        f"Acceso denegado: Usuario {request.user.username} "
-                        f"con rol {user_role} intentó acceder a vista que requiere {roles}"
+                    log_event(
+                        logger, 'auth.role_denied', logging.WARNING,
+                        user=request.user.username, role=user_role, required=roles, path=request.path
                     )
                     if request.META.get('HTTP_X_REQUESTED_WITH') == 'XMLHttpRequest':
                         return JsonResponse({'error': 'Permission denied'}, status=403)
@@ -84,7 +86,8 @@ def arquitecto_or_admin_required(view_func):
 def project_owner_required(view_func):
     """
     Decorador que verifica si el usuario es propietario del proyecto o administrador.
-    El proyecto debe ser accesible mediante kwargs['slug'] o kwargs['pk'].
+    El proyecto debe ser accesible mediante kwargs['slug'] o kwargs['pk'] y se
+    pasa a la vista como kwargs['project'] (cargado una sola vez por petición).
     """
     @wraps(view_func)
     def wrapper(request, *args, **kwargs):
@@ -96,11 +99,11 @@ def project_owner_required(view_func):
         
         try:
             # Intentar obtener el proyecto por slug o pk
-            project_identifier = kwargs.get('slug') or kwargs.get('pk')
             if kwargs.get('slug'):
-                project = Project.objects.get(slug=project_identifier)
+                project = get_object(request, Project, slug=kwargs['slug'])
             else:
-                project = Project.objects.get(pk=project_identifier)
+                project = get_object(request, Project, pk=kwargs.get('pk'))
+            kwargs['project'] = project
             
             # Verificar si es el propietario o administrador
             user_profile = request.user.profile
@@ -118,9 +121,9 @@ def project_owner_required(view_func):
             if user_profile.is_admin() or project.arquitecto == request.user:
                 return view_func(request, *args, **kwargs)
             
-            logger.warning(
-                f"Acceso denegado: Usuario {request.user.username} "
-                f"intentó acceder al proyecto {project.title} sin ser propietario"
+            log_event(
+                logger, 'auth.project_denied', logging.WARNING,
+                user=request.user.username, project=project.slug
             )
             messages.error(request, 'No tienes permisos para gestionar este proyecto.')
             return redirect('vulcano:dashboard')
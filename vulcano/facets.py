@@ -0,0 +1,191 @@
+"""
+Conteos de facetas de proyectos (categoría / estado / publicado).
+Se guardan en ProjectFacetCount, una fila por combinación, y se mantienen
+por deltas desde las señales de Project y desde ProjectQuerySet.update,
+por lo que nunca hace falta recalcular con COUNT(*) por petición.
+"""
+
+from collections import Counter
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F
+from .cache_namespaces import bump
+from .utils import cached_computation
+import logging
+
+logger = logging.getLogger('vulcano')
+
+# Campos de Project que definen una faceta
+FACET_FIELDS = ('category', 'status', 'is_published')
+
+CACHE_KEY = 'project_facet_counts'
+CACHE_NAMESPACE = 'facets'
+CACHE_TIMEOUT = 3600
+
+
+def facet_key(obj):
+    """Retorna la tupla (category, status, is_published) de un proyecto."""
+    return tuple(getattr(obj, field) for field in FACET_FIELDS)
+
+
+def touches_facets(update_fields):
+    """Indica si un guardado con update_fields puede cambiar las facetas."""
+    return update_fields is None or bool(set(update_fields) & set(FACET_FIELDS))
+
+
+def read_key(project_id):
+    """
+    Lee la faceta actual de un proyecto desde la base de datos.
+    Dentro de una transacción bloquea la fila (SELECT ... FOR UPDATE) para
+    que dos guardados concurrentes del mismo proyecto se serialicen.
+
+    Returns:
+        Tupla de faceta o None si el proyecto no existe
+    """
+    from .models import Project
+
+    queryset = Project.objects.filter(pk=project_id)
+    if connection.in_atomic_block:
+        queryset = queryset.select_for_update()
+    return queryset.values_list(*FACET_FIELDS).first()
+
+
+def apply_deltas(deltas):
+    """
+    Aplica variaciones a los contadores con UPDATE ... SET count = count + n.
+
+    Args:
+        deltas: dict o Counter {faceta: variación}
+    """
+    from .models import ProjectFacetCount
+
+    changed = False
+    for key, delta in deltas.items():
+        if not delta:
+            continue
+        changed = True
+        filters = dict(zip(FACET_FIELDS, key))
+        updated = ProjectFacetCount.objects.filter(**filters).update(count=F('count') + delta)
+        if not updated:
+            try:
+                with transaction.atomic():
+                    ProjectFacetCount.objects.create(count=delta, **filters)
+            except IntegrityError:
+                # Otra transacción creó la fila entre el UPDATE y el INSERT
+                ProjectFacetCount.objects.filter(**filters).update(count=F('count') + delta)
+
+    if changed:
+        invalidate_cache()
+
+
+def invalidate_cache():
+    """
+    Invalida el namespace de los conteos en caché (al confirmar la
+    transacción, para que una lectura concurrente no guarde valores sin confirmar).
+    """
+    bump(CACHE_NAMESPACE)
+
+
+def record_change(old_key, new_key):
+    """Registra que un proyecto pasó de old_key a new_key (None = no existe)."""
+    if old_key == new_key:
+        return
+    deltas = Counter()
+    if old_key is not None:
+        deltas[old_key] -= 1
+    if new_key is not None:
+        deltas[new_key] += 1
+    apply_deltas(deltas)
+
+
+def rebuild_facet_counts():
+    """
+    Recalcula todos los contadores desde la tabla de proyectos.
+    Solo es necesario si se modificaron proyectos con SQL directo.
+
+    Returns:
+        int: Número de combinaciones con proyectos
+    """
+    from .models import Project, ProjectFacetCount
+    from django.db.models import Count
+
+    with transaction.atomic():
+        rows = Project.objects.order_by().values(*FACET_FIELDS).annotate(total=Count('id'))
+        ProjectFacetCount.objects.all().delete()
+        ProjectFacetCount.objects.bulk_create([
+            ProjectFacetCount(
+                category=row['category'],
+                status=row['status'],
+                is_published=row['is_published'],
+                count=row['total'],
+            )
+            for row in rows
+        ])
+    invalidate_cache()
+    return len(rows)
+
+
+def get_facet_counts():
+    """
+    Retorna todas las combinaciones con su conteo, servidas desde caché.
+
+    Returns:
+        Lista de tuplas (category, status, is_published, count)
+    """
+    from .models import ProjectFacetCount
+
+    return cached_computation(
+        CACHE_KEY,
+        lambda: list(ProjectFacetCount.objects.filter(count__gt=0).values_list(*FACET_FIELDS, 'count')),
+        CACHE_TIMEOUT,
+        name='facet_counts',
+        depends_on=[CACHE_NAMESPACE]
+    )
+
+
+def count_by(field, **filters):
+    """
+    Agrega los conteos por un campo de faceta con filtros opcionales.
+
+    Ejemplo:
+        count_by('category', is_published=True)
+
+    Returns:
+        Lista de dicts {field: valor, 'count': n} ordenada por conteo descendente
+    """
+    index = FACET_FIELDS.index(field)
+    positions = {FACET_FIELDS.index(name): value for name, value in filters.items()}
+
+    totals = Counter()
+    for row in get_facet_counts():
+        if all(row[position] == value for position, value in positions.items()):
+            totals[row[index]] += row[-1]
+
+    return [
+        {field: value, 'count': count}
+        for value, count in sorted(totals.items(), key=lambda item: (-item[1], str(item[0])))
+        if count > 0
+    ]
+
+
+def get_category_counts(published=True):
+    """Conteo de proyectos por categoría con su etiqueta legible."""
+    from .models import Project
+
+    labels = dict(Project.CATEGORY_CHOICES)
+    filters = {} if published is None else {'is_published': published}
+    rows = count_by('category', **filters)
+    for row in rows:
+        row['label'] = labels.get(row['category'], row['category'])
+    return rows
+
+
+def get_status_counts(published=None):
+    """Conteo de proyectos por estado con su etiqueta legible."""
+    from .models import Project
+
+    labels = dict(Project.STATUS_CHOICES)
+    filters = {} if published is None else {'is_published': published}
+    rows = count_by('status', **filters)
+    for row in rows:
+        row['label'] = labels.get(row['status'], row['status'])
+    return rows
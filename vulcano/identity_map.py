@@ -0,0 +1,87 @@
+"""
+Mapa de identidad por petición.
+
+Cada petición (IdentityMapMiddleware) tiene un IdentityMap donde se guardan
+los objetos ya cargados, por modelo y clave primaria. get_object() consulta
+la base de datos solo la primera vez que se pide un objeto en la petición;
+por ejemplo, el proyecto que carga project_owner_required es el mismo que
+recibe la vista.
+
+El usuario y su perfil se cargan juntos en una sola consulta
+(ProfileModelBackend), por lo que request.user.profile no vuelve a consultar
+en decoradores, vistas ni plantillas.
+"""
+
+from django.contrib.auth import BACKEND_SESSION_KEY, get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+# Sesiones iniciadas con el backend por defecto, anteriores a ProfileModelBackend
+LEGACY_BACKEND = 'django.contrib.auth.backends.ModelBackend'
+PROFILE_BACKEND = 'vulcano.identity_map.ProfileModelBackend'
+
+
+class ProfileModelBackend(ModelBackend):
+    """ModelBackend que carga el perfil del usuario en la misma consulta."""
+
+    def get_user(self, user_id):
+        UserModel = get_user_model()
+        try:
+            user = UserModel._default_manager.select_related('profile').get(pk=user_id)
+        except UserModel.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
+
+
+class IdentityMap:
+    """Objetos cargados durante una petición, por modelo y clave primaria."""
+
+    def __init__(self):
+        self._objects = {}
+        self._lookups = {}
+
+    @staticmethod
+    def _identity(model, pk):
+        return (model._meta.label, model._meta.pk.to_python(pk))
+
+    def add(self, obj):
+        """Registra un objeto (si ya había uno con la misma identidad, retorna ese)."""
+        return self._objects.setdefault(self._identity(type(obj), obj.pk), obj)
+
+    def get(self, model, **lookup):
+        """
+        Objeto del modelo que cumple `lookup`, cargado una sola vez por petición.
+
+        Raises:
+            model.DoesNotExist: Si no existe
+        """
+        if set(lookup) <= {'pk', model._meta.pk.name} and len(lookup) == 1:
+            identity = self._identity(model, next(iter(lookup.values())))
+        else:
+            identity = self._lookups.get((model._meta.label, frozenset(lookup.items())))
+        if identity in self._objects:
+            return self._objects[identity]
+
+        obj = self.add(model._default_manager.get(**lookup))
+        self._lookups[(model._meta.label, frozenset(lookup.items()))] = self._identity(model, obj.pk)
+        return obj
+
+
+def get_object(request, model, **lookup):
+    """
+    Carga un objeto a través del mapa de identidad de la petición (o
+    directamente si la petición no tiene mapa).
+
+    Uso:
+        project = get_object(request, Project, slug=slug)
+    """
+    identity_map = getattr(request, 'identity_map', None)
+    if identity_map is None:
+        return model._default_manager.get(**lookup)
+    return identity_map.get(model, **lookup)
+
+
+def upgrade_session_backend(request):
+    """Pasa las sesiones del backend por defecto a ProfileModelBackend sin cerrarlas."""
+    session = getattr(request, 'session', None)
+    if session is not None and session.get(BACKEND_SESSION_KEY) == LEGACY_BACKEND:
+        session[BACKEND_SESSION_KEY] = PROFILE_BACKEND
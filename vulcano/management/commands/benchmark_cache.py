@@ -0,0 +1,123 @@
+"""
+Management Command para comparar los backends de caché: memoria local
+(LocMemCache), base de datos (DatabaseCache) y archivo SQLite compartido
+(vulcano.sqlite_cache.SQLiteCache).
+
+Uso:
+    python manage.py benchmark_cache
+    python manage.py benchmark_cache --operations 5000 --workers 3
+"""
+
+import multiprocessing
+import os
+import statistics
+import tempfile
+import time
+from django.core.cache.backends.db import DatabaseCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management.base import BaseCommand
+from django.core.management.commands.createcachetable import Command as CreateCacheTable
+from django.db import connection
+from vulcano.sqlite_cache import SQLiteCache
+
+
+BENCHMARK_TABLE = 'vulcano_benchmark_cache'
+VALUE = {'total_projects': 42, 'published_projects': 40, 'titles': ['Casa Patio'] * 20}
+
+
+def run_worker(path, operations, queue):
+    """Worker independiente: incrementa un contador compartido."""
+    cache = SQLiteCache(path, {})
+    start = time.perf_counter()
+    for _ in range(operations):
+        cache.incr('shared_counter')
+    queue.put(time.perf_counter() - start)
+
+
+class Command(BaseCommand):
+    help = 'Mide get/set/incr/get_many en LocMem, DatabaseCache y la caché SQLite compartida'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--operations',
+            type=int,
+            default=2000,
+            help='Operaciones por prueba (por defecto: 2000)',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=3,
+            help='Procesos concurrentes para la prueba de incr compartido (por defecto: 3)',
+        )
+
+    def handle(self, *args, **options):
+        operations = options['operations']
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'cache.sqlite3')
+            creator = CreateCacheTable()
+            creator.verbosity = 0
+            creator.create_table('default', BENCHMARK_TABLE, False)
+            try:
+                backends = [
+                    ('LocMem', LocMemCache('benchmark', {'OPTIONS': {'MAX_ENTRIES': operations * 2}})),
+                    ('DatabaseCache', DatabaseCache(BENCHMARK_TABLE, {'OPTIONS': {'MAX_ENTRIES': operations * 2}})),
+                    ('SQLite WAL', SQLiteCache(path, {})),
+                ]
+                self.stdout.write(
+                    f"{'Backend':<16}{'set (µs)':>12}{'get (µs)':>12}{'incr (µs)':>12}{'get_many x50 (µs)':>20}"
+                )
+                for label, cache in backends:
+                    self.stdout.write(f'{label:<16}' + ''.join(
+                        f'{value:>{width}.1f}' for value, width in zip(self.measure(cache, operations), (12, 12, 12, 20))
+                    ))
+            finally:
+                with connection.cursor() as cursor:
+                    cursor.execute(f'DROP TABLE {connection.ops.quote_name(BENCHMARK_TABLE)}')
+
+            self.measure_shared(path, operations, options['workers'])
+
+        self.stdout.write(self.style.SUCCESS('Benchmark completado'))
+
+    def measure(self, cache, operations):
+        """Retorna µs por operación (mediana por lote de 100) de set, get, incr y get_many."""
+        keys = [f'bench:{i}' for i in range(operations)]
+        cache.set('bench:counter', 0)
+        return (
+            self.per_operation(lambda key: cache.set(key, VALUE), keys),
+            self.per_operation(lambda key: cache.get(key), keys),
+            self.per_operation(lambda key: cache.incr('bench:counter'), keys),
+            self.per_operation(lambda key: cache.get_many(keys[:50]), keys[:max(operations // 50, 100)]),
+        )
+
+    def per_operation(self, func, keys, batch=100):
+        timings = []
+        for start in range(0, len(keys), batch):
+            chunk = keys[start:start + batch]
+            begin = time.perf_counter()
+            for key in chunk:
+                func(key)
+            timings.append((time.perf_counter() - begin) * 1e6 / len(chunk))
+        return statistics.median(timings)
+
+    def measure_shared(self, path, operations, workers):
+        """Varios procesos incrementan el mismo contador: comprueba atomicidad y throughput."""
+        SQLiteCache(path, {}).set('shared_counter', 0, None)
+        queue = multiprocessing.Queue()
+        processes = [
+            multiprocessing.Process(target=run_worker, args=(path, operations, queue))
+            for _ in range(workers)
+        ]
+        start = time.perf_counter()
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        elapsed = time.perf_counter() - start
+
+        total = SQLiteCache(path, {}).get('shared_counter')
+        self.stdout.write(
+            f"incr compartido: {workers} procesos x {operations} = {total} "
+            f"(esperado {workers * operations}), {workers * operations / elapsed:.0f} ops/s"
+        )
@@ -0,0 +1,103 @@
+"""
+Management Command para comparar la búsqueda de texto completo con icontains.
+Genera proyectos sintéticos dentro de una transacción que se revierte al final.
+
+Uso:
+    python manage.py benchmark_search
+    python manage.py benchmark_search --projects 100000 --repeat 5
+"""
+
+import random
+import statistics
+import time
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+from vulcano.models import Project, ProjectSearchDocument
+from vulcano.search import get_document_parts, search_projects, write_documents
+
+
+WORDS = [
+    'casa', 'moderna', 'edificio', 'oficinas', 'jardín', 'terraza', 'hormigón',
+    'madera', 'vidrio', 'fachada', 'patio', 'escuela', 'hospital', 'museo',
+    'biblioteca', 'plaza', 'parque', 'vivienda', 'residencial', 'sostenible',
+    'iluminación', 'natural', 'ventilación', 'cubierta', 'estructura', 'acero',
+]
+LOCATIONS = ['Lima', 'Cusco', 'Arequipa', 'Trujillo', 'Piura', 'Ciudad de México', 'Bogotá']
+QUERIES = ['casa moderna', 'museo', 'hormigon', 'bibliteca', 'jardin terraza', 'Cusco']
+
+
+class Command(BaseCommand):
+    help = 'Mide la búsqueda de proyectos (texto completo vs icontains) con datos sintéticos'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--projects',
+            type=int,
+            default=100000,
+            help='Número de proyectos sintéticos (por defecto: 100000)',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='Repeticiones por consulta (por defecto: 5)',
+        )
+
+    def handle(self, *args, **options):
+        rng = random.Random(42)
+
+        with transaction.atomic():
+            self.stdout.write(f"Generando {options['projects']} proyectos sintéticos...")
+            self.populate(options['projects'], rng)
+
+            self.stdout.write(f"{'Consulta':<20}{'icontains (ms)':>16}{'FTS (ms)':>12}{'Resultados':>12}")
+            for query in QUERIES:
+                legacy = Project.objects.filter(is_published=True).filter(
+                    Q(title__icontains=query) |
+                    Q(description__icontains=query) |
+                    Q(location__icontains=query)
+                )
+                legacy_ms = self.measure(lambda: list(legacy.order_by('-created_at')[:12]), options['repeat'])
+
+                ranked = search_projects(Project.objects.filter(is_published=True), query)
+                fts_ms = self.measure(lambda: list(ranked[:12]), options['repeat'])
+
+                self.stdout.write(f"{query:<20}{legacy_ms:>16.2f}{fts_ms:>12.2f}{ranked.count():>12}")
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(self.style.SUCCESS('Benchmark completado (datos revertidos)'))
+
+    def populate(self, total, rng, batch_size=2000):
+        """Crea proyectos y sus documentos de búsqueda por lotes."""
+        arquitecto = User.objects.create_user(username='benchmark_search_arq', password=None)
+
+        for start in range(0, total, batch_size):
+            projects = []
+            for i in range(start, min(start + batch_size, total)):
+                title = ' '.join(rng.sample(WORDS, 3)).capitalize()
+                projects.append(Project(
+                    title=f'{title} {i}',
+                    slug=f'benchmark-{i}',
+                    description=' '.join(rng.choices(WORDS, k=40)),
+                    location=rng.choice(LOCATIONS),
+                    arquitecto=arquitecto,
+                    is_published=True,
+                ))
+            # bulk_create no dispara señales: se indexa explícitamente
+            created = Project.objects.bulk_create(projects)
+            write_documents(
+                ProjectSearchDocument,
+                [(project.pk, get_document_parts(project)) for project in created]
+            )
+
+    def measure(self, func, repeat):
+        """Retorna la mediana en milisegundos de varias ejecuciones."""
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - start) * 1000)
+        return statistics.median(timings)
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from vulcano.view_analytics import compact_view_buckets
+
+
+class Command(BaseCommand):
+    help = 'Agrupa las visitas horarias antiguas en días y las diarias antiguas en meses (programar por cron diario)'
+
+    def handle(self, *args, **options):
+        compacted = compact_view_buckets()
+        self.stdout.write(self.style.SUCCESS(
+            f"Periodos agrupados: {compacted['hour']} hora(s) en días, {compacted['day']} día(s) en meses"
+        ))
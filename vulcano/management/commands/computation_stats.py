@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from vulcano.utils import COMPUTATION_EVENTS, get_computation_stats
+
+
+class Command(BaseCommand):
+    help = 'Muestra los contadores de aciertos, fallos y recálculos de los cálculos cacheados'
+
+    def handle(self, *args, **options):
+        stats = get_computation_stats()
+        if not stats:
+            self.stdout.write('Sin datos de cálculos cacheados')
+            return
+
+        self.stdout.write(' '.join(['nombre'.ljust(20)] + [event.rjust(10) for event in COMPUTATION_EVENTS]))
+        for name, counts in stats.items():
+            self.stdout.write(' '.join([name.ljust(20)] + [str(counts[event]).rjust(10) for event in COMPUTATION_EVENTS]))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from vulcano.view_counts import FLUSH_BATCH_SIZE, flush_view_counts
+
+
+class Command(BaseCommand):
+    help = 'Suma a Project.views_count las visitas pendientes del buffer (programar por cron cada minuto)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=FLUSH_BATCH_SIZE,
+            help='Visitas consolidadas por transacción'
+        )
+
+    def handle(self, *args, **options):
+        total = flush_view_counts(options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Visitas consolidadas: {total}'))
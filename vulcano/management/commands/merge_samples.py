@@ -0,0 +1,54 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from vulcano.sampler import merge, to_speedscope
+import json
+import time
+
+
+class Command(BaseCommand):
+    help = 'Une las muestras de CPU de todos los workers de una ventana de tiempo en un flamegraph'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--minutes', type=int, default=60, help='Duración de la ventana en minutos')
+        parser.add_argument(
+            '--end', type=str, default=None,
+            help='Fin de la ventana (YYYY-MM-DD HH:MM, por defecto ahora)'
+        )
+        parser.add_argument('--view', type=str, default=None, help='Solo un nombre de URL (ej: vulcano:home)')
+        parser.add_argument(
+            '--format', choices=['folded', 'speedscope'], default='folded',
+            help='folded (flamegraph.pl, speedscope) o JSON de speedscope'
+        )
+        parser.add_argument('--output', type=str, default=None, help='Archivo de salida (por defecto la consola)')
+
+    def handle(self, *args, **options):
+        end = time.time()
+        if options['end']:
+            moment = parse_datetime(options['end'])
+            if moment is None:
+                raise CommandError(f"Fecha inválida: {options['end']}")
+            if timezone.is_naive(moment):
+                moment = timezone.make_aware(moment)
+            end = moment.timestamp()
+        start = end - options['minutes'] * 60
+
+        counts = merge(settings.SAMPLER_DIRECTORY, start, end, options['view'])
+        if not counts:
+            raise CommandError('Sin muestras en la ventana indicada')
+
+        if options['format'] == 'speedscope':
+            name = f"Vulcano {options['view'] or 'todas las vistas'} ({options['minutes']} min)"
+            content = json.dumps(to_speedscope(counts, name), separators=(',', ':'))
+        else:
+            content = ''.join(f'{stack} {count}\n' for stack, count in counts.most_common())
+
+        if not options['output']:
+            self.stdout.write(content, ending='')
+            return
+        with open(options['output'], 'w', encoding='utf-8') as output:
+            output.write(content)
+        self.stdout.write(self.style.SUCCESS(
+            f"{sum(counts.values())} muestras ({len(counts)} stacks) escritas en {options['output']}"
+        ))
@@ -0,0 +1,19 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from vulcano.activity import prune_activity
+
+
+class Command(BaseCommand):
+    help = 'Elimina del registro de actividad los meses más antiguos que la retención (programar por cron mensual)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--months',
+            type=int,
+            default=settings.ACTIVITY_RETENTION_MONTHS,
+            help='Meses que se conservan, incluido el actual'
+        )
+
+    def handle(self, *args, **options):
+        deleted = prune_activity(options['months'])
+        self.stdout.write(self.style.SUCCESS(f'Eventos de actividad eliminados: {deleted}'))
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from vulcano.conversations import rebuild_conversations
+
+
+class Command(BaseCommand):
+    help = 'Recalcula desde cero las conversaciones de la bandeja de entrada a partir de los mensajes'
+
+    def handle(self, *args, **options):
+        total = rebuild_conversations()
+        self.stdout.write(self.style.SUCCESS(f'Conversaciones recalculadas: {total}'))
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from vulcano.facets import rebuild_facet_counts
+
+
+class Command(BaseCommand):
+    help = 'Recalcula los conteos de facetas de proyectos (categoría/estado/publicado)'
+
+    def handle(self, *args, **options):
+        total = rebuild_facet_counts()
+        self.stdout.write(self.style.SUCCESS(f'Conteos de facetas recalculados: {total} combinación(es)'))
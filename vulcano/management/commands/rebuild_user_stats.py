@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from vulcano.user_stats import rebuild_user_stats
+
+
+class Command(BaseCommand):
+    help = 'Recalcula desde cero las estadísticas de los portales (UserStats) de todos los usuarios'
+
+    def handle(self, *args, **options):
+        total = rebuild_user_stats()
+        self.stdout.write(self.style.SUCCESS(f'Estadísticas recalculadas: {total} usuario(s)'))
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+from vulcano.slow_queries import get_store
+
+
+class Command(BaseCommand):
+    help = 'Muestra las consultas lentas más costosas registradas (p95, llamadas y planes de ejecución)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=10, help='Cantidad de consultas a mostrar')
+        parser.add_argument(
+            '--order', choices=['p95', 'total', 'calls', 'max'], default='p95',
+            help='Criterio de orden'
+        )
+        parser.add_argument('--plans', action='store_true', help='Incluye el último plan capturado')
+        parser.add_argument('--clear', action='store_true', help='Vacía el registro')
+
+    def handle(self, *args, **options):
+        store = get_store()
+        if store is None:
+            raise CommandError('SLOW_QUERY_LOCATION no está configurado')
+
+        if options['clear']:
+            store.clear()
+            self.stdout.write(self.style.SUCCESS('Registro de consultas lentas vaciado'))
+            return
+
+        queries = store.top(options['limit'], options['order'])
+        if not queries:
+            self.stdout.write('Sin consultas lentas registradas')
+            return
+
+        self.stdout.write(f"{'llamadas':>9} {'p95 ms':>9} {'máx ms':>9} {'total ms':>11}  consulta")
+        for query in queries:
+            self.stdout.write(
+                f"{query['calls']:>9} {query['p95_ms']:>9.0f} {query['max_ms']:>9.0f} "
+                f"{query['total_ms']:>11.0f}  {query['fingerprint'][:160]}"
+            )
+            if options['plans'] and query['plan']:
+                for line in query['plan'].splitlines():
+                    self.stdout.write(f"{'':>41}| {line}")
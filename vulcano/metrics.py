@@ -0,0 +1,314 @@
+"""
+Métricas de la aplicación en formato de texto de Prometheus.
+
+MetricsMiddleware (vulcano.middleware) mide cada petición y acumula, por
+nombre de URL:
+
+- vulcano_http_request_duration_seconds: histograma de latencia.
+- vulcano_http_response_size_bytes: histograma del tamaño de la respuesta.
+- vulcano_db_queries_total / vulcano_db_query_seconds_total: consultas SQL y
+  su tiempo.
+- vulcano_cache_requests_total: aciertos y fallos de la caché de página y de
+  cached_computation (incluye .cached() de vulcano.query_cache).
+
+Cada proceso acumula en memoria y cada METRICS_FLUSH_INTERVAL segundos suma
+sus deltas a un registro compartido en un archivo SQLite (METRICS_LOCATION),
+de modo que /metrics muestra el total de todos los workers de gunicorn. Sin
+METRICS_LOCATION (en tests) el registro vive solo en memoria del proceso.
+
+Además cada respuesta lleva una cabecera Server-Timing con el desglose de
+db, cache, render (plantillas, incluidas las consultas perezosas que se
+evalúan al renderizar) y total, visible en las herramientas del navegador.
+"""
+
+from collections import Counter
+from django.conf import settings
+from django.template.backends.django import DjangoTemplates
+from .sqlite_cache import open_connection
+import atexit
+import os
+import re
+import threading
+import time
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+# Etiqueta le de un bucket (siempre la última de la serie)
+LE_PATTERN = re.compile(r'(?:^|,)le="([^"]+)"$')
+
+# Familias expuestas: nombre -> (tipo, ayuda)
+FAMILIES = {
+    'vulcano_http_request_duration_seconds': ('histogram', 'Latencia de las peticiones por vista'),
+    'vulcano_http_response_size_bytes': ('histogram', 'Tamaño del cuerpo de las respuestas por vista'),
+    'vulcano_db_queries_total': ('counter', 'Consultas SQL ejecutadas por vista'),
+    'vulcano_db_query_seconds_total': ('counter', 'Tiempo en consultas SQL por vista'),
+    'vulcano_cache_requests_total': ('counter', 'Lecturas de caché por tipo y resultado'),
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS metric_sample (
+    name TEXT NOT NULL,
+    labels TEXT NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (name, labels)
+) WITHOUT ROWID;
+"""
+
+
+def format_labels(**labels):
+    """Etiquetas en formato Prometheus, ordenadas y escapadas."""
+    escaped = (
+        (key, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for key, value in sorted(labels.items())
+    )
+    return ','.join(f'{key}="{value}"' for key, value in escaped)
+
+
+class Registry:
+    """Contadores del proceso; flush() suma los pendientes al registro compartido."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pending = Counter()
+        self.totals = Counter()
+        self.last_flush = time.monotonic()
+        self.pid = os.getpid()
+        self._conn = None
+
+    def _check_fork(self):
+        # Un worker recién creado no hereda lo pendiente del proceso padre
+        if self.pid != os.getpid():
+            self.pending.clear()
+            self.totals.clear()
+            self._conn = None
+            self.pid = os.getpid()
+
+    def inc(self, name, labels, value=1):
+        with self.lock:
+            self._check_fork()
+            self.pending[(name, labels)] += value
+
+    def observe(self, name, labels, value, buckets):
+        """Registra una observación en un histograma (buckets acumulativos)."""
+        with self.lock:
+            self._check_fork()
+            # Todos los buckets existen desde la primera observación (a 0 los que no suman)
+            for bound in buckets:
+                self.pending[(f'{name}_bucket', f'{labels},le="{bound}"')] += int(value <= bound)
+            self.pending[(f'{name}_bucket', f'{labels},le="+Inf"')] += 1
+            self.pending[(f'{name}_sum', labels)] += value
+            self.pending[(f'{name}_count', labels)] += 1
+
+    def _connection(self):
+        if self._conn is None:
+            self._conn = open_connection(settings.METRICS_LOCATION, SCHEMA, check_same_thread=False)
+        return self._conn
+
+    def flush(self, force=False):
+        """Suma lo pendiente al registro compartido (como mucho cada METRICS_FLUSH_INTERVAL)."""
+        interval = getattr(settings, 'METRICS_FLUSH_INTERVAL', 5)
+        if not force and time.monotonic() - self.last_flush < interval:
+            return
+        with self.lock:
+            self._check_fork()
+            pending, self.pending = self.pending, Counter()
+            self.last_flush = time.monotonic()
+            if not pending:
+                return
+            if not getattr(settings, 'METRICS_LOCATION', None):
+                self.totals.update(pending)
+                return
+            conn = self._connection()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                conn.executemany(
+                    'INSERT INTO metric_sample (name, labels, value) VALUES (?, ?, ?) '
+                    'ON CONFLICT (name, labels) DO UPDATE SET value = value + excluded.value',
+                    [(name, labels, value) for (name, labels), value in pending.items()]
+                )
+            except BaseException:
+                conn.execute('ROLLBACK')
+                self.pending.update(pending)
+                raise
+            conn.execute('COMMIT')
+
+    def samples(self):
+        """Todas las muestras (las de todos los procesos si hay registro compartido)."""
+        self.flush(force=True)
+        if not getattr(settings, 'METRICS_LOCATION', None):
+            with self.lock:
+                return dict(self.totals)
+        with self.lock:
+            rows = self._connection().execute('SELECT name, labels, value FROM metric_sample').fetchall()
+        return {(name, labels): value for name, labels, value in rows}
+
+    def reset(self):
+        """Vacía el registro (tests y despliegues)."""
+        with self.lock:
+            self.pending.clear()
+            self.totals.clear()
+            if getattr(settings, 'METRICS_LOCATION', None):
+                self._connection().execute('DELETE FROM metric_sample')
+
+
+registry = Registry()
+atexit.register(lambda: registry.flush(force=True))
+
+
+def family_of(sample_name):
+    for suffix in ('_bucket', '_sum', '_count'):
+        if sample_name.endswith(suffix) and sample_name[:-len(suffix)] in FAMILIES:
+            return sample_name[:-len(suffix)]
+    return sample_name
+
+
+def sample_order(sample):
+    """
+    Orden de las muestras: por nombre y etiquetas, y los buckets de cada
+    serie por su límite numérico, con +Inf al final.
+    """
+    (name, labels), _ = sample
+    match = LE_PATTERN.search(labels)
+    if match is None:
+        return name, labels, 0.0
+    return name, labels[:match.start()], float(match.group(1))
+
+
+def render_metrics():
+    """Texto de exposición de Prometheus (versión 0.0.4)."""
+    by_family = {}
+    for (name, labels), value in sorted(registry.samples().items(), key=sample_order):
+        by_family.setdefault(family_of(name), []).append((name, labels, value))
+
+    lines = []
+    for family, samples in sorted(by_family.items()):
+        kind, description = FAMILIES.get(family, ('untyped', ''))
+        lines.append(f'# HELP {family} {description}')
+        lines.append(f'# TYPE {family} {kind}')
+        for name, labels, value in samples:
+            number = int(value) if float(value).is_integer() else value
+            lines.append(f'{name}{{{labels}}} {number}' if labels else f'{name} {number}')
+    return '\n'.join(lines) + '\n'
+
+
+# ==================== PETICIÓN EN CURSO ====================
+
+_local = threading.local()
+
+
+class RequestMetrics:
+    """Tiempos acumulados de la petición en curso (hilo actual)."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.db_count = 0
+        self.db_time = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.cache_time = 0.0
+        self.render_time = 0.0
+        # RequestProfile de vulcano.profiler si la petición se está perfilando
+        self.profile = None
+
+    def __call__(self, execute, sql, params, many, context):
+        """Envoltorio de ejecución: cuenta y cronometra las consultas."""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_count += 1
+            self.db_time += time.perf_counter() - start
+
+    def server_timing(self, total):
+        """Valor de la cabecera Server-Timing (milisegundos)."""
+        return ', '.join([
+            f'db;dur={self.db_time * 1000:.1f};desc="{self.db_count} consultas"',
+            f'cache;dur={self.cache_time * 1000:.1f};desc="{self.cache_hits} aciertos, {self.cache_misses} fallos"',
+            f'render;dur={self.render_time * 1000:.1f}',
+            f'total;dur={total * 1000:.1f}',
+        ])
+
+
+def start_request():
+    _local.current = RequestMetrics()
+    return _local.current
+
+
+def end_request():
+    _local.current = None
+
+
+def current():
+    return getattr(_local, 'current', None)
+
+
+def record_cache(kind, hit, seconds):
+    """
+    Registra una lectura de caché.
+
+    Args:
+        kind: Tipo de caché ('page', 'computation')
+        hit: Si se sirvió desde la caché
+        seconds: Tiempo de la lectura
+    """
+    registry.inc('vulcano_cache_requests_total', format_labels(cache=kind, result='hit' if hit else 'miss'))
+    request_metrics = current()
+    if request_metrics is not None:
+        request_metrics.cache_time += seconds
+        if hit:
+            request_metrics.cache_hits += 1
+        else:
+            request_metrics.cache_misses += 1
+
+
+def record_request(request_metrics, view, method, status, size, total):
+    """Acumula las métricas de una petición terminada."""
+    labels = format_labels(view=view, method=method, status=status)
+    view_labels = format_labels(view=view)
+    registry.observe('vulcano_http_request_duration_seconds', labels, total, LATENCY_BUCKETS)
+    if size is not None:
+        registry.observe('vulcano_http_response_size_bytes', view_labels, size, SIZE_BUCKETS)
+    registry.inc('vulcano_db_queries_total', view_labels, request_metrics.db_count)
+    registry.inc('vulcano_db_query_seconds_total', view_labels, request_metrics.db_time)
+    registry.flush()
+
+
+# ==================== PLANTILLAS ====================
+
+class TimedTemplate:
+    """Plantilla que suma su tiempo de renderizado a la petición en curso."""
+
+    def __init__(self, template):
+        self.template = template
+
+    def __getattr__(self, name):
+        return getattr(self.template, name)
+
+    @property
+    def name(self):
+        origin = getattr(self.template, 'origin', None)
+        return getattr(origin, 'template_name', None) or '<string>'
+
+    def render(self, context=None, request=None):
+        request_metrics = current()
+        if request_metrics is None:
+            return self.template.render(context, request)
+        start = time.perf_counter()
+        try:
+            return self.template.render(context, request)
+        finally:
+            end = time.perf_counter()
+            request_metrics.render_time += end - start
+            if request_metrics.profile is not None:
+                request_metrics.profile.add_template(self.name, start, end)
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """Backend DjangoTemplates que mide el renderizado para Server-Timing."""
+
+    def from_string(self, template_code):
+        return TimedTemplate(super().from_string(template_code))
+
+    def get_template(self, template_name):
+        return TimedTemplate(super().get_template(template_name))
@@ -1,5 +1,20 @@
 """Middleware for Vulcano platform"""
 
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from .cache_namespaces import collect_invalidations
+from . import metrics, profiler
+from .sampler import get_sampler
+from .identity_map import IdentityMap, upgrade_session_backend
+from .query_budget import QueryTracker, report, should_track
+import logging
+import sys
+import time
+
+logger = logging.getLogger('vulcano')
+
+
 class TestModeMiddleware:
     """Middleware para agregar atributo test_mode a las peticiones en tests"""
 
@@ -13,4 +28,152 @@ class TestModeMiddleware:
         response = self.get_response(request)
         if hasattr(response, 'test_mode'):
             request.test_mode = response.test_mode
-        return response
\ No newline at end of file
+        return response
+
+
+class InvalidationCollectorMiddleware:
+    """
+    Acumula las invalidaciones de caché de la petición (señales y
+    clear_user_cache) y las aplica una sola vez al terminarla.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        """Procesa la petición"""
+        with collect_invalidations():
+            return self.get_response(request)
+
+
+class IdentityMapMiddleware:
+    """
+    Da a cada petición su mapa de identidad (ver vulcano.identity_map).
+    Debe ir después de AuthenticationMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        """Procesa la petición"""
+        upgrade_session_backend(request)
+        request.identity_map = IdentityMap()
+        return self.get_response(request)
+
+
+class QueryBudgetMiddleware:
+    """
+    Mide las consultas de las peticiones muestreadas y reporta las que
+    superan el presupuesto de su vista o repiten consultas (ver
+    vulcano.query_budget). Debe ir al principio para contar también las
+    de sesión y autenticación.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        """Procesa la petición"""
+        if not should_track():
+            return self.get_response(request)
+        tracker = request.query_tracker = QueryTracker()
+        with connection.execute_wrapper(tracker):
+            response = self.get_response(request)
+        report(tracker, request.path)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        """Toma el presupuesto declarado por la vista"""
+        tracker = getattr(request, 'query_tracker', None)
+        if tracker is not None:
+            tracker.budget = getattr(view_func, 'query_budget', None)
+            tracker.view_name = f"{view_func.__module__}.{view_func.__name__}"
+        return None
+
+
+class MetricsMiddleware:
+    """
+    Registra latencia, consultas, caché y tamaño de cada petición (ver
+    vulcano.metrics) y agrega la cabecera Server-Timing. Debe ir el primero.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        """Procesa la petición"""
+        request_metrics = metrics.start_request()
+        try:
+            with connection.execute_wrapper(request_metrics):
+                response = self.get_response(request)
+        finally:
+            metrics.end_request()
+        total = time.perf_counter() - request_metrics.start
+
+        match = request.resolver_match
+        view = match.view_name if match else 'unresolved'
+        size = None if response.streaming else len(response.content)
+        metrics.record_request(request_metrics, view, request.method, response.status_code, size, total)
+        response['Server-Timing'] = request_metrics.server_timing(total)
+        return response
+
+
+class ProfilerMiddleware:
+    """
+    Perfila las peticiones que traen un token firmado por un usuario staff
+    (ver vulcano.profiler). Debe ir justo después de MetricsMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        """Procesa la petición"""
+        token = profiler.requested_token(request)
+        if token is None:
+            return self.get_response(request)
+        issued_by = profiler.read_token(token)
+        if issued_by is None:
+            logger.warning(f"Token de perfilado inválido o expirado en {request.path}")
+            return self.get_response(request)
+        if sys.getprofile() is not None:
+            logger.warning(f"Otro perfilador está activo; no se perfila {request.path}")
+            return self.get_response(request)
+
+        profile = profiler.RequestProfile(settings.PROFILER_MAX_EVENTS)
+        request_metrics = metrics.current()
+        if request_metrics is not None:
+            request_metrics.profile = profile
+        response = profile.run(self.get_response, request)
+        try:
+            response['X-Vulcano-Profile'] = profiler.save(profile, request, response, issued_by)
+        except Exception as e:
+            logger.error(f"Error al guardar el perfil de {request.path}: {str(e)}")
+        return response
+
+
+class SamplerMiddleware:
+    """
+    Anota qué vista atiende cada hilo para el muestreador de CPU continuo
+    (ver vulcano.sampler). Se desactiva con SAMPLER_ENABLED = False.
+    """
+
+    def __init__(self, get_response):
+        if not settings.SAMPLER_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        """Procesa la petición"""
+        sampler = get_sampler()
+        sampler.begin()
+        try:
+            return self.get_response(request)
+        finally:
+            sampler.end()
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        """Las muestras desde aquí se atribuyen al nombre de URL"""
+        get_sampler().set_view(request.resolver_match.view_name)
+        return None
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.6 on 2026-10-17 04:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vulcano', '0004_alter_userprofile_phone'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='main_image',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='vulcano.projectimage', verbose_name='Imagen principal'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='main_image_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='Alto de imagen principal'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='main_image_url',
+            field=models.CharField(blank=True, default='', editable=False, max_length=500, verbose_name='URL de imagen principal'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='main_image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='Ancho de imagen principal'),
+        ),
+        migrations.AddField(
+            model_name='projectimage',
+            name='height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='Alto'),
+        ),
+        migrations.AddField(
+            model_name='projectimage',
+            name='width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='Ancho'),
+        ),
+    ]
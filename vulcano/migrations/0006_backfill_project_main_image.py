@@ -0,0 +1,49 @@
+# Generated by Django 5.2.6 on 2026-10-17 04:35
+
+from django.db import migrations
+
+
+def backfill_main_image(apps, schema_editor):
+    """
+    Rellena el puntero desnormalizado a la imagen principal de cada proyecto.
+    Las dimensiones se completan cuando se vuelve a subir o cambiar una imagen,
+    para no tener que abrir cada archivo del almacenamiento durante la migración.
+    """
+    Project = apps.get_model('vulcano', 'Project')
+    ProjectImage = apps.get_model('vulcano', 'ProjectImage')
+
+    for project in Project.objects.only('pk').iterator():
+        image = (
+            ProjectImage.objects.filter(project_id=project.pk)
+            .order_by('-is_main', 'order', 'created_at', 'pk')
+            .first()
+        )
+        if image is None:
+            continue
+        Project.objects.filter(pk=project.pk).update(
+            main_image=image,
+            main_image_url=image.image.url if image.image else '',
+            main_image_width=image.width,
+            main_image_height=image.height,
+        )
+
+
+def clear_main_image(apps, schema_editor):
+    Project = apps.get_model('vulcano', 'Project')
+    Project.objects.update(
+        main_image=None,
+        main_image_url='',
+        main_image_width=None,
+        main_image_height=None,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vulcano', '0005_project_main_image_project_main_image_height_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_main_image, clear_main_image),
+    ]
@@ -0,0 +1,142 @@
+# Generated by Django 5.2.6 on 2026-10-17 04:32
+
+import django.contrib.postgres.operations
+import django.contrib.postgres.search
+import django.db.models.deletion
+from django.db import migrations, models
+import re
+import unicodedata
+
+# Copia de lo que necesita la migración de vulcano.search en el momento de crearla:
+# la migración no debe cambiar si el módulo cambia después
+SEARCH_CONFIG = 'spanish'
+FTS_TABLE = 'vulcano_project_search_fts'
+TRIGRAM_TABLE = 'vulcano_project_search_trigram'
+BATCH_SIZE = 1000
+
+_WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def normalize_text(text):
+    """Minúsculas y sin acentos (igual que vulcano.search.normalize_text)."""
+    if not text:
+        return ''
+    decomposed = unicodedata.normalize('NFKD', str(text).lower())
+    stripped = ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return ' '.join(_WORD_RE.findall(stripped))
+
+
+def write_documents(ProjectSearchDocument, connection, rows):
+    """Escribe un lote de documentos y las estructuras propias del motor."""
+    if not rows:
+        return
+    ProjectSearchDocument.objects.using(connection.alias).bulk_create([
+        ProjectSearchDocument(
+            project_id=project_id,
+            content=' '.join(value for value in parts.values() if value)
+        )
+        for project_id, parts in rows
+    ])
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.executemany(
+                "UPDATE vulcano_project_search SET vector = "
+                "setweight(to_tsvector(%s::regconfig, %s), 'A') || "
+                "setweight(to_tsvector(%s::regconfig, %s), 'B') || "
+                "setweight(to_tsvector(%s::regconfig, %s), 'C') "
+                "WHERE project_id = %s",
+                [
+                    (SEARCH_CONFIG, parts['title'], SEARCH_CONFIG, parts['location'],
+                     SEARCH_CONFIG, parts['body'], project_id)
+                    for project_id, parts in rows
+                ]
+            )
+        elif connection.vendor == 'sqlite':
+            cursor.executemany(
+                f"INSERT INTO {FTS_TABLE} (rowid, title, location, body) VALUES (%s, %s, %s, %s)",
+                [(project_id, parts['title'], parts['location'], parts['body']) for project_id, parts in rows]
+            )
+            cursor.executemany(
+                f"INSERT INTO {TRIGRAM_TABLE} (rowid, content) VALUES (%s, %s)",
+                [
+                    (project_id, ' '.join(value for value in parts.values() if value))
+                    for project_id, parts in rows
+                ]
+            )
+
+
+def create_search_structures(apps, schema_editor):
+    """
+    Crea los índices específicos de cada motor y rellena los documentos.
+    PostgreSQL: GIN sobre el tsvector y GIN de trigramas sobre el contenido.
+    SQLite: tablas virtuales FTS5 (palabras sin acentos y trigramas).
+    """
+    connection = schema_editor.connection
+    if connection.vendor == 'postgresql':
+        schema_editor.execute(
+            "CREATE INDEX IF NOT EXISTS vulcano_project_search_vector_gin "
+            "ON vulcano_project_search USING gin (vector)"
+        )
+        schema_editor.execute(
+            "CREATE INDEX IF NOT EXISTS vulcano_project_search_content_trgm "
+            "ON vulcano_project_search USING gin (content gin_trgm_ops)"
+        )
+    elif connection.vendor == 'sqlite':
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+            "USING fts5(title, location, body, tokenize = 'unicode61 remove_diacritics 2')"
+        )
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {TRIGRAM_TABLE} "
+            "USING fts5(content, tokenize = 'trigram')"
+        )
+
+    Project = apps.get_model('vulcano', 'Project')
+    ProjectSearchDocument = apps.get_model('vulcano', 'ProjectSearchDocument')
+    rows = []
+    for project in Project.objects.using(connection.alias).order_by('pk').iterator(chunk_size=BATCH_SIZE):
+        rows.append((project.pk, {
+            'title': normalize_text(project.title),
+            'location': normalize_text(project.location),
+            'body': normalize_text(project.description or project.short_description),
+        }))
+        if len(rows) >= BATCH_SIZE:
+            write_documents(ProjectSearchDocument, connection, rows)
+            rows = []
+    write_documents(ProjectSearchDocument, connection, rows)
+
+
+def drop_search_structures(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute("DROP INDEX IF EXISTS vulcano_project_search_vector_gin")
+        schema_editor.execute("DROP INDEX IF EXISTS vulcano_project_search_content_trgm")
+    elif vendor == 'sqlite':
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+        schema_editor.execute(f"DROP TABLE IF EXISTS {TRIGRAM_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vulcano', '0006_backfill_project_main_image'),
+    ]
+
+    operations = [
+        django.contrib.postgres.operations.TrigramExtension(),
+        migrations.CreateModel(
+            name='ProjectSearchDocument',
+            fields=[
+                ('project', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_document', serialize=False, to='vulcano.project', verbose_name='Proyecto')),
+                ('content', models.TextField(blank=True, verbose_name='Contenido normalizado')),
+                ('vector', django.contrib.postgres.search.SearchVectorField(blank=True, null=True, verbose_name='Vector de búsqueda')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Última actualización')),
+            ],
+            options={
+                'verbose_name': 'Documento de búsqueda',
+                'verbose_name_plural': 'Documentos de búsqueda',
+                'db_table': 'vulcano_project_search',
+            },
+        ),
+        migrations.RunPython(create_search_structures, drop_search_structures),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.6 on 2026-10-17 04:39
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_facet_counts(apps, schema_editor):
+    """
+    Calcula los conteos iniciales; a partir de aquí se mantienen por deltas.
+    """
+    Project = apps.get_model('vulcano', 'Project')
+    ProjectFacetCount = apps.get_model('vulcano', 'ProjectFacetCount')
+
+    rows = Project.objects.order_by().values('category', 'status', 'is_published').annotate(total=Count('id'))
+    ProjectFacetCount.objects.bulk_create([
+        ProjectFacetCount(
+            category=row['category'],
+            status=row['status'],
+            is_published=row['is_published'],
+            count=row['total'],
+        )
+        for row in rows
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vulcano', '0007_project_search_document'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectFacetCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category', models.CharField(max_length=50, verbose_name='Categoría')),
+                ('status', models.CharField(max_length=20, verbose_name='Estado')),
+                ('is_published', models.BooleanField(verbose_name='Publicado')),
+                ('count', models.IntegerField(default=0, verbose_name='Proyectos')),
+            ],
+            options={
+                'verbose_name': 'Conteo de faceta',
+                'verbose_name_plural': 'Conteos de facetas',
+                'db_table': 'vulcano_project_facet_count',
+                'constraints': [models.UniqueConstraint(fields=('category', 'status', 'is_published'), name='unique_project_facet')],
+            },
+        ),
+        migrations.RunPython(backfill_facet_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.6 on 2026-10-17 04:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vulcano', '0008_project_facet_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectViewHit',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Fecha de visita')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='pending_views', to='vulcano.project', verbose_name='Proyecto')),
+            ],
+            options={
+                'verbose_name': 'Visita pendiente',
+                'verbose_name_plural': 'Visitas pendientes',
+                'db_table': 'vulcano_project_view_hit',
+            },
+        ),
+    ]
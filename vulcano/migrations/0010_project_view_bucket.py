@@ -0,0 +1,31 @@
+# Generated by Django 5.2.6 on 2026-10-17 04:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vulcano', '0009_project_view_hit'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectViewBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('granularity', models.CharField(choices=[('hour', 'Hora'), ('day', 'Día'), ('month', 'Mes')], max_length=5, verbose_name='Granularidad')),
+                ('bucket_start', models.DateTimeField(verbose_name='Inicio del periodo')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='Visitas')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='view_buckets', to='vulcano.project', verbose_name='Proyecto')),
+            ],
+            options={
+                'verbose_name': 'Visitas por periodo',
+                'verbose_name_plural': 'Visitas por periodo',
+                'db_table': 'vulcano_project_view_bucket',
+                'indexes': [models.Index(fields=['granularity', 'bucket_start'], name='vulcano_pro_granula_7d81f6_idx')],
+                'constraints': [models.UniqueConstraint(fields=('project', 'granularity', 'bucket_start'), name='unique_project_view_bucket')],
+            },
+        ),
+    ]
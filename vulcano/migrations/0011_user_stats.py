@@ -0,0 +1,42 @@
+# Generated by Django 5.2.6 on 2026-10-17 05:01
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('vulcano', '0010_project_view_bucket'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserStats',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to=settings.AUTH_USER_MODEL, verbose_name='Usuario')),
+                ('projects_total', models.IntegerField(default=0, verbose_name='Proyectos')),
+                ('projects_published', models.IntegerField(default=0, verbose_name='Proyectos publicados')),
+                ('projects_in_progress', models.IntegerField(default=0, verbose_name='Proyectos en progreso')),
+                ('projects_completed', models.IntegerField(default=0, verbose_name='Proyectos completados')),
+                ('views_total', models.BigIntegerField(default=0, verbose_name='Visitas totales')),
+                ('clients_total', models.IntegerField(default=0, verbose_name='Clientes distintos')),
+                ('new_projects_month', models.IntegerField(default=0, verbose_name='Proyectos nuevos del mes')),
+                ('new_projects_month_start', models.DateField(blank=True, null=True, verbose_name='Mes de proyectos nuevos')),
+                ('assigned_total', models.IntegerField(default=0, verbose_name='Proyectos asignados')),
+                ('assigned_in_progress', models.IntegerField(default=0, verbose_name='Asignados en progreso')),
+                ('assigned_completed', models.IntegerField(default=0, verbose_name='Asignados completados')),
+                ('assigned_featured', models.IntegerField(default=0, verbose_name='Asignados destacados')),
+                ('assigned_architects', models.IntegerField(default=0, verbose_name='Arquitectos distintos')),
+                ('unread_messages', models.IntegerField(default=0, verbose_name='Mensajes sin leer')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Última actualización')),
+            ],
+            options={
+                'verbose_name': 'Estadísticas de usuario',
+                'verbose_name_plural': 'Estadísticas de usuarios',
+                'db_table': 'vulcano_user_stats',
+            },
+        ),
+    ]
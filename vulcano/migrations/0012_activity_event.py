@@ -0,0 +1,37 @@
+# Generated by Django 5.2.6 on 2026-10-17 05:41
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vulcano', '0011_user_stats'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ActivityEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('username', models.CharField(max_length=150, verbose_name='Nombre de usuario')),
+                ('action', models.CharField(max_length=100, verbose_name='Acción')),
+                ('details', models.TextField(blank=True, verbose_name='Detalles')),
+                ('ip_address', models.GenericIPAddressField(blank=True, null=True, verbose_name='Dirección IP')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Fecha')),
+                ('project', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='activity_events', to='vulcano.project', verbose_name='Proyecto')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='activity_events', to=settings.AUTH_USER_MODEL, verbose_name='Usuario')),
+            ],
+            options={
+                'verbose_name': 'Evento de actividad',
+                'verbose_name_plural': 'Eventos de actividad',
+                'db_table': 'vulcano_activity_event',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['user', '-created_at'], name='vulcano_act_user_id_9d10c4_idx'), models.Index(fields=['project', '-created_at'], name='vulcano_act_project_dd7ca6_idx'), models.Index(fields=['created_at'], name='vulcano_act_created_1ef284_idx')],
+            },
+        ),
+    ]
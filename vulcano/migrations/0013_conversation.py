@@ -0,0 +1,149 @@
+# Generated by Django 5.2.6 on 2026-10-17 05:46
+
+from collections import Counter
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+from django.utils.text import Truncator
+
+
+def backfill_conversations(apps, schema_editor):
+    """
+    Agrupa los mensajes existentes en conversaciones; a partir de aquí se
+    mantienen desde las señales de Message.
+    """
+    Message = apps.get_model('vulcano', 'Message')
+    Conversation = apps.get_model('vulcano', 'Conversation')
+    ConversationParticipant = apps.get_model('vulcano', 'ConversationParticipant')
+    db_alias = schema_editor.connection.alias
+
+    threads = {}
+    rows = Message.objects.using(db_alias).order_by('created_at', 'id').values_list(
+        'id', 'sender_id', 'recipient_id', 'project_id', 'created_at', 'is_read'
+    )
+    for pk, sender_id, recipient_id, project_id, created_at, is_read in rows.iterator(chunk_size=2000):
+        key = (min(sender_id, recipient_id), max(sender_id, recipient_id), project_id)
+        thread = threads.setdefault(key, {'ids': [], 'unread': Counter()})
+        thread['ids'].append(pk)
+        thread['last'] = (pk, sender_id, created_at)
+        if not is_read:
+            thread['unread'][recipient_id] += 1
+    if not threads:
+        return
+
+    last_messages = Message.objects.using(db_alias).only('subject', 'body').in_bulk(
+        [thread['last'][0] for thread in threads.values()]
+    )
+    conversations = []
+    for (user_low_id, user_high_id, project_id), thread in threads.items():
+        last_id, sender_id, created_at = thread['last']
+        last = last_messages[last_id]
+        conversations.append(Conversation(
+            user_low_id=user_low_id,
+            user_high_id=user_high_id,
+            project_id=project_id,
+            last_message_id=last_id,
+            last_sender_id=sender_id,
+            last_subject=last.subject,
+            last_snippet=Truncator(' '.join(last.body.split())).chars(140),
+            last_message_at=created_at,
+            message_count=len(thread['ids']),
+        ))
+    Conversation.objects.using(db_alias).bulk_create(conversations)
+
+    participants = []
+    for conversation, thread in zip(conversations, threads.values()):
+        for user_id in {conversation.user_low_id, conversation.user_high_id}:
+            participants.append(ConversationParticipant(
+                conversation=conversation,
+                user_id=user_id,
+                unread_count=thread['unread'][user_id],
+                last_message_at=conversation.last_message_at,
+            ))
+        for start in range(0, len(thread['ids']), 500):
+            Message.objects.using(db_alias).filter(pk__in=thread['ids'][start:start + 500]).update(
+                conversation=conversation
+            )
+    ConversationParticipant.objects.using(db_alias).bulk_create(participants)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vulcano', '0012_activity_event'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ConversationParticipant',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('unread_count', models.IntegerField(default=0, verbose_name='Mensajes sin leer')),
+                ('last_message_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Fecha del último mensaje')),
+            ],
+            options={
+                'verbose_name': 'Participante de conversación',
+                'verbose_name_plural': 'Participantes de conversaciones',
+                'db_table': 'vulcano_conversation_participant',
+            },
+        ),
+        migrations.CreateModel(
+            name='Conversation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_subject', models.CharField(blank=True, max_length=200, verbose_name='Asunto del último mensaje')),
+                ('last_snippet', models.CharField(blank=True, max_length=150, verbose_name='Extracto del último mensaje')),
+                ('last_message_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Fecha del último mensaje')),
+                ('message_count', models.IntegerField(default=0, verbose_name='Mensajes')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Fecha de creación')),
+                ('last_message', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='vulcano.message', verbose_name='Último mensaje')),
+                ('last_sender', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Remitente del último mensaje')),
+                ('project', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='conversations', to='vulcano.project', verbose_name='Proyecto relacionado')),
+                ('user_high', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Participante')),
+                ('user_low', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Participante')),
+            ],
+            options={
+                'verbose_name': 'Conversación',
+                'verbose_name_plural': 'Conversaciones',
+                'db_table': 'vulcano_conversation',
+            },
+        ),
+        migrations.AddField(
+            model_name='message',
+            name='conversation',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='messages', to='vulcano.conversation', verbose_name='Conversación'),
+        ),
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['conversation', '-created_at'], name='vulcano_mes_convers_e0ea18_idx'),
+        ),
+        migrations.AddField(
+            model_name='conversationparticipant',
+            name='conversation',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='participants', to='vulcano.conversation', verbose_name='Conversación'),
+        ),
+        migrations.AddField(
+            model_name='conversationparticipant',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='conversation_memberships', to=settings.AUTH_USER_MODEL, verbose_name='Usuario'),
+        ),
+        migrations.AddConstraint(
+            model_name='conversation',
+            constraint=models.UniqueConstraint(condition=models.Q(('project__isnull', False)), fields=('user_low', 'user_high', 'project'), name='unique_project_conversation'),
+        ),
+        migrations.AddConstraint(
+            model_name='conversation',
+            constraint=models.UniqueConstraint(condition=models.Q(('project__isnull', True)), fields=('user_low', 'user_high'), name='unique_direct_conversation'),
+        ),
+        migrations.AddIndex(
+            model_name='conversationparticipant',
+            index=models.Index(fields=['user', '-last_message_at'], name='vulcano_con_user_id_157b61_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='conversationparticipant',
+            constraint=models.UniqueConstraint(fields=('conversation', 'user'), name='unique_conversation_participant'),
+        ),
+        migrations.RunPython(backfill_conversations, migrations.RunPython.noop),
+    ]
@@ -3,11 +3,15 @@ Modelos de datos para la plataforma Vulcano.
 Define la estructura de proyectos, imágenes, perfiles de usuario y mensajería.
 """
 
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import User
+from django.contrib.postgres.search import SearchVectorField
 from django.core.validators import FileExtensionValidator
+from django.utils import timezone
 from django.utils.text import slugify
 from django.urls import reverse
+from collections import Counter
+from .query_cache import CachedQuerySet
 import os
 
 
@@ -89,6 +93,92 @@ class UserProfile(models.Model):
         return self.role == 'cliente'
 
 
+class ProjectQuerySet(CachedQuerySet):
+    """
+    QuerySet de proyectos que mantiene los conteos de facetas y las
+    versiones de caché en operaciones masivas que no disparan señales.
+    """
+    
+    def update(self, **kwargs):
+        """
+        Actualización masiva que mantiene los conteos de facetas, invalida
+        los namespaces de caché y recalcula las estadísticas de los usuarios
+        de los proyectos afectados.
+        """
+        from . import cache_namespaces, user_stats
+        
+        track_caches = cache_namespaces.tracks_update(kwargs)
+        track_stats = user_stats.tracks_update(kwargs)
+        if not (track_caches or track_stats):
+            return self._update_facets(kwargs)
+        
+        with transaction.atomic(using=self.db):
+            if track_stats:
+                project_ids = list(self.order_by().values_list('pk', flat=True))
+                users = user_stats.project_users(project_ids)
+            if track_caches:
+                rows = cache_namespaces.invalidate_bulk_update(self, lambda: self._update_facets(kwargs))
+            else:
+                rows = self._update_facets(kwargs)
+            if track_stats:
+                # Arquitectos anteriores y nuevos
+                users |= user_stats.project_users(project_ids)
+                user_stats.rebuild_user_stats(users)
+        return rows
+    
+    update.alters_data = True
+    
+    def _update_facets(self, kwargs):
+        """
+        Si cambia una faceta, bloquea las filas afectadas, lee sus facetas
+        anteriores y aplica los deltas en la misma transacción.
+        """
+        from . import facets
+        
+        if not set(kwargs) & set(facets.FACET_FIELDS):
+            return super().update(**kwargs)
+        
+        with transaction.atomic(using=self.db):
+            # Bloqueo por pk: FOR UPDATE no admite DISTINCT ni joins externos
+            locked = self.model._base_manager.filter(
+                pk__in=self.order_by().values('pk')
+            ).select_for_update()
+            old_keys = Counter(locked.values_list(*facets.FACET_FIELDS))
+            rows = super().update(**kwargs)
+            
+            new_values = {field: kwargs[field] for field in facets.FACET_FIELDS if field in kwargs}
+            if any(hasattr(value, 'resolve_expression') for value in new_values.values()):
+                # Expresiones (F, Case...): no se conoce el valor final por fila
+                facets.rebuild_facet_counts()
+                return rows
+            
+            deltas = Counter()
+            for key, total in old_keys.items():
+                new_key = tuple(new_values.get(field, value) for field, value in zip(facets.FACET_FIELDS, key))
+                deltas[key] -= total
+                deltas[new_key] += total
+            facets.apply_deltas(deltas)
+        return rows
+    
+    def bulk_create(self, objs, *args, **kwargs):
+        """Creación masiva sumando los nuevos proyectos a sus facetas, listados y arquitectos."""
+        from . import cache_namespaces, facets, user_stats
+        
+        with transaction.atomic(using=self.db):
+            created = super().bulk_create(objs, *args, **kwargs)
+            facets.apply_deltas(Counter(facets.facet_key(obj) for obj in created))
+            namespaces = set()
+            for obj in created:
+                namespaces |= cache_namespaces.project_namespaces(
+                    obj.pk, None, cache_namespaces.listing_state(obj)
+                )
+            cache_namespaces.bump(*namespaces)
+            user_stats.rebuild_user_stats({obj.arquitecto_id for obj in created})
+        return created
+    
+    bulk_create.alters_data = True
+
+
 class Project(models.Model):
     """
     Modelo principal para proyectos arquitectónicos.
@@ -198,6 +288,35 @@ class Project(models.Model):
         default=0,
         verbose_name='Visualizaciones'
     )
+    # Imagen principal desnormalizada: evita consultar `images` en cada tarjeta
+    main_image = models.ForeignKey(
+        'ProjectImage',
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
+        related_name='+',
+        editable=False,
+        verbose_name='Imagen principal'
+    )
+    main_image_url = models.CharField(
+        max_length=500,
+        blank=True,
+        default='',
+        editable=False,
+        verbose_name='URL de imagen principal'
+    )
+    main_image_width = models.PositiveIntegerField(
+        blank=True,
+        null=True,
+        editable=False,
+        verbose_name='Ancho de imagen principal'
+    )
+    main_image_height = models.PositiveIntegerField(
+        blank=True,
+        null=True,
+        editable=False,
+        verbose_name='Alto de imagen principal'
+    )
     created_at = models.DateTimeField(
         auto_now_add=True,
         verbose_name='Fecha de creación'
@@ -225,6 +344,11 @@ class Project(models.Model):
             )
         ]
     
+    objects = ProjectQuerySet.as_manager()
+    
+    # Campos mantenidos exclusivamente por ProjectImage (ver refresh_main_image)
+    MAIN_IMAGE_FIELDS = ('main_image', 'main_image_url', 'main_image_width', 'main_image_height')
+    
     def __str__(self):
         return self.title
     
@@ -240,20 +364,97 @@ class Project(models.Model):
         if not self.short_description and self.description:
             self.short_description = self.description[:297] + '...' if len(self.description) > 300 else self.description
         
-        super().save(*args, **kwargs)
+        # Una instancia obsoleta no debe sobrescribir el puntero a la imagen principal:
+        # se relee de la fila. Sin fila (clonado o borrada) el guardado inserta como siempre
+        if (self.pk is not None and not self._state.adding and kwargs.get('update_fields') is None
+                and not kwargs.get('force_insert') and not kwargs.get('force_update')):
+            attnames = [self._meta.get_field(name).attname for name in self.MAIN_IMAGE_FIELDS]
+            current = type(self)._base_manager.filter(pk=self.pk).values(*attnames).first()
+            for attname, value in (current or {}).items():
+                setattr(self, attname, value)
+        
+        # Las señales de facetas leen y actualizan contadores en la misma transacción
+        from .facets import touches_facets
+        if touches_facets(kwargs.get('update_fields')):
+            with transaction.atomic():
+                super().save(*args, **kwargs)
+        else:
+            super().save(*args, **kwargs)
     
     def get_absolute_url(self):
         """Retorna la URL absoluta del proyecto."""
         return reverse('vulcano:project_detail', kwargs={'slug': self.slug})
     
     def increment_views(self):
-        """Incrementa el contador de visualizaciones."""
+        """
+        Registra una visualización en el buffer de visitas (ver vulcano.view_counts).
+        No escribe en vulcano_project: el contador se consolida con flush_view_counts.
+        """
+        from . import view_counts
+        
+        view_counts.record_view(self.pk)
         self.views_count += 1
-        self.save(update_fields=['views_count'])
     
     def get_main_image(self):
-        """Retorna la imagen principal del proyecto."""
-        return self.images.filter(is_main=True).first() or self.images.first()
+        """
+        Retorna la imagen principal del proyecto.
+        Usa el puntero desnormalizado `main_image`, mantenido por ProjectImage.
+        """
+        if not self.main_image_id:
+            return None
+        return self.main_image
+    
+    def refresh_main_image(self):
+        """
+        Recalcula el puntero a la imagen principal y su URL/dimensiones en caché.
+        Elige la imagen marcada como principal o, en su defecto, la primera.
+        """
+        image = (
+            ProjectImage.objects.filter(project_id=self.pk)
+            .order_by('-is_main', 'order', 'created_at', 'pk')
+            .first()
+        )
+        values = {
+            'main_image': image,
+            'main_image_url': image.image.url if image and image.image else '',
+            'main_image_width': image.width if image else None,
+            'main_image_height': image.height if image else None,
+        }
+        Project.objects.filter(pk=self.pk).update(**values)
+        for field, value in values.items():
+            setattr(self, field, value)
+    
+    def add_images(self, files, main_first=False):
+        """
+        Agrega varias imágenes con un solo INSERT y recalcula la imagen
+        principal una vez (ProjectImage.objects.create en un bucle cuesta
+        tres consultas por imagen).
+        
+        Args:
+            files: Archivos subidos, en orden
+            main_first: Si la primera pasa a ser la imagen principal
+        
+        Returns:
+            Lista de ProjectImage creadas
+        """
+        from . import cache_namespaces
+        
+        start = self.images.count()
+        images = [
+            ProjectImage(project=self, image=file, is_main=(main_first and i == 0), order=start + i)
+            for i, file in enumerate(files)
+        ]
+        for image in images:
+            image._read_dimensions()
+        
+        with transaction.atomic():
+            if main_first and images:
+                ProjectImage.objects.filter(project=self, is_main=True).update(is_main=False)
+            created = ProjectImage.objects.bulk_create(images)
+            self.refresh_main_image()
+            # bulk_create no envía post_save
+            cache_namespaces.bump(f"project:{self.pk}")
+        return created
 
 
 class ProjectImage(models.Model):
@@ -285,6 +486,18 @@ class ProjectImage(models.Model):
         default=0,
         verbose_name='Orden'
     )
+    width = models.PositiveIntegerField(
+        blank=True,
+        null=True,
+        editable=False,
+        verbose_name='Ancho'
+    )
+    height = models.PositiveIntegerField(
+        blank=True,
+        null=True,
+        editable=False,
+        verbose_name='Alto'
+    )
     uploaded_at = models.DateTimeField(
         auto_now_add=True,
         verbose_name='Fecha de subida'
@@ -304,19 +517,185 @@ class ProjectImage(models.Model):
         return f"{self.project.title} - {self.caption}" if self.caption else f"Imagen de {self.project.title}"
     
     def save(self, *args, **kwargs):
-        """Asegura que solo exista una imagen principal por proyecto."""
-        if self.is_main:
-            ProjectImage.objects.filter(
-                project=self.project,
-                is_main=True
-            ).update(is_main=False)
-        super().save(*args, **kwargs)
+        """
+        Asegura que solo exista una imagen principal por proyecto y
+        actualiza el puntero desnormalizado del proyecto en la misma transacción.
+        """
+        if self.image and not self.image._committed:
+            self._read_dimensions()
+        
+        with transaction.atomic():
+            if self.is_main:
+                ProjectImage.objects.filter(
+                    project=self.project,
+                    is_main=True
+                ).update(is_main=False)
+            super().save(*args, **kwargs)
+            self.project.refresh_main_image()
     
     def delete(self, *args, **kwargs):
-        """Elimina el archivo físico al eliminar el registro."""
+        """
+        Elimina el archivo físico al eliminar el registro.
+        El puntero del proyecto se recalcula desde la señal post_delete.
+        """
         if self.image and os.path.isfile(self.image.path):
             os.remove(self.image.path)
         super().delete(*args, **kwargs)
+    
+    def _read_dimensions(self):
+        """Lee ancho y alto del archivo recién subido."""
+        try:
+            self.width = self.image.width
+            self.height = self.image.height
+        except Exception:
+            self.width = self.height = None
+
+
+class ProjectSearchDocument(models.Model):
+    """
+    Documento de búsqueda mantenido por proyecto (ver vulcano.search).
+    `content` guarda el texto normalizado sin acentos; `vector` solo se usa
+    en PostgreSQL, donde se indexa con GIN junto a un índice de trigramas.
+    """
+    project = models.OneToOneField(
+        Project,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='search_document',
+        verbose_name='Proyecto'
+    )
+    content = models.TextField(
+        blank=True,
+        verbose_name='Contenido normalizado'
+    )
+    vector = SearchVectorField(
+        null=True,
+        blank=True,
+        verbose_name='Vector de búsqueda'
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Última actualización'
+    )
+    
+    class Meta:
+        db_table = 'vulcano_project_search'
+        verbose_name = 'Documento de búsqueda'
+        verbose_name_plural = 'Documentos de búsqueda'
+    
+    def __str__(self):
+        return f"Búsqueda: {self.project_id}"
+
+
+class ProjectFacetCount(models.Model):
+    """
+    Conteo de proyectos por combinación de categoría, estado y publicación.
+    Se mantiene por deltas (ver vulcano.facets); no se edita a mano.
+    """
+    category = models.CharField(
+        max_length=50,
+        verbose_name='Categoría'
+    )
+    status = models.CharField(
+        max_length=20,
+        verbose_name='Estado'
+    )
+    is_published = models.BooleanField(
+        verbose_name='Publicado'
+    )
+    count = models.IntegerField(
+        default=0,
+        verbose_name='Proyectos'
+    )
+    
+    class Meta:
+        db_table = 'vulcano_project_facet_count'
+        verbose_name = 'Conteo de faceta'
+        verbose_name_plural = 'Conteos de facetas'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['category', 'status', 'is_published'],
+                name='unique_project_facet'
+            )
+        ]
+    
+    def __str__(self):
+        return f"{self.category}/{self.status}/{self.is_published}: {self.count}"
+
+
+class ProjectViewHit(models.Model):
+    """
+    Visita pendiente de sumar a Project.views_count.
+    Tabla de solo inserción: las visitas se consolidan por lotes con
+    `manage.py flush_view_counts` (ver vulcano.view_counts).
+    """
+    project = models.ForeignKey(
+        Project,
+        on_delete=models.CASCADE,
+        related_name='pending_views',
+        verbose_name='Proyecto'
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Fecha de visita'
+    )
+    
+    class Meta:
+        db_table = 'vulcano_project_view_hit'
+        verbose_name = 'Visita pendiente'
+        verbose_name_plural = 'Visitas pendientes'
+    
+    def __str__(self):
+        return f"Visita a {self.project_id} ({self.created_at})"
+
+
+class ProjectViewBucket(models.Model):
+    """
+    Visitas de un proyecto agregadas por hora, día o mes (ver vulcano.view_analytics).
+    Las horas se alimentan al consolidar ProjectViewHit y compact_view_buckets
+    agrupa las horas y días antiguos en días y meses.
+    """
+    GRANULARITY_CHOICES = [
+        ('hour', 'Hora'),
+        ('day', 'Día'),
+        ('month', 'Mes'),
+    ]
+    
+    project = models.ForeignKey(
+        Project,
+        on_delete=models.CASCADE,
+        related_name='view_buckets',
+        verbose_name='Proyecto'
+    )
+    granularity = models.CharField(
+        max_length=5,
+        choices=GRANULARITY_CHOICES,
+        verbose_name='Granularidad'
+    )
+    bucket_start = models.DateTimeField(
+        verbose_name='Inicio del periodo'
+    )
+    count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Visitas'
+    )
+    
+    class Meta:
+        db_table = 'vulcano_project_view_bucket'
+        verbose_name = 'Visitas por periodo'
+        verbose_name_plural = 'Visitas por periodo'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['project', 'granularity', 'bucket_start'],
+                name='unique_project_view_bucket'
+            )
+        ]
+        indexes = [
+            models.Index(fields=['granularity', 'bucket_start']),
+        ]
+    
+    def __str__(self):
+        return f"{self.project_id} {self.granularity} {self.bucket_start}: {self.count}"
 
 
 class Message(models.Model):
@@ -344,6 +723,15 @@ class Message(models.Model):
         related_name='messages',
         verbose_name='Proyecto relacionado'
     )
+    # Se asigna al crear el mensaje (ver vulcano.conversations)
+    conversation = models.ForeignKey(
+        'Conversation',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='messages',
+        verbose_name='Conversación'
+    )
     subject = models.CharField(
         max_length=200,
         verbose_name='Asunto'
@@ -365,6 +753,8 @@ class Message(models.Model):
         verbose_name='Fecha de envío'
     )
     
+    objects = CachedQuerySet.as_manager()
+    
     class Meta:
         db_table = 'vulcano_message'
         verbose_name = 'Mensaje'
@@ -373,6 +763,7 @@ class Message(models.Model):
         indexes = [
             models.Index(fields=['-created_at']),
             models.Index(fields=['recipient', 'is_read']),
+            models.Index(fields=['conversation', '-created_at']),
         ]
     
     def __str__(self):
@@ -384,4 +775,267 @@ class Message(models.Model):
             from django.utils import timezone
             self.is_read = True
             self.read_at = timezone.now()
-            self.save(update_fields=['is_read', 'read_at'])
\ No newline at end of file
+            self.save(update_fields=['is_read', 'read_at'])
+
+
+class Conversation(models.Model):
+    """
+    Hilo de mensajes entre dos usuarios, opcionalmente sobre un proyecto.
+    Guarda desnormalizado el último mensaje para que la bandeja de entrada
+    no tenga que recorrer los mensajes (ver vulcano.conversations).
+    """
+    # Participantes ordenados (user_low.id <= user_high.id): un único hilo por par
+    user_low = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='Participante'
+    )
+    user_high = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='Participante'
+    )
+    project = models.ForeignKey(
+        Project,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='conversations',
+        verbose_name='Proyecto relacionado'
+    )
+    last_message = models.ForeignKey(
+        Message,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        verbose_name='Último mensaje'
+    )
+    last_sender = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        verbose_name='Remitente del último mensaje'
+    )
+    last_subject = models.CharField(
+        max_length=200,
+        blank=True,
+        verbose_name='Asunto del último mensaje'
+    )
+    last_snippet = models.CharField(
+        max_length=150,
+        blank=True,
+        verbose_name='Extracto del último mensaje'
+    )
+    last_message_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='Fecha del último mensaje'
+    )
+    message_count = models.IntegerField(
+        default=0,
+        verbose_name='Mensajes'
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Fecha de creación'
+    )
+    
+    class Meta:
+        db_table = 'vulcano_conversation'
+        verbose_name = 'Conversación'
+        verbose_name_plural = 'Conversaciones'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user_low', 'user_high', 'project'],
+                condition=models.Q(project__isnull=False),
+                name='unique_project_conversation'
+            ),
+            models.UniqueConstraint(
+                fields=['user_low', 'user_high'],
+                condition=models.Q(project__isnull=True),
+                name='unique_direct_conversation'
+            ),
+        ]
+    
+    def __str__(self):
+        return f"{self.user_low_id} ↔ {self.user_high_id}: {self.last_subject}"
+    
+    def has_participant(self, user):
+        return user.pk in (self.user_low_id, self.user_high_id)
+    
+    def other_participant(self, user):
+        """El otro usuario del hilo (requiere select_related de ambos)."""
+        return self.user_high if self.user_low_id == user.pk else self.user_low
+
+
+class ConversationParticipant(models.Model):
+    """
+    Estado de una conversación para cada participante. La bandeja de
+    entrada es una consulta sobre el índice (user, -last_message_at).
+    """
+    conversation = models.ForeignKey(
+        Conversation,
+        on_delete=models.CASCADE,
+        related_name='participants',
+        verbose_name='Conversación'
+    )
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='conversation_memberships',
+        verbose_name='Usuario'
+    )
+    unread_count = models.IntegerField(
+        default=0,
+        verbose_name='Mensajes sin leer'
+    )
+    # Copia de Conversation.last_message_at para ordenar sin join
+    last_message_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='Fecha del último mensaje'
+    )
+    
+    class Meta:
+        db_table = 'vulcano_conversation_participant'
+        verbose_name = 'Participante de conversación'
+        verbose_name_plural = 'Participantes de conversaciones'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['conversation', 'user'],
+                name='unique_conversation_participant'
+            )
+        ]
+        indexes = [
+            models.Index(fields=['user', '-last_message_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.user_id} en {self.conversation_id} ({self.unread_count} sin leer)"
+
+
+class UserStats(models.Model):
+    """
+    Estadísticas de un usuario para los portales (modelo de lectura).
+    Se mantiene por deltas desde las señales (ver vulcano.user_stats), así
+    que cada portal las lee con una consulta por clave primaria.
+    """
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats',
+        verbose_name='Usuario'
+    )
+    
+    # Proyectos propios (arquitectos)
+    projects_total = models.IntegerField(default=0, verbose_name='Proyectos')
+    projects_published = models.IntegerField(default=0, verbose_name='Proyectos publicados')
+    projects_in_progress = models.IntegerField(default=0, verbose_name='Proyectos en progreso')
+    projects_completed = models.IntegerField(default=0, verbose_name='Proyectos completados')
+    views_total = models.BigIntegerField(default=0, verbose_name='Visitas totales')
+    clients_total = models.IntegerField(default=0, verbose_name='Clientes distintos')
+    new_projects_month = models.IntegerField(default=0, verbose_name='Proyectos nuevos del mes')
+    new_projects_month_start = models.DateField(
+        null=True,
+        blank=True,
+        verbose_name='Mes de proyectos nuevos'
+    )
+    
+    # Proyectos asignados (clientes)
+    assigned_total = models.IntegerField(default=0, verbose_name='Proyectos asignados')
+    assigned_in_progress = models.IntegerField(default=0, verbose_name='Asignados en progreso')
+    assigned_completed = models.IntegerField(default=0, verbose_name='Asignados completados')
+    assigned_featured = models.IntegerField(default=0, verbose_name='Asignados destacados')
+    assigned_architects = models.IntegerField(default=0, verbose_name='Arquitectos distintos')
+    
+    unread_messages = models.IntegerField(default=0, verbose_name='Mensajes sin leer')
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Última actualización'
+    )
+    
+    class Meta:
+        db_table = 'vulcano_user_stats'
+        verbose_name = 'Estadísticas de usuario'
+        verbose_name_plural = 'Estadísticas de usuarios'
+    
+    def __str__(self):
+        return f"Estadísticas de {self.user_id}"
+    
+    @property
+    def projects_draft(self):
+        return self.projects_total - self.projects_published
+    
+    @property
+    def projects_this_month(self):
+        """Proyectos creados en el mes en curso (0 si el contador es de un mes anterior)."""
+        from django.utils import timezone
+        
+        if self.new_projects_month_start != timezone.localdate().replace(day=1):
+            return 0
+        return self.new_projects_month
+
+
+class ActivityEvent(models.Model):
+    """
+    Registro de auditoría de la actividad de los usuarios.
+    Se escribe por lotes desde un buffer en memoria del proceso (ver
+    vulcano.activity) y `manage.py prune_activity` elimina los meses antiguos.
+    """
+    user = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='activity_events',
+        verbose_name='Usuario'
+    )
+    # Se conserva aunque el usuario se elimine
+    username = models.CharField(
+        max_length=150,
+        verbose_name='Nombre de usuario'
+    )
+    action = models.CharField(
+        max_length=100,
+        verbose_name='Acción'
+    )
+    project = models.ForeignKey(
+        Project,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='activity_events',
+        verbose_name='Proyecto'
+    )
+    details = models.TextField(
+        blank=True,
+        verbose_name='Detalles'
+    )
+    ip_address = models.GenericIPAddressField(
+        null=True,
+        blank=True,
+        verbose_name='Dirección IP'
+    )
+    # Momento de la acción (no el de la escritura del lote)
+    created_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='Fecha'
+    )
+    
+    class Meta:
+        db_table = 'vulcano_activity_event'
+        verbose_name = 'Evento de actividad'
+        verbose_name_plural = 'Eventos de actividad'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at']),
+            models.Index(fields=['project', '-created_at']),
+            models.Index(fields=['created_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.username}: {self.action} ({self.created_at})"
@@ -0,0 +1,150 @@
+"""
+Caché de página completa para visitantes anónimos.
+
+Cada entrada guarda el HTML, el instante lógico (vulcano.cache_namespaces)
+en que empezó a generarse y las etiquetas de los datos que muestra, que son
+namespaces de caché: `project:<id>`, `user:<id>`, `category:<categoría|all>`,
+`global`. Las señales suben la versión de esos namespaces; una entrada es
+válida solo si ninguna de sus etiquetas se invalidó después de empezar a
+generarla. Así, publicar un proyecto solo descarta las páginas que lo listan.
+"""
+
+from functools import wraps
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.http import HttpResponse, QueryDict
+from .cache_namespaces import changed_since, current_clock, get_versions
+from . import metrics
+import hashlib
+import logging
+import re
+import time
+
+logger = logging.getLogger('vulcano')
+
+PAGE_CACHE_TIMEOUT = 300
+
+_FRAGMENT_RE = '<!--page-cache:{name}-->.*?<!--/page-cache:{name}-->'
+
+
+def add_tags(request, *tags):
+    """Registra etiquetas de datos mostrados por la página en construcción."""
+    if not hasattr(request, 'page_cache_tags'):
+        request.page_cache_tags = set()
+    request.page_cache_tags.update(tags)
+
+
+def project_tags(projects):
+    """Etiquetas de una lista de proyectos mostrados como tarjeta."""
+    return [f"project:{project.pk}" for project in projects]
+
+
+def normalize_params(request, params):
+    """
+    QueryDict solo con los parámetros relevantes, sin vacíos y en orden fijo.
+    Los parámetros de seguimiento (utm_*, fbclid...) se descartan.
+    """
+    normalized = QueryDict(mutable=True)
+    for name in sorted(params):
+        value = ' '.join(request.GET.get(name, '').split())
+        if value:
+            normalized[name] = value
+    normalized._mutable = False
+    return normalized
+
+
+def is_cacheable_request(request):
+    """Solo GET/HEAD anónimos sin mensajes pendientes."""
+    if not getattr(settings, 'PAGE_CACHE_ENABLED', True):
+        return False
+    if request.method not in ('GET', 'HEAD') or request.user.is_authenticated:
+        return False
+    # len() no marca los mensajes como leídos
+    return len(get_messages(request)) == 0
+
+
+def get_valid_entry(key):
+    """Retorna la entrada si ninguna de sus etiquetas se invalidó después de generarla."""
+    start = time.perf_counter()
+    entry = cache.get(key)
+    if entry is not None and changed_since(entry['tags'], entry['clock']):
+        entry = None
+    metrics.record_cache('page', entry is not None, time.perf_counter() - start)
+    return entry
+
+
+def replace_fragments(content, refresh, request):
+    """Vuelve a renderizar las regiones dinámicas marcadas en el HTML cacheado."""
+    for name, render in refresh.items():
+        pattern = re.compile(_FRAGMENT_RE.format(name=re.escape(name)), re.DOTALL)
+        fresh = f"<!--page-cache:{name}-->{render(request)}<!--/page-cache:{name}-->"
+        content = pattern.sub(lambda match: fresh, content, count=1)
+    return content
+
+
+def anonymous_page_cache(namespace, params=(), refresh=None, on_hit=None, timeout=PAGE_CACHE_TIMEOUT):
+    """
+    Decorador de caché de página para visitantes anónimos.
+
+    La vista registra con add_tags() qué datos muestra. En un acierto no se
+    ejecuta la vista; `on_hit(request, meta)` permite efectos secundarios
+    baratos (p. ej. contar la visita) y `refresh` re-renderiza regiones
+    marcadas con <!--page-cache:nombre--> que cambian con más frecuencia.
+
+    Uso:
+        @anonymous_page_cache('home', params=('category', 'search', 'sort', 'cursor'))
+        def home(request):
+            ...
+    """
+    refresh = refresh or {}
+
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if not is_cacheable_request(request):
+                return view_func(request, *args, **kwargs)
+
+            normalized = normalize_params(request, params)
+            raw = f"{request.path}?{normalized.urlencode()}"
+            key = f"page_cache:{namespace}:{hashlib.md5(raw.encode()).hexdigest()}"
+
+            entry = get_valid_entry(key)
+            if entry is not None:
+                if on_hit:
+                    on_hit(request, entry['meta'])
+                response = HttpResponse(
+                    replace_fragments(entry['content'], refresh, request),
+                    content_type=entry['content_type']
+                )
+                response['X-Page-Cache'] = 'HIT'
+                return response
+
+            # La vista ve solo los parámetros normalizados, igual que la clave
+            request.GET = normalized
+            request.page_cache_tags = set()
+            request.page_cache_meta = {}
+            clock = current_clock()
+            response = view_func(request, *args, **kwargs)
+
+            if (
+                response.status_code == 200
+                and not getattr(response, 'streaming', False)
+                and not request.META.get('CSRF_COOKIE_NEEDED')
+                and request.page_cache_tags
+            ):
+                if hasattr(response, 'render') and callable(response.render):
+                    response.render()
+                # Crea las versiones que falten para que no se den por invalidadas al leer
+                get_versions(request.page_cache_tags)
+                cache.set(key, {
+                    'content': response.content.decode(response.charset),
+                    'content_type': response['Content-Type'],
+                    'tags': sorted(request.page_cache_tags),
+                    'meta': request.page_cache_meta,
+                    'clock': clock,
+                }, timeout)
+                response['X-Page-Cache'] = 'MISS'
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,227 @@
+"""
+Paginación por cursor (keyset) para listados de Vulcano.
+Cada página se obtiene con un WHERE sobre la última fila vista en lugar de
+OFFSET, por lo que el coste es O(tamaño de página) a cualquier profundidad.
+"""
+
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Q
+import base64
+import binascii
+import json
+
+
+def _json_default(value):
+    """Serializa fechas con microsegundos completos y decimales como texto."""
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return str(value)
+
+
+class InvalidCursor(ValueError):
+    """Cursor mal formado o que no corresponde al orden solicitado."""
+
+
+class CursorPage:
+    """
+    Página de resultados obtenida con un cursor.
+    Expone una interfaz parecida a django.core.paginator.Page para las plantillas.
+    """
+
+    def __init__(self, object_list, paginator, number, has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.number = number
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __repr__(self):
+        return f"<CursorPage {self.number}>"
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+    @property
+    def next_cursor(self):
+        """Cursor que apunta a la página siguiente."""
+        if not self._has_next:
+            return None
+        return self.paginator.encode_cursor(self.object_list[-1], 'next', self.number + 1)
+
+    @property
+    def previous_cursor(self):
+        """Cursor que apunta a la página anterior (None si es la primera)."""
+        if not self._has_previous or self.number <= 2:
+            return None
+        return self.paginator.encode_cursor(self.object_list[0], 'prev', self.number - 1)
+
+    def page_links(self):
+        """
+        Barra de páginas abreviada: 1 … n-1 [n] n+1 … última.
+        Solo las páginas vecinas tienen cursor; la primera se enlaza sin él
+        y la última solo se muestra cuando hay un total disponible.
+
+        Returns:
+            Lista de dicts con number, cursor, is_current, is_first y is_ellipsis
+        """
+        links = []
+        if self.number > 1:
+            links.append({'number': 1, 'is_first': True})
+            if self.number > 3:
+                links.append({'is_ellipsis': True})
+            if self.number > 2:
+                links.append({'number': self.number - 1, 'cursor': self.previous_cursor})
+        links.append({'number': self.number, 'is_current': True})
+        if self._has_next:
+            links.append({'number': self.number + 1, 'cursor': self.next_cursor})
+            num_pages = self.paginator.num_pages
+            if num_pages is None or num_pages > self.number + 1:
+                links.append({'is_ellipsis': True})
+        return links
+
+
+class CursorPaginator:
+    """
+    Paginador por cursor sobre un orden estable.
+
+    El orden debe terminar en un campo único (normalmente 'id' o '-id')
+    para que no haya empates. Admite campos del modelo y anotaciones.
+
+    Uso:
+        paginator = CursorPaginator(queryset, 12, ('-created_at', '-id'))
+        page = paginator.page(request.GET.get('cursor'))
+    """
+
+    def __init__(self, queryset, per_page, ordering, count_cache_key=None, count_timeout=60):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.ordering = tuple(ordering)
+        self.count_cache_key = count_cache_key
+        self.count_timeout = count_timeout
+        self._count = None
+
+    @property
+    def fields(self):
+        """Lista de (nombre, descendente) a partir del orden."""
+        return [(name.lstrip('-'), name.startswith('-')) for name in self.ordering]
+
+    @property
+    def count(self):
+        """
+        Total de resultados. Si se indica count_cache_key se guarda en caché,
+        por lo que puede estar desfasado hasta count_timeout segundos.
+        """
+        if self._count is None:
+            if self.count_cache_key:
+                self._count = cache.get_or_set(
+                    self.count_cache_key, self.queryset.order_by().count, self.count_timeout
+                )
+            else:
+                self._count = self.queryset.order_by().count()
+        return self._count
+
+    @property
+    def num_pages(self):
+        """Número de páginas, solo si el total está disponible sin consultar."""
+        if self._count is None:
+            return None
+        return max(1, -(-self._count // self.per_page))
+
+    def page(self, cursor=None):
+        """
+        Retorna la página indicada por el cursor (la primera si es None o inválido).
+
+        Args:
+            cursor: Cursor opaco generado por CursorPage
+
+        Returns:
+            CursorPage
+        """
+        try:
+            values, direction, number = self.decode_cursor(cursor) if cursor else (None, 'next', 1)
+        except InvalidCursor:
+            values, direction, number = None, 'next', 1
+
+        queryset = self.queryset
+        if direction == 'prev':
+            ordering = [name[1:] if name.startswith('-') else f"-{name}" for name in self.ordering]
+        else:
+            ordering = list(self.ordering)
+
+        if values is not None:
+            queryset = queryset.filter(self._keyset_filter(values, reverse=direction == 'prev'))
+
+        rows = list(queryset.order_by(*ordering)[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+
+        if direction == 'prev':
+            rows.reverse()
+            return CursorPage(rows, self, number, has_next=True, has_previous=has_more)
+        return CursorPage(rows, self, number, has_next=has_more, has_previous=values is not None)
+
+    def _keyset_filter(self, values, reverse=False):
+        """
+        Construye (a < x) OR (a = x AND b < y) ... según el sentido de cada campo.
+        """
+        condition = Q()
+        equal = Q()
+        for (name, descending), value in zip(self.fields, values):
+            lookup = 'lt' if descending != reverse else 'gt'
+            condition |= equal & Q(**{f"{name}__{lookup}": value})
+            equal &= Q(**{name: value})
+        return condition
+
+    def encode_cursor(self, obj, direction, number):
+        """Serializa los valores de orden de un objeto en un cursor opaco."""
+        payload = {
+            'v': [getattr(obj, name) for name, _ in self.fields],
+            'd': direction,
+            'p': number,
+        }
+        raw = json.dumps(payload, default=_json_default, separators=(',', ':'))
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, cursor):
+        """
+        Decodifica un cursor y convierte sus valores al tipo de cada campo.
+
+        Raises:
+            InvalidCursor: Si el cursor no es válido para este orden
+        """
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            values, direction, number = payload['v'], payload['d'], int(payload['p'])
+        except (binascii.Error, ValueError, TypeError, KeyError):
+            raise InvalidCursor(cursor)
+
+        if direction not in ('next', 'prev') or number < 1 or len(values) != len(self.fields):
+            raise InvalidCursor(cursor)
+
+        converted = []
+        for (name, _), value in zip(self.fields, values):
+            try:
+                field = self.queryset.model._meta.get_field(name)
+                converted.append(field.to_python(value))
+            except FieldDoesNotExist:
+                converted.append(value)
+            except Exception:
+                raise InvalidCursor(cursor)
+        return converted, direction, number
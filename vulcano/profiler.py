@@ -0,0 +1,316 @@
+"""
+Perfilador bajo demanda de peticiones reales.
+
+Un usuario staff genera en /staff/perfiles/ un token firmado
+(django.core.signing, válido PROFILER_TOKEN_MAX_AGE segundos) y lo agrega a
+la petición que quiere medir, como parámetro `?_profile=<token>` o como
+cabecera `X-Vulcano-Profile: <token>`. Así se puede perfilar, por ejemplo,
+el portal de un arquitecto concreto pasándole el enlace.
+
+ProfilerMiddleware (vulcano.middleware) mide esa petición con un perfilador
+determinista (sys.setprofile) y guarda en PROFILER_DIRECTORY un archivo de
+speedscope (https://www.speedscope.app) con tres perfiles sobre la misma
+línea de tiempo:
+
+- Python: árbol de llamadas completo (funciones y builtins).
+- SQL: cada consulta con su duración.
+- Plantillas: renderizado de cada plantilla (requiere MetricsMiddleware y
+  el backend vulcano.metrics.TimedDjangoTemplates).
+
+La respuesta lleva la cabecera X-Vulcano-Profile con el id del perfil, que
+se descarga desde /staff/perfiles/<id>/. Sin token el middleware no hace
+nada más que buscarlo: el coste fuera de las peticiones perfiladas es nulo.
+"""
+
+from django.conf import settings
+from django.core import signing
+from django.db import connections
+from .query_budget import fingerprint
+from contextlib import ExitStack
+import json
+import logging
+import os
+import re
+import sys
+import time
+import uuid
+
+logger = logging.getLogger('vulcano')
+
+QUERY_PARAM = '_profile'
+HEADER = 'HTTP_X_VULCANO_PROFILE'
+TOKEN_SALT = 'vulcano.profiler'
+SPEEDSCOPE_SCHEMA = 'https://www.speedscope.app/file-format-schema.json'
+PROFILE_ID = re.compile(r'^[\w-]+$')
+
+
+# ==================== TOKENS ====================
+
+def make_token(user):
+    """Token firmado con el que `user` (staff) autoriza perfilar peticiones."""
+    return signing.dumps(user.get_username(), salt=TOKEN_SALT)
+
+
+def read_token(token):
+    """
+    Valida un token.
+
+    Returns:
+        Nombre del usuario staff que lo emitió, o None si es inválido, expiró
+        o el usuario ya no es staff
+    """
+    from django.contrib.auth.models import User
+
+    try:
+        username = signing.loads(token, salt=TOKEN_SALT, max_age=settings.PROFILER_TOKEN_MAX_AGE)
+    except signing.BadSignature:
+        return None
+    if not User.objects.filter(username=username, is_staff=True, is_active=True).exists():
+        return None
+    return username
+
+
+def requested_token(request):
+    """Token de la petición, sin analizar la query string si no lo menciona."""
+    token = request.META.get(HEADER)
+    if token is None and f'{QUERY_PARAM}=' in request.META.get('QUERY_STRING', ''):
+        token = request.GET.get(QUERY_PARAM)
+    return token
+
+
+# ==================== PERFIL DE UNA PETICIÓN ====================
+
+class RequestProfile:
+    """Llamadas, consultas y plantillas de una petición, en el hilo que la atiende."""
+
+    def __init__(self, max_events):
+        self.max_events = max_events
+        self.frames = []
+        self.frame_index = {}
+        self.events = []
+        self.stack = []
+        self.queries = []
+        self.templates = []
+        self.truncated = False
+        self.start = None
+        self.end = None
+
+    def _frame(self, key, name, file, line):
+        index = self.frame_index.get(key)
+        if index is None:
+            index = self.frame_index[key] = len(self.frames)
+            self.frames.append({'name': name, 'file': file, 'line': line})
+        return index
+
+    def _trace(self, frame, event, arg):
+        now = time.perf_counter()
+        if event == 'call':
+            code = frame.f_code
+            index = self._frame(code, code.co_qualname, code.co_filename, code.co_firstlineno)
+        elif event == 'c_call':
+            module = getattr(arg, '__module__', None) or 'builtins'
+            name = getattr(arg, '__qualname__', None) or getattr(arg, '__name__', '?')
+            index = self._frame(('c', module, name), f'{module}.{name}', module, None)
+        else:
+            # return, c_return, c_exception; las que cierran llamadas abiertas
+            # antes de empezar (el stack del middleware) se ignoran
+            if self.stack:
+                self.events.append(('C', self.stack.pop(), now))
+            return
+        self.stack.append(index)
+        self.events.append(('O', index, now))
+        if len(self.events) >= self.max_events:
+            self.truncated = True
+            sys.setprofile(None)
+
+    def __call__(self, execute, sql, params, many, context):
+        """Envoltorio de ejecución: línea de tiempo de las consultas."""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, start, time.perf_counter()))
+
+    def add_template(self, name, start, end):
+        """Lo llama vulcano.metrics.TimedTemplate al terminar un renderizado."""
+        self.templates.append((name, start, end))
+
+    def run(self, func, *args):
+        """Ejecuta func(*args) perfilando sus llamadas y consultas."""
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(self))
+            self.start = time.perf_counter()
+            sys.setprofile(self._trace)
+            try:
+                return func(*args)
+            finally:
+                sys.setprofile(None)
+                self.end = time.perf_counter()
+
+    # ---------- exportación ----------
+
+    def _ms(self, moment):
+        return round((moment - self.start) * 1000, 4)
+
+    def _evented(self, name, events):
+        return {
+            'type': 'evented',
+            'name': name,
+            'unit': 'milliseconds',
+            'startValue': 0,
+            'endValue': self._ms(self.end),
+            'events': events,
+        }
+
+    def _call_events(self):
+        events = [{'type': kind, 'frame': index, 'at': self._ms(moment)} for kind, index, moment in self.events]
+        # Lo que quedó abierto (sys.setprofile(None), corte por tamaño) se cierra al final
+        open_frames = []
+        for kind, index, _ in self.events:
+            if kind == 'O':
+                open_frames.append(index)
+            elif open_frames:
+                open_frames.pop()
+        for index in reversed(open_frames):
+            events.append({'type': 'C', 'frame': index, 'at': self._ms(self.end)})
+        return events
+
+    def _interval_events(self, intervals):
+        """Eventos anidados a partir de intervalos (frame, inicio, fin)."""
+        events = []
+        stack = []
+        for index, start, end in sorted(intervals, key=lambda item: (item[1], -item[2])):
+            while stack and stack[-1][1] <= start:
+                closed, closed_end = stack.pop()
+                events.append({'type': 'C', 'frame': closed, 'at': self._ms(closed_end)})
+            if stack:
+                end = min(end, stack[-1][1])
+            events.append({'type': 'O', 'frame': index, 'at': self._ms(start)})
+            stack.append((index, end))
+        while stack:
+            closed, closed_end = stack.pop()
+            events.append({'type': 'C', 'frame': closed, 'at': self._ms(closed_end)})
+        return events
+
+    def speedscope(self, name):
+        """Archivo de speedscope (formato JSON) con los perfiles Python, SQL y Plantillas."""
+        query_intervals = [
+            (self._frame(('sql', fingerprint(sql)), fingerprint(sql)[:300], 'sql', None), start, end)
+            for sql, start, end in self.queries
+        ]
+        template_intervals = [
+            (self._frame(('template', template), template, template, None), start, end)
+            for template, start, end in self.templates
+        ]
+        return {
+            '$schema': SPEEDSCOPE_SCHEMA,
+            'name': name,
+            'exporter': 'vulcano.profiler',
+            'activeProfileIndex': 0,
+            'shared': {'frames': self.frames},
+            'profiles': [
+                self._evented(f'Python: {name}', self._call_events()),
+                self._evented('SQL', self._interval_events(query_intervals)),
+                self._evented('Plantillas', self._interval_events(template_intervals)),
+            ],
+        }
+
+    def summary(self):
+        return {
+            'duration_ms': self._ms(self.end),
+            'queries': len(self.queries),
+            'sql_ms': round(sum(end - start for _, start, end in self.queries) * 1000, 1),
+            'templates': len(self.templates),
+            'template_ms': round(sum(
+                end - start for _, start, end in self._outermost(self.templates)
+            ) * 1000, 1),
+            'calls': sum(1 for kind, _, _ in self.events if kind == 'O'),
+            'truncated': self.truncated,
+        }
+
+    @staticmethod
+    def _outermost(intervals):
+        """Intervalos no contenidos en otro (para no contar dos veces los anidados)."""
+        outer = []
+        for interval in sorted(intervals, key=lambda item: (item[1], -item[2])):
+            if not outer or interval[1] >= outer[-1][2]:
+                outer.append(interval)
+        return outer
+
+
+# ==================== ALMACENAMIENTO ====================
+
+def directory():
+    path = settings.PROFILER_DIRECTORY
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def profile_path(profile_id):
+    """Ruta del archivo de speedscope de un perfil, o None si no existe."""
+    if not PROFILE_ID.match(profile_id):
+        return None
+    path = os.path.join(directory(), f'{profile_id}.speedscope.json')
+    return path if os.path.exists(path) else None
+
+
+def recorded_path(request):
+    """Ruta pedida sin el token (que no debe quedar guardado)."""
+    query = request.GET.copy()
+    query.pop(QUERY_PARAM, None)
+    return f'{request.path}?{query.urlencode()}' if query else request.path
+
+
+def save(profile, request, response, issued_by):
+    """
+    Guarda el perfil de una petición y su resumen.
+
+    Returns:
+        Id del perfil
+    """
+    profile_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+    path = recorded_path(request)
+    user = getattr(request, 'user', None)
+    meta = {
+        'id': profile_id,
+        'created': time.time(),
+        'method': request.method,
+        'path': path,
+        'user': user.get_username() if user is not None and user.is_authenticated else None,
+        'status': response.status_code,
+        'issued_by': issued_by,
+        **profile.summary(),
+    }
+
+    base = os.path.join(directory(), profile_id)
+    with open(f'{base}.speedscope.json', 'w', encoding='utf-8') as output:
+        json.dump(profile.speedscope(f'{request.method} {path}'), output, separators=(',', ':'))
+    with open(f'{base}.json', 'w', encoding='utf-8') as output:
+        json.dump(meta, output)
+    prune()
+    return profile_id
+
+
+def list_profiles():
+    """Resúmenes de los perfiles guardados, del más reciente al más antiguo."""
+    profiles = []
+    for name in os.listdir(directory()):
+        if name.endswith('.json') and not name.endswith('.speedscope.json'):
+            try:
+                with open(os.path.join(directory(), name), encoding='utf-8') as meta:
+                    profiles.append(json.load(meta))
+            except (OSError, ValueError) as e:
+                logger.error(f"Error al leer el perfil {name}: {str(e)}")
+    profiles.sort(key=lambda meta: meta['created'], reverse=True)
+    return profiles
+
+
+def prune():
+    """Conserva solo los PROFILER_KEEP perfiles más recientes."""
+    for meta in list_profiles()[settings.PROFILER_KEEP:]:
+        for suffix in ('.speedscope.json', '.json'):
+            try:
+                os.remove(os.path.join(directory(), f"{meta['id']}{suffix}"))
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,102 @@
+"""
+Presupuesto de consultas por vista y detector de N+1.
+
+QueryBudgetMiddleware (vulcano.middleware) cuenta las consultas SQL de cada
+petición muestreada y agrupa las que tienen la misma forma (huella: el SQL
+sin literales y con las listas IN colapsadas). Al terminar la petición
+reporta:
+
+- Si la vista declaró un presupuesto con @query_budget(n) y se superó.
+- Si una misma forma se repitió QUERY_BUDGET_REPEAT_THRESHOLD veces o más
+  (típico N+1: get_main_image en un bucle, user.profile en una plantilla).
+
+Según QUERY_BUDGET_MODE se lanza QueryBudgetExceeded ('raise', por defecto
+en `manage.py test`, para que un test falle en cuanto una vista empeora) o
+se registra un aviso en el log ('log', en producción, solo para la fracción
+QUERY_BUDGET_SAMPLE_RATE de las peticiones).
+"""
+
+from collections import Counter
+from django.conf import settings
+import logging
+import random
+import re
+
+logger = logging.getLogger('vulcano')
+
+DEFAULT_REPEAT_THRESHOLD = 5
+
+
+class QueryBudgetExceeded(Exception):
+    """Una vista superó su presupuesto de consultas o repitió una consulta (N+1)."""
+
+
+def query_budget(n):
+    """
+    Declara el máximo de consultas SQL de una vista (incluye middleware,
+    sesión, usuario y plantillas).
+
+    Uso:
+        @query_budget(8)
+        def home(request):
+            ...
+    """
+    def decorator(view_func):
+        view_func.query_budget = n
+        return view_func
+    return decorator
+
+
+def fingerprint(sql):
+    """Forma de una consulta: sin literales y con las listas IN colapsadas."""
+    sql = re.sub(r"'(?:[^']|'')*'", '?', sql)
+    sql = re.sub(r'\b\d+\b', '?', sql)
+    sql = re.sub(r'\((?:\s*(?:%s|\?)\s*,)*\s*(?:%s|\?)\s*\)', '(...)', sql)
+    return re.sub(r'\s+', ' ', sql).strip()
+
+
+class QueryTracker:
+    """Envoltorio de ejecución que cuenta las consultas por huella."""
+
+    def __init__(self):
+        self.count = 0
+        self.shapes = Counter()
+        self.budget = None
+        self.view_name = None
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        self.shapes[fingerprint(sql)] += 1
+        return execute(sql, params, many, context)
+
+    def repeated(self, threshold):
+        """Huellas ejecutadas `threshold` veces o más, de la más repetida a la menos."""
+        return [(shape, total) for shape, total in self.shapes.most_common() if total >= threshold]
+
+    def problems(self, threshold):
+        """Descripciones de lo que se superó (lista vacía si nada)."""
+        problems = []
+        if self.budget is not None and self.count > self.budget:
+            problems.append(f"{self.count} consultas con un presupuesto de {self.budget}")
+        for shape, total in self.repeated(threshold):
+            problems.append(f"posible N+1, {total} veces: {shape[:300]}")
+        return problems
+
+
+def should_track():
+    """Decide si la petición actual se mide (muestreo)."""
+    rate = getattr(settings, 'QUERY_BUDGET_SAMPLE_RATE', 0)
+    return rate >= 1 or random.random() < rate
+
+
+def report(tracker, path):
+    """Lanza o registra los problemas de una petición según QUERY_BUDGET_MODE."""
+    threshold = getattr(settings, 'QUERY_BUDGET_REPEAT_THRESHOLD', DEFAULT_REPEAT_THRESHOLD)
+    problems = tracker.problems(threshold)
+    if not problems:
+        return
+    message = f"Consultas de {tracker.view_name or path}: " + '; '.join(problems)
+    if getattr(settings, 'QUERY_BUDGET_MODE', 'log') == 'raise':
+        raise QueryBudgetExceeded(message)
+    logger.warning(message)
+
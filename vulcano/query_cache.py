@@ -0,0 +1,150 @@
+"""
+Caché de resultados de QuerySet invalidada por versiones de tabla.
+
+`Project.objects.filter(...).cached(300)` guarda la lista de resultados bajo
+una clave derivada del SQL compilado y sus parámetros. El resultado depende
+del namespace `table:<tabla>` (vulcano.cache_namespaces) de cada tabla que
+aparece en la consulta, incluidas las de select_related y subconsultas.
+
+Las versiones de tabla no salen de señales: un envoltorio de ejecución
+(connection.execute_wrapper) instalado en cada conexión reconoce toda
+sentencia INSERT/UPDATE/DELETE y sube el namespace de su tabla. Así se
+cubren también los queryset.update() de las acciones del admin, los
+borrados rápidos sin señales y el SQL crudo. Como cualquier bump, se aplica
+una vez al terminar la petición o al confirmar la transacción; mientras
+tanto, las consultas de tablas con escrituras pendientes van a la base de
+datos sin pasar por la caché.
+
+Los prefetch_related no se cachean: se resuelven sobre la lista cacheada
+en cada evaluación.
+"""
+
+from django.apps import apps
+from django.conf import settings
+from django.core.exceptions import EmptyResultSet
+from django.db import models
+from . import cache_namespaces
+from .utils import cached_computation
+import hashlib
+import re
+import threading
+
+# Tablas con escrituras en casi cada petición: no versionan (sería un
+# avance del reloj por visita) y no pueden usarse en consultas cacheadas
+IGNORED_TABLES = {'django_session', 'vulcano_project_view_hit', 'vulcano_activity_event'}
+
+WRITE_SQL = re.compile(
+    r'^\s*(?:INSERT(?:\s+OR\s+\w+)?\s+INTO|UPDATE|DELETE\s+FROM|REPLACE\s+INTO)\s+[`"\[]?([\w.]+)',
+    re.IGNORECASE
+)
+
+_local = threading.local()
+
+
+def table_namespace(table):
+    return f"table:{table}"
+
+
+def ignored_tables():
+    """IGNORED_TABLES más las tablas de cachés en base de datos (evita invalidarse a sí mismas)."""
+    tables = set(IGNORED_TABLES)
+    for config in settings.CACHES.values():
+        if config['BACKEND'].endswith('DatabaseCache'):
+            tables.add(config['LOCATION'])
+    return tables
+
+
+def written_table(sql):
+    """Tabla modificada por una sentencia SQL (None si no escribe)."""
+    match = WRITE_SQL.match(sql)
+    return match.group(1) if match else None
+
+
+def track_writes(execute, sql, params, many, context):
+    """
+    Envoltorio de ejecución: tras cada escritura sube la versión de su
+    tabla (después, para que nadie cachee las filas anteriores como nuevas).
+    """
+    result = execute(sql, params, many, context)
+    table = written_table(sql) if isinstance(sql, str) else None
+    if table and not getattr(_local, 'bumping', False) and table not in ignored_tables():
+        _local.bumping = True
+        try:
+            cache_namespaces.bump(table_namespace(table))
+        finally:
+            _local.bumping = False
+    return result
+
+
+def install(connection):
+    """Instala track_writes en una conexión (una sola vez)."""
+    if track_writes not in connection.execute_wrappers:
+        connection.execute_wrappers.append(track_writes)
+
+
+def query_tables(sql):
+    """Tablas de modelos que aparecen (entre comillas) en el SQL compilado."""
+    from django.db import connection
+
+    quote = connection.ops.quote_name
+    return {
+        model._meta.db_table
+        for model in apps.get_models(include_auto_created=True)
+        if quote(model._meta.db_table) in sql
+    }
+
+
+def fetch(queryset, timeout):
+    """
+    Resultados de la consulta desde la caché (o la base de datos).
+    Retorna None si la consulta no admite caché (vacía por construcción).
+    """
+    try:
+        sql, params = queryset.query.chain().get_compiler(queryset.db).as_sql()
+    except EmptyResultSet:
+        return None
+
+    tables = query_tables(sql)
+    blocked = tables & ignored_tables()
+    if blocked:
+        raise ValueError(f"No se pueden cachear consultas sobre {', '.join(sorted(blocked))}")
+
+    namespaces = sorted(table_namespace(table) for table in tables)
+
+    def compute():
+        return list(queryset._iterable_class(queryset))
+
+    if cache_namespaces.pending(namespaces):
+        # Escrituras propias sin aplicar: la caché aún no las refleja
+        return compute()
+
+    raw = f"{queryset.db}|{queryset._iterable_class.__qualname__}|{sql}|{params!r}"
+    key = f"query_cache:{hashlib.md5(raw.encode()).hexdigest()}"
+    return cached_computation(key, compute, timeout, name='query_cache', depends_on=namespaces)
+
+
+class CachedQuerySet(models.QuerySet):
+    """
+    QuerySet con caché opcional de resultados.
+
+    Uso:
+        Project.objects.filter(is_published=True).cached(300)[:3]
+    """
+
+    _cache_timeout = None
+
+    def cached(self, timeout=300):
+        """Copia del QuerySet cuyos resultados se leen de la caché durante `timeout` segundos."""
+        clone = self._chain()
+        clone._cache_timeout = timeout
+        return clone
+
+    def _clone(self):
+        clone = super()._clone()
+        clone._cache_timeout = self._cache_timeout
+        return clone
+
+    def _fetch_all(self):
+        if self._result_cache is None and self._cache_timeout is not None:
+            self._result_cache = fetch(self, self._cache_timeout)
+        super()._fetch_all()
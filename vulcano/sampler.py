@@ -0,0 +1,240 @@
+"""
+Muestreo estadístico continuo de la CPU en cada worker.
+
+SamplerMiddleware (vulcano.middleware) anota qué hilo atiende qué vista
+(nombre de URL) y un hilo del proceso toma, SAMPLER_HZ veces por segundo,
+el stack de esos hilos con sys._current_frames(). Los stacks se acumulan
+en formato "folded" (`vista;marco;marco;... cuenta`) y cada
+SAMPLER_FLUSH_INTERVAL segundos se vuelcan a un archivo propio del worker
+en SAMPLER_DIRECTORY (`<timestamp>-<pid>.folded`).
+
+`manage.py merge_samples` une los archivos de todos los workers de una
+ventana de tiempo en un flamegraph (folded, para flamegraph.pl o
+speedscope, o JSON de speedscope). Los marcos de renderizado de plantillas
+llevan el nombre de la plantilla para distinguirlas en el gráfico.
+
+Con 10 Hz el coste es despreciable: solo se recorren los stacks de los hilos
+que están atendiendo una petición.
+"""
+
+from collections import Counter
+from django.conf import settings
+from .profiler import SPEEDSCOPE_SCHEMA
+import atexit
+import logging
+import os
+import re
+import sys
+import threading
+import time
+
+logger = logging.getLogger('vulcano')
+
+FILE_NAME = re.compile(r'^(\d+)-(\d+)\.folded$')
+
+try:
+    from django.template.base import Template as _DjangoTemplate
+    TEMPLATE_RENDER_CODE = _DjangoTemplate._render.__code__
+except (ImportError, AttributeError):
+    TEMPLATE_RENDER_CODE = None
+
+
+def frame_label(frame):
+    """Nombre de un marco: módulo.función, o la plantilla que se renderiza."""
+    code = frame.f_code
+    if code is TEMPLATE_RENDER_CODE:
+        template = frame.f_locals.get('self')
+        return f"plantilla:{getattr(template, 'name', None) or '<string>'}"
+    module = frame.f_globals.get('__name__', '?')
+    # ';' separa marcos en el formato folded
+    return f'{module}.{code.co_qualname}'.replace(';', ',')
+
+
+def fold(view, frame, max_depth):
+    """Stack de `frame` en formato folded, con la vista como raíz."""
+    labels = []
+    while frame is not None and len(labels) < max_depth:
+        labels.append(frame_label(frame))
+        frame = frame.f_back
+    labels.append(view)
+    return ';'.join(reversed(labels))
+
+
+class Sampler:
+    """Hilo muestreador del proceso y sus cuentas pendientes de volcar."""
+
+    def __init__(self, hz, directory, flush_interval, max_depth=200):
+        self.interval = 1 / hz
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.max_depth = max_depth
+        self.pid = os.getpid()
+        self.lock = threading.Lock()
+        self.active = {}
+        self.counts = Counter()
+        self.last_flush = time.monotonic()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='vulcano-sampler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Detiene el hilo y vuelca lo pendiente."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.flush()
+
+    def begin(self, view='unresolved'):
+        """El hilo actual empieza a atender una petición."""
+        self.active[threading.get_ident()] = view
+
+    def set_view(self, view):
+        ident = threading.get_ident()
+        if ident in self.active:
+            self.active[ident] = view
+
+    def end(self):
+        self.active.pop(threading.get_ident(), None)
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            try:
+                self.sample()
+                if time.monotonic() - self.last_flush >= self.flush_interval:
+                    self.flush()
+            except Exception as e:
+                logger.error(f"Error en el muestreador de CPU: {str(e)}")
+
+    def sample(self):
+        """Toma una muestra del stack de cada hilo que atiende una petición."""
+        frames = sys._current_frames()
+        stacks = [
+            fold(view, frames[ident], self.max_depth)
+            for ident, view in list(self.active.items())
+            if ident in frames
+        ]
+        if stacks:
+            with self.lock:
+                self.counts.update(stacks)
+
+    def flush(self):
+        """Vuelca las cuentas pendientes a un archivo nuevo del worker."""
+        with self.lock:
+            counts, self.counts = self.counts, Counter()
+            self.last_flush = time.monotonic()
+        if not counts:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f'{int(time.time())}-{self.pid}.folded')
+        temporary = f'{path}.tmp'
+        with open(temporary, 'w', encoding='utf-8') as output:
+            for stack, count in counts.items():
+                output.write(f'{stack} {count}\n')
+        os.replace(temporary, path)
+        prune(self.directory)
+
+
+_sampler = None
+_sampler_lock = threading.Lock()
+
+
+def get_sampler():
+    """Muestreador del proceso; se arranca en el primer uso de cada worker."""
+    global _sampler
+    if _sampler is None or _sampler.pid != os.getpid():
+        with _sampler_lock:
+            if _sampler is None or _sampler.pid != os.getpid():
+                _sampler = Sampler(
+                    settings.SAMPLER_HZ, settings.SAMPLER_DIRECTORY, settings.SAMPLER_FLUSH_INTERVAL
+                )
+                _sampler.start()
+    return _sampler
+
+
+def stop_sampler():
+    """Detiene el muestreador del proceso (apagado del worker y tests)."""
+    global _sampler
+    with _sampler_lock:
+        if _sampler is not None and _sampler.pid == os.getpid():
+            _sampler.stop()
+        _sampler = None
+
+
+atexit.register(stop_sampler)
+
+
+# ==================== LECTURA ====================
+
+def prune(directory):
+    """Elimina los archivos más antiguos que SAMPLER_RETENTION_HOURS."""
+    cutoff = time.time() - settings.SAMPLER_RETENTION_HOURS * 3600
+    for name in os.listdir(directory):
+        match = FILE_NAME.match(name)
+        if match and int(match.group(1)) < cutoff:
+            try:
+                os.remove(os.path.join(directory, name))
+            except FileNotFoundError:
+                pass
+
+
+def merge(directory, start, end, view=None):
+    """
+    Suma los stacks de todos los workers volcados entre `start` y `end`.
+
+    Args:
+        directory: Carpeta de los archivos .folded
+        start, end: Timestamps (segundos) de la ventana
+        view: Si se indica, solo los stacks de ese nombre de URL
+
+    Returns:
+        Counter de stack folded -> muestras
+    """
+    counts = Counter()
+    if not os.path.isdir(directory):
+        return counts
+    for name in os.listdir(directory):
+        match = FILE_NAME.match(name)
+        if not match or not start <= int(match.group(1)) <= end:
+            continue
+        with open(os.path.join(directory, name), encoding='utf-8') as data:
+            for line in data:
+                stack, _, count = line.rstrip('\n').rpartition(' ')
+                if stack and (view is None or stack.split(';', 1)[0] == view):
+                    counts[stack] += int(count)
+    return counts
+
+
+def to_speedscope(counts, name):
+    """Perfil 'sampled' de speedscope a partir de stacks folded."""
+    frames = []
+    frame_index = {}
+    samples = []
+    weights = []
+    for stack, count in counts.most_common():
+        indexes = []
+        for label in stack.split(';'):
+            if label not in frame_index:
+                frame_index[label] = len(frames)
+                frames.append({'name': label})
+            indexes.append(frame_index[label])
+        samples.append(indexes)
+        weights.append(count)
+    return {
+        '$schema': SPEEDSCOPE_SCHEMA,
+        'name': name,
+        'exporter': 'vulcano.sampler',
+        'activeProfileIndex': 0,
+        'shared': {'frames': frames},
+        'profiles': [{
+            'type': 'sampled',
+            'name': name,
+            'unit': 'none',
+            'startValue': 0,
+            'endValue': sum(weights),
+            'samples': samples,
+            'weights': weights,
+        }],
+    }
@@ -0,0 +1,320 @@
+"""
+Motor de búsqueda de texto completo para proyectos de Vulcano.
+Mantiene un documento de búsqueda por proyecto: tsvector + GIN con
+stemming en español sobre PostgreSQL y tablas virtuales FTS5 sobre SQLite.
+"""
+
+from django.db import connection
+from django.db.models import Case, F, FloatField, Q, Value, When
+import logging
+import re
+import unicodedata
+
+logger = logging.getLogger('vulcano')
+
+# Configuración de texto de PostgreSQL (stemming en español)
+SEARCH_CONFIG = 'spanish'
+
+# Similitud mínima de trigramas para tolerar errores tipográficos
+TRIGRAM_THRESHOLD = 0.3
+
+# Máximo de coincidencias que se ordenan por relevancia en SQLite
+MAX_RESULTS = 500
+
+# Tablas virtuales FTS5 (solo SQLite)
+FTS_TABLE = 'vulcano_project_search_fts'
+TRIGRAM_TABLE = 'vulcano_project_search_trigram'
+
+# Campos de Project que alimentan el documento de búsqueda
+INDEXED_FIELDS = {'title', 'location', 'description', 'short_description'}
+
+# Pesos por campo: título, ubicación, descripción
+FIELD_WEIGHTS = (('title', 'A', 10.0), ('location', 'B', 4.0), ('body', 'C', 1.0))
+
+_WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def normalize_text(text):
+    """
+    Normaliza texto para búsqueda: minúsculas y sin acentos.
+    Se aplica igual al documento y a la consulta, por lo que la búsqueda
+    es insensible a acentos sin depender de la extensión unaccent.
+
+    Args:
+        text: Texto a normalizar
+
+    Returns:
+        String normalizado
+    """
+    if not text:
+        return ''
+    decomposed = unicodedata.normalize('NFKD', str(text).lower())
+    stripped = ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return ' '.join(_WORD_RE.findall(stripped))
+
+
+def tokenize(query):
+    """Divide una consulta normalizada en términos."""
+    return normalize_text(query).split()
+
+
+def get_document_parts(project):
+    """
+    Obtiene los campos normalizados que componen el documento de un proyecto.
+
+    Args:
+        project: Instancia de Project
+
+    Returns:
+        dict con title, location y body normalizados
+    """
+    return {
+        'title': normalize_text(project.title),
+        'location': normalize_text(project.location),
+        'body': normalize_text(project.description or project.short_description),
+    }
+
+
+def index_project(project):
+    """
+    Crea o actualiza el documento de búsqueda de un proyecto.
+
+    Args:
+        project: Instancia de Project ya guardada
+    """
+    from .models import ProjectSearchDocument
+
+    write_documents(ProjectSearchDocument, [(project.pk, get_document_parts(project))])
+
+
+def write_documents(document_model, rows):
+    """
+    Escribe documentos de búsqueda y las estructuras propias del motor por lotes.
+
+    Args:
+        document_model: Modelo ProjectSearchDocument
+        rows: Lista de tuplas (project_id, parts) con parts de get_document_parts
+    """
+    if not rows:
+        return
+
+    project_ids = [project_id for project_id, _ in rows]
+    document_model.objects.filter(project_id__in=project_ids).delete()
+    document_model.objects.bulk_create([
+        document_model(
+            project_id=project_id,
+            content=' '.join(value for value in parts.values() if value)
+        )
+        for project_id, parts in rows
+    ])
+
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.executemany(
+                "UPDATE vulcano_project_search SET vector = "
+                "setweight(to_tsvector(%s::regconfig, %s), 'A') || "
+                "setweight(to_tsvector(%s::regconfig, %s), 'B') || "
+                "setweight(to_tsvector(%s::regconfig, %s), 'C') "
+                "WHERE project_id = %s",
+                [
+                    (SEARCH_CONFIG, parts['title'], SEARCH_CONFIG, parts['location'],
+                     SEARCH_CONFIG, parts['body'], project_id)
+                    for project_id, parts in rows
+                ]
+            )
+        elif connection.vendor == 'sqlite':
+            _sqlite_delete(cursor, project_ids)
+            cursor.executemany(
+                f"INSERT INTO {FTS_TABLE} (rowid, title, location, body) VALUES (%s, %s, %s, %s)",
+                [(project_id, parts['title'], parts['location'], parts['body']) for project_id, parts in rows]
+            )
+            cursor.executemany(
+                f"INSERT INTO {TRIGRAM_TABLE} (rowid, content) VALUES (%s, %s)",
+                [
+                    (project_id, ' '.join(value for value in parts.values() if value))
+                    for project_id, parts in rows
+                ]
+            )
+
+
+def _sqlite_delete(cursor, project_ids):
+    """Elimina filas de las tablas FTS5 para los proyectos indicados."""
+    for table in (FTS_TABLE, TRIGRAM_TABLE):
+        cursor.executemany(
+            f"DELETE FROM {table} WHERE rowid = %s",
+            [(project_id,) for project_id in project_ids]
+        )
+
+
+def remove_project(project_id):
+    """
+    Elimina un proyecto del índice.
+    El documento se borra en cascada; en SQLite también hay que limpiar FTS5.
+
+    Args:
+        project_id: ID del proyecto eliminado
+    """
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            _sqlite_delete(cursor, [project_id])
+
+
+def rebuild_index(batch_size=1000):
+    """
+    Reconstruye el índice completo a partir de la tabla de proyectos.
+    Necesario tras cambios masivos que no disparan señales (queryset.update).
+
+    Args:
+        batch_size: Proyectos procesados por lote
+
+    Returns:
+        int: Número de proyectos indexados
+    """
+    from .models import Project, ProjectSearchDocument
+
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE}")
+            cursor.execute(f"DELETE FROM {TRIGRAM_TABLE}")
+    ProjectSearchDocument.objects.all().delete()
+
+    total = 0
+    batch = []
+    projects = Project.objects.only(
+        'id', 'title', 'location', 'description', 'short_description'
+    ).order_by('pk')
+    for project in projects.iterator(chunk_size=batch_size):
+        batch.append((project.pk, get_document_parts(project)))
+        if len(batch) >= batch_size:
+            write_documents(ProjectSearchDocument, batch)
+            total += len(batch)
+            batch = []
+    write_documents(ProjectSearchDocument, batch)
+
+    return total + len(batch)
+
+
+def trigram_similarity(query, text):
+    """
+    Similitud de trigramas por palabra, aproximación a word_similarity de pg_trgm.
+    Para cada término de la consulta toma la palabra más parecida del texto
+    y promedia. Se usa en SQLite para filtrar candidatos con errores tipográficos.
+
+    Returns:
+        float entre 0 y 1
+    """
+    def trigrams(word):
+        padded = f"  {word} "
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+    query_words = query.split()
+    text_trigrams = [trigrams(word) for word in set(text.split())]
+    if not query_words or not text_trigrams:
+        return 0.0
+
+    total = 0.0
+    for word in query_words:
+        word_trigrams = trigrams(word)
+        total += max(
+            len(word_trigrams & other) / len(word_trigrams | other)
+            for other in text_trigrams
+        )
+    return total / len(query_words)
+
+
+def _sqlite_matches(terms):
+    """
+    Busca en las tablas FTS5 y retorna {project_id: puntuación}.
+    Primero coincidencias por prefijo ordenadas por bm25; si faltan,
+    candidatos por trigramas filtrados por similitud.
+    """
+    weights = ', '.join(str(weight) for _, _, weight in FIELD_WEIGHTS)
+    match = ' AND '.join(f'"{term}"*' for term in terms)
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT rowid, bm25({FTS_TABLE}, {weights}) FROM {FTS_TABLE} "
+            f"WHERE {FTS_TABLE} MATCH %s ORDER BY 2 LIMIT %s",
+            [match, MAX_RESULTS]
+        )
+        # bm25 es negativo: cuanto menor, más relevante
+        scores = {row[0]: 1.0 + -row[1] for row in cursor.fetchall()}
+
+        fuzzy_terms = [term for term in terms if len(term) >= 3]
+        if len(scores) < MAX_RESULTS and fuzzy_terms:
+            grams = {term[i:i + 3] for term in fuzzy_terms for i in range(len(term) - 2)}
+            cursor.execute(
+                f"SELECT rowid, content FROM {TRIGRAM_TABLE} "
+                f"WHERE {TRIGRAM_TABLE} MATCH %s ORDER BY rank LIMIT %s",
+                [' OR '.join(f'"{gram}"' for gram in sorted(grams)), MAX_RESULTS]
+            )
+            query = ' '.join(fuzzy_terms)
+            for project_id, content in cursor.fetchall():
+                if project_id in scores:
+                    continue
+                similarity = trigram_similarity(query, content)
+                if similarity >= TRIGRAM_THRESHOLD:
+                    scores[project_id] = similarity
+
+    return scores
+
+
+def search_projects(queryset, query):
+    """
+    Filtra un queryset de proyectos por texto y lo anota con `search_rank`.
+    El resultado viene ordenado por relevancia; el llamador puede reordenarlo.
+
+    Args:
+        queryset: QuerySet de Project
+        query: Texto introducido por el usuario
+
+    Returns:
+        QuerySet filtrado y ordenado por relevancia
+    """
+    terms = tokenize(query)
+    if not terms:
+        return queryset
+
+    if connection.vendor == 'postgresql':
+        from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramWordSimilarity
+
+        normalized = ' '.join(terms)
+        search_query = SearchQuery(
+            ' & '.join(f"{term}:*" for term in terms),
+            config=SEARCH_CONFIG,
+            search_type='raw'
+        )
+        # El operador %> usa el índice de trigramas con este umbral
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT set_config('pg_trgm.word_similarity_threshold', %s, false)",
+                [str(TRIGRAM_THRESHOLD)]
+            )
+        return queryset.filter(
+            Q(search_document__vector=search_query) |
+            Q(search_document__content__trigram_word_similar=normalized)
+        ).annotate(
+            search_rank=(
+                SearchRank(F('search_document__vector'), search_query) +
+                TrigramWordSimilarity(normalized, 'search_document__content')
+            )
+        ).order_by('-search_rank', '-created_at')
+
+    if connection.vendor == 'sqlite':
+        scores = _sqlite_matches(terms)
+        if not scores:
+            return queryset.none()
+        return queryset.filter(pk__in=list(scores)).annotate(
+            search_rank=Case(
+                *[When(pk=pk, then=Value(score)) for pk, score in scores.items()],
+                default=Value(0.0),
+                output_field=FloatField(),
+            )
+        ).order_by('-search_rank', '-created_at')
+
+    # Otros motores: búsqueda básica sin índice
+    return queryset.filter(
+        Q(title__icontains=query) |
+        Q(description__icontains=query) |
+        Q(location__icontains=query)
+    )
@@ -1,14 +1,14 @@
 """
 Señales de Django para automatizar tareas en la aplicación Vulcano.
-Gestiona creación automática de perfiles y limpieza de caché.
+Gestiona creación automática de perfiles e invalidación de caché.
 """
 
-from django.db.models.signals import post_save, post_delete, pre_save
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_save, post_delete, pre_save, pre_delete, m2m_changed
 from django.contrib.auth.models import User
 from django.dispatch import receiver
-from django.core.cache import cache
 from .models import UserProfile, Project, ProjectImage, Message
-from .utils import clear_user_cache
+from . import cache_namespaces, conversations, facets, query_cache, search, slow_queries, user_stats
 import logging
 
 logger = logging.getLogger('vulcano')
@@ -44,55 +44,160 @@ def save_user_profile(sender, instance, **kwargs):
 
 
 @receiver(post_save, sender=Project)
-def clear_project_caches(sender, instance, **kwargs):
+def update_search_document(sender, instance, **kwargs):
     """
-    Limpia cachés relacionados cuando se crea o actualiza un proyecto.
+    Mantiene actualizado el documento de búsqueda del proyecto.
     """
+    if kwargs.get('update_fields') and not set(kwargs['update_fields']) & search.INDEXED_FIELDS:
+        return
     try:
-        # Limpiar caché del arquitecto
-        if instance.arquitecto:
-            clear_user_cache(instance.arquitecto)
-        
-        # Limpiar caché de clientes asignados
-        for client in instance.clients.all():
-            clear_user_cache(client)
-        
-        # Limpiar caché de proyectos por categoría
-        cache.delete('projects_by_category')
-        
-        logger.debug(f"Cachés limpiados para proyecto: {instance.title}")
+        search.index_project(instance)
     except Exception as e:
-        logger.error(f"Error al limpiar cachés de proyecto: {str(e)}")
+        logger.error(f"Error al indexar proyecto para búsqueda: {str(e)}")
 
 
 @receiver(post_delete, sender=Project)
-def clear_project_caches_on_delete(sender, instance, **kwargs):
+def remove_search_document(sender, instance, **kwargs):
     """
-    Limpia cachés cuando se elimina un proyecto.
+    Elimina el proyecto del índice de búsqueda.
     """
     try:
-        if instance.arquitecto:
-            clear_user_cache(instance.arquitecto)
-        
-        cache.delete('projects_by_category')
-        
-        logger.info(f"Proyecto eliminado y cachés limpiados: {instance.title}")
+        search.remove_project(instance.pk)
     except Exception as e:
-        logger.error(f"Error al limpiar cachés tras eliminar proyecto: {str(e)}")
+        logger.error(f"Error al eliminar proyecto del índice de búsqueda: {str(e)}")
+
+
+@receiver(pre_save, sender=Project)
+def read_previous_facet(sender, instance, **kwargs):
+    """
+    Guarda la faceta que el proyecto tiene en la base de datos antes de guardarlo.
+    Se lee de la fila (bloqueada) y no de la instancia, que puede estar obsoleta.
+    """
+    instance._facet_previous = None
+    if instance._state.adding or not facets.touches_facets(kwargs.get('update_fields')):
+        return
+    try:
+        instance._facet_previous = facets.read_key(instance.pk)
+    except Exception as e:
+        logger.error(f"Error al leer faceta previa del proyecto: {str(e)}")
+
+
+@receiver(post_save, sender=Project)
+def update_facet_counts(sender, instance, created, **kwargs):
+    """
+    Aplica el delta de facetas del proyecto guardado.
+    """
+    if not created and not facets.touches_facets(kwargs.get('update_fields')):
+        return
+    try:
+        previous = None if created else getattr(instance, '_facet_previous', None)
+        facets.record_change(previous, facets.facet_key(instance))
+    except Exception as e:
+        logger.error(f"Error al actualizar conteos de facetas: {str(e)}")
+
+
+@receiver(pre_delete, sender=Project)
+def read_deleted_facet(sender, instance, **kwargs):
+    """
+    Guarda la faceta del proyecto que se va a eliminar.
+    """
+    try:
+        instance._facet_previous = facets.read_key(instance.pk)
+    except Exception as e:
+        instance._facet_previous = None
+        logger.error(f"Error al leer faceta del proyecto eliminado: {str(e)}")
+
+
+@receiver(post_delete, sender=Project)
+def decrement_facet_counts(sender, instance, **kwargs):
+    """
+    Resta el proyecto eliminado de su faceta.
+    """
+    try:
+        facets.record_change(getattr(instance, '_facet_previous', None), None)
+    except Exception as e:
+        logger.error(f"Error al actualizar conteos de facetas: {str(e)}")
+
+
+@receiver(pre_save, sender=Project)
+def read_previous_listing_state(sender, instance, **kwargs):
+    """
+    Guarda los campos de listado que el proyecto tiene en la base de datos,
+    para saber después si cambió su presencia u orden en los listados.
+    """
+    instance._listing_previous = None
+    if instance._state.adding or not cache_namespaces.tracks_update(kwargs.get('update_fields')):
+        return
+    try:
+        instance._listing_previous = cache_namespaces.read_listing_state(instance.pk)
+    except Exception as e:
+        logger.error(f"Error al leer estado previo del proyecto: {str(e)}")
+
+
+@receiver(post_save, sender=Project)
+def bump_project_namespaces(sender, instance, created, **kwargs):
+    """
+    Invalida los namespaces de caché del proyecto y de los listados donde
+    cambió. No recorre relaciones: clientes y arquitecto no cachean nada que
+    dependa del proyecto (sus estadísticas viven en UserStats).
+    """
+    if not created and not cache_namespaces.tracks_update(kwargs.get('update_fields')):
+        return
+    try:
+        cache_namespaces.invalidate_project(
+            instance.pk,
+            getattr(instance, '_listing_previous', None),
+            cache_namespaces.listing_state(instance)
+        )
+    except Exception as e:
+        logger.error(f"Error al invalidar caché del proyecto: {str(e)}")
+
+
+@receiver(post_delete, sender=Project)
+def bump_deleted_project_namespaces(sender, instance, **kwargs):
+    """
+    Invalida los namespaces de caché que incluían el proyecto eliminado.
+    """
+    try:
+        previous = cache_namespaces.listing_state(instance)
+        # La faceta leída de la base de datos antes de borrar es más fiable que la instancia
+        facet = getattr(instance, '_facet_previous', None)
+        if facet:
+            previous.update(zip(facets.FACET_FIELDS, facet))
+            previous.pop('status')
+        cache_namespaces.invalidate_project(instance.pk, previous, None)
+        logger.info(f"Proyecto eliminado y cachés invalidados: {instance.title}")
+    except Exception as e:
+        logger.error(f"Error al invalidar caché del proyecto eliminado: {str(e)}")
 
 
 @receiver(post_save, sender=ProjectImage)
-def clear_image_caches(sender, instance, **kwargs):
+@receiver(post_delete, sender=ProjectImage)
+def bump_image_namespaces(sender, instance, **kwargs):
     """
-    Limpia cachés cuando se agrega o actualiza una imagen de proyecto.
+    Invalida el namespace del proyecto (galería e imagen principal); lo que
+    muestra su tarjeta, incluidos los destacados, depende de él.
     """
     try:
-        if instance.project and instance.project.arquitecto:
-            clear_user_cache(instance.project.arquitecto)
-        
-        logger.debug(f"Caché limpiado tras guardar imagen de: {instance.project.title}")
+        cache_namespaces.bump(f"project:{instance.project_id}")
     except Exception as e:
-        logger.error(f"Error al limpiar caché de imagen: {str(e)}")
+        logger.error(f"Error al invalidar caché de imagen: {str(e)}")
+
+
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=UserProfile)
+def bump_user_namespace(sender, instance, **kwargs):
+    """
+    Invalida el namespace del usuario (páginas y tarjetas donde aparece).
+    Los inicios de sesión (solo last_login) no cambian nada visible.
+    """
+    if kwargs.get('update_fields') and set(kwargs['update_fields']) <= {'last_login'}:
+        return
+    try:
+        user_id = instance.pk if sender is User else instance.user_id
+        cache_namespaces.bump(f"user:{user_id}")
+    except Exception as e:
+        logger.error(f"Error al invalidar caché de usuario: {str(e)}")
 
 
 @receiver(post_delete, sender=ProjectImage)
@@ -111,18 +216,28 @@ def delete_image_file(sender, instance, **kwargs):
         logger.error(f"Error al eliminar archivo de imagen: {str(e)}")
 
 
+@receiver(post_delete, sender=ProjectImage)
+def refresh_main_image_on_delete(sender, instance, **kwargs):
+    """
+    Recalcula la imagen principal desnormalizada del proyecto.
+    Cubre tanto image.delete() como borrados masivos desde un queryset.
+    """
+    try:
+        Project(pk=instance.project_id).refresh_main_image()
+    except Exception as e:
+        logger.error(f"Error al recalcular imagen principal: {str(e)}")
+
+
 @receiver(post_save, sender=Message)
-def clear_message_caches(sender, instance, **kwargs):
+def bump_message_namespaces(sender, instance, **kwargs):
     """
-    Limpia cachés de estadísticas cuando se crea o actualiza un mensaje.
+    Invalida los namespaces de remitente y destinatario cuando se crea o
+    actualiza un mensaje.
     """
     try:
-        clear_user_cache(instance.recipient)
-        clear_user_cache(instance.sender)
-        
-        logger.debug(f"Cachés limpiados tras mensaje de {instance.sender} a {instance.recipient}")
+        cache_namespaces.bump(f"user:{instance.recipient_id}", f"user:{instance.sender_id}")
     except Exception as e:
-        logger.error(f"Error al limpiar cachés de mensaje: {str(e)}")
+        logger.error(f"Error al invalidar cachés de mensaje: {str(e)}")
 
 
 @receiver(pre_save, sender=ProjectImage)
@@ -140,4 +255,207 @@ def set_main_image_logic(sender, instance, **kwargs):
             
             logger.debug(f"Imagen principal establecida para: {instance.project.title}")
         except Exception as e:
-            logger.error(f"Error al establecer imagen principal: {str(e)}")
\ No newline at end of file
+            logger.error(f"Error al establecer imagen principal: {str(e)}")
+
+@receiver(post_save, sender=User)
+def create_user_stats(sender, instance, created, **kwargs):
+    """
+    Crea la fila de estadísticas (a cero) del usuario nuevo, para que
+    ningún delta posterior se descarte por falta de fila.
+    """
+    if created:
+        try:
+            user_stats.create_user_stats([instance.pk])
+        except Exception as e:
+            logger.error(f"Error al crear estadísticas para {instance.username}: {str(e)}")
+
+
+@receiver(pre_save, sender=Project)
+def read_previous_stats_state(sender, instance, **kwargs):
+    """
+    Guarda el estado del proyecto en la base de datos antes de guardarlo,
+    para calcular los deltas de estadísticas de sus usuarios.
+    """
+    instance._stats_previous = None
+    if instance._state.adding or not user_stats.tracks_update(kwargs.get('update_fields')):
+        return
+    try:
+        instance._stats_previous = user_stats.read_project_state(instance.pk)
+    except Exception as e:
+        logger.error(f"Error al leer estado previo del proyecto para estadísticas: {str(e)}")
+
+
+@receiver(post_save, sender=Project)
+def update_user_stats(sender, instance, created, **kwargs):
+    """
+    Aplica los deltas de estadísticas del arquitecto y los clientes del proyecto.
+    """
+    if not created and not user_stats.tracks_update(kwargs.get('update_fields')):
+        return
+    try:
+        previous = None if created else getattr(instance, '_stats_previous', None)
+        user_stats.record_project_change(instance, previous)
+    except Exception as e:
+        logger.error(f"Error al actualizar estadísticas de usuarios: {str(e)}")
+
+
+@receiver(pre_delete, sender=Project)
+def read_deleted_stats_state(sender, instance, **kwargs):
+    """
+    Guarda el estado y los clientes del proyecto que se va a eliminar
+    (las asignaciones se borran sin disparar m2m_changed).
+    """
+    try:
+        instance._stats_deleted = (
+            user_stats.read_project_state(instance.pk),
+            list(instance.clients.values_list('id', flat=True)),
+        )
+    except Exception as e:
+        instance._stats_deleted = (None, [])
+        logger.error(f"Error al leer estado del proyecto eliminado para estadísticas: {str(e)}")
+
+
+@receiver(post_delete, sender=Project)
+def decrement_user_stats(sender, instance, **kwargs):
+    """
+    Resta el proyecto eliminado de las estadísticas de sus usuarios.
+    """
+    try:
+        state, client_ids = getattr(instance, '_stats_deleted', (None, []))
+        user_stats.record_project_deleted(state, client_ids, instance.created_at)
+    except Exception as e:
+        logger.error(f"Error al actualizar estadísticas de usuarios: {str(e)}")
+
+
+@receiver(m2m_changed, sender=Project.clients.through)
+def update_assignment_stats(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Ajusta las estadísticas al asignar o quitar clientes de proyectos,
+    desde el proyecto (project.clients) o desde el cliente (user.assigned_projects).
+    """
+    try:
+        if action == 'pre_clear':
+            # clear() no informa de los IDs eliminados: se leen antes
+            related = instance.assigned_projects if reverse else instance.clients
+            instance._stats_cleared = set(related.values_list('id', flat=True))
+            return
+        if action == 'post_clear':
+            pk_set = getattr(instance, '_stats_cleared', set())
+        elif action not in ('post_add', 'post_remove'):
+            return
+        if not pk_set:
+            return
+
+        if reverse:
+            pairs = [(project_id, instance.pk) for project_id in pk_set]
+        else:
+            pairs = [(instance.pk, client_id) for client_id in pk_set]
+        user_stats.record_assignments(pairs, 1 if action == 'post_add' else -1)
+    except Exception as e:
+        logger.error(f"Error al actualizar estadísticas de asignaciones: {str(e)}")
+
+
+@receiver(pre_save, sender=Message)
+def read_previous_message_state(sender, instance, **kwargs):
+    """
+    Guarda destinatario y estado de lectura del mensaje antes de guardarlo.
+    """
+    instance._stats_previous = None
+    if instance._state.adding:
+        return
+    try:
+        instance._stats_previous = Message.objects.filter(pk=instance.pk).values_list(
+            'recipient_id', 'is_read'
+        ).first()
+    except Exception as e:
+        logger.error(f"Error al leer estado previo del mensaje: {str(e)}")
+
+
+@receiver(post_save, sender=Message)
+def update_unread_stats(sender, instance, created, **kwargs):
+    """
+    Ajusta el contador de mensajes sin leer del destinatario.
+    """
+    try:
+        previous = None if created else getattr(instance, '_stats_previous', None)
+        user_stats.record_message_change(previous, (instance.recipient_id, instance.is_read))
+    except Exception as e:
+        logger.error(f"Error al actualizar mensajes sin leer: {str(e)}")
+
+
+@receiver(post_delete, sender=Message)
+def decrement_unread_stats(sender, instance, **kwargs):
+    """
+    Resta el mensaje eliminado si no se había leído.
+    """
+    try:
+        user_stats.record_message_change((instance.recipient_id, instance.is_read), None)
+    except Exception as e:
+        logger.error(f"Error al actualizar mensajes sin leer: {str(e)}")
+
+
+@receiver(pre_save, sender=Message)
+def assign_conversation(sender, instance, **kwargs):
+    """
+    Asigna la conversación del par y proyecto a un mensaje nuevo.
+    """
+    if not instance._state.adding or instance.conversation_id is not None:
+        return
+    try:
+        instance.conversation_id = conversations.conversation_for(
+            instance.sender_id, instance.recipient_id, instance.project_id
+        )
+    except Exception as e:
+        logger.error(f"Error al asignar conversación: {str(e)}")
+
+
+@receiver(post_save, sender=Message)
+def update_conversation(sender, instance, created, **kwargs):
+    """
+    Actualiza el último mensaje y los no leídos de la conversación.
+    """
+    try:
+        if created:
+            conversations.record_message(instance)
+        else:
+            conversations.record_read_change(instance, getattr(instance, '_stats_previous', None))
+    except Exception as e:
+        logger.error(f"Error al actualizar conversación: {str(e)}")
+
+
+@receiver(post_delete, sender=Message)
+def refresh_deleted_conversation(sender, instance, **kwargs):
+    """
+    Recalcula la conversación del mensaje eliminado.
+    """
+    if instance.conversation_id is None:
+        return
+    try:
+        conversations.refresh_conversation(instance.conversation_id)
+    except Exception as e:
+        logger.error(f"Error al recalcular conversación: {str(e)}")
+
+
+@receiver(pre_delete, sender=Project)
+def detach_project_conversations(sender, instance, **kwargs):
+    """
+    Pasa las conversaciones del proyecto eliminado a las directas de cada par.
+    """
+    try:
+        conversations.detach_project(instance.pk)
+    except Exception as e:
+        logger.error(f"Error al desvincular conversaciones del proyecto: {str(e)}")
+
+
+@receiver(connection_created)
+def install_execute_wrappers(sender, connection, **kwargs):
+    """
+    Registra las escrituras de cada conexión nueva para versionar sus
+    tablas (ver vulcano.query_cache) y mide sus consultas lentas (ver
+    vulcano.slow_queries).
+    """
+    try:
+        query_cache.install(connection)
+        slow_queries.install(connection)
+    except Exception as e:
+        logger.error(f"Error al instalar los envoltorios de ejecución: {str(e)}")
@@ -0,0 +1,235 @@
+"""
+Registro de consultas lentas con planes de ejecución muestreados.
+
+Un envoltorio de ejecución (connection.execute_wrapper), instalado en cada
+conexión al crearse, mide cada consulta. Las que tardan
+SLOW_QUERY_THRESHOLD_MS o más:
+
+- Se registran en el log 'vulcano' como aviso.
+- Se agrupan por huella (vulcano.query_budget.fingerprint) en un archivo
+  SQLite (SLOW_QUERY_LOCATION) con llamadas, tiempo total y máximo, y una
+  muestra de duraciones para calcular el p95.
+- Con probabilidad SLOW_QUERY_EXPLAIN_RATE se guarda el plan del SELECT:
+  EXPLAIN (ANALYZE, BUFFERS) en PostgreSQL (vuelve a ejecutar la consulta,
+  por eso se muestrea) o EXPLAIN QUERY PLAN en SQLite.
+
+El archivo rota solo: las muestras y huellas sin actividad en
+SLOW_QUERY_RETENTION_DAYS se eliminan. `manage.py slow_queries` muestra
+las peores.
+"""
+
+from django.conf import settings
+from .query_budget import fingerprint
+from .sqlite_cache import open_connection
+import hashlib
+import logging
+import math
+import os
+import random
+import threading
+import time
+
+logger = logging.getLogger('vulcano')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS slow_query (
+    id TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    example TEXT NOT NULL,
+    calls INTEGER NOT NULL,
+    total_ms REAL NOT NULL,
+    max_ms REAL NOT NULL,
+    plan TEXT,
+    last_seen REAL NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS slow_query_sample (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    query_id TEXT NOT NULL,
+    duration_ms REAL NOT NULL,
+    created REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS slow_query_sample_query ON slow_query_sample (query_id, duration_ms);
+CREATE INDEX IF NOT EXISTS slow_query_sample_created ON slow_query_sample (created);
+"""
+
+# Probabilidad de purgar lo antiguo en cada registro
+ROTATE_PROBABILITY = 0.01
+
+_local = threading.local()
+
+
+class SlowQueryStore:
+    """Archivo SQLite compartido por los procesos con las consultas lentas agrupadas."""
+
+    def __init__(self, path):
+        self._path = path
+        self._conn = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        if self._conn is None or self._pid != os.getpid():
+            self._conn = open_connection(self._path, SCHEMA, check_same_thread=False)
+            self._pid = os.getpid()
+        return self._conn
+
+    def record(self, sql, duration_ms, plan=None):
+        """Suma una ejecución lenta a su huella (y guarda el plan si se capturó)."""
+        shape = fingerprint(sql)
+        query_id = hashlib.md5(shape.encode()).hexdigest()
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                conn.execute(
+                    'INSERT INTO slow_query (id, fingerprint, example, calls, total_ms, max_ms, plan, last_seen) '
+                    'VALUES (?, ?, ?, 1, ?, ?, ?, ?) '
+                    'ON CONFLICT (id) DO UPDATE SET calls = calls + 1, total_ms = total_ms + excluded.total_ms, '
+                    'max_ms = MAX(max_ms, excluded.max_ms), plan = COALESCE(excluded.plan, plan), '
+                    'example = CASE WHEN excluded.plan IS NULL THEN example ELSE excluded.example END, '
+                    'last_seen = excluded.last_seen',
+                    (query_id, shape, sql, duration_ms, duration_ms, plan, now)
+                )
+                conn.execute(
+                    'INSERT INTO slow_query_sample (query_id, duration_ms, created) VALUES (?, ?, ?)',
+                    (query_id, duration_ms, now)
+                )
+                if random.random() < ROTATE_PROBABILITY:
+                    self._rotate(conn, now)
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+            conn.execute('COMMIT')
+
+    def _rotate(self, conn, now):
+        cutoff = now - getattr(settings, 'SLOW_QUERY_RETENTION_DAYS', 7) * 86400
+        conn.execute('DELETE FROM slow_query_sample WHERE created < ?', (cutoff,))
+        conn.execute('DELETE FROM slow_query WHERE last_seen < ?', (cutoff,))
+
+    def top(self, limit=10, order='p95'):
+        """
+        Peores consultas.
+
+        Args:
+            limit: Máximo de filas
+            order: 'p95', 'total', 'calls' o 'max'
+
+        Returns:
+            Lista de dicts con fingerprint, example, calls, total_ms, max_ms, p95_ms, plan
+        """
+        with self._lock:
+            conn = self._connect()
+            rows = conn.execute(
+                'SELECT id, fingerprint, example, calls, total_ms, max_ms, plan FROM slow_query'
+            ).fetchall()
+            durations = {}
+            for query_id, duration in conn.execute(
+                'SELECT query_id, duration_ms FROM slow_query_sample ORDER BY query_id, duration_ms'
+            ):
+                durations.setdefault(query_id, []).append(duration)
+
+        queries = []
+        for query_id, shape, example, calls, total_ms, max_ms, plan in rows:
+            samples = durations.get(query_id) or [max_ms]
+            queries.append({
+                'fingerprint': shape,
+                'example': example,
+                'calls': calls,
+                'total_ms': total_ms,
+                'max_ms': max_ms,
+                'p95_ms': samples[max(math.ceil(len(samples) * 0.95) - 1, 0)],
+                'plan': plan,
+            })
+        key = {'p95': 'p95_ms', 'total': 'total_ms', 'calls': 'calls', 'max': 'max_ms'}[order]
+        queries.sort(key=lambda query: query[key], reverse=True)
+        return queries[:limit]
+
+    def clear(self):
+        with self._lock:
+            conn = self._connect()
+            conn.execute('DELETE FROM slow_query_sample')
+            conn.execute('DELETE FROM slow_query')
+
+
+_stores = {}
+
+
+def get_store():
+    """Store de SLOW_QUERY_LOCATION (None si el registro en archivo está desactivado)."""
+    path = getattr(settings, 'SLOW_QUERY_LOCATION', None)
+    if not path:
+        return None
+    if path not in _stores:
+        _stores[path] = SlowQueryStore(path)
+    return _stores[path]
+
+
+def explain(connection, sql, params):
+    """
+    Plan de ejecución de un SELECT, o None si el motor no se soporta.
+    Usa un cursor del driver: no pasa por los envoltorios de ejecución.
+    """
+    if connection.vendor == 'postgresql':
+        prefix = 'EXPLAIN (ANALYZE, BUFFERS) '
+    elif connection.vendor == 'sqlite':
+        prefix = 'EXPLAIN QUERY PLAN '
+    else:
+        return None
+
+    cursor = connection.create_cursor()
+    # En PostgreSQL un error abortaría la transacción en curso
+    savepoint = connection.vendor == 'postgresql' and connection.in_atomic_block
+    try:
+        if savepoint:
+            cursor.execute('SAVEPOINT vulcano_explain')
+        try:
+            cursor.execute(prefix + sql, params)
+            rows = cursor.fetchall()
+        finally:
+            if savepoint:
+                cursor.execute('ROLLBACK TO SAVEPOINT vulcano_explain')
+                cursor.execute('RELEASE SAVEPOINT vulcano_explain')
+    finally:
+        cursor.close()
+    # SQLite: (id, parent, notused, detail); PostgreSQL: una línea de texto por fila
+    return '\n'.join(str(row[-1]) for row in rows)
+
+
+def record(connection, sql, params, duration_ms):
+    """Registra una consulta lenta: log, store y plan muestreado."""
+    logger.warning(f"Consulta lenta ({duration_ms:.0f} ms): {sql[:300]}")
+    store = get_store()
+    if store is None:
+        return
+    plan = None
+    is_select = sql.lstrip()[:6].upper() == 'SELECT'
+    if is_select and random.random() < getattr(settings, 'SLOW_QUERY_EXPLAIN_RATE', 0.1):
+        try:
+            plan = explain(connection, sql, params)
+        except Exception as e:
+            logger.error(f"Error al obtener el plan de una consulta lenta: {str(e)}")
+    store.record(sql, duration_ms, plan)
+
+
+def track_slow_queries(execute, sql, params, many, context):
+    """Envoltorio de ejecución: mide la consulta y registra las lentas."""
+    start = time.perf_counter()
+    result = execute(sql, params, many, context)
+    duration_ms = (time.perf_counter() - start) * 1000
+    threshold = getattr(settings, 'SLOW_QUERY_THRESHOLD_MS', None)
+    if threshold is not None and duration_ms >= threshold and not many and not getattr(_local, 'busy', False):
+        _local.busy = True
+        try:
+            record(context['connection'], sql, params, duration_ms)
+        except Exception as e:
+            logger.error(f"Error al registrar una consulta lenta: {str(e)}")
+        finally:
+            _local.busy = False
+    return result
+
+
+def install(connection):
+    """Instala track_slow_queries en una conexión (una sola vez)."""
+    if track_slow_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(track_slow_queries)
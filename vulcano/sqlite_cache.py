@@ -0,0 +1,276 @@
+"""
+Backend de caché compartido entre procesos, sobre un archivo SQLite en modo WAL.
+
+LocMemCache es privada de cada worker de gunicorn: una invalidación solo
+limpia el worker que atendió la escritura y cada worker calienta su propia
+copia. Este backend guarda las entradas en un archivo local que comparten
+todos los procesos del host, sin servidor externo:
+
+- WAL permite lecturas concurrentes con un único escritor.
+- incr/add/escrituras usan BEGIN IMMEDIATE, por lo que son atómicos entre
+  procesos.
+- Las entradas caducan por TTL y, al superar OPTIONS['MAX_BYTES'], se
+  expulsan las de acceso más antiguo (LRU aproximado: la marca de acceso se
+  actualiza como mucho cada ACCESS_RESOLUTION segundos por clave).
+
+Configuración:
+    CACHES = {
+        'default': {
+            'BACKEND': 'vulcano.sqlite_cache.SQLiteCache',
+            'LOCATION': '/var/cache/vulcano/cache.sqlite3',
+            'OPTIONS': {'MAX_BYTES': 64 * 1024 * 1024},
+        }
+    }
+"""
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+# Tras expulsar, el tamaño queda en esta fracción del presupuesto
+CULL_TARGET = 0.9
+ACCESS_RESOLUTION = 10
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_entry (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    expires REAL,
+    size INTEGER NOT NULL,
+    accessed REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS cache_entry_accessed ON cache_entry (accessed);
+CREATE INDEX IF NOT EXISTS cache_entry_expires ON cache_entry (expires);
+CREATE TABLE IF NOT EXISTS cache_meta (id INTEGER PRIMARY KEY CHECK (id = 0), bytes INTEGER NOT NULL);
+INSERT OR IGNORE INTO cache_meta (id, bytes) VALUES (0, 0);
+CREATE TRIGGER IF NOT EXISTS cache_entry_insert AFTER INSERT ON cache_entry BEGIN
+    UPDATE cache_meta SET bytes = bytes + NEW.size WHERE id = 0;
+END;
+CREATE TRIGGER IF NOT EXISTS cache_entry_delete AFTER DELETE ON cache_entry BEGIN
+    UPDATE cache_meta SET bytes = bytes - OLD.size WHERE id = 0;
+END;
+CREATE TRIGGER IF NOT EXISTS cache_entry_update AFTER UPDATE OF size ON cache_entry BEGIN
+    UPDATE cache_meta SET bytes = bytes - OLD.size + NEW.size WHERE id = 0;
+END;
+"""
+
+
+def open_connection(path, schema, busy_timeout=5, check_same_thread=True):
+    """Abre el archivo en modo WAL y autocommit, creando el esquema si falta."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(
+        path, timeout=busy_timeout, isolation_level=None, check_same_thread=check_same_thread
+    )
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.executescript(schema)
+    return conn
+
+
+class SQLiteCache(BaseCache):
+    """Caché de Django compartida por todos los procesos que abren el mismo archivo."""
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self._path = location
+        self._max_bytes = int(options.get('MAX_BYTES', DEFAULT_MAX_BYTES))
+        self._busy_timeout = float(options.get('BUSY_TIMEOUT', 5))
+        self._local = threading.local()
+
+    # ---------- Conexión ----------
+
+    @property
+    def _conn(self):
+        """Conexión propia del hilo; se reabre tras un fork (workers de gunicorn)."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = open_connection(self._path, SCHEMA, self._busy_timeout)
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _write(self, func):
+        """Ejecuta func(conn) dentro de BEGIN IMMEDIATE (exclusión entre procesos)."""
+        conn = self._conn
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            result = func(conn)
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+        return result
+
+    # ---------- Serialización ----------
+
+    def _expires(self, timeout):
+        """Instante absoluto de caducidad (None = nunca)."""
+        return self.get_backend_timeout(timeout)
+
+    @staticmethod
+    def _dumps(value):
+        return pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+    def _store(self, conn, key, value, expires, now):
+        data = self._dumps(value)
+        conn.execute(
+            'INSERT INTO cache_entry (key, value, expires, size, accessed) VALUES (?, ?, ?, ?, ?) '
+            'ON CONFLICT (key) DO UPDATE SET value = excluded.value, expires = excluded.expires, '
+            'size = excluded.size, accessed = excluded.accessed',
+            (key, data, expires, len(data) + len(key), now)
+        )
+
+    def _cull(self, conn, now):
+        """Elimina caducadas y, si aún se supera el presupuesto, las de acceso más antiguo."""
+        total = conn.execute('SELECT bytes FROM cache_meta WHERE id = 0').fetchone()[0]
+        if total <= self._max_bytes:
+            return
+        conn.execute('DELETE FROM cache_entry WHERE expires IS NOT NULL AND expires <= ?', (now,))
+        total = conn.execute('SELECT bytes FROM cache_meta WHERE id = 0').fetchone()[0]
+        excess = total - int(self._max_bytes * CULL_TARGET)
+        if excess <= 0:
+            return
+        victims = []
+        for key, size in conn.execute('SELECT key, size FROM cache_entry ORDER BY accessed'):
+            victims.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        conn.executemany('DELETE FROM cache_entry WHERE key = ?', victims)
+
+    # ---------- API de BaseCache ----------
+
+    def get(self, key, default=None, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        return self._get_many([key]).get(key, default)
+
+    def get_many(self, keys, version=None):
+        keys = {self.make_and_validate_key(key, version=version): key for key in keys}
+        return {keys[key]: value for key, value in self._get_many(list(keys)).items()}
+
+    def _get_many(self, keys):
+        if not keys:
+            return {}
+        now = time.time()
+        rows = self._conn.execute(
+            f"SELECT key, value, expires, accessed FROM cache_entry WHERE key IN ({', '.join('?' * len(keys))})",
+            keys
+        ).fetchall()
+        found = {}
+        expired = []
+        touched = []
+        for key, data, expires, accessed in rows:
+            if expires is not None and expires <= now:
+                expired.append((key, now))
+                continue
+            found[key] = pickle.loads(data)
+            if accessed < now - ACCESS_RESOLUTION:
+                touched.append((now, key))
+        if expired or touched:
+            def write(conn):
+                conn.executemany('DELETE FROM cache_entry WHERE key = ? AND expires <= ?', expired)
+                conn.executemany('UPDATE cache_entry SET accessed = ? WHERE key = ?', touched)
+            self._write(write)
+        return found
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        self._set_many({key: value}, timeout)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        self._set_many(
+            {self.make_and_validate_key(key, version=version): value for key, value in data.items()},
+            timeout
+        )
+        return []
+
+    def _set_many(self, data, timeout):
+        expires = self._expires(timeout)
+        now = time.time()
+
+        def write(conn):
+            for key, value in data.items():
+                self._store(conn, key, value, expires, now)
+            self._cull(conn, now)
+        self._write(write)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        expires = self._expires(timeout)
+        now = time.time()
+        data = self._dumps(value)
+
+        def write(conn):
+            cursor = conn.execute(
+                'INSERT INTO cache_entry (key, value, expires, size, accessed) VALUES (?, ?, ?, ?, ?) '
+                'ON CONFLICT (key) DO UPDATE SET value = excluded.value, expires = excluded.expires, '
+                'size = excluded.size, accessed = excluded.accessed '
+                'WHERE cache_entry.expires IS NOT NULL AND cache_entry.expires <= ?',
+                (key, data, expires, len(data) + len(key), now, now)
+            )
+            if cursor.rowcount:
+                self._cull(conn, now)
+            return bool(cursor.rowcount)
+        return self._write(write)
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        now = time.time()
+        cursor = self._write(lambda conn: conn.execute(
+            'UPDATE cache_entry SET expires = ? WHERE key = ? AND (expires IS NULL OR expires > ?)',
+            (self._expires(timeout), key, now)
+        ))
+        return bool(cursor.rowcount)
+
+    def incr(self, key, delta=1, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        now = time.time()
+
+        def write(conn):
+            row = conn.execute(
+                'SELECT value, expires FROM cache_entry WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None or (row[1] is not None and row[1] <= now):
+                raise ValueError("Key '%s' not found" % key)
+            value = pickle.loads(row[0]) + delta
+            data = self._dumps(value)
+            conn.execute(
+                'UPDATE cache_entry SET value = ?, size = ?, accessed = ? WHERE key = ?',
+                (data, len(data) + len(key), now, key)
+            )
+            return value
+        return self._write(write)
+
+    def has_key(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        row = self._conn.execute(
+            'SELECT 1 FROM cache_entry WHERE key = ? AND (expires IS NULL OR expires > ?)',
+            (key, time.time())
+        ).fetchone()
+        return row is not None
+
+    def delete(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        cursor = self._write(lambda conn: conn.execute('DELETE FROM cache_entry WHERE key = ?', (key,)))
+        return bool(cursor.rowcount)
+
+    def delete_many(self, keys, version=None):
+        keys = [(self.make_and_validate_key(key, version=version),) for key in keys]
+        self._write(lambda conn: conn.executemany('DELETE FROM cache_entry WHERE key = ?', keys))
+
+    def clear(self):
+        def write(conn):
+            conn.execute('DELETE FROM cache_entry')
+            conn.execute('UPDATE cache_meta SET bytes = 0 WHERE id = 0')
+        self._write(write)
+
+    def size(self):
+        """Bytes ocupados por las entradas (clave + valor serializado)."""
+        return self._conn.execute('SELECT bytes FROM cache_meta WHERE id = 0').fetchone()[0]
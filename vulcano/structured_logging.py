@@ -0,0 +1,182 @@
+"""
+Logging estructurado, perezoso y no bloqueante.
+
+log_event(logger, 'evento', campo=valor, ...) emite un evento con campos:
+
+- Si el nivel no está habilitado, o el muestreo del evento lo descarta
+  (LOG_SAMPLE_RATES), no se evalúa ni se formatea nada.
+- Los campos que son funciones (p. ej. `lambda: len(page)`) solo se evalúan
+  si el evento se va a emitir.
+- El texto ('evento campo=valor ...') y el JSON se construyen en el
+  formatter, ya en el hilo del QueueListener. Los registros normales se
+  formatean en el hilo que loguea, como con QueueHandler.
+
+Con LOG_ASYNC, VulcanoConfig.ready() llama a install_queue_logging(): el
+logger raíz queda con un único QueueHandler y sus handlers reales (consola,
+archivo) pasan a un QueueListener en un hilo propio, así que atender una
+petición nunca espera a la E/S del log. JsonFormatter escribe cada registro
+como una línea JSON.
+"""
+
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from django.conf import settings
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+
+
+class EventMessage:
+    """Mensaje de un evento; el texto se arma solo si se formatea."""
+
+    __slots__ = ('event', 'fields')
+
+    def __init__(self, event, fields):
+        self.event = event
+        self.fields = fields
+
+    def __str__(self):
+        return ' '.join([self.event] + [f'{key}={value}' for key, value in self.fields.items()])
+
+
+def sample_rate(event):
+    return getattr(settings, 'LOG_SAMPLE_RATES', {}).get(event, 1.0)
+
+
+def log_event(logger, event, level=logging.INFO, **fields):
+    """
+    Emite un evento estructurado.
+
+    Args:
+        logger: Logger destino
+        event: Nombre del evento (clave de LOG_SAMPLE_RATES)
+        level: Nivel de logging
+        **fields: Campos del evento; los invocables se evalúan solo si se emite
+    """
+    if not logger.isEnabledFor(level):
+        return
+    rate = sample_rate(event)
+    if rate < 1 and random.random() >= rate:
+        return
+    fields = {key: value() if callable(value) else value for key, value in fields.items()}
+    if rate < 1:
+        # Para ponderar al agregar eventos muestreados
+        fields['sample_rate'] = rate
+    logger.log(level, EventMessage(event, fields), extra={'event': event, 'fields': fields}, stacklevel=2)
+
+
+class JsonFormatter(logging.Formatter):
+    """Una línea JSON por registro, con los campos de los eventos al primer nivel."""
+
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'module': record.module,
+        }
+        event = getattr(record, 'event', None)
+        if event is not None:
+            entry['event'] = event
+            for key, value in record.fields.items():
+                entry.setdefault(key, value)
+        else:
+            entry['message'] = record.getMessage()
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+# ==================== COLA DE LOGGING ====================
+
+class MessageFormatter(logging.Formatter):
+    """Solo el mensaje; el traceback queda aparte en exc_text."""
+
+    def format(self, record):
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        return record.getMessage()
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    Encola los eventos de log_event sin formatear: sus campos ya están
+    evaluados y el texto se arma en el listener. El resto de registros se
+    formatean aquí como en QueueHandler (`msg % args` y el traceback en el
+    hilo que loguea, con el estado de ese momento), conservando el traceback
+    aparte para JsonFormatter.
+    """
+
+    def __init__(self, queue):
+        super().__init__(queue)
+        self.setFormatter(MessageFormatter())
+
+    def prepare(self, record):
+        if isinstance(record.msg, EventMessage):
+            return record
+        prepared = super().prepare(record)
+        prepared.exc_text = record.exc_text
+        prepared.stack_info = record.stack_info
+        return prepared
+
+
+_listeners = {}
+
+
+def install_queue_logging(logger=None):
+    """
+    Pasa los handlers de `logger` (por defecto el raíz) a un QueueListener.
+
+    Returns:
+        El QueueListener, o None si el logger no tiene handlers
+    """
+    logger = logger or logging.getLogger()
+    if logger.name in _listeners or not logger.handlers:
+        return _listeners.get(logger.name)
+
+    handlers = list(logger.handlers)
+    log_queue = queue.SimpleQueue()
+    for handler in handlers:
+        logger.removeHandler(handler)
+    queue_handler = DeferredQueueHandler(log_queue)
+    logger.addHandler(queue_handler)
+
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.logger = logger
+    listener.queue_handler = queue_handler
+    listener.start()
+    _listeners[logger.name] = listener
+    return listener
+
+
+def stop_queue_logging():
+    """
+    Escribe lo encolado, detiene los listeners y devuelve los handlers a sus
+    loggers (lo que se loguee después, ya al salir, se escribe directo).
+    """
+    while _listeners:
+        _, listener = _listeners.popitem()
+        if listener._thread is not None:
+            listener.stop()
+        listener.logger.removeHandler(listener.queue_handler)
+        for handler in listener.handlers:
+            listener.logger.addHandler(handler)
+
+
+def _restart_after_fork():
+    # El hilo del listener no existe en el proceso hijo (workers de gunicorn
+    # con --preload): cola nueva y un hilo propio por worker
+    for listener in _listeners.values():
+        listener.queue = listener.queue_handler.queue = queue.SimpleQueue()
+        listener._thread = None
+        listener.start()
+
+
+atexit.register(stop_queue_logging)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_restart_after_fork)
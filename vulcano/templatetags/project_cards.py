@@ -0,0 +1,101 @@
+"""
+Template tags de tarjetas de proyecto con caché de fragmentos versionada.
+
+Uso en plantillas:
+    {% load project_cards %}
+    {% prefetch_project_cards projects 'grid' %}
+    {% for project in projects %}
+        {% project_card project 'grid' %}
+    {% endfor %}
+
+La clave de cada tarjeta incluye el id, `updated_at` y la versión de la
+imagen principal, por lo que nunca hace falta invalidar: una tarjeta
+modificada simplemente deja de usar su clave anterior, que expira sola.
+"""
+
+from django import template
+from django.core.cache import cache
+from django.template.loader import get_template
+from django.utils.safestring import mark_safe
+import hashlib
+
+register = template.Library()
+
+# Incrementar al modificar las plantillas de tarjetas para descartar el HTML cacheado
+CARD_CACHE_VERSION = 1
+CARD_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Variante -> (plantilla, muestra el nombre del arquitecto)
+CARD_VARIANTS = {
+    'grid': ('partials/project_cards/_grid.html', False),
+    'featured': ('partials/project_cards/_featured.html', True),
+    'related': ('partials/project_cards/_related.html', False),
+    'portal': ('partials/project_cards/_portal.html', True),
+}
+
+# Clave de render_context donde prefetch_project_cards deja los fragmentos leídos
+PREFETCH_CONTEXT_KEY = 'project_card_fragments'
+
+
+def card_cache_key(project, variant):
+    """
+    Clave de caché de la tarjeta de un proyecto.
+
+    Además de id, updated_at e imagen principal incluye los campos que
+    cambian sin actualizar updated_at (contador de visitas, destacado
+    desde acciones masivas) y, si la variante lo muestra, el arquitecto.
+    """
+    _, shows_arquitecto = CARD_VARIANTS[variant]
+    parts = [
+        CARD_CACHE_VERSION,
+        project.updated_at.isoformat() if project.updated_at else '',
+        project.main_image_id,
+        project.main_image_url,
+        project.main_image_width,
+        project.views_count,
+        project.is_featured,
+    ]
+    if shows_arquitecto:
+        parts.append(project.arquitecto.get_full_name())
+    digest = hashlib.md5(repr(parts).encode()).hexdigest()
+    return f"project_card:{variant}:{project.pk}:{digest}"
+
+
+def render_card(project, variant):
+    """Renderiza la tarjeta sin caché."""
+    template_name, _ = CARD_VARIANTS[variant]
+    return get_template(template_name).render({'project': project})
+
+
+@register.simple_tag(takes_context=True)
+def prefetch_project_cards(context, projects, variant='grid'):
+    """
+    Lee de una vez (cache.get_many) las tarjetas de toda una página para que
+    cada {% project_card %} posterior no haga su propia consulta a la caché.
+    """
+    keys = [card_cache_key(project, variant) for project in projects]
+    found = cache.get_many(keys) if keys else {}
+
+    # None marca las claves ya consultadas que no estaban en caché
+    fragments = context.render_context.setdefault(PREFETCH_CONTEXT_KEY, {})
+    fragments.update({key: found.get(key) for key in keys})
+    return ''
+
+
+@register.simple_tag(takes_context=True)
+def project_card(context, project, variant='grid'):
+    """
+    Renderiza la tarjeta de un proyecto usando la caché de fragmentos.
+    Si la página se precargó con prefetch_project_cards, no consulta la caché.
+    """
+    if variant not in CARD_VARIANTS:
+        raise template.TemplateSyntaxError(f"Variante de tarjeta desconocida: {variant}")
+
+    key = card_cache_key(project, variant)
+    fragments = context.render_context.get(PREFETCH_CONTEXT_KEY, {})
+    html = fragments[key] if key in fragments else cache.get(key)
+    if html is None:
+        html = render_card(project, variant)
+        cache.set(key, html, CARD_CACHE_TIMEOUT)
+        fragments[key] = html
+    return mark_safe(html)
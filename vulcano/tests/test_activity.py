@@ -0,0 +1,121 @@
+"""
+Test Activity - Vulcano Platform
+Tests del registro de actividad persistente y su escritura por lotes
+"""
+
+from django.test import TestCase, Client, RequestFactory
+from django.urls import reverse
+from django.contrib.auth.models import User
+from django.utils import timezone
+from datetime import timedelta
+from vulcano.activity import (
+    ActivityBuffer, drop_missing_references, flush_activity, get_buffer, prune_activity
+)
+from vulcano.models import ActivityEvent, Project
+from vulcano.utils import log_user_activity
+import threading
+
+
+class ActivityEventTest(TestCase):
+    """Tests del registro de auditoría"""
+
+    def setUp(self):
+        """Configuración inicial"""
+        self.arquitecto = User.objects.create_user(username='arquitecto', password='pass123')
+        self.arquitecto.profile.role = 'arquitecto'
+        self.arquitecto.profile.save()
+        self.project = Project.objects.create(
+            title='Casa', description='Casa de prueba', arquitecto=self.arquitecto
+        )
+
+    def test_login_is_recorded_with_ip(self):
+        """El login deja un evento con la IP real del cliente"""
+        Client().post(reverse('vulcano:login'), {'username': 'arquitecto', 'password': 'pass123'})
+        event = ActivityEvent.objects.get(user=self.arquitecto)
+        self.assertEqual(event.action, 'Inicio de sesión')
+        self.assertEqual(event.username, 'arquitecto')
+        self.assertEqual(event.ip_address, '127.0.0.1')
+
+    def test_project_timeline(self):
+        """Los eventos se consultan por proyecto y una IP inválida se descarta"""
+        request = RequestFactory().get('/', HTTP_X_FORWARDED_FOR='no-es-una-ip')
+        log_user_activity(self.arquitecto, 'Editar proyecto', 'Proyecto: Casa', project=self.project, request=request)
+        event, = self.project.activity_events.all()
+        self.assertEqual(event.user, self.arquitecto)
+        self.assertIsNone(event.ip_address)
+
+    def test_async_mode_buffers_without_writing(self):
+        """Con ACTIVITY_ASYNC la petición solo encola el evento"""
+        with self.settings(ACTIVITY_ASYNC=True, ACTIVITY_BUFFER_SIZE=1000, ACTIVITY_FLUSH_INTERVAL_MS=3600000):
+            try:
+                with self.assertNumQueries(0):
+                    log_user_activity(self.arquitecto, 'Crear proyecto', project=self.project)
+                self.assertEqual(len(get_buffer().events), 1)
+                self.assertEqual(get_buffer().flush(), 1)
+            finally:
+                flush_activity()
+        self.assertTrue(ActivityEvent.objects.filter(project=self.project).exists())
+
+    def test_missing_references_are_dropped(self):
+        """Un proyecto borrado antes del volcado no rompe el lote"""
+        event = ActivityEvent(user_id=self.arquitecto.pk, username='arquitecto', action='x', project_id=999999)
+        drop_missing_references([event])
+        self.assertEqual(event.user_id, self.arquitecto.pk)
+        self.assertIsNone(event.project_id)
+
+    def test_prune_by_month(self):
+        """Se eliminan los meses completos fuera de la retención"""
+        now = timezone.now()
+        for days in (0, 400):
+            ActivityEvent.objects.create(
+                user=self.arquitecto, username='arquitecto', action='x', created_at=now - timedelta(days=days)
+            )
+        self.assertEqual(prune_activity(months=12), 1)
+        self.assertEqual(ActivityEvent.objects.count(), 1)
+
+
+class ActivityBufferTest(TestCase):
+    """Tests del buffer en memoria y su hilo de volcado"""
+
+    def setUp(self):
+        """Configuración inicial"""
+        self.batches = []
+        self.written = threading.Event()
+
+    def writer(self, events):
+        self.batches.append(list(events))
+        self.written.set()
+
+    def test_flush_when_full(self):
+        """Al llenarse, el hilo vuelca el lote completo con una sola escritura"""
+        buffer = ActivityBuffer(self.writer, max_events=3, interval=3600)
+        for number in range(3):
+            buffer.add(number)
+        self.assertTrue(self.written.wait(5))
+        buffer.stop()
+        self.assertEqual(self.batches, [[0, 1, 2]])
+
+    def test_flush_on_interval(self):
+        """Un lote incompleto se vuelca al cumplirse el intervalo"""
+        buffer = ActivityBuffer(self.writer, max_events=100, interval=0.01)
+        buffer.add('evento')
+        self.assertTrue(self.written.wait(5))
+        buffer.stop()
+        self.assertEqual(self.batches, [['evento']])
+
+    def test_stop_flushes_pending(self):
+        """Al apagar el worker se escribe lo pendiente"""
+        buffer = ActivityBuffer(self.writer, max_events=100, interval=3600)
+        buffer.add('evento')
+        self.assertEqual(buffer.stop(), 1)
+        self.assertEqual(self.batches, [['evento']])
+
+    def test_writer_errors_are_logged(self):
+        """Un error de escritura se registra y no llega a la petición"""
+        def failing_writer(events):
+            raise RuntimeError('sin conexión')
+
+        buffer = ActivityBuffer(failing_writer, max_events=100, interval=3600)
+        buffer.add('evento')
+        with self.assertLogs('vulcano', level='ERROR'):
+            self.assertEqual(buffer.stop(), 0)
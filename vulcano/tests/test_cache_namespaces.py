@@ -0,0 +1,182 @@
+"""
+Test Cache Namespaces - Vulcano Platform
+Tests de la invalidación por versiones de namespaces
+"""
+
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection, transaction
+from unittest import mock
+from vulcano import cache_namespaces
+from vulcano.cache_namespaces import (
+    bump, changed_since, collect_invalidations, current_clock, get_versions, version_key, versioned_key
+)
+from vulcano.models import Project, ProjectImage
+from vulcano.utils import get_featured_projects
+from vulcano.tests.test_performance import TEMP_MEDIA_ROOT, make_image_file
+
+
+class CacheNamespacesTest(TestCase):
+    """Tests del reloj lógico y las versiones"""
+
+    def setUp(self):
+        """Configuración inicial"""
+        cache.clear()
+
+    def test_bump_is_one_increment_for_all_namespaces(self):
+        """Un bump avanza el reloj una vez y versiona todos sus namespaces"""
+        clock = current_clock()
+        with mock.patch('vulcano.cache_namespaces.cache.incr', wraps=cache.incr) as incr:
+            bump('user:1', 'project:2', 'category:all')
+        self.assertEqual(incr.call_count, 1)
+        versions = get_versions(['user:1', 'project:2', 'category:all', 'user:9'])
+        self.assertEqual(versions['user:1'], clock + 1)
+        self.assertEqual(versions['project:2'], clock + 1)
+        self.assertEqual(versions['user:9'], clock + 1)
+
+    def test_changed_since(self):
+        """Solo los namespaces invalidados después del instante afectan"""
+        get_versions(['user:1', 'user:2'])
+        clock = current_clock()
+        self.assertFalse(changed_since(['user:1', 'user:2'], clock))
+        bump('user:2')
+        self.assertFalse(changed_since(['user:1'], clock))
+        self.assertTrue(changed_since(['user:1', 'user:2'], clock))
+
+    def test_evicted_version_invalidates(self):
+        """Si la caché pierde una versión, lo calculado antes deja de ser válido"""
+        clock = current_clock()
+        bump('project:1')
+        later = current_clock()
+        cache.delete(version_key('project:1'))
+        bump('project:99')
+        self.assertTrue(changed_since(['project:1'], later))
+        self.assertTrue(changed_since(['project:1'], clock))
+
+    def test_versioned_key_changes_on_bump(self):
+        """La clave versionada cambia al invalidar su namespace"""
+        key = versioned_key('home_count', 'category:all')
+        self.assertEqual(key, versioned_key('home_count', 'category:all'))
+        bump('category:all')
+        self.assertNotEqual(key, versioned_key('home_count', 'category:all'))
+
+    def test_collected_bumps_apply_once(self):
+        """Las invalidaciones de un bloque se aplican una vez al salir"""
+        clock = current_clock()
+        with mock.patch('vulcano.cache_namespaces.tick', wraps=cache_namespaces.tick) as tick:
+            with collect_invalidations():
+                bump('project:1', 'category:all')
+                bump('project:1', 'global')
+                with collect_invalidations():
+                    bump('user:1')
+                self.assertFalse(changed_since(['project:1', 'user:1'], clock))
+        self.assertEqual(tick.call_count, 1)
+        self.assertEqual(set(get_versions(['project:1', 'category:all', 'global', 'user:1']).values()), {clock + 1})
+
+    def test_transaction_bumps_apply_on_commit(self):
+        """Dentro de una transacción se acumulan hasta confirmarla"""
+        clock = current_clock()
+        with mock.patch('vulcano.cache_namespaces.tick', wraps=cache_namespaces.tick) as tick:
+            with self.captureOnCommitCallbacks(execute=True):
+                with transaction.atomic():
+                    bump('project:1')
+                    bump('project:2', 'category:all')
+                    self.assertFalse(changed_since(['project:1'], clock))
+        self.assertEqual(tick.call_count, 1)
+        self.assertTrue(changed_since(['project:1', 'project:2'], clock))
+
+    def test_rolled_back_savepoint_starts_new_batch(self):
+        """Tras revertir un savepoint, las invalidaciones siguientes no se pierden"""
+        get_versions(['project:1', 'project:2'])
+        clock = current_clock()
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                try:
+                    with transaction.atomic():
+                        bump('project:1')
+                        raise ValueError
+                except ValueError:
+                    pass
+                bump('project:2')
+        self.assertFalse(changed_since(['project:1'], clock))
+        self.assertTrue(changed_since(['project:2'], clock))
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
+class ProjectNamespacesTest(TestCase):
+    """Tests de las señales que invalidan namespaces"""
+
+    def setUp(self):
+        """Configuración inicial"""
+        cache.clear()
+        self.arquitecto = User.objects.create_user(username='arquitecto', password='pass123')
+        self.cliente = User.objects.create_user(username='cliente', password='pass123')
+        self.project = Project.objects.create(
+            title='Casa Patio',
+            description='Test',
+            category='residential',
+            status='completed',
+            location='Lima',
+            arquitecto=self.arquitecto,
+            is_published=True,
+            is_featured=True
+        )
+        self.project.clients.add(self.cliente)
+
+    def test_save_does_not_iterate_clients(self):
+        """Guardar un proyecto no consulta sus clientes para invalidar cachés"""
+        self.project.description = 'Nueva descripción'
+        with CaptureQueriesContext(connection) as ctx:
+            self.project.save()
+        self.assertFalse([q for q in ctx.captured_queries if 'vulcano_project_clients' in q['sql']])
+
+    def test_save_bumps_project_and_listings(self):
+        """Un cambio de listado invalida proyecto, categorías y global"""
+        with mock.patch.object(cache_namespaces, 'bump', wraps=bump) as spy:
+            self.project.title = 'Casa Patio Nueva'
+            self.project.save()
+        self.assertEqual(set(spy.call_args.args), {
+            f"project:{self.project.pk}", 'category:all', 'category:residential', 'global'
+        })
+
+    def test_featured_list_follows_image_and_architect_changes(self):
+        """Los destacados se recalculan al cambiar una imagen o el arquitecto mostrado"""
+        featured = get_featured_projects()
+        self.assertEqual(featured[0].main_image_url, '')
+        with self.assertNumQueries(0):
+            get_featured_projects()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ProjectImage.objects.create(project=self.project, image=make_image_file(), is_main=True)
+        self.assertNotEqual(get_featured_projects()[0].main_image_url, '')
+
+        self.arquitecto.first_name = 'Ana'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.arquitecto.save()
+        self.assertEqual(get_featured_projects()[0].arquitecto.first_name, 'Ana')
+
+    def test_create_request_with_images_bumps_once(self):
+        """Crear un proyecto con cinco imágenes cuesta un solo avance del reloj"""
+        self.arquitecto.profile.role = 'arquitecto'
+        self.arquitecto.profile.save()
+        self.client.login(username='arquitecto', password='pass123')
+        clock = current_clock()
+        with mock.patch('vulcano.cache_namespaces.tick', wraps=cache_namespaces.tick) as tick:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(reverse('vulcano:project_create'), {
+                    'title': 'Casa Lote',
+                    'description': 'Proyecto con galería',
+                    'category': 'residential',
+                    'status': 'draft',
+                    'location': 'Lima',
+                    'is_published': True,
+                    'images': [make_image_file(f'foto{i}.png') for i in range(5)],
+                })
+        project = Project.objects.get(title='Casa Lote')
+        self.assertRedirects(response, reverse('vulcano:project_detail', kwargs={'slug': project.slug}))
+        self.assertEqual(project.images.count(), 5)
+        self.assertEqual(tick.call_count, 1)
+        self.assertTrue(changed_since([f"project:{project.pk}", 'category:all', f"user:{self.arquitecto.pk}"], clock))
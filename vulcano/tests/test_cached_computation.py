@@ -0,0 +1,141 @@
+"""
+Test Cached Computation - Vulcano Platform
+Tests de la caché de cálculos protegida contra estampidas
+"""
+
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from io import StringIO
+from unittest import mock
+from vulcano.models import Project
+from vulcano.utils import (
+    FEATURED_CACHE_KEY, cached_computation, computation_counters, expire_computation,
+    get_computation_stats, get_featured_projects
+)
+
+
+class CachedComputationTest(TestCase):
+    """Tests de single-flight, refresco anticipado y contadores"""
+
+    def setUp(self):
+        """Configuración inicial"""
+        # Lo pendiente de tests anteriores se vuelca antes de vaciar la caché
+        computation_counters.flush()
+        cache.clear()
+        self.calls = 0
+
+    def compute(self):
+        self.calls += 1
+        return self.calls
+
+    def test_hit_and_counters(self):
+        """El primer acceso calcula y los siguientes sirven desde caché"""
+        for _ in range(3):
+            self.assertEqual(cached_computation('total', self.compute, 60, beta=0), 1)
+        self.assertEqual(self.calls, 1)
+        counts = get_computation_stats()['total']
+        self.assertEqual((counts['miss'], counts['recompute'], counts['hit']), (1, 1, 2))
+
+    def test_single_flight_serves_stale(self):
+        """Con el candado tomado por otro proceso se sirve el valor caducado"""
+        cached_computation('total', self.compute, 60, beta=0)
+        expire_computation('total')
+        cache.add('total:lock', 'otro-proceso')
+
+        self.assertEqual(cached_computation('total', self.compute, 60, beta=0), 1)
+        self.assertEqual(self.calls, 1)
+
+        # Liberado el candado, un único lector recalcula
+        cache.delete('total:lock')
+        self.assertEqual(cached_computation('total', self.compute, 60, beta=0), 2)
+        self.assertEqual(cached_computation('total', self.compute, 60, beta=0), 2)
+        self.assertEqual(get_computation_stats()['total']['stale'], 2)
+
+    def test_foreign_lock_is_not_released(self):
+        """Solo quien tomó el candado lo libera"""
+        def compute():
+            cache.set('total:lock', 'otro-proceso')
+            return 1
+
+        cached_computation('total', compute, 60)
+        self.assertEqual(cache.get('total:lock'), 'otro-proceso')
+
+    def test_early_refresh_near_expiry(self):
+        """Cerca de la caducidad un cálculo lento se refresca antes de tiempo"""
+        cached_computation('total', self.compute, 60)
+        entry = cache.get('total')
+        entry['delta'] = 10.0
+        cache.set('total', entry, 120)
+
+        # Margen XFetch = -10 * log(1 - 0.5) ≈ 6.9 s > 1 s restante
+        with mock.patch('vulcano.utils.time.time', return_value=entry['expires_at'] - 1), \
+                mock.patch('vulcano.utils.random.random', return_value=0.5):
+            self.assertEqual(cached_computation('total', self.compute, 60), 2)
+        self.assertEqual(get_computation_stats()['total']['early'], 1)
+
+    def test_waits_for_concurrent_computation(self):
+        """Sin valor previo y con el candado tomado, espera al otro cálculo"""
+        cache.add('total:lock', 'otro-proceso')
+        with mock.patch('vulcano.utils.time.sleep', side_effect=lambda s: cache.set('total', {
+            'value': 'ajeno', 'delta': 0, 'expires_at': 0, 'stale_timeout': 60
+        }, 60)):
+            self.assertEqual(cached_computation('total', self.compute, 60), 'ajeno')
+        self.assertEqual(self.calls, 0)
+
+    def test_hits_do_not_write_to_cache(self):
+        """Un acierto solo cuenta en memoria hasta el siguiente volcado"""
+        cached_computation('total', self.compute, 60, beta=0)
+        computation_counters.flush()
+        with self.settings(COMPUTATION_STATS_FLUSH_INTERVAL=3600), \
+                mock.patch.object(cache, 'incr') as incr, mock.patch.object(cache, 'add') as add:
+            for _ in range(5):
+                cached_computation('total', self.compute, 60, beta=0)
+        incr.assert_not_called()
+        add.assert_not_called()
+        self.assertEqual(get_computation_stats()['total']['hit'], 5)
+
+    def test_names_are_not_lost(self):
+        """Cada nombre ocupa su propia ranura aunque otro worker registre a la vez"""
+        cache.add('computation_stats:names:0', 'de-otro-worker', None)
+        cached_computation('total', self.compute, 60, name='totales')
+        self.assertEqual(sorted(get_computation_stats()), ['de-otro-worker', 'totales'])
+
+    def test_command_prints_counters(self):
+        """El comando muestra los contadores por nombre"""
+        cached_computation('total', self.compute, 60, name='totales')
+        out = StringIO()
+        call_command('computation_stats', stdout=out)
+        self.assertIn('totales', out.getvalue())
+
+
+class FeaturedProjectsCacheTest(TestCase):
+    """Tests de la caché de proyectos destacados"""
+
+    def setUp(self):
+        """Configuración inicial"""
+        cache.clear()
+        self.arquitecto = User.objects.create_user(username='arquitecto', password='pass123')
+        self.project = Project.objects.create(
+            title='Casa Patio',
+            description='Test',
+            category='residential',
+            status='completed',
+            location='Lima',
+            arquitecto=self.arquitecto,
+            is_published=True,
+            is_featured=True
+        )
+
+    def test_cached_and_expired_by_signals(self):
+        """Se sirve sin consultas y se refresca al cambiar un proyecto"""
+        self.assertEqual(get_featured_projects(), [self.project])
+        with self.assertNumQueries(0):
+            self.assertEqual(get_featured_projects(), [self.project])
+
+        self.project.is_featured = False
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project.save()
+        self.assertEqual(get_featured_projects(), [])
+        self.assertIsNotNone(cache.get(FEATURED_CACHE_KEY))
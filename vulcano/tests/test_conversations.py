@@ -0,0 +1,216 @@
+"""
+Test Conversations - Vulcano Platform
+Tests de las conversaciones con último mensaje desnormalizado
+"""
+
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.utils import timezone
+from datetime import timedelta
+from io import StringIO
+from vulcano.conversations import THREAD_PAGE_SIZE, record_message
+from vulcano.models import Conversation, ConversationParticipant, Message, Project
+from vulcano.user_stats import get_user_stats
+
+COMPARED_FIELDS = [
+    'user_low_id', 'user_high_id', 'project_id', 'last_message_id', 'last_sender_id',
+    'last_subject', 'last_snippet', 'message_count',
+]
+
+
+class ConversationTest(TestCase):
+    """Tests del mantenimiento de conversaciones desde las señales de Message"""
+
+    def setUp(self):
+        """Configuración inicial"""
+        self.arquitecto = User.objects.create_user(username='arquitecto', password='pass123')
+        self.cliente = User.objects.create_user(username='cliente', password='pass123')
+        self.project = Project.objects.create(
+            title='Casa', description='Casa de prueba', arquitecto=self.arquitecto
+        )
+
+    def send(self, sender, recipient, subject='Consulta', body='Hola', **kwargs):
+        return Message.objects.create(sender=sender, recipient=recipient, subject=subject, body=body, **kwargs)
+
+    def unread(self, user, conversation):
+        return ConversationParticipant.objects.get(conversation=conversation, user=user).unread_count
+
+    def snapshot(self):
+        return {
+            (row[0], row[1], row[2]): row
+            for row in Conversation.objects.values_list(*COMPARED_FIELDS)
+        }
+
+    def test_messages_share_conversation_per_pair_and_project(self):
+        """Las respuestas van al mismo hilo; un proyecto abre otro"""
+        first = self.send(self.cliente, self.arquitecto)
+        reply = self.send(self.arquitecto, self.cliente, 'Re: Consulta', 'Buenas\n  tardes')
+        other = self.send(self.cliente, self.arquitecto, project=self.project)
+
+        self.assertEqual(first.conversation_id, reply.conversation_id)
+        self.assertNotEqual(first.conversation_id, other.conversation_id)
+
+        conversation = reply.conversation
+        conversation.refresh_from_db()
+        self.assertEqual(conversation.last_message_id, reply.pk)
+        self.assertEqual(conversation.last_sender_id, self.arquitecto.pk)
+        self.assertEqual(conversation.last_snippet, 'Buenas tardes')
+        self.assertEqual(conversation.message_count, 2)
+        self.assertEqual(self.unread(self.arquitecto, conversation), 1)
+        self.assertEqual(self.unread(self.cliente, conversation), 1)
+
+    def test_read_state_changes_adjust_unread(self):
+        """Leer un mensaje resta uno a los no leídos del destinatario"""
+        message = self.send(self.cliente, self.arquitecto)
+        message.mark_as_read()
+        self.assertEqual(self.unread(self.arquitecto, message.conversation), 0)
+
+    def test_older_message_does_not_move_pointer(self):
+        """Un mensaje confirmado fuera de orden no pisa al más reciente"""
+        latest = self.send(self.cliente, self.arquitecto, 'Nuevo')
+        older = self.send(self.cliente, self.arquitecto, 'Viejo')
+        older.created_at = latest.created_at - timedelta(minutes=5)
+        Conversation.objects.filter(pk=latest.conversation_id).update(
+            last_message=latest, last_subject='Nuevo', last_message_at=latest.created_at
+        )
+        record_message(older)
+        conversation = Conversation.objects.get(pk=latest.conversation_id)
+        self.assertEqual(conversation.last_subject, 'Nuevo')
+
+    def test_delete_refreshes_conversation(self):
+        """Borrar el último mensaje retrocede el puntero; sin mensajes se elimina"""
+        first = self.send(self.cliente, self.arquitecto, 'Primero')
+        last = self.send(self.cliente, self.arquitecto, 'Segundo')
+        last.delete()
+        conversation = Conversation.objects.get(pk=first.conversation_id)
+        self.assertEqual(conversation.last_message_id, first.pk)
+        self.assertEqual(conversation.message_count, 1)
+        self.assertEqual(self.unread(self.arquitecto, conversation), 1)
+
+        first.delete()
+        self.assertFalse(Conversation.objects.exists())
+
+    def test_project_delete_merges_into_direct_conversation(self):
+        """Las conversaciones del proyecto pasan a la directa del mismo par"""
+        direct = self.send(self.cliente, self.arquitecto, 'Directo')
+        on_project = self.send(self.arquitecto, self.cliente, 'Del proyecto', project=self.project)
+        self.project.delete()
+
+        conversation = Conversation.objects.get()
+        self.assertEqual(conversation.pk, direct.conversation_id)
+        self.assertEqual(conversation.message_count, 2)
+        self.assertEqual(conversation.last_message_id, on_project.pk)
+        self.assertEqual(self.unread(self.cliente, conversation), 1)
+
+    def test_rebuild_matches_incremental_state(self):
+        """El comando reconstruye lo mismo y recoge mensajes sin conversación"""
+        self.send(self.cliente, self.arquitecto)
+        self.send(self.arquitecto, self.cliente, 'Re: Consulta').mark_as_read()
+        self.send(self.cliente, self.arquitecto, project=self.project)
+        expected = self.snapshot()
+        # bulk_create no emite señales
+        Message.objects.bulk_create([
+            Message(sender=self.cliente, recipient=self.arquitecto, subject='Masivo', body='x')
+        ])
+
+        out = StringIO()
+        call_command('rebuild_conversations', stdout=out)
+        self.assertIn('Conversaciones recalculadas: 2', out.getvalue())
+        self.assertFalse(Message.objects.filter(conversation=None).exists())
+        rebuilt = self.snapshot()
+        key = (self.arquitecto.pk, self.cliente.pk, None)
+        self.assertEqual(rebuilt[key][-1], expected[key][-1] + 1)
+        self.assertEqual(rebuilt[key[:2] + (self.project.pk,)][1:], expected[key[:2] + (self.project.pk,)][1:])
+        self.assertEqual(
+            ConversationParticipant.objects.get(user=self.arquitecto, conversation__project=None).unread_count, 2
+        )
+
+
+class ConversationViewsTest(TestCase):
+    """Tests de la bandeja de conversaciones y del hilo por cursor"""
+
+    def setUp(self):
+        """Configuración inicial"""
+        self.client = Client()
+        self.user = User.objects.create_user(username='testuser', password='pass123')
+        self.others = [
+            User.objects.create_user(username=f'otro{number}', password='pass123') for number in range(3)
+        ]
+        self.client.login(username='testuser', password='pass123')
+
+    def send(self, sender, recipient, subject):
+        return Message.objects.create(sender=sender, recipient=recipient, subject=subject, body='Texto')
+
+    def test_inbox_lists_conversations_with_constant_queries(self):
+        """Una fila por conversación y las mismas consultas con más hilos"""
+        self.send(self.others[0], self.user, 'Primera')
+        self.send(self.user, self.others[0], 'Respuesta')
+        with CaptureQueriesContext(connection) as one:
+            response = self.client.get(reverse('vulcano:inbox'))
+        self.assertEqual(len(response.context['conversations']), 1)
+        self.assertContains(response, 'Respuesta')
+
+        for other in self.others[1:]:
+            self.send(other, self.user, f'De {other.username}')
+        with CaptureQueriesContext(connection) as many:
+            response = self.client.get(reverse('vulcano:inbox'))
+        self.assertEqual(len(response.context['conversations']), 3)
+        self.assertEqual(len(many), len(one))
+
+    def test_inbox_filters(self):
+        """Recibidos y enviados según el remitente del último mensaje"""
+        self.send(self.others[0], self.user, 'Pendiente')
+        self.send(self.user, self.others[1], 'Esperando')
+
+        response = self.client.get(reverse('vulcano:inbox') + '?filter=received')
+        self.assertEqual([m.other_user for m in response.context['conversations']], [self.others[0]])
+        response = self.client.get(reverse('vulcano:inbox') + '?filter=sent')
+        self.assertEqual([m.other_user for m in response.context['conversations']], [self.others[1]])
+        response = self.client.get(reverse('vulcano:inbox') + '?filter=unread')
+        self.assertEqual(response.context['unread_messages'], 1)
+        self.assertEqual(len(response.context['conversations']), 1)
+
+    def test_thread_marks_read(self):
+        """Abrir el hilo marca leídos sus mensajes y ajusta los contadores"""
+        get_user_stats(self.user)
+        message = self.send(self.others[0], self.user, 'Hola')
+        self.send(self.others[0], self.user, 'Sigues ahí')
+        self.assertEqual(get_user_stats(self.user).unread_messages, 2)
+
+        response = self.client.get(reverse('vulcano:conversation_detail', args=[message.conversation_id]))
+        self.assertContains(response, 'Sigues ahí')
+        self.assertFalse(Message.objects.filter(recipient=self.user, is_read=False).exists())
+        self.assertEqual(get_user_stats(self.user).unread_messages, 0)
+        self.assertEqual(
+            ConversationParticipant.objects.get(user=self.user, conversation_id=message.conversation_id).unread_count, 0
+        )
+
+    def test_thread_loads_older_messages_by_cursor(self):
+        """La primera página trae los más recientes y el cursor los anteriores"""
+        start = timezone.now() - timedelta(days=1)
+        for number in range(THREAD_PAGE_SIZE + 5):
+            message = self.send(self.others[0], self.user, f'Mensaje {number:02d}')
+            Message.objects.filter(pk=message.pk).update(created_at=start + timedelta(minutes=number))
+        url = reverse('vulcano:conversation_detail', args=[message.conversation_id])
+
+        response = self.client.get(url)
+        thread = response.context['thread']
+        self.assertEqual(len(thread), THREAD_PAGE_SIZE)
+        self.assertEqual(thread[-1].subject, f'Mensaje {THREAD_PAGE_SIZE + 4:02d}')
+
+        response = self.client.get(
+            url, {'cursor': response.context['page'].next_cursor}, HTTP_X_REQUESTED_WITH='XMLHttpRequest'
+        )
+        self.assertTemplateUsed(response, 'messaging/_thread_messages.html')
+        self.assertTemplateNotUsed(response, 'base.html')
+        self.assertEqual([m.subject for m in response.context['thread']], [f'Mensaje {n:02d}' for n in range(5)])
+
+    def test_thread_requires_participant(self):
+        """Un tercero no puede abrir la conversación"""
+        message = self.send(self.others[0], self.others[1], 'Privado')
+        response = self.client.get(reverse('vulcano:conversation_detail', args=[message.conversation_id]))
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,184 @@
+"""
+Test Facets - Vulcano Platform
+Tests de los conteos de facetas mantenidos por deltas
+"""
+
+from django.test import TestCase, Client, RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth.models import User
+from django.contrib.admin.sites import AdminSite
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Count, F, Value
+from io import StringIO
+from vulcano.admin import ProjectAdmin
+from vulcano.models import Project, ProjectFacetCount
+from vulcano import facets
+
+
+class FacetCountTest(TestCase):
+    """Tests de mantenimiento incremental de ProjectFacetCount"""
+
+    def setUp(self):
+        """Configuración inicial"""
+        self.arquitecto = User.objects.create_user(
+            username='arquitecto',
+            email='arq@test.com',
+            password='pass123'
+        )
+        self.counter = 0
+        cache.clear()
+
+    def create_project(self, **kwargs):
+        self.counter += 1
+        defaults = {
+            'title': f'Proyecto {self.counter}',
+            'description': 'Test',
+            'category': 'residential',
+            'status': 'completed',
+            'location': 'Test',
+            'arquitecto': self.arquitecto,
+            'is_published': True,
+        }
+        defaults.update(kwargs)
+        return Project.objects.create(**defaults)
+
+    def assert_counts_exact(self):
+        """Los contadores coinciden con un COUNT(*) agrupado"""
+        expected = {
+            (row['category'], row['status'], row['is_published']): row['total']
+            for row in Project.objects.order_by().values(*facets.FACET_FIELDS).annotate(total=Count('id'))
+        }
+        stored = {
+            key[:3]: key[3]
+            for key in ProjectFacetCount.objects.filter(count__gt=0).values_list(*facets.FACET_FIELDS, 'count')
+        }
+        self.assertEqual(stored, expected)
+        self.assertFalse(ProjectFacetCount.objects.filter(count__lt=0).exists())
+
+    def test_create_update_delete(self):
+        """Crear, mover de categoría, despublicar y eliminar ajustan los contadores"""
+        project = self.create_project()
+        self.create_project(category='commercial')
+        self.assert_counts_exact()
+
+        project.category = 'cultural'
+        project.save()
+        self.assert_counts_exact()
+
+        project.is_published = False
+        project.save()
+        self.assert_counts_exact()
+
+        project.delete()
+        self.assert_counts_exact()
+
+    def test_stale_instance_uses_database_state(self):
+        """Una instancia obsoleta no descuadra los contadores"""
+        project = self.create_project()
+        stale = Project.objects.get(pk=project.pk)
+
+        project.is_published = False
+        project.save()
+
+        stale.status = 'in_progress'
+        stale.save()
+        self.assert_counts_exact()
+
+        stale = Project.objects.get(pk=project.pk)
+        Project.objects.filter(pk=project.pk).update(category='commercial')
+        stale.delete()
+        self.assert_counts_exact()
+
+    def test_views_increment_skips_facets(self):
+        """Guardar solo views_count no toca la tabla de facetas"""
+        project = self.create_project()
+        with CaptureQueriesContext(connection) as ctx:
+            project.increment_views()
+        sql = ' '.join(query['sql'] for query in ctx.captured_queries)
+        self.assertNotIn('vulcano_project_facet_count', sql)
+        self.assertNotIn('FOR UPDATE', sql)
+
+    def test_queryset_update_and_admin_actions(self):
+        """Las acciones masivas del admin mantienen los contadores exactos"""
+        for _ in range(3):
+            self.create_project(is_published=False)
+        self.create_project(category='commercial', is_published=False)
+
+        admin_user = User.objects.create_superuser('root', 'root@test.com', 'pass123')
+        request = RequestFactory().post('/admin/')
+        request.user = admin_user
+        model_admin = ProjectAdmin(Project, AdminSite())
+        model_admin.message_user = lambda *args, **kwargs: None
+
+        with self.captureOnCommitCallbacks(execute=True):
+            model_admin.make_published(request, Project.objects.filter(category='residential'))
+        self.assert_counts_exact()
+        self.assertEqual(
+            facets.get_category_counts(),
+            [{'category': 'residential', 'count': 3, 'label': dict(Project.CATEGORY_CHOICES)['residential']}]
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            model_admin.make_unpublished(request, Project.objects.all())
+        self.assert_counts_exact()
+        self.assertEqual(facets.get_category_counts(), [])
+
+    def test_update_with_expression_rebuilds(self):
+        """Una actualización con expresiones recalcula los contadores"""
+        self.create_project()
+        self.create_project(status='draft')
+        Project.objects.update(status=F('category'))
+        self.assert_counts_exact()
+        Project.objects.filter(status='residential').update(status=Value('draft'))
+        self.assert_counts_exact()
+
+    def test_bulk_create_counts(self):
+        """bulk_create suma los nuevos proyectos"""
+        Project.objects.bulk_create([
+            Project(title=f'Masivo {i}', slug=f'masivo-{i}', description='Test',
+                    location='Test', arquitecto=self.arquitecto, category='urban')
+            for i in range(5)
+        ])
+        self.assert_counts_exact()
+
+    def test_counts_served_from_cache(self):
+        """Las lecturas repetidas no consultan la base de datos"""
+        self.create_project()
+        facets.get_facet_counts()
+        with self.assertNumQueries(0):
+            facets.get_category_counts()
+            facets.get_status_counts()
+
+    def test_rebuild_command(self):
+        """El comando de reconstrucción recalcula desde cero"""
+        self.create_project()
+        ProjectFacetCount.objects.update(count=99)
+        call_command('rebuild_facet_counts', stdout=StringIO())
+        self.assert_counts_exact()
+
+    def test_home_and_admin_portal_use_facets(self):
+        """Home y el portal de administrador muestran los contadores"""
+        self.create_project(category='cultural')
+        self.create_project(category='cultural', status='in_progress')
+        self.create_project(category='urban', is_published=False)
+
+        response = Client().get(reverse('vulcano:home'))
+        self.assertEqual(
+            [(row['category'], row['count']) for row in response.context['categories']],
+            [('cultural', 2)]
+        )
+        self.assertContains(response, 'data-category="cultural"')
+
+        admin = User.objects.create_user(username='admin', password='pass123')
+        admin.profile.role = 'admin'
+        admin.profile.save()
+        client = Client()
+        client.login(username='admin', password='pass123')
+        response = client.get(reverse('vulcano:portal_admin'))
+        self.assertEqual(
+            {row['status']: row['count'] for row in response.context['projects_by_status']},
+            {'completed': 2, 'in_progress': 1}
+        )
@@ -0,0 +1,67 @@
+"""
+Test Identity Map - Vulcano Platform
+Tests del mapa de identidad por petición
+"""
+
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth.models import User
+from django.db import connection
+from vulcano.identity_map import IdentityMap, LEGACY_BACKEND
+from vulcano.models import Project
+
+
+class IdentityMapTest(TestCase):
+    """Tests de IdentityMap y de las consultas por petición"""
+
+    def setUp(self):
+        """Configuración inicial"""
+        self.arquitecto = User.objects.create_user(username='arquitecto', password='pass123')
+        self.arquitecto.profile.role = 'arquitecto'
+        self.arquitecto.profile.save()
+        self.project = Project.objects.create(
+            title='Casa Patio',
+            description='Test',
+            category='residential',
+            status='planning',
+            location='Lima',
+            arquitecto=self.arquitecto
+        )
+        self.client = Client()
+
+    def test_same_object_per_identity(self):
+        """Un objeto se carga una vez aunque se pida por slug o por pk"""
+        identity_map = IdentityMap()
+        with self.assertNumQueries(1):
+            by_slug = identity_map.get(Project, slug=self.project.slug)
+            self.assertIs(identity_map.get(Project, slug=self.project.slug), by_slug)
+            self.assertIs(identity_map.get(Project, pk=str(self.project.pk)), by_slug)
+            self.assertIs(identity_map.get(Project, id=self.project.pk), by_slug)
+
+    def test_missing_object_raises(self):
+        """Los objetos inexistentes lanzan DoesNotExist"""
+        with self.assertRaises(Project.DoesNotExist):
+            IdentityMap().get(Project, slug='no-existe')
+
+    def test_edit_page_loads_user_profile_and_project_once(self):
+        """project_edit carga usuario y perfil en una consulta y el proyecto en otra"""
+        self.client.login(username='arquitecto', password='pass123')
+        url = reverse('vulcano:project_edit', kwargs={'slug': self.project.slug})
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['project'], self.project)
+
+        sqls = [q['sql'] for q in ctx.captured_queries]
+        project_loads = [sql for sql in sqls if sql.startswith('SELECT') and 'FROM "vulcano_project" WHERE' in sql]
+        profile_loads = [sql for sql in sqls if 'FROM "vulcano_user_profile"' in sql]
+        self.assertEqual(len(project_loads), 1, project_loads)
+        self.assertEqual(profile_loads, [])
+        self.assertTrue(any('FROM "auth_user" LEFT OUTER JOIN "vulcano_user_profile"' in sql for sql in sqls))
+
+    def test_legacy_sessions_stay_logged_in(self):
+        """Las sesiones del backend por defecto siguen autenticadas"""
+        self.client.force_login(self.arquitecto, backend=LEGACY_BACKEND)
+        response = self.client.get(reverse('vulcano:dashboard'))
+        self.assertRedirects(response, reverse('vulcano:portal_arquitecto'), fetch_redirect_response=False)
@@ -0,0 +1,129 @@
+"""
+Test Metrics - Vulcano Platform
+Tests de las métricas de Prometheus y la cabecera Server-Timing
+"""
+
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from vulcano import metrics
+from vulcano.metrics import Registry, format_labels
+from vulcano.utils import cached_computation
+import os
+import re
+import shutil
+import tempfile
+
+
+class MetricsTest(TestCase):
+    """Tests del middleware y del endpoint /metrics"""
+
+    def setUp(self):
+        """Configuración inicial"""
+        cache.clear()
+        metrics.registry.reset()
+        self.client = Client()
+        self.staff = User.objects.create_user(username='staff', password='pass123', is_staff=True)
+
+    def scrape(self):
+        client = Client()
+        client.force_login(self.staff)
+        response = client.get(reverse('vulcano:metrics'))
+        self.assertEqual(response.status_code, 200)
+        return response.content.decode()
+
+    def test_server_timing_header(self):
+        """Cada respuesta desglosa db, cache, render y total"""
+        response = self.client.get(reverse('vulcano:home'))
+        timing = response['Server-Timing']
+        for part in ('db;dur=', 'cache;dur=', 'render;dur=', 'total;dur='):
+            self.assertIn(part, timing)
+        self.assertRegex(timing, r'db;dur=[\d.]+;desc="[1-9]\d* consultas"')
+
+    def test_metrics_requires_token_or_staff(self):
+        """/metrics no es público"""
+        url = reverse('vulcano:metrics')
+        self.assertEqual(self.client.get(url).status_code, 403)
+        with override_settings(METRICS_TOKEN='secreto'):
+            self.assertEqual(self.client.get(url, HTTP_AUTHORIZATION='Bearer otro').status_code, 403)
+            self.assertEqual(self.client.get(url, HTTP_AUTHORIZATION='Bearer secreto').status_code, 200)
+
+    def test_request_metrics_exposed(self):
+        """Latencia, tamaño y consultas por vista en formato Prometheus"""
+        for _ in range(3):
+            self.client.get(reverse('vulcano:home'))
+        text = self.scrape()
+
+        self.assertIn('# TYPE vulcano_http_request_duration_seconds histogram', text)
+        labels = format_labels(view='vulcano:home', method='GET', status=200)
+        self.assertIn(f'vulcano_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 3', text)
+        self.assertIn(f'vulcano_http_request_duration_seconds_count{{{labels}}} 3', text)
+        self.assertIn('vulcano_http_response_size_bytes_count{view="vulcano:home"} 3', text)
+        self.assertRegex(text, r'vulcano_db_queries_total\{view="vulcano:home"\} [1-9]')
+
+    def test_histogram_exposition_is_valid(self):
+        """Cada serie expone todos sus buckets, en orden numérico y acumulativos"""
+        labels = format_labels(view='vulcano:home')
+        metrics.registry.observe('vulcano_http_request_duration_seconds', labels, 0.3, metrics.LATENCY_BUCKETS)
+        metrics.registry.observe('vulcano_http_request_duration_seconds', labels, 4, metrics.LATENCY_BUCKETS)
+
+        buckets, count = [], None
+        for line in metrics.render_metrics().splitlines():
+            if line.startswith('#'):
+                continue
+            sample, value = line.rsplit(' ', 1)
+            if sample.startswith('vulcano_http_request_duration_seconds_bucket{view="vulcano:home",'):
+                bound = re.search(r'le="([^"]+)"', sample).group(1)
+                buckets.append((float(bound), float(value)))
+            elif sample == f'vulcano_http_request_duration_seconds_count{{{labels}}}':
+                count = float(value)
+
+        bounds = [bound for bound, _ in buckets]
+        self.assertEqual(bounds, [float(bound) for bound in metrics.LATENCY_BUCKETS] + [float('inf')])
+        values = [value for _, value in buckets]
+        self.assertEqual(values, sorted(values))
+        self.assertEqual(values[0], 0)
+        self.assertEqual(dict(buckets)[0.25], 0)
+        self.assertEqual(dict(buckets)[0.5], 1)
+        self.assertEqual(values[-1], count)
+
+    def test_cache_hits_and_misses(self):
+        """Las lecturas de cached_computation se cuentan como aciertos o fallos"""
+        cached_computation('metrics_test', lambda: 1, 60)
+        cached_computation('metrics_test', lambda: 1, 60)
+        text = self.scrape()
+        self.assertIn('vulcano_cache_requests_total{cache="computation",result="hit"} 1', text)
+        self.assertIn('vulcano_cache_requests_total{cache="computation",result="miss"} 1', text)
+
+
+class SharedRegistryTest(TestCase):
+    """Tests del registro compartido entre procesos"""
+
+    def setUp(self):
+        """Configuración inicial"""
+        self.directory = tempfile.mkdtemp()
+        self.settings_override = override_settings(
+            METRICS_LOCATION=os.path.join(self.directory, 'metrics.sqlite3')
+        )
+        self.settings_override.enable()
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_workers_are_summed(self):
+        """Dos registros (dos workers) suman sus contadores en el archivo"""
+        worker_a, worker_b = Registry(), Registry()
+        labels = format_labels(view='vulcano:home')
+        worker_a.inc('vulcano_db_queries_total', labels, 4)
+        worker_b.inc('vulcano_db_queries_total', labels, 3)
+        worker_a.observe('vulcano_http_request_duration_seconds', labels, 0.02, metrics.LATENCY_BUCKETS)
+        worker_b.observe('vulcano_http_request_duration_seconds', labels, 3, metrics.LATENCY_BUCKETS)
+        worker_a.flush(force=True)
+
+        samples = worker_b.samples()
+        self.assertEqual(samples[('vulcano_db_queries_total', labels)], 7)
+        self.assertEqual(samples[('vulcano_http_request_duration_seconds_bucket', f'{labels},le="0.025"')], 1)
+        self.assertEqual(samples[('vulcano_http_request_duration_seconds_bucket', f'{labels},le="5"')], 2)
+        self.assertEqual(samples[('vulcano_http_request_duration_seconds_count', labels)], 2)
@@ -0,0 +1,180 @@
+"""
+Test Page Cache - Vulcano Platform
+Tests de la caché de página completa para visitantes anónimos
+"""
+
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache, caches
+from vulcano import tiered_cache
+from vulcano.sqlite_cache import SQLiteCache
+from vulcano.models import Project, ProjectImage
+from vulcano.view_counts import flush_view_counts
+from vulcano.tests.test_performance import TEMP_MEDIA_ROOT, make_image_file
+import copy
+import os
+import tempfile
+
+
+@override_settings(PAGE_CACHE_ENABLED=True, MEDIA_ROOT=TEMP_MEDIA_ROOT)
+class AnonymousPageCacheTest(TestCase):
+    """Tests de aciertos, claves normalizadas e invalidación por etiquetas"""
+
+    def setUp(self):
+        """Configuración inicial"""
+        cache.clear()
+        self.client = Client()
+        self.arquitecto = User.objects.create_user(
+            username='arquitecto',
+            email='arq@test.com',
+            password='pass123'
+        )
+        self.arquitecto.profile.role = 'arquitecto'
+        self.arquitecto.profile.save()
+        self.casa = self.create_project('Casa Patio', 'residential')
+        self.museo = self.create_project('Museo Nuevo', 'cultural')
+
+    def create_project(self, title, category, **kwargs):
+        return Project.objects.create(
+            title=title,
+            description='Test',
+            category=category,
+            status='completed',
+            location='Lima',
+            arquitecto=self.arquitecto,
+            is_published=kwargs.pop('is_published', True),
+            **kwargs
+        )
+
+    def get(self, url, **params):
+        return self.client.get(url, params)
+
+    def assert_cache(self, response, state):
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get('X-Page-Cache'), state)
+
+    def test_second_anonymous_hit_skips_database(self):
+        """La segunda visita anónima se sirve sin consultas"""
+        url = reverse('vulcano:home')
+        self.assert_cache(self.get(url), 'MISS')
+        with self.assertNumQueries(0):
+            response = self.get(url)
+        self.assert_cache(response, 'HIT')
+        self.assertContains(response, 'Casa Patio')
+
+    def test_authenticated_users_bypass_cache(self):
+        """Los usuarios autenticados nunca reciben páginas cacheadas"""
+        url = reverse('vulcano:home')
+        self.get(url)
+        self.client.login(username='arquitecto', password='pass123')
+        response = self.get(url)
+        self.assertIsNone(response.get('X-Page-Cache'))
+
+    def test_query_string_is_normalized(self):
+        """Parámetros ajenos, vacíos u ordenados distinto comparten entrada"""
+        url = reverse('vulcano:home')
+        self.assert_cache(self.get(url, category='cultural', search=''), 'MISS')
+        self.assert_cache(self.get(url, utm_source='news', category='cultural'), 'HIT')
+        self.assert_cache(self.get(url, category='residential'), 'MISS')
+
+    def test_publish_evicts_only_listings_of_its_category(self):
+        """Publicar un proyecto solo invalida los listados donde aparece"""
+        url = reverse('vulcano:home')
+        for params in ({}, {'category': 'cultural'}, {'category': 'residential'}):
+            self.get(url, **params)
+
+        # Las invalidaciones se aplican al confirmar la transacción
+        with self.captureOnCommitCallbacks(execute=True):
+            self.create_project('Teatro Central', 'cultural')
+
+        self.assert_cache(self.get(url), 'MISS')
+        self.assert_cache(self.get(url, category='cultural'), 'MISS')
+        response = self.get(url, category='residential')
+        self.assert_cache(response, 'HIT')
+
+        # La barra de categorías se refresca incluso en páginas cacheadas
+        self.assertEqual(response.content.decode().count('filter-count">2<'), 1)
+
+    def test_edit_evicts_pages_that_show_the_project(self):
+        """Editar un proyecto invalida su detalle y los listados que lo muestran"""
+        home = reverse('vulcano:home')
+        casa_url = reverse('vulcano:project_detail', kwargs={'slug': self.casa.slug})
+        museo_url = reverse('vulcano:project_detail', kwargs={'slug': self.museo.slug})
+        for url in (home, casa_url, museo_url):
+            self.get(url)
+
+        self.casa.description = 'Nueva descripción'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.casa.save()
+
+        self.assert_cache(self.get(casa_url), 'MISS')
+        self.assert_cache(self.get(home), 'MISS')
+        self.assert_cache(self.get(museo_url), 'HIT')
+
+    def test_image_upload_evicts_project_pages(self):
+        """Subir una imagen invalida las páginas del proyecto"""
+        url = reverse('vulcano:project_detail', kwargs={'slug': self.casa.slug})
+        self.get(url)
+        with self.captureOnCommitCallbacks(execute=True):
+            ProjectImage.objects.create(project=self.casa, image=make_image_file())
+        self.casa.refresh_from_db()
+
+        response = self.get(url)
+        self.assert_cache(response, 'MISS')
+        self.assertContains(response, self.casa.main_image_url)
+
+    def test_bulk_unpublish_evicts_listings(self):
+        """Las acciones masivas (queryset.update) también invalidan"""
+        url = reverse('vulcano:home')
+        self.get(url)
+        with self.captureOnCommitCallbacks(execute=True):
+            Project.objects.filter(pk=self.museo.pk).update(is_published=False)
+
+        response = self.get(url)
+        self.assert_cache(response, 'MISS')
+        self.assertNotContains(response, 'Museo Nuevo')
+
+    def test_cached_detail_still_counts_views(self):
+        """El detalle servido desde caché sigue contando visitas únicas"""
+        url = reverse('vulcano:project_detail', kwargs={'slug': self.casa.slug})
+        self.get(url)
+        self.assert_cache(Client(HTTP_USER_AGENT='Mozilla/5.0 (Macintosh)').get(url), 'HIT')
+
+        flush_view_counts()
+        self.casa.refresh_from_db()
+        self.assertEqual(self.casa.views_count, 2)
+
+    def test_unpublished_detail_is_not_cached(self):
+        """Las redirecciones (proyecto no publicado) no se cachean"""
+        draft = self.create_project('Borrador', 'urban', is_published=False)
+        url = reverse('vulcano:project_detail', kwargs={'slug': draft.slug})
+        self.assertEqual(self.get(url).status_code, 302)
+
+        draft.is_published = True
+        draft.save()
+        # Cliente nuevo: la redirección dejó un mensaje pendiente en la sesión
+        self.assert_cache(Client().get(url), 'MISS')
+
+
+class ProductionCachePageCacheTest(AnonymousPageCacheTest):
+    """Las mismas pruebas sobre la caché de producción (TieredCache sobre SQLiteCache)"""
+
+    def setUp(self):
+        """Configuración inicial: PRODUCTION_CACHES sobre un archivo temporal"""
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        tiered_cache._tiers.clear()
+        self.addCleanup(tiered_cache._tiers.clear)
+        config = copy.deepcopy(settings.PRODUCTION_CACHES)
+        config['shared']['LOCATION'] = os.path.join(tmp.name, 'cache.sqlite3')
+        override = override_settings(CACHES=config)
+        override.enable()
+        self.addCleanup(override.disable)
+        super().setUp()
+
+    def test_uses_production_backends(self):
+        """La caché activa es la de producción, no LocMem"""
+        self.assertIsInstance(caches['default'], tiered_cache.TieredCache)
+        self.assertIsInstance(caches['shared'], SQLiteCache)
@@ -0,0 +1,170 @@
+"""
+Test Pagination - Vulcano Platform
+Tests de la paginación por cursor del listado público de proyectos
+"""
+
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.urls import reverse
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.utils import timezone
+from datetime import timedelta
+from vulcano.models import Project
+from vulcano.pagination import CursorPaginator
+
+
+class CursorPaginatorTest(TestCase):
+    """Tests del paginador por cursor sobre órdenes con empates"""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Proyectos con fechas, visitas y títulos repetidos para forzar empates"""
+        # Títulos repetidos entre arquitectos (título único por arquitecto)
+        arquitectos = [
+            User.objects.create_user(username=f'arquitecto{n}', password='pass123')
+            for n in range(8)
+        ]
+        base = timezone.now()
+        projects = Project.objects.bulk_create([
+            Project(
+                title=f'Proyecto {i % 4}',
+                slug=f'proyecto-{i}',
+                description='Test',
+                location='Lima',
+                arquitecto=arquitectos[i // 4],
+                is_published=True,
+                views_count=i % 3,
+            )
+            for i in range(30)
+        ])
+        # Fechas repetidas con microsegundos para comprobar el desempate por id
+        for i, project in enumerate(projects):
+            Project.objects.filter(pk=project.pk).update(
+                created_at=base - timedelta(minutes=i // 3, microseconds=123)
+            )
+
+    def walk(self, ordering):
+        """Recorre todas las páginas hacia delante y retorna (páginas, ids)"""
+        paginator = CursorPaginator(Project.objects.all(), 7, ordering)
+        pages = [paginator.page()]
+        while pages[-1].has_next():
+            pages.append(paginator.page(pages[-1].next_cursor))
+        return pages, [project.pk for page in pages for project in page]
+
+    def test_all_sorts_cover_every_row_once(self):
+        """Cada orden recorre todos los proyectos sin duplicados ni huecos"""
+        for ordering in (('-created_at', '-id'), ('created_at', 'id'),
+                         ('-views_count', '-id'), ('title', 'id')):
+            with self.subTest(ordering=ordering):
+                pages, ids = self.walk(ordering)
+                expected = list(Project.objects.order_by(*ordering).values_list('pk', flat=True))
+                self.assertEqual(ids, expected)
+                self.assertEqual([page.number for page in pages], [1, 2, 3, 4, 5])
+
+    def test_previous_cursor_returns_same_rows(self):
+        """Navegar hacia atrás devuelve exactamente la página anterior"""
+        ordering = ('-views_count', '-id')
+        pages, _ = self.walk(ordering)
+        paginator = CursorPaginator(Project.objects.all(), 7, ordering)
+
+        for current, previous in zip(pages[2:], pages[1:]):
+            back = paginator.page(current.previous_cursor)
+            self.assertEqual(list(back), list(previous))
+            self.assertEqual(back.number, previous.number)
+            self.assertTrue(back.has_next())
+            self.assertTrue(back.has_previous())
+
+        # Desde la página 2 se vuelve a la primera sin cursor
+        self.assertIsNone(pages[1].previous_cursor)
+
+    def test_invalid_cursor_falls_back_to_first_page(self):
+        """Un cursor manipulado no produce error sino la primera página"""
+        paginator = CursorPaginator(Project.objects.all(), 7, ('title', 'id'))
+        first = paginator.page()
+        for cursor in ('basura', 'eyJ2IjpbXX0', paginator.encode_cursor(first[0], 'sideways', 2)):
+            with self.subTest(cursor=cursor):
+                page = paginator.page(cursor)
+                self.assertEqual(page.number, 1)
+                self.assertEqual(list(page), list(first))
+
+    def test_page_links_are_elided(self):
+        """La barra de páginas solo muestra vecinas, primera y elipsis"""
+        pages, _ = self.walk(('-created_at', '-id'))
+        links = pages[2].page_links()
+
+        self.assertEqual(
+            [link.get('number') for link in links],
+            [1, 2, 3, 4, None]
+        )
+        self.assertTrue(links[0]['is_first'])
+        self.assertTrue(links[2]['is_current'])
+
+    def test_count_is_cached(self):
+        """El total se guarda en caché y no se recalcula en cada petición"""
+        cache.clear()
+        CursorPaginator(Project.objects.all(), 7, ('-id',), count_cache_key='test_count').count
+        with self.assertNumQueries(0):
+            count = CursorPaginator(Project.objects.all(), 7, ('-id',), count_cache_key='test_count').count
+        self.assertEqual(count, 30)
+
+
+class HomeCursorPaginationTest(TestCase):
+    """Tests de la paginación por cursor en la vista home"""
+
+    def setUp(self):
+        """Configuración inicial"""
+        self.client = Client()
+        arquitecto = User.objects.create_user(username='arquitecto', password='pass123')
+        Project.objects.bulk_create([
+            Project(
+                title=f'Proyecto {i:03d}',
+                slug=f'proyecto-{i}',
+                description='Test',
+                location='Lima',
+                arquitecto=arquitecto,
+                is_published=True,
+            )
+            for i in range(40)
+        ])
+        cache.clear()
+
+    def test_follow_next_cursor_through_home(self):
+        """Seguir el cursor de home recorre los proyectos en orden de título"""
+        url = reverse('vulcano:home')
+        response = self.client.get(url, {'sort': 'title'})
+        titles = [project.title for project in response.context['projects']]
+        while response.context['projects'].has_next():
+            response = self.client.get(url, {
+                'sort': 'title',
+                'cursor': response.context['projects'].next_cursor,
+            })
+            titles += [project.title for project in response.context['projects']]
+
+        self.assertEqual(titles, [f'Proyecto {i:03d}' for i in range(40)])
+        self.assertEqual(response.context['total_projects'], 40)
+
+    def test_sort_select_values_are_honoured(self):
+        """Los valores del selector de orden (created_at) se respetan"""
+        response = self.client.get(reverse('vulcano:home'), {'sort': 'created_at'})
+        page = response.context['projects']
+        self.assertEqual(page.paginator.ordering, ('created_at', 'id'))
+
+    def test_deep_page_query_count_is_constant(self):
+        """Una página profunda no cuesta más consultas que la primera"""
+        url = reverse('vulcano:home')
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as first:
+            response = self.client.get(url)
+
+        page = response.context['projects']
+        while page.has_next():
+            response = self.client.get(url, {'cursor': page.next_cursor})
+            page = response.context['projects']
+
+        with CaptureQueriesContext(connection) as deep:
+            self.client.get(url, {'cursor': page.paginator.encode_cursor(page[0], 'next', page.number)})
+
+        self.assertEqual(len(first), len(deep))
+        self.assertNotIn('OFFSET', ' '.join(q['sql'] for q in deep.captured_queries).upper())
@@ -0,0 +1,254 @@
+"""
+Test Performance - Vulcano Platform
+Tests de regresión de rendimiento: número de consultas y datos desnormalizados
+"""
+
+from django.test import TestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.urls import reverse
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from vulcano.models import Project, ProjectImage, Message
+from io import BytesIO
+from PIL import Image
+import shutil
+import tempfile
+
+
+TEMP_MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def tearDownModule():
+    shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+
+def make_image_file(name='test.png', size=(40, 30)):
+    """Genera un PNG válido en memoria para subir como imagen"""
+    buffer = BytesIO()
+    Image.new('RGB', size, (200, 80, 20)).save(buffer, format='PNG')
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/png')
+
+
+def image_queries(ctx):
+    """Consultas capturadas que tocan la tabla de imágenes"""
+    return [q['sql'] for q in ctx.captured_queries if 'vulcano_project_image' in q['sql']]
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
+class MainImagePointerTest(TestCase):
+    """Tests del puntero desnormalizado a la imagen principal"""
+
+    def setUp(self):
+        """Configuración inicial"""
+        self.arquitecto = User.objects.create_user(
+            username='arquitecto',
+            email='arq@test.com',
+            password='pass123'
+        )
+        self.project = Project.objects.create(
+            title='Proyecto Imagen',
+            description='Test',
+            category='residential',
+            status='completed',
+            location='Test',
+            arquitecto=self.arquitecto
+        )
+
+    def test_first_image_becomes_main(self):
+        """La primera imagen subida se usa como principal aunque no esté marcada"""
+        image = ProjectImage.objects.create(project=self.project, image=make_image_file())
+        self.project.refresh_from_db()
+
+        self.assertEqual(self.project.main_image_id, image.id)
+        self.assertEqual(self.project.main_image_url, image.image.url)
+        self.assertEqual(self.project.main_image_width, 40)
+        self.assertEqual(self.project.main_image_height, 30)
+
+    def test_is_main_image_takes_precedence(self):
+        """La imagen marcada como principal reemplaza al puntero"""
+        ProjectImage.objects.create(project=self.project, image=make_image_file(), order=0)
+        main = ProjectImage.objects.create(
+            project=self.project, image=make_image_file(size=(64, 48)), is_main=True, order=1
+        )
+        self.project.refresh_from_db()
+
+        self.assertEqual(self.project.main_image_id, main.id)
+        self.assertEqual(self.project.main_image_width, 64)
+        self.assertEqual(ProjectImage.objects.filter(project=self.project, is_main=True).count(), 1)
+
+    def test_delete_main_image_falls_back(self):
+        """Al borrar la imagen principal el puntero pasa a la siguiente"""
+        main = ProjectImage.objects.create(project=self.project, image=make_image_file(), is_main=True)
+        other = ProjectImage.objects.create(project=self.project, image=make_image_file(), order=1)
+
+        main.delete()
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.main_image_id, other.id)
+
+        ProjectImage.objects.filter(project=self.project).delete()
+        self.project.refresh_from_db()
+        self.assertIsNone(self.project.main_image_id)
+        self.assertEqual(self.project.main_image_url, '')
+        self.assertIsNone(self.project.get_main_image())
+
+    def test_stale_instance_does_not_overwrite_pointer(self):
+        """Guardar una instancia obsoleta del proyecto conserva el puntero"""
+        stale = Project.objects.get(pk=self.project.pk)
+        image = ProjectImage.objects.create(project=self.project, image=make_image_file())
+
+        stale.title = 'Proyecto Renombrado'
+        stale.save()
+
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.title, 'Proyecto Renombrado')
+        self.assertEqual(self.project.main_image_id, image.id)
+
+    def test_clone_inserts_new_project(self):
+        """El idiom de clonado (pk = None) inserta una fila nueva"""
+        clone = Project.objects.get(pk=self.project.pk)
+        clone.pk = None
+        clone.title = 'Proyecto Copia'
+        clone.slug = ''
+        clone.save()
+
+        self.assertNotEqual(clone.pk, self.project.pk)
+        self.assertEqual(Project.objects.count(), 2)
+
+    def test_saving_deleted_project_inserts_it_again(self):
+        """Guardar una instancia cuya fila se borró la vuelve a insertar"""
+        stale = Project.objects.get(pk=self.project.pk)
+        Project.objects.filter(pk=self.project.pk).delete()
+
+        stale.save()
+        self.assertTrue(Project.objects.filter(pk=self.project.pk, title='Proyecto Imagen').exists())
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
+class ListingQueryCountTest(TestCase):
+    """
+    Regresión N+1: las plantillas de listados no deben consultar imágenes
+    por tarjeta y el número de consultas no debe crecer con los proyectos.
+    """
+
+    def setUp(self):
+        """Configuración inicial"""
+        self.client = Client()
+        self.arquitecto = User.objects.create_user(
+            username='arquitecto',
+            email='arq@test.com',
+            password='pass123'
+        )
+        self.arquitecto.profile.role = 'arquitecto'
+        self.arquitecto.profile.save()
+
+        self.cliente = User.objects.create_user(
+            username='cliente',
+            email='cliente@test.com',
+            password='pass123'
+        )
+        self.admin = User.objects.create_user(
+            username='admin',
+            email='admin@test.com',
+            password='pass123'
+        )
+        self.admin.profile.role = 'admin'
+        self.admin.profile.save()
+
+        self.counter = 0
+        cache.clear()
+
+    def create_projects(self, count, **kwargs):
+        """Crea proyectos publicados con dos imágenes cada uno"""
+        projects = []
+        for _ in range(count):
+            self.counter += 1
+            project = Project.objects.create(
+                title=f'Proyecto {self.counter}',
+                description='Test',
+                category='residential',
+                status='completed',
+                location='Test',
+                arquitecto=self.arquitecto,
+                is_published=True,
+                **kwargs
+            )
+            project.clients.add(self.cliente)
+            ProjectImage.objects.create(project=project, image=make_image_file(), is_main=True)
+            ProjectImage.objects.create(project=project, image=make_image_file(), order=1)
+            projects.append(project)
+        return projects
+
+    def count_queries(self, url):
+        """Ejecuta la petición y retorna el contexto de consultas capturadas"""
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return ctx
+
+    def assert_constant_queries(self, url, extra=11, **kwargs):
+        """Verifica que las consultas no dependen del número de tarjetas"""
+        self.create_projects(1, **kwargs)
+        cache.clear()
+        self.count_queries(url)
+        small = self.count_queries(url)
+
+        self.create_projects(extra, **kwargs)
+        cache.clear()
+        self.count_queries(url)
+        large = self.count_queries(url)
+
+        self.assertEqual(image_queries(large), [])
+        self.assertEqual(
+            len(small), len(large),
+            f"Consultas con 1 proyecto: {len(small)}, con {extra + 1}: {len(large)}"
+        )
+
+    def test_home_grid_and_featured(self):
+        """Home con 12 tarjetas y destacados usa un número constante de consultas"""
+        self.assert_constant_queries(reverse('vulcano:home'), is_featured=True)
+
+    def test_portal_cliente(self):
+        """Portal de cliente no consulta imágenes por proyecto asignado"""
+        self.client.login(username='cliente', password='pass123')
+        self.assert_constant_queries(reverse('vulcano:portal_cliente'))
+
+    def test_portal_arquitecto(self):
+        """Portal de arquitecto no consulta imágenes por proyecto"""
+        self.client.login(username='arquitecto', password='pass123')
+        self.assert_constant_queries(reverse('vulcano:portal_arquitecto'), extra=8)
+
+    def test_portal_admin(self):
+        """Portal de administrador no consulta imágenes de proyectos recientes"""
+        self.client.login(username='admin', password='pass123')
+        self.assert_constant_queries(reverse('vulcano:portal_admin'), extra=4)
+
+    def test_project_detail_related(self):
+        """Los proyectos relacionados del detalle no consultan imágenes"""
+        project = self.create_projects(1)[0]
+        url = reverse('vulcano:project_detail', kwargs={'slug': project.slug})
+        self.create_projects(3)
+        ctx = self.count_queries(url)
+
+        # Solo la galería del propio proyecto lee la tabla de imágenes
+        self.assertEqual(len(image_queries(ctx)), 1)
+
+    def test_message_detail(self):
+        """El detalle de mensaje muestra la imagen del proyecto sin consultarla"""
+        project = self.create_projects(1)[0]
+        message = Message.objects.create(
+            sender=self.arquitecto,
+            recipient=self.cliente,
+            project=project,
+            subject='Avance',
+            body='Test'
+        )
+        self.client.login(username='cliente', password='pass123')
+        ctx = self.count_queries(reverse('vulcano:message_detail', kwargs={'pk': message.pk}))
+
+        self.assertEqual(image_queries(ctx), [])
+        self.assertContains(
+            self.client.get(reverse('vulcano:message_detail', kwargs={'pk': message.pk})),
+            project.main_image_url
+        )
@@ -0,0 +1,118 @@
+"""
+Test Profiler - Vulcano Platform
+Tests del perfilador bajo demanda para usuarios staff
+"""
+
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+from django.contrib.auth.models import User
+from django.core import signing
+from vulcano import profiler
+import json
+import os
+import shutil
+import tempfile
+
+
+class ProfilerTest(TestCase):
+    """Tests del middleware, el formato speedscope y las vistas protegidas"""
+
+    def setUp(self):
+        """Configuración inicial"""
+        self.directory = tempfile.mkdtemp()
+        self.settings_override = override_settings(PROFILER_DIRECTORY=self.directory)
+        self.settings_override.enable()
+        self.client = Client()
+        self.staff = User.objects.create_user(username='staff', password='pass123', is_staff=True)
+        self.token = profiler.make_token(self.staff)
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def load(self, profile_id):
+        with open(profiler.profile_path(profile_id), encoding='utf-8') as data:
+            return json.load(data)
+
+    def test_without_token_nothing_is_recorded(self):
+        """Sin token la petición no se perfila"""
+        response = self.client.get(reverse('vulcano:home'))
+        self.assertNotIn('X-Vulcano-Profile', response)
+        self.assertEqual(profiler.list_profiles(), [])
+
+    def test_invalid_or_revoked_token_is_ignored(self):
+        """Tokens mal firmados o de usuarios que ya no son staff no perfilan"""
+        forged = signing.dumps('staff', salt='otra-sal')
+        response = self.client.get(reverse('vulcano:home'), {'_profile': forged})
+        self.assertNotIn('X-Vulcano-Profile', response)
+
+        User.objects.filter(pk=self.staff.pk).update(is_staff=False)
+        response = self.client.get(reverse('vulcano:home'), {'_profile': self.token})
+        self.assertNotIn('X-Vulcano-Profile', response)
+
+    def test_query_param_records_speedscope_profile(self):
+        """El perfil tiene árbol de llamadas, línea de tiempo SQL y plantillas"""
+        response = self.client.get(reverse('vulcano:home'), {'_profile': self.token, 'q': 'casa'})
+        profile_id = response['X-Vulcano-Profile']
+        data = self.load(profile_id)
+
+        self.assertEqual(data['$schema'], profiler.SPEEDSCOPE_SCHEMA)
+        python, sql, templates = data['profiles']
+        names = {frame['name'] for frame in data['shared']['frames']}
+        self.assertIn('home', names)
+        self.assertIn('home.html', names)
+        self.assertTrue(sql['events'])
+        self.assertTrue(templates['events'])
+
+        # Cada perfil evented abre y cierra sus frames de forma anidada
+        for evented in data['profiles']:
+            stack = []
+            for event in evented['events']:
+                if event['type'] == 'O':
+                    stack.append(event['frame'])
+                else:
+                    self.assertEqual(stack.pop(), event['frame'])
+            self.assertEqual(stack, [])
+
+        meta = profiler.list_profiles()[0]
+        self.assertEqual(meta['id'], profile_id)
+        self.assertEqual(meta['issued_by'], 'staff')
+        self.assertEqual(meta['path'], '/?q=casa')
+        self.assertGreater(meta['queries'], 0)
+
+    def test_header_triggers_profile(self):
+        """La cabecera X-Vulcano-Profile también activa el perfilado"""
+        response = self.client.get(reverse('vulcano:home'), HTTP_X_VULCANO_PROFILE=self.token)
+        self.assertIsNotNone(profiler.profile_path(response['X-Vulcano-Profile']))
+
+    def test_event_limit_truncates(self):
+        """El límite de eventos corta el perfil sin romper la petición"""
+        with self.settings(PROFILER_MAX_EVENTS=100):
+            response = self.client.get(reverse('vulcano:home'), {'_profile': self.token})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(profiler.list_profiles()[0]['truncated'])
+
+    def test_old_profiles_are_pruned(self):
+        """Solo se conservan los PROFILER_KEEP más recientes"""
+        with self.settings(PROFILER_KEEP=2, PROFILER_MAX_EVENTS=100):
+            for _ in range(3):
+                self.client.get(reverse('vulcano:home'), {'_profile': self.token})
+        self.assertEqual(len(profiler.list_profiles()), 2)
+        self.assertEqual(len(os.listdir(self.directory)), 4)
+
+    def test_views_require_staff(self):
+        """La lista y la descarga solo son accesibles para staff"""
+        response = self.client.get(reverse('vulcano:home'), HTTP_X_VULCANO_PROFILE=self.token)
+        profile_id = response['X-Vulcano-Profile']
+        download = reverse('vulcano:profile_download', args=[profile_id])
+
+        self.assertEqual(self.client.get(reverse('vulcano:profile_list')).status_code, 302)
+        self.assertEqual(self.client.get(download).status_code, 302)
+
+        self.client.force_login(self.staff)
+        response = self.client.get(reverse('vulcano:profile_list'))
+        self.assertContains(response, profile_id)
+        response = self.client.get(download)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('attachment', response['Content-Disposition'])
+        self.assertEqual(self.client.get(reverse('vulcano:profile_download', args=['no-existe'])).status_code, 404)
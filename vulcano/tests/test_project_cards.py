@@ -0,0 +1,134 @@
+"""
+Test Project Cards - Vulcano Platform
+Tests de la caché de fragmentos de tarjetas de proyecto
+"""
+
+from django.test import TestCase, Client
+from django.template import Context, Template
+from django.urls import reverse
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from unittest import mock
+from vulcano.models import Project
+from vulcano.templatetags.project_cards import card_cache_key, render_card
+import logging
+import statistics
+import time
+
+logger = logging.getLogger('vulcano')
+
+GRID_TEMPLATE = Template(
+    "{% load project_cards %}"
+    "{% prefetch_project_cards projects 'grid' %}"
+    "{% for project in projects %}{% project_card project 'grid' %}{% endfor %}"
+)
+UNCACHED_GRID_TEMPLATE = Template(
+    "{% for project in projects %}{% include 'partials/project_cards/_grid.html' %}{% endfor %}"
+)
+
+
+class ProjectCardCacheTest(TestCase):
+    """Tests del tag {% project_card %}"""
+
+    def setUp(self):
+        """Configuración inicial"""
+        self.arquitecto = User.objects.create_user(
+            username='arquitecto',
+            email='arq@test.com',
+            password='pass123',
+            first_name='Ana',
+            last_name='Torres'
+        )
+        self.projects = [
+            Project.objects.create(
+                title=f'Proyecto {i}',
+                description='Descripción de prueba ' * 10,
+                category='residential',
+                status='completed',
+                location='Lima, Perú',
+                arquitecto=self.arquitecto,
+                is_published=True
+            )
+            for i in range(12)
+        ]
+        cache.clear()
+
+    def render_grid(self):
+        return GRID_TEMPLATE.render(Context({'projects': self.projects}))
+
+    def test_cached_card_matches_uncached_render(self):
+        """La tarjeta cacheada es idéntica a la renderizada sin caché"""
+        expected = UNCACHED_GRID_TEMPLATE.render(Context({'projects': self.projects}))
+        self.assertEqual(self.render_grid(), expected)
+        self.assertEqual(self.render_grid(), expected)
+
+    def test_page_uses_single_cache_round_trip(self):
+        """Con la página en caché solo se hace un get_many y ningún render"""
+        self.render_grid()
+        cached = cache.get_many([card_cache_key(project, 'grid') for project in self.projects])
+        with mock.patch.object(cache, 'get') as get, \
+                mock.patch.object(cache, 'get_many', return_value=cached) as get_many, \
+                mock.patch('vulcano.templatetags.project_cards.render_card') as render:
+            self.render_grid()
+        self.assertEqual(get_many.call_count, 1)
+        self.assertEqual(get.call_count, 0)
+        render.assert_not_called()
+
+    def test_key_changes_with_project_version(self):
+        """La clave cambia al editar el proyecto, su imagen o sus visitas"""
+        project = self.projects[0]
+        original = card_cache_key(project, 'grid')
+
+        project.title = 'Proyecto Renombrado'
+        project.save()
+        edited = card_cache_key(project, 'grid')
+        self.assertNotEqual(edited, original)
+
+        project.increment_views()
+        viewed = card_cache_key(project, 'grid')
+        self.assertNotEqual(viewed, edited)
+
+        project.main_image_url = '/media/projects/nueva.jpg'
+        self.assertNotEqual(card_cache_key(project, 'grid'), viewed)
+
+    def test_edited_project_renders_fresh_card(self):
+        """Una tarjeta editada se vuelve a renderizar con los datos nuevos"""
+        self.render_grid()
+        self.projects[3].title = 'Título Actualizado'
+        self.projects[3].save()
+        self.assertIn('Título Actualizado', self.render_grid())
+
+    def test_listings_render_cards(self):
+        """Home y detalle muestran las tarjetas de proyectos"""
+        response = Client().get(reverse('vulcano:home'))
+        self.assertContains(response, 'class="project-card"', count=12)
+
+        response = Client().get(reverse('vulcano:project_detail', kwargs={'slug': self.projects[0].slug}))
+        self.assertContains(response, 'Proyectos Relacionados')
+        self.assertContains(response, 'class="card-vulcano"', count=3)
+
+    def test_render_time_benchmark(self):
+        """Benchmark: tiempo de render de una página de 12 tarjetas sin y con caché"""
+        def measure(func, repeat=15):
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                func()
+                timings.append((time.perf_counter() - start) * 1000)
+            return statistics.median(timings)
+
+        def uncached():
+            for project in self.projects:
+                render_card(project, 'grid')
+
+        before = measure(uncached)
+        self.render_grid()
+        after = measure(self.render_grid)
+        # Los tiempos solo se registran: compararlos haría el test inestable en CI
+        logger.info(f"Render de 12 tarjetas: {before:.2f} ms sin caché, {after:.2f} ms con caché")
+
+        # Con la caché caliente la rejilla no renderiza tarjetas ni consulta la base de datos
+        with mock.patch('vulcano.templatetags.project_cards.render_card', wraps=render_card) as render, \
+                self.assertNumQueries(0):
+            self.render_grid()
+        render.assert_not_called()
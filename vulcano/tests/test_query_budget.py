@@ -0,0 +1,146 @@
+"""
+Test Query Budget - Vulcano Platform
+Tests del presupuesto de consultas por vista y del detector de N+1
+"""
+
+from django.test import TestCase, Client, RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth.models import User
+from django.db import connection
+from django.http import HttpResponse
+from vulcano.middleware import QueryBudgetMiddleware
+from vulcano.models import Project
+from vulcano.query_budget import QueryBudgetExceeded, fingerprint, query_budget
+from vulcano.tests.test_performance import TEMP_MEDIA_ROOT, make_image_file
+
+
+def run_view(view):
+    """Ejecuta una vista a través de QueryBudgetMiddleware como lo haría el handler"""
+    def get_response(request):
+        middleware.process_view(request, view, (), {})
+        return view(request)
+    middleware = QueryBudgetMiddleware(get_response)
+    return middleware(RequestFactory().get('/'))
+
+
+@query_budget(2)
+def two_queries(request):
+    list(User.objects.all())
+    list(Project.objects.all())
+    return HttpResponse()
+
+
+@query_budget(2)
+def three_queries(request):
+    list(User.objects.all())
+    list(Project.objects.all())
+    User.objects.count()
+    return HttpResponse()
+
+
+def n_plus_one(request):
+    for user in User.objects.all():
+        Project.objects.filter(arquitecto_id=user.pk).count()
+    return HttpResponse()
+
+
+class QueryBudgetTest(TestCase):
+    """Tests del middleware y del decorador"""
+
+    def setUp(self):
+        """Configuración inicial"""
+        for i in range(5):
+            User.objects.create_user(username=f'usuario{i}', password='pass123')
+
+    def test_fingerprint(self):
+        """Los literales y las listas IN no cambian la huella"""
+        self.assertEqual(
+            fingerprint('SELECT * FROM "t" WHERE "id" IN (%s, %s, %s) AND "x" = 3'),
+            fingerprint('SELECT * FROM "t" WHERE "id" IN (%s)  AND "x" = 41'),
+        )
+        self.assertEqual(fingerprint("SELECT 'a''b', 7"), 'SELECT ?, ?')
+
+    def test_within_budget(self):
+        """Una vista dentro de su presupuesto responde normalmente"""
+        self.assertEqual(run_view(two_queries).status_code, 200)
+
+    def test_over_budget_raises_in_tests(self):
+        """En modo 'raise' superar el presupuesto es un error"""
+        with self.assertRaisesMessage(QueryBudgetExceeded, '3 consultas con un presupuesto de 2'):
+            run_view(three_queries)
+
+    def test_repeated_queries_are_reported(self):
+        """Cinco consultas de la misma forma se detectan como N+1"""
+        with self.assertRaisesMessage(QueryBudgetExceeded, 'posible N+1, 5 veces'):
+            run_view(n_plus_one)
+
+    @override_settings(QUERY_BUDGET_MODE='log')
+    def test_log_mode_only_warns(self):
+        """En modo 'log' solo se registra un aviso"""
+        with self.assertLogs('vulcano', level='WARNING') as logs:
+            self.assertEqual(run_view(three_queries).status_code, 200)
+        self.assertIn('three_queries', logs.output[0])
+
+    @override_settings(QUERY_BUDGET_MODE='log', QUERY_BUDGET_SAMPLE_RATE=0)
+    def test_unsampled_requests_are_not_tracked(self):
+        """Las peticiones fuera de la muestra no se miden"""
+        with self.assertNoLogs('vulcano', level='WARNING'):
+            run_view(three_queries)
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
+class ViewBudgetRegressionTest(TestCase):
+    """Las vistas no crecen en consultas con más filas"""
+
+    def setUp(self):
+        """Configuración inicial"""
+        self.arquitecto = User.objects.create_user(username='arquitecto', password='pass123')
+        self.arquitecto.profile.role = 'arquitecto'
+        self.arquitecto.profile.save()
+        self.admin = User.objects.create_superuser(username='admin', password='pass123', email='a@a.com')
+        self.client = Client()
+
+    def create_projects(self, total):
+        for i in range(total):
+            architect = User.objects.create_user(username=f'arq{i}', password='pass123')
+            Project.objects.create(
+                title=f'Proyecto {i}',
+                description='Test',
+                category='residential',
+                status='completed',
+                location='Lima',
+                arquitecto=architect,
+                is_published=True,
+                is_featured=True
+            )
+
+    def test_home_with_many_projects(self):
+        """La portada con muchos proyectos no repite consultas"""
+        self.create_projects(15)
+        self.assertEqual(self.client.get(reverse('vulcano:home')).status_code, 200)
+
+    def test_admin_changelist_selects_architects(self):
+        """El listado del admin carga los arquitectos en la misma consulta"""
+        self.create_projects(10)
+        self.client.force_login(self.admin)
+        response = self.client.get(reverse('admin:vulcano_project_changelist'))
+        self.assertEqual(response.status_code, 200)
+
+    def test_project_create_inserts_images_at_once(self):
+        """Las imágenes de un proyecto nuevo se insertan en una sola sentencia"""
+        self.client.login(username='arquitecto', password='pass123')
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.post(reverse('vulcano:project_create'), {
+                'title': 'Casa Lote',
+                'description': 'Proyecto con galería',
+                'category': 'residential',
+                'status': 'draft',
+                'location': 'Lima',
+                'images': [make_image_file(f'foto{i}.png') for i in range(5)],
+            })
+        project = Project.objects.get(title='Casa Lote')
+        self.assertEqual(project.images.count(), 5)
+        self.assertEqual(project.main_image.order, 0)
+        inserts = [q['sql'] for q in ctx.captured_queries if q['sql'].startswith('INSERT INTO "vulcano_project_image"')]
+        self.assertEqual(len(inserts), 1)
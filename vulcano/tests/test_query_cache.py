@@ -0,0 +1,121 @@
+"""
+Test Query Cache - Vulcano Platform
+Tests de la caché de resultados de QuerySet por versiones de tabla
+"""
+
+from django.test import TestCase, Client
+from django.urls import reverse
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import transaction
+from vulcano.models import Project, Message
+from vulcano.query_cache import written_table
+
+
+class QueryCacheTest(TestCase):
+    """Tests de .cached() y de la invalidación por tabla"""
+
+    def setUp(self):
+        """Configuración inicial"""
+        cache.clear()
+        self.arquitecto = User.objects.create_user(username='arquitecto', password='pass123')
+        self.cliente = User.objects.create_user(username='cliente', password='pass123')
+        self.project = Project.objects.create(
+            title='Casa Patio',
+            description='Test',
+            category='residential',
+            status='completed',
+            location='Lima',
+            arquitecto=self.arquitecto,
+            is_published=True
+        )
+
+    def published(self):
+        return Project.objects.filter(is_published=True).select_related('arquitecto').cached(60)
+
+    def test_written_table(self):
+        """Se reconoce la tabla de cada sentencia de escritura"""
+        self.assertEqual(written_table('INSERT INTO "vulcano_project" ("title") VALUES (%s)'), 'vulcano_project')
+        self.assertEqual(written_table('INSERT OR IGNORE INTO "vulcano_message" ("id")'), 'vulcano_message')
+        self.assertEqual(written_table('UPDATE "auth_user" SET "first_name" = %s'), 'auth_user')
+        self.assertEqual(written_table(' DELETE FROM `vulcano_project` WHERE 1'), 'vulcano_project')
+        self.assertIsNone(written_table('SELECT * FROM "vulcano_project"'))
+
+    def test_results_are_cached(self):
+        """La segunda evaluación no consulta la base de datos"""
+        self.assertEqual(list(self.published()), [self.project])
+        with self.assertNumQueries(0):
+            projects = list(self.published())
+            self.assertEqual(projects[0].arquitecto.username, 'arquitecto')
+
+    def test_different_queries_do_not_collide(self):
+        """Cada SQL y parámetros tienen su propia entrada"""
+        list(self.published())
+        self.assertEqual(list(Project.objects.filter(is_published=False).cached(60)), [])
+        self.assertEqual(
+            list(Project.objects.filter(is_published=True).values_list('title', flat=True).cached(60)),
+            ['Casa Patio']
+        )
+
+    def test_save_and_delete_invalidate(self):
+        """Guardar o eliminar un proyecto invalida las consultas de su tabla"""
+        list(self.published())
+        self.project.title = 'Casa Patio Nueva'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project.save()
+        self.assertEqual(self.published()[0].title, 'Casa Patio Nueva')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project.delete()
+        self.assertEqual(list(self.published()), [])
+
+    def test_joined_table_invalidates(self):
+        """Un cambio en una tabla de select_related también invalida"""
+        list(self.published())
+        self.arquitecto.first_name = 'Ana'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.arquitecto.save()
+        self.assertEqual(self.published()[0].arquitecto.first_name, 'Ana')
+
+    def test_bulk_update_without_signals_invalidates(self):
+        """queryset.update() de Message, sin señales, invalida igualmente"""
+        Message.objects.create(sender=self.cliente, recipient=self.arquitecto, subject='Hola', body='Test')
+        unread = Message.objects.filter(is_read=False).cached(60)
+        self.assertEqual(len(unread), 1)
+        Message.objects.update(is_read=True)
+        self.assertEqual(len(Message.objects.filter(is_read=False).cached(60)), 0)
+
+    def test_pending_writes_bypass_cache(self):
+        """Dentro de una transacción con escrituras se lee de la base de datos"""
+        list(self.published())
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                Project.objects.filter(pk=self.project.pk).update(title='En curso')
+                self.assertEqual(self.published()[0].title, 'En curso')
+        self.assertEqual(self.published()[0].title, 'En curso')
+
+    def test_prefetch_runs_on_cached_results(self):
+        """Los prefetch_related se resuelven sobre la lista cacheada"""
+        self.project.clients.add(self.cliente)
+        list(Project.objects.prefetch_related('clients').cached(60))
+        with self.assertNumQueries(1):
+            projects = list(Project.objects.prefetch_related('clients').cached(60))
+        self.assertEqual(list(projects[0].clients.all()), [self.cliente])
+
+    def test_ignored_tables_cannot_be_cached(self):
+        """Las consultas sobre tablas no versionadas se rechazan"""
+        with self.assertRaises(ValueError):
+            list(Project.objects.filter(pending_views__isnull=False).cached(60))
+
+    def test_admin_action_invalidates(self):
+        """Las acciones masivas del admin invalidan las consultas cacheadas"""
+        admin = User.objects.create_superuser(username='admin', password='pass123', email='a@a.com')
+        client = Client()
+        client.force_login(admin)
+        list(self.published())
+        with self.captureOnCommitCallbacks(execute=True):
+            client.post(reverse('admin:vulcano_project_changelist'), {
+                'action': 'make_unpublished',
+                '_selected_action': [self.project.pk],
+            })
+        self.assertEqual(list(self.published()), [])
@@ -0,0 +1,101 @@
+"""
+Test Sampler - Vulcano Platform
+Tests del muestreador continuo de CPU y del comando merge_samples
+"""
+
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.template import Context, Template
+from io import StringIO
+from vulcano.sampler import Sampler, merge, stop_sampler
+import json
+import os
+import shutil
+import tempfile
+import time
+
+
+class SamplerTest(TestCase):
+    """Tests del muestreo, el volcado por worker y la unión de archivos"""
+
+    def setUp(self):
+        """Configuración inicial"""
+        self.directory = tempfile.mkdtemp()
+        self.settings_override = override_settings(
+            SAMPLER_DIRECTORY=self.directory, SAMPLER_HZ=1000, SAMPLER_FLUSH_INTERVAL=3600
+        )
+        self.settings_override.enable()
+
+    def tearDown(self):
+        stop_sampler()
+        self.settings_override.disable()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def sampler(self, pid=None):
+        sampler = Sampler(10, self.directory, 3600)
+        if pid is not None:
+            sampler.pid = pid
+        return sampler
+
+    def test_sample_folds_stack_under_view(self):
+        """La vista es la raíz del stack y las plantillas llevan su nombre"""
+        sampler = self.sampler()
+        sampler.begin()
+        sampler.set_view('vulcano:prueba')
+        Template('{{ probe }}', name='prueba.html').render(Context({'probe': sampler.sample}))
+        sampler.end()
+        sampler.sample()
+
+        (stack, count), = sampler.counts.items()
+        self.assertEqual(count, 1)
+        self.assertTrue(stack.startswith('vulcano:prueba;'))
+        self.assertIn(';plantilla:prueba.html;', stack)
+        self.assertIn('test_sample_folds_stack_under_view', stack)
+
+    def test_workers_are_merged(self):
+        """Los archivos de varios workers se suman en la ventana"""
+        for pid in (101, 102):
+            sampler = self.sampler(pid)
+            sampler.counts.update({'vulcano:home;a;b': 2, 'vulcano:dashboard;a': 1})
+            sampler.flush()
+        with open(os.path.join(self.directory, f'{int(time.time()) - 7200}-103.folded'), 'w') as old:
+            old.write('vulcano:home;a;b 50\n')
+
+        counts = merge(self.directory, time.time() - 3600, time.time())
+        self.assertEqual(counts['vulcano:home;a;b'], 4)
+        self.assertEqual(counts['vulcano:dashboard;a'], 2)
+        self.assertEqual(merge(self.directory, time.time() - 3600, time.time(), 'vulcano:dashboard'),
+                         {'vulcano:dashboard;a': 2})
+
+    def test_merge_command(self):
+        """El comando genera folded o JSON de speedscope"""
+        sampler = self.sampler()
+        sampler.counts.update({'vulcano:home;a;b': 3, 'vulcano:home;a': 1})
+        sampler.flush()
+
+        out = StringIO()
+        call_command('merge_samples', stdout=out)
+        self.assertEqual(out.getvalue(), 'vulcano:home;a;b 3\nvulcano:home;a 1\n')
+
+        output = os.path.join(self.directory, 'flame.json')
+        call_command('merge_samples', '--format', 'speedscope', '--output', output, stdout=StringIO())
+        with open(output) as data:
+            profile = json.load(data)['profiles'][0]
+        self.assertEqual(profile['type'], 'sampled')
+        self.assertEqual(profile['weights'], [3, 1])
+
+        with self.assertRaises(CommandError):
+            call_command('merge_samples', '--view', 'vulcano:otra', stdout=StringIO())
+
+    def test_middleware_samples_requests(self):
+        """Con el muestreador activo las peticiones reales quedan registradas"""
+        with self.settings(SAMPLER_ENABLED=True):
+            client = Client()
+            for _ in range(50):
+                client.get(reverse('vulcano:home'))
+                stop_sampler()
+                if merge(self.directory, 0, time.time() + 1, 'vulcano:home'):
+                    break
+        self.assertTrue(merge(self.directory, 0, time.time() + 1, 'vulcano:home'))
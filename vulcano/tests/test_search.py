@@ -0,0 +1,106 @@
+"""
+Test Search - Vulcano Platform
+Tests del motor de búsqueda de texto completo de proyectos
+"""
+
+from django.test import TestCase, Client
+from django.urls import reverse
+from django.contrib.auth.models import User
+from vulcano.models import Project, ProjectSearchDocument
+from vulcano.search import normalize_text, search_projects, rebuild_index, trigram_similarity
+
+
+class NormalizeTextTest(TestCase):
+    """Tests de normalización de texto"""
+
+    def test_normalize_removes_accents_and_case(self):
+        """Verificar que elimina acentos y mayúsculas"""
+        self.assertEqual(normalize_text('Jardín de Hormigón'), 'jardin de hormigon')
+
+    def test_normalize_strips_punctuation(self):
+        """Verificar que elimina signos de puntuación"""
+        self.assertEqual(normalize_text('  Casa, (moderna)! '), 'casa moderna')
+
+    def test_trigram_similarity_tolerates_typos(self):
+        """Verificar similitud alta ante errores tipográficos"""
+        self.assertGreater(trigram_similarity('bibliteca', 'nueva biblioteca municipal'), 0.3)
+        self.assertLess(trigram_similarity('hospital', 'nueva biblioteca municipal'), 0.3)
+
+
+class ProjectSearchTest(TestCase):
+    """Tests de búsqueda sobre el índice mantenido por señales"""
+
+    def setUp(self):
+        """Configuración inicial"""
+        self.arquitecto = User.objects.create_user(
+            username='arquitecto',
+            email='arq@test.com',
+            password='pass123'
+        )
+        self.museo = self.create_project(
+            'Museo de Arte Contemporáneo', 'Gran sala de exposiciones con lucernarios', 'Lima'
+        )
+        self.casa = self.create_project(
+            'Casa Moderna', 'Vivienda unifamiliar junto al museo del barrio', 'Cusco'
+        )
+        self.escuela = self.create_project(
+            'Escuela Rural', 'Aulas de madera y adobe', 'Jaén'
+        )
+
+    def create_project(self, title, description, location):
+        return Project.objects.create(
+            title=title,
+            description=description,
+            category='cultural',
+            status='completed',
+            location=location,
+            arquitecto=self.arquitecto,
+            is_published=True
+        )
+
+    def search(self, query):
+        return list(search_projects(Project.objects.all(), query))
+
+    def test_document_created_on_save(self):
+        """Verificar que cada proyecto tiene documento de búsqueda"""
+        self.assertEqual(ProjectSearchDocument.objects.count(), 3)
+        self.assertIn('contemporaneo', self.museo.search_document.content)
+
+    def test_search_is_accent_insensitive(self):
+        """Verificar búsqueda sin acentos"""
+        self.assertEqual(self.search('contemporaneo'), [self.museo])
+        self.assertEqual(self.search('JAEN'), [self.escuela])
+
+    def test_search_matches_prefixes(self):
+        """Verificar coincidencia por prefijo mientras se escribe"""
+        self.assertIn(self.museo, self.search('contemp'))
+
+    def test_title_ranks_above_description(self):
+        """Verificar que una coincidencia en el título pesa más que en la descripción"""
+        self.assertEqual(self.search('museo'), [self.museo, self.casa])
+
+    def test_search_tolerates_typos(self):
+        """Verificar tolerancia a errores tipográficos"""
+        self.assertIn(self.escuela, self.search('escuele'))
+
+    def test_index_updated_on_save_and_delete(self):
+        """Verificar que el índice sigue los cambios de los proyectos"""
+        self.escuela.title = 'Colegio Rural'
+        self.escuela.save()
+        self.assertEqual(self.search('colegio'), [self.escuela])
+
+        self.escuela.delete()
+        self.assertEqual(self.search('colegio'), [])
+
+    def test_rebuild_index_after_bulk_update(self):
+        """Verificar reconstrucción tras un update masivo que no dispara señales"""
+        Project.objects.filter(pk=self.casa.pk).update(title='Residencia Andina')
+        self.assertEqual(self.search('andina'), [])
+
+        self.assertEqual(rebuild_index(), 3)
+        self.assertEqual(self.search('andina'), [self.casa])
+
+    def test_home_view_uses_search(self):
+        """Verificar que home filtra y ordena por relevancia"""
+        response = Client().get(reverse('vulcano:home'), {'search': 'museo'})
+        self.assertEqual(list(response.context['projects']), [self.museo, self.casa])
@@ -0,0 +1,77 @@
+"""
+Test Slow Queries - Vulcano Platform
+Tests del registro de consultas lentas y sus planes
+"""
+
+from django.test import TestCase, override_settings
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from io import StringIO
+from vulcano.models import Project
+from vulcano.slow_queries import get_store
+import os
+import shutil
+import tempfile
+
+
+class SlowQueriesTest(TestCase):
+    """Tests del envoltorio de ejecución y del comando de reporte"""
+
+    def setUp(self):
+        """Configuración inicial"""
+        self.directory = tempfile.mkdtemp()
+        self.settings_override = override_settings(
+            SLOW_QUERY_LOCATION=os.path.join(self.directory, 'slow.sqlite3'),
+            SLOW_QUERY_THRESHOLD_MS=0,
+            SLOW_QUERY_EXPLAIN_RATE=1.0,
+        )
+        self.settings_override.enable()
+        self.arquitecto = User.objects.create_user(username='arquitecto', password='pass123')
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_queries_are_grouped_by_fingerprint(self):
+        """Consultas iguales con distintos parámetros comparten huella"""
+        get_store().clear()
+        for title in ('Casa', 'Museo', 'Teatro'):
+            list(Project.objects.filter(title=title))
+        query = next(q for q in get_store().top(50, 'calls') if 'FROM "vulcano_project"' in q['fingerprint'])
+        self.assertEqual(query['calls'], 3)
+        self.assertGreaterEqual(query['max_ms'], query['p95_ms'])
+        self.assertIn('vulcano_project', query['plan'])
+
+    def test_writes_are_not_explained(self):
+        """Solo se piden planes de SELECT"""
+        get_store().clear()
+        Project.objects.filter(pk=0).update(title='x')
+        updates = [q for q in get_store().top(50) if q['fingerprint'].startswith('UPDATE')]
+        self.assertTrue(updates)
+        self.assertIsNone(updates[0]['plan'])
+
+    def test_explain_does_not_count_as_query(self):
+        """El EXPLAIN usa el cursor del driver, fuera de los envoltorios"""
+        with self.assertNumQueries(1):
+            list(Project.objects.all())
+
+    def test_below_threshold_is_ignored(self):
+        """Las consultas rápidas no se registran"""
+        get_store().clear()
+        with self.settings(SLOW_QUERY_THRESHOLD_MS=60000):
+            list(Project.objects.all())
+        self.assertEqual(get_store().top(), [])
+
+    def test_report_command(self):
+        """El comando lista las peores consultas con sus planes"""
+        get_store().clear()
+        list(Project.objects.filter(title='Casa'))
+        out = StringIO()
+        call_command('slow_queries', '--plans', '--order', 'calls', stdout=out)
+        self.assertIn('vulcano_project', out.getvalue())
+        self.assertIn('| ', out.getvalue())
+
+        call_command('slow_queries', '--clear', stdout=StringIO())
+        out = StringIO()
+        call_command('slow_queries', stdout=out)
+        self.assertIn('Sin consultas lentas', out.getvalue())
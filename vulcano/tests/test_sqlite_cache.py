@@ -0,0 +1,102 @@
+"""
+Test SQLite Cache - Vulcano Platform
+Tests del backend de caché compartido entre procesos
+"""
+
+from django.test import SimpleTestCase
+from unittest import mock
+import os
+import tempfile
+import threading
+import time
+from vulcano.sqlite_cache import SQLiteCache
+
+
+class SQLiteCacheTest(SimpleTestCase):
+    """Tests de SQLiteCache sobre un archivo temporal"""
+
+    def setUp(self):
+        """Configuración inicial"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'cache.sqlite3')
+        self.cache = self.make_cache()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def make_cache(self, **options):
+        return SQLiteCache(self.path, {'TIMEOUT': 300, 'OPTIONS': options})
+
+    def test_basic_operations(self):
+        """set/get/add/delete/get_many/set_many/has_key"""
+        self.cache.set('a', {'x': 1})
+        self.assertEqual(self.cache.get('a'), {'x': 1})
+        self.assertFalse(self.cache.add('a', 2))
+        self.assertTrue(self.cache.add('b', 2))
+        self.cache.set_many({'c': 3, 'd': [4]})
+        self.assertEqual(self.cache.get_many(['a', 'b', 'c', 'd', 'z']), {'a': {'x': 1}, 'b': 2, 'c': 3, 'd': [4]})
+        self.assertTrue(self.cache.delete('a'))
+        self.assertFalse(self.cache.has_key('a'))
+        self.assertEqual(self.cache.get('a', 'def'), 'def')
+        self.cache.delete_many(['b', 'c'])
+        self.assertEqual(self.cache.get_many(['b', 'c', 'd']), {'d': [4]})
+        self.cache.clear()
+        self.assertEqual((self.cache.get('d'), self.cache.size()), (None, 0))
+
+    def test_ttl(self):
+        """Las entradas caducadas no se sirven y pueden volver a añadirse"""
+        self.cache.set('a', 1, 10)
+        self.cache.set('forever', 1, None)
+        with mock.patch('vulcano.sqlite_cache.time.time', return_value=time.time() + 11):
+            self.assertIsNone(self.cache.get('a'))
+            self.assertTrue(self.cache.add('a', 2))
+            self.assertEqual(self.cache.get('forever'), 1)
+        self.cache.set('cero', 1, 0)
+        self.assertIsNone(self.cache.get('cero'))
+
+    def test_incr_is_atomic_across_connections(self):
+        """incr concurrente desde varios hilos (conexiones distintas) no pierde incrementos"""
+        self.cache.set('counter', 0)
+        with self.assertRaises(ValueError):
+            self.cache.incr('missing')
+
+        def work():
+            other = self.make_cache()
+            for _ in range(50):
+                other.incr('counter')
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.cache.get('counter'), 200)
+        self.assertEqual(self.cache.decr('counter', 10), 190)
+
+    def test_shared_between_instances(self):
+        """Dos instancias sobre el mismo archivo (dos workers) ven las mismas entradas"""
+        worker = self.make_cache()
+        worker.set('user_stats_1', {'total': 3})
+        self.assertEqual(self.cache.get('user_stats_1'), {'total': 3})
+        self.cache.delete('user_stats_1')
+        self.assertIsNone(worker.get('user_stats_1'))
+
+    def test_lru_eviction_within_budget(self):
+        """Al superar MAX_BYTES se expulsan las entradas de acceso más antiguo"""
+        cache = self.make_cache(MAX_BYTES=20000)
+        payload = 'x' * 1000
+        with mock.patch('vulcano.sqlite_cache.time.time') as clock:
+            for i in range(15):
+                clock.return_value = 1000.0 + i * 100
+                cache.set(f'k{i}', payload, None)
+            # Leer k0 lo marca como reciente
+            clock.return_value = 3000.0
+            cache.get('k0')
+            for i in range(15, 25):
+                clock.return_value = 3000.0 + i * 100
+                cache.set(f'k{i}', payload, None)
+
+        self.assertLessEqual(cache.size(), 20000)
+        self.assertIsNotNone(cache.get('k0'))
+        self.assertIsNone(cache.get('k1'))
+        self.assertIsNotNone(cache.get('k24'))
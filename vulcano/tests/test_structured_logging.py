@@ -0,0 +1,110 @@
+"""
+Test Structured Logging - Vulcano Platform
+Tests del logging estructurado, perezoso, muestreado y asíncrono
+"""
+
+from django.test import TestCase
+from vulcano.structured_logging import (
+    JsonFormatter, log_event, install_queue_logging, stop_queue_logging
+)
+import json
+import logging
+import threading
+
+
+class RecordingHandler(logging.Handler):
+    """Guarda los registros y el hilo en que se escribieron"""
+
+    def __init__(self):
+        super().__init__()
+        self.records = []
+        self.threads = []
+
+    def emit(self, record):
+        self.records.append(record)
+        self.threads.append(threading.current_thread())
+
+
+class StructuredLoggingTest(TestCase):
+    """Tests de log_event, JsonFormatter y la cola de logging"""
+
+    def setUp(self):
+        """Configuración inicial"""
+        self.logger = logging.getLogger('vulcano.tests.structured')
+        self.logger.propagate = False
+        self.logger.setLevel(logging.INFO)
+        self.handler = RecordingHandler()
+        self.logger.addHandler(self.handler)
+
+    def tearDown(self):
+        stop_queue_logging()
+        for handler in list(self.logger.handlers):
+            self.logger.removeHandler(handler)
+
+    def test_disabled_level_evaluates_nothing(self):
+        """Con el nivel deshabilitado los campos perezosos no se evalúan"""
+        calls = []
+        log_event(self.logger, 'prueba', logging.DEBUG, total=lambda: calls.append(1))
+        self.assertEqual(calls, [])
+        self.assertEqual(self.handler.records, [])
+
+    def test_lazy_fields_are_evaluated_when_emitted(self):
+        """Los invocables se resuelven y el mensaje de texto lleva los campos"""
+        log_event(self.logger, 'prueba', user='ana', total=lambda: 3)
+        record, = self.handler.records
+        self.assertEqual(record.fields, {'user': 'ana', 'total': 3})
+        self.assertEqual(record.getMessage(), 'prueba user=ana total=3')
+        self.assertEqual(record.funcName, 'test_lazy_fields_are_evaluated_when_emitted')
+
+    def test_sampling(self):
+        """Los eventos muestreados se descartan antes de evaluar campos"""
+        calls = []
+        with self.settings(LOG_SAMPLE_RATES={'ruidoso': 0.0, 'mitad': 0.5}):
+            for _ in range(20):
+                log_event(self.logger, 'ruidoso', total=lambda: calls.append(1))
+            for _ in range(200):
+                log_event(self.logger, 'mitad')
+        self.assertEqual(calls, [])
+        self.assertTrue(0 < len(self.handler.records) < 200)
+        self.assertEqual(self.handler.records[0].fields['sample_rate'], 0.5)
+
+    def test_json_formatter(self):
+        """Eventos con campos al primer nivel y registros de texto con message"""
+        log_event(self.logger, 'prueba', user='ana', when=object)
+        self.logger.info('texto %s', 'plano')
+        event, plain = (json.loads(JsonFormatter().format(record)) for record in self.handler.records)
+        self.assertEqual(event['event'], 'prueba')
+        self.assertEqual(event['user'], 'ana')
+        self.assertEqual(event['level'], 'INFO')
+        self.assertEqual(plain['message'], 'texto plano')
+
+    def test_queue_listener_writes_in_its_own_thread(self):
+        """Con la cola instalada, el handler real escribe desde el listener"""
+        install_queue_logging(self.logger)
+        self.assertNotIn(self.handler, self.logger.handlers)
+        log_event(self.logger, 'prueba', user='ana')
+        stop_queue_logging()
+
+        self.assertIn(self.handler, self.logger.handlers)
+        self.assertEqual(self.handler.records[0].fields, {'user': 'ana'})
+        self.assertIsNot(self.handler.threads[0], threading.current_thread())
+
+    def test_plain_records_are_formatted_before_queueing(self):
+        """Los registros normales se formatean en el hilo que loguea; los eventos no"""
+        install_queue_logging(self.logger)
+        items = ['antes']
+        self.logger.info('lista %s', items)
+        items.append('después')
+        try:
+            raise ValueError('fallo')
+        except ValueError:
+            self.logger.exception('error')
+        log_event(self.logger, 'prueba', user='ana')
+        stop_queue_logging()
+
+        plain, error, event = self.handler.records
+        self.assertEqual(plain.getMessage(), "lista ['antes']")
+        self.assertIsNone(plain.args)
+        self.assertIsNone(error.exc_info)
+        self.assertIn('ValueError: fallo', json.loads(JsonFormatter().format(error))['exception'])
+        self.assertEqual(event.fields, {'user': 'ana'})
@@ -0,0 +1,127 @@
+"""
+Test Tiered Cache - Vulcano Platform
+Tests de la caché L1 por proceso y su bus de invalidación
+"""
+
+from django.core.cache import caches
+from django.test import SimpleTestCase, override_settings
+from unittest import mock
+import multiprocessing
+import os
+import tempfile
+import time
+from vulcano import tiered_cache
+
+POLL_INTERVAL = 0.05
+# Margen para el arranque del sondeo y la planificación del sistema
+STALE_BOUND = POLL_INTERVAL + 0.5
+
+
+def read_until(stop, results):
+    """Proceso lector: informa de cada cambio del valor que ve en su L1."""
+    cache = caches['default']
+    seen = 'inicial'
+    while not stop.is_set():
+        value = cache.get('featured_projects')
+        if value != seen:
+            results.put((value, time.time()))
+            seen = value
+        time.sleep(0.005)
+
+
+class TieredCacheTest(SimpleTestCase):
+    """Tests de TieredCache sobre una caché SQLiteCache temporal"""
+
+    def setUp(self):
+        """Configuración inicial"""
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        tiered_cache._tiers.clear()
+        self.addCleanup(tiered_cache._tiers.clear)
+        self.use_caches(os.path.join(tmp.name, 'cache.sqlite3'), bus='sqlite')
+
+    def use_caches(self, path, bus):
+        override = override_settings(CACHES={
+            'default': {
+                'BACKEND': 'vulcano.tiered_cache.TieredCache',
+                'LOCATION': 'shared',
+                'OPTIONS': {
+                    'L1_KEYS': r'^(featured_projects|user_stats_\d+)$',
+                    'L1_TIMEOUT': 30,
+                    'POLL_INTERVAL': POLL_INTERVAL,
+                    'BUS': bus,
+                },
+            },
+            'shared': {'BACKEND': 'vulcano.sqlite_cache.SQLiteCache', 'LOCATION': path},
+        })
+        override.enable()
+        self.addCleanup(override.disable)
+        self.cache = caches['default']
+
+    def test_l1_serves_hot_keys_without_l2(self):
+        """Las claves L1 se leen del proceso; las demás siempre del nivel 2"""
+        self.cache.set('featured_projects', [1, 2])
+        self.cache.set('page_cache:x', 'html')
+        self.cache.get('featured_projects')
+
+        with mock.patch.object(caches['shared'], 'get', wraps=caches['shared'].get) as l2_get:
+            value = self.cache.get('featured_projects')
+            self.assertEqual(self.cache.get('page_cache:x'), 'html')
+        self.assertEqual(value, [1, 2])
+        self.assertEqual(l2_get.call_count, 1)
+
+        # Cada lectura recibe una copia propia
+        value.append(3)
+        self.assertEqual(self.cache.get('featured_projects'), [1, 2])
+
+    def test_local_writes_evict_immediately(self):
+        """set/delete/incr del propio proceso se ven en la siguiente lectura"""
+        self.cache.set('user_stats_1', 1)
+        self.assertEqual(self.cache.get('user_stats_1'), 1)
+        self.cache.incr('user_stats_1')
+        self.assertEqual(self.cache.get('user_stats_1'), 2)
+        self.cache.delete('user_stats_1')
+        self.assertIsNone(self.cache.get('user_stats_1'))
+        self.assertEqual(self.cache.get_many(['user_stats_1', 'featured_projects']), {})
+
+    def run_reader(self, write):
+        """
+        Arranca un lector en otro proceso, espera a que cachee el valor inicial,
+        aplica `write` desde este proceso y retorna (valor visto, segundos de retraso).
+        """
+        self.cache.set('featured_projects', 'v1')
+        context = multiprocessing.get_context('fork')
+        results = context.Queue()
+        stop = context.Event()
+        process = context.Process(target=read_until, args=(stop, results))
+        process.start()
+        self.addCleanup(process.join)
+        self.addCleanup(stop.set)
+
+        self.assertEqual(results.get(timeout=3)[0], 'v1')
+        time.sleep(0.2)
+        written_at = time.time()
+        write()
+        try:
+            value, seen_at = results.get(timeout=1)
+        except Exception:
+            return None, None
+        return value, seen_at - written_at
+
+    def test_bus_bounds_stale_reads_across_processes(self):
+        """Otro proceso deja de ver el valor anterior en menos de POLL_INTERVAL + margen"""
+        value, delay = self.run_reader(lambda: self.cache.set('featured_projects', 'v2'))
+        self.assertEqual(value, 'v2')
+        self.assertLessEqual(delay, STALE_BOUND)
+
+    def test_delete_reaches_other_processes(self):
+        """Un delete (clear_user_cache, señales) también expulsa la clave en los demás"""
+        value, delay = self.run_reader(lambda: self.cache.delete('featured_projects'))
+        self.assertIsNone(value)
+        self.assertLessEqual(delay, STALE_BOUND)
+
+    def test_without_bus_l1_stays_stale(self):
+        """Sin bus, el otro proceso sigue sirviendo su L1 hasta L1_TIMEOUT"""
+        self.use_caches(caches['shared']._path, bus=None)
+        value, delay = self.run_reader(lambda: self.cache.set('featured_projects', 'v2'))
+        self.assertIsNone(delay)
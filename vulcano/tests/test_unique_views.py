@@ -0,0 +1,105 @@
+"""
+Test Unique Views - Vulcano Platform
+Tests del conteo de visitas únicas sin sesión
+"""
+
+from django.test import TestCase, Client
+from django.urls import reverse
+from django.contrib.auth.models import User
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from unittest import mock
+from vulcano.models import Project
+from vulcano.unique_views import BloomFilter, WINDOW_SECONDS
+from vulcano.view_counts import flush_view_counts, pending_views
+
+BROWSER = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 Chrome/126.0 Safari/537.36'
+
+
+class BloomFilterTest(TestCase):
+    """Tests del filtro de Bloom"""
+
+    def test_no_false_negatives_and_bounded_false_positives(self):
+        """Todo lo añadido está presente y los falsos positivos rondan la tasa pedida"""
+        bloom = BloomFilter.for_capacity(2000, 0.01)
+        members = [f'visitante-{i}' for i in range(2000)]
+        for member in members:
+            bloom.add(member)
+        self.assertTrue(all(member in bloom for member in members))
+
+        false_positives = sum(f'otro-{i}' in bloom for i in range(10000))
+        self.assertLess(false_positives / 10000, 0.02)
+
+    def test_round_trip_through_bytes(self):
+        """El filtro se serializa a bytes para guardarlo en caché"""
+        bloom = BloomFilter.for_capacity(100, 0.01)
+        self.assertTrue(bloom.add('a'))
+        self.assertFalse(bloom.add('a'))
+        restored = BloomFilter.for_capacity(100, 0.01, bloom.to_bytes())
+        self.assertIn('a', restored)
+
+
+class UniqueViewTrackingTest(TestCase):
+    """Tests de deduplicación de visitas en project_detail"""
+
+    def setUp(self):
+        """Configuración inicial"""
+        cache.clear()
+        self.arquitecto = User.objects.create_user(username='arquitecto', password='pass123')
+        self.project = Project.objects.create(
+            title='Casa Patio',
+            description='Test',
+            category='residential',
+            status='completed',
+            location='Lima',
+            arquitecto=self.arquitecto,
+            is_published=True
+        )
+        self.url = reverse('vulcano:project_detail', kwargs={'slug': self.project.slug})
+
+    def visit(self, user_agent=BROWSER, ip='203.0.113.10'):
+        return Client(HTTP_USER_AGENT=user_agent, REMOTE_ADDR=ip).get(self.url)
+
+    def test_same_visitor_counted_once_without_session(self):
+        """El mismo visitante con clientes distintos (sin cookies) cuenta una vez"""
+        for _ in range(3):
+            response = self.visit()
+            self.assertNotIn('sessionid', response.cookies)
+        self.visit(ip='203.0.113.11')
+
+        self.assertEqual(pending_views(self.project.id), 2)
+        self.assertFalse(Session.objects.exists())
+
+    def test_spoofed_forwarded_for_is_same_visitor(self):
+        """Rotar X-Forwarded-For tras el proxy no crea visitantes nuevos"""
+        for spoofed in ('198.51.100.1', '198.51.100.2', '198.51.100.3, 10.0.0.1'):
+            Client(
+                HTTP_USER_AGENT=BROWSER, REMOTE_ADDR='127.0.0.1',
+                HTTP_X_FORWARDED_FOR=f'{spoofed}, 203.0.113.10'
+            ).get(self.url)
+        Client(
+            HTTP_USER_AGENT=BROWSER, REMOTE_ADDR='127.0.0.1', HTTP_X_FORWARDED_FOR='203.0.113.11'
+        ).get(self.url)
+
+        self.assertEqual(pending_views(self.project.id), 2)
+
+    def test_bots_are_not_counted(self):
+        """Los crawlers no suman visitas"""
+        for agent in ('Googlebot/2.1 (+http://www.google.com/bot.html)',
+                      'facebookexternalhit/1.1', 'python-requests/2.32', 'curl/8.4.0'):
+            self.assertEqual(self.visit(user_agent=agent).status_code, 200)
+        self.assertEqual(pending_views(self.project.id), 0)
+
+    def test_visitor_counted_again_after_two_windows(self):
+        """La ventana rota: pasadas 48 horas el visitante vuelve a contar"""
+        now = 1_800_000_000
+        with mock.patch('vulcano.unique_views.time.time', return_value=now):
+            self.visit()
+        with mock.patch('vulcano.unique_views.time.time', return_value=now + WINDOW_SECONDS):
+            self.visit()
+        with mock.patch('vulcano.unique_views.time.time', return_value=now + 2 * WINDOW_SECONDS):
+            self.visit()
+
+        flush_view_counts()
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.views_count, 2)
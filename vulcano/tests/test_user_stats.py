@@ -0,0 +1,189 @@
+"""
+Test User Stats - Vulcano Platform
+Tests del modelo de lectura de estadísticas por usuario
+"""
+
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from io import StringIO
+from vulcano.models import Project, Message, UserStats
+from vulcano.user_stats import compute_user_stats, get_user_stats
+from vulcano.view_counts import flush_view_counts
+
+COMPARED_FIELDS = [
+    field.name for field in UserStats._meta.concrete_fields
+    if field.name not in ('user', 'updated_at')
+]
+
+
+class UserStatsTest(TestCase):
+    """Tests de mantenimiento incremental de UserStats"""
+
+    def setUp(self):
+        """Configuración inicial"""
+        self.arquitecto = self.create_user('arquitecto', 'arquitecto')
+        self.otro_arquitecto = self.create_user('otro', 'arquitecto')
+        self.cliente = self.create_user('cliente', 'cliente')
+        self.cliente2 = self.create_user('cliente2', 'cliente')
+        self.users = [self.arquitecto, self.otro_arquitecto, self.cliente, self.cliente2]
+        self.counter = 0
+
+    def create_user(self, username, role):
+        user = User.objects.create_user(username=username, password='pass123')
+        user.profile.role = role
+        user.profile.save()
+        return user
+
+    def create_project(self, **kwargs):
+        self.counter += 1
+        defaults = {
+            'title': f'Proyecto {self.counter}',
+            'description': 'Test',
+            'category': 'residential',
+            'status': 'planning',
+            'location': 'Lima',
+            'arquitecto': self.arquitecto,
+            'is_published': False,
+        }
+        defaults.update(kwargs)
+        return Project.objects.create(**defaults)
+
+    def assert_stats_exact(self):
+        """Cada fila coincide con un recálculo desde cero"""
+        expected = compute_user_stats([user.pk for user in self.users])
+        for user in self.users:
+            row = UserStats.objects.get(pk=user.pk)
+            stored = {field: getattr(row, field) for field in COMPARED_FIELDS}
+            fresh = {field: 0 for field in COMPARED_FIELDS}
+            fresh.update(expected[user.pk])
+            self.assertEqual(stored, fresh, user.username)
+
+    def test_project_lifecycle(self):
+        """Crear, publicar, cambiar estado, reasignar y eliminar proyectos"""
+        project = self.create_project()
+        self.create_project(status='in_progress', is_published=True)
+        self.assert_stats_exact()
+
+        project.is_published = True
+        project.status = 'completed'
+        project.save()
+        self.assert_stats_exact()
+
+        project.arquitecto = self.otro_arquitecto
+        project.save()
+        self.assert_stats_exact()
+
+        project.delete()
+        self.assert_stats_exact()
+
+        stats = get_user_stats(self.arquitecto)
+        self.assertEqual((stats.projects_total, stats.projects_draft, stats.projects_this_month), (1, 0, 1))
+
+    def test_client_assignments(self):
+        """Asignar y quitar clientes desde ambos lados de la relación"""
+        casa = self.create_project(status='in_progress', is_featured=True)
+        museo = self.create_project(arquitecto=self.otro_arquitecto)
+
+        casa.clients.add(self.cliente, self.cliente2)
+        self.cliente.assigned_projects.add(museo)
+        self.assert_stats_exact()
+
+        casa.status = 'completed'
+        casa.save()
+        self.assert_stats_exact()
+
+        casa.clients.remove(self.cliente2)
+        self.assert_stats_exact()
+
+        self.cliente.assigned_projects.clear()
+        self.assert_stats_exact()
+
+        museo.clients.set([self.cliente2])
+        museo.delete()
+        self.assert_stats_exact()
+
+    def test_bulk_operations_and_views(self):
+        """queryset.update, bulk_create y la consolidación de visitas"""
+        projects = [self.create_project() for _ in range(3)]
+        projects[0].clients.add(self.cliente)
+
+        Project.objects.filter(arquitecto=self.arquitecto).update(is_published=True, status='in_progress')
+        self.assert_stats_exact()
+
+        Project.objects.bulk_create([
+            Project(title='Masivo', slug='masivo', description='Test', location='Lima',
+                    arquitecto=self.otro_arquitecto, category='urban')
+        ])
+        self.assert_stats_exact()
+
+        for project in projects:
+            project.increment_views()
+        projects[0].increment_views()
+        flush_view_counts()
+        self.assert_stats_exact()
+        self.assertEqual(get_user_stats(self.arquitecto).views_total, 4)
+
+    def test_unread_messages(self):
+        """Enviar, leer y eliminar mensajes ajusta los no leídos"""
+        messages = [
+            Message.objects.create(sender=self.cliente, recipient=self.arquitecto, subject=f'Hola {i}', body='Test')
+            for i in range(3)
+        ]
+        self.assertEqual(get_user_stats(self.arquitecto).unread_messages, 3)
+
+        messages[0].mark_as_read()
+        messages[1].delete()
+        messages[0].delete()
+        self.assert_stats_exact()
+        self.assertEqual(get_user_stats(self.arquitecto).unread_messages, 1)
+
+    def test_deleting_user_with_projects(self):
+        """Eliminar un arquitecto con proyectos elimina también sus estadísticas"""
+        self.create_project(arquitecto=self.otro_arquitecto).clients.add(self.cliente)
+        self.otro_arquitecto.delete()
+        self.users.remove(self.otro_arquitecto)
+        self.assertFalse(UserStats.objects.filter(pk=self.otro_arquitecto.pk).exists())
+        self.assert_stats_exact()
+
+    def test_row_created_with_user(self):
+        """La fila existe desde el alta: los deltas previos a la primera lectura no se pierden"""
+        nuevo = self.create_user('nuevo', 'arquitecto')
+        self.users.append(nuevo)
+        self.assertTrue(UserStats.objects.filter(pk=nuevo.pk).exists())
+
+        Message.objects.create(sender=self.cliente, recipient=nuevo, subject='Hola', body='Test')
+        self.create_project(arquitecto=nuevo)
+        self.assert_stats_exact()
+
+    def test_missing_row_is_rebuilt_on_read(self):
+        """Un usuario sin fila (anterior a UserStats) la obtiene al leerla"""
+        self.create_project()
+        UserStats.objects.filter(pk=self.arquitecto.pk).delete()
+        self.assertEqual(get_user_stats(self.arquitecto).projects_total, 1)
+        self.assert_stats_exact()
+
+    def test_rebuild_command(self):
+        """El comando de reconstrucción recalcula desde cero"""
+        self.create_project()
+        UserStats.objects.update(projects_total=99)
+        call_command('rebuild_user_stats', stdout=StringIO())
+        self.assert_stats_exact()
+
+    def test_portals_read_stats_with_one_lookup(self):
+        """Los portales leen las estadísticas con una consulta por clave primaria"""
+        self.create_project(is_published=True).clients.add(self.cliente)
+        for username, url_name in (('arquitecto', 'portal_arquitecto'), ('cliente', 'portal_cliente')):
+            client = Client()
+            client.login(username=username, password='pass123')
+            with CaptureQueriesContext(connection) as ctx:
+                response = client.get(reverse(f'vulcano:{url_name}'))
+            self.assertEqual(response.status_code, 200)
+            stats_queries = [q['sql'] for q in ctx.captured_queries if 'vulcano_user_stats' in q['sql']]
+            self.assertEqual(len(stats_queries), 1, stats_queries)
+
+        self.assertEqual(response.context['my_projects_count'], 1)
+        self.assertEqual(response.context['my_architects_count'], 1)
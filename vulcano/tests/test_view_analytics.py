@@ -0,0 +1,160 @@
+"""
+Test View Analytics - Vulcano Platform
+Tests de las series temporales de visitas por proyecto
+"""
+
+from django.test import TestCase, Client
+from django.urls import reverse
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db.models import Sum
+from django.utils import timezone
+from datetime import datetime, timedelta
+from io import StringIO
+from vulcano.models import Project, ProjectViewBucket, ProjectViewHit
+from vulcano.view_analytics import add_to_buckets, compact_view_buckets, period_start, view_history
+from vulcano.view_counts import flush_view_counts, record_view
+
+
+def local(*args):
+    return timezone.make_aware(datetime(*args))
+
+
+class ViewAnalyticsTest(TestCase):
+    """Tests de ProjectViewBucket, compactación e histórico"""
+
+    def setUp(self):
+        """Configuración inicial"""
+        self.arquitecto = User.objects.create_user(username='arquitecto', password='pass123')
+        self.arquitecto.profile.role = 'arquitecto'
+        self.arquitecto.profile.save()
+        self.casa, self.museo = [
+            Project.objects.create(
+                title=title,
+                description='Test',
+                category='residential',
+                status='completed',
+                location='Lima',
+                arquitecto=self.arquitecto,
+                is_published=True
+            )
+            for title in ('Casa Patio', 'Museo Nuevo')
+        ]
+
+    def add_hours(self, project, start, hours, views=1):
+        add_to_buckets({(project.id, start + timedelta(hours=i)): views for i in range(hours)})
+
+    def test_flush_feeds_hourly_buckets(self):
+        """Consolidar el buffer suma las visitas a su hora"""
+        for _ in range(3):
+            record_view(self.casa.id)
+        record_view(self.museo.id)
+        first = ProjectViewHit.objects.order_by('id').first()
+        ProjectViewHit.objects.filter(pk=first.pk).update(created_at=local(2026, 3, 2, 9, 45))
+        ProjectViewHit.objects.exclude(pk=first.pk).update(created_at=local(2026, 3, 2, 10, 5))
+
+        flush_view_counts()
+
+        self.assertEqual(
+            list(ProjectViewBucket.objects.order_by('project_id', 'bucket_start')
+                 .values_list('project_id', 'granularity', 'bucket_start', 'count')),
+            [
+                (self.casa.id, 'hour', local(2026, 3, 2, 9), 1),
+                (self.casa.id, 'hour', local(2026, 3, 2, 10), 2),
+                (self.museo.id, 'hour', local(2026, 3, 2, 10), 1),
+            ]
+        )
+
+    def test_compaction_rolls_up_complete_periods(self):
+        """Horas antiguas pasan a días y días antiguos a meses sin perder visitas"""
+        now = local(2026, 6, 15, 12)
+        self.add_hours(self.casa, local(2026, 6, 1), 48)      # antiguas: 2 días
+        self.add_hours(self.casa, local(2026, 6, 14), 5)      # recientes
+        add_to_buckets({(self.casa.id, local(2026, 2, day)): 10 for day in (3, 4)}, 'day')
+        total = ProjectViewBucket.objects.aggregate(total=Sum('count'))['total']
+
+        compacted = compact_view_buckets(now)
+
+        self.assertEqual(compacted, {'hour': 48, 'day': 2})
+        self.assertEqual(ProjectViewBucket.objects.aggregate(total=Sum('count'))['total'], total)
+        self.assertEqual(
+            list(ProjectViewBucket.objects.exclude(granularity='hour').order_by('bucket_start')
+                 .values_list('granularity', 'bucket_start', 'count')),
+            [
+                ('month', local(2026, 2, 1), 20),
+                ('day', local(2026, 6, 1), 24),
+                ('day', local(2026, 6, 2), 24),
+            ]
+        )
+        self.assertEqual(ProjectViewBucket.objects.filter(granularity='hour').count(), 5)
+
+        # Idempotente: una segunda pasada no cambia nada
+        self.assertEqual(compact_view_buckets(now), {'hour': 0, 'day': 0})
+
+    def test_history_is_single_query_across_levels(self):
+        """El histórico diario suma días compactados y horas pendientes en una consulta"""
+        add_to_buckets({(self.casa.id, local(2026, 6, 1)): 7}, 'day')
+        self.add_hours(self.casa, local(2026, 6, 2, 8), 3, views=2)
+        self.add_hours(self.museo, local(2026, 6, 2, 8), 1, views=5)
+
+        with self.assertNumQueries(1):
+            history = view_history('day', local(2026, 6, 1), local(2026, 6, 3), project=self.casa)
+        self.assertEqual(
+            [(row['bucket'], row['views']) for row in history],
+            [(local(2026, 6, 1), 7), (local(2026, 6, 2), 6)]
+        )
+
+        history = view_history('month', arquitecto=self.arquitecto)
+        self.assertEqual([(row['bucket'], row['views']) for row in history], [(local(2026, 6, 1), 18)])
+
+    def test_history_keeps_compacted_periods(self):
+        """Los meses ya compactados aparecen a su periodo al pedir días, aunque start caiga dentro"""
+        add_to_buckets({(self.casa.id, local(2026, 2, day)): 10 for day in (3, 20)}, 'day')
+        add_to_buckets({(self.casa.id, local(2026, 6, 1)): 7}, 'day')
+        compact_view_buckets(local(2026, 6, 15, 12))
+
+        history = view_history('day', local(2026, 2, 15), local(2026, 6, 3), project=self.casa)
+        self.assertEqual(
+            [(row['bucket'], row['granularity'], row['views']) for row in history],
+            [(local(2026, 2, 1), 'month', 20), (local(2026, 6, 1), 'day', 7)]
+        )
+
+        history = view_history('month', local(2026, 6, 15), project=self.casa)
+        self.assertEqual([(row['bucket'], row['views']) for row in history], [(local(2026, 6, 1), 7)])
+
+    def test_period_start(self):
+        """Los periodos se alinean en la zona horaria local"""
+        value = local(2026, 6, 15, 13, 42, 7)
+        self.assertEqual(period_start(value, 'hour'), local(2026, 6, 15, 13))
+        self.assertEqual(period_start(value, 'day'), local(2026, 6, 15))
+        self.assertEqual(period_start(value, 'month'), local(2026, 6, 1))
+
+    def test_history_api_permissions(self):
+        """El API responde al arquitecto dueño y rechaza a otros usuarios"""
+        today = timezone.localdate()
+        add_to_buckets({(self.casa.id, period_start(timezone.now(), 'hour')): 4})
+
+        client = Client()
+        client.login(username='arquitecto', password='pass123')
+        response = client.get(reverse('vulcano:ajax_project_view_history', args=[self.casa.id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['history'], [
+            {'bucket': local(today.year, today.month, today.day).isoformat(), 'granularity': 'day', 'views': 4}
+        ])
+
+        response = client.get(
+            reverse('vulcano:ajax_architect_view_history', args=[self.arquitecto.id]),
+            {'granularity': 'year'}
+        )
+        self.assertEqual(response.status_code, 400)
+
+        User.objects.create_user(username='otro', password='pass123')
+        client.login(username='otro', password='pass123')
+        response = client.get(reverse('vulcano:ajax_project_view_history', args=[self.casa.id]))
+        self.assertEqual(response.status_code, 403)
+
+    def test_compact_command(self):
+        """El comando informa de los periodos agrupados"""
+        out = StringIO()
+        call_command('compact_view_buckets', stdout=out)
+        self.assertIn('Periodos agrupados', out.getvalue())
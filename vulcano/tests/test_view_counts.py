@@ -0,0 +1,186 @@
+"""
+Test View Counts - Vulcano Platform
+Tests del contador de visitas con escritura diferida
+"""
+
+from django.test import TestCase, TransactionTestCase, Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import OperationalError, connection, connections
+from io import StringIO
+from threading import Barrier, Thread
+from unittest import mock
+from vulcano.models import Project, ProjectQuerySet, ProjectViewHit
+from vulcano import view_counts
+
+
+def create_projects(arquitecto, total):
+    return [
+        Project.objects.create(
+            title=f'Proyecto {i}',
+            description='Test',
+            category='residential',
+            status='completed',
+            location='Lima',
+            arquitecto=arquitecto,
+            is_published=True
+        )
+        for i in range(total)
+    ]
+
+
+class BufferedViewCountTest(TestCase):
+    """Tests del buffer de visitas y su consolidación"""
+
+    def setUp(self):
+        """Configuración inicial"""
+        self.arquitecto = User.objects.create_user(
+            username='arquitecto',
+            email='arq@test.com',
+            password='pass123'
+        )
+        self.projects = create_projects(self.arquitecto, 3)
+
+    def test_detail_page_never_writes_project_row(self):
+        """La página de detalle solo inserta en el buffer"""
+        project = self.projects[0]
+        url = reverse('vulcano:project_detail', kwargs={'slug': project.slug})
+        with CaptureQueriesContext(connection) as ctx:
+            response = Client().get(url)
+        self.assertEqual(response.context['project'].views_count, 1)
+
+        project_writes = [
+            query['sql'] for query in ctx.captured_queries
+            if query['sql'].startswith(('UPDATE "vulcano_project" ', 'INSERT INTO "vulcano_project" '))
+        ]
+        self.assertEqual(project_writes, [])
+        self.assertEqual(view_counts.pending_views(project.id), 1)
+
+    def test_flush_uses_single_case_update(self):
+        """Un lote se suma con un UPDATE ... CASE y vacía el buffer"""
+        for project, hits in zip(self.projects, (3, 1, 2)):
+            for _ in range(hits):
+                project.increment_views()
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(view_counts.flush_view_counts(), 6)
+        updates = [
+            query['sql'] for query in ctx.captured_queries
+            if query['sql'].startswith('UPDATE "vulcano_project" ')
+        ]
+        self.assertEqual(len(updates), 1)
+        self.assertIn('CASE', updates[0])
+
+        self.assertEqual(
+            list(Project.objects.order_by('id').values_list('views_count', flat=True)),
+            [3, 1, 2]
+        )
+        self.assertEqual(view_counts.pending_views(), 0)
+
+    def test_flush_in_batches(self):
+        """Con lotes pequeños se consolida todo en varias transacciones"""
+        for _ in range(7):
+            self.projects[0].increment_views()
+        self.assertEqual(view_counts.flush_view_counts(batch_size=3), 7)
+        self.projects[0].refresh_from_db()
+        self.assertEqual(self.projects[0].views_count, 7)
+
+    def test_views_recorded_during_flush_are_kept(self):
+        """Las visitas que llegan mientras se consolida quedan para el siguiente lote"""
+        project = self.projects[0]
+        project.increment_views()
+        original_update = ProjectQuerySet.update
+
+        def update_during_new_visit(queryset, **kwargs):
+            view_counts.record_view(project.pk)
+            return original_update(queryset, **kwargs)
+
+        with mock.patch.object(ProjectQuerySet, 'update', autospec=True, side_effect=update_during_new_visit):
+            self.assertEqual(view_counts.flush_batch(), 1)
+
+        self.assertEqual(view_counts.pending_views(project.pk), 1)
+        view_counts.flush_view_counts()
+        project.refresh_from_db()
+        self.assertEqual(project.views_count, 2)
+
+    def test_interleaved_stale_instances_do_not_lose_views(self):
+        """Varias instancias obsoletas del mismo proyecto (una por worker) suman todas sus visitas"""
+        workers = [Project.objects.get(pk=self.projects[0].pk) for _ in range(8)]
+        for step in range(25):
+            for stale in workers:
+                stale.increment_views()
+            if step % 5 == 0:
+                view_counts.flush_batch(batch_size=7)
+
+        view_counts.flush_view_counts()
+        self.projects[0].refresh_from_db()
+        self.assertEqual(self.projects[0].views_count, 200)
+
+    def test_flush_command(self):
+        """El comando consolida las visitas pendientes"""
+        self.projects[1].increment_views()
+        out = StringIO()
+        call_command('flush_view_counts', stdout=out)
+        self.assertIn('Visitas consolidadas: 1', out.getvalue())
+        self.assertFalse(ProjectViewHit.objects.exists())
+
+
+class ConcurrentViewCountTest(TransactionTestCase):
+    """
+    Visitas concurrentes desde varios hilos no pierden conteos.
+    Requiere una base de pruebas con conexiones reales (no SQLite en memoria).
+    """
+
+    THREADS = 8
+    VIEWS_PER_THREAD = 25
+
+    def setUp(self):
+        """Los hilos necesitan conexiones propias a la misma base de pruebas"""
+        if connection.vendor == 'sqlite' and connection.is_in_memory_db():
+            self.skipTest('SQLite en memoria no admite escrituras concurrentes entre conexiones')
+
+    def test_concurrent_views_are_not_lost(self):
+        """Hilos con instancias obsoletas del mismo proyecto más una consolidación simultánea"""
+        arquitecto = User.objects.create_user(username='arquitecto', password='pass123')
+        project = create_projects(arquitecto, 1)[0]
+        barrier = Barrier(self.THREADS + 1)
+        errors = []
+
+        def visit():
+            try:
+                # Cada hilo trabaja con su propia instancia (obsoleta para los demás)
+                stale = Project.objects.get(pk=project.pk)
+                barrier.wait()
+                for _ in range(self.VIEWS_PER_THREAD):
+                    stale.increment_views()
+            except Exception as exc:
+                errors.append(exc)
+            finally:
+                connections.close_all()
+
+        def flush():
+            try:
+                barrier.wait()
+                for _ in range(10):
+                    try:
+                        view_counts.flush_view_counts(batch_size=20)
+                    except OperationalError:
+                        # SQLite: el lote bloqueado se revierte entero y queda pendiente
+                        continue
+            except Exception as exc:
+                errors.append(exc)
+            finally:
+                connections.close_all()
+
+        threads = [Thread(target=visit) for _ in range(self.THREADS)] + [Thread(target=flush)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        view_counts.flush_view_counts()
+        project.refresh_from_db()
+        self.assertEqual(project.views_count, self.THREADS * self.VIEWS_PER_THREAD)
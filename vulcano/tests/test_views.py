@@ -6,7 +6,9 @@ Tests para todas las vistas de la aplicación
 from django.test import TestCase, Client
 from django.urls import reverse
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from vulcano.models import Project, Message, ProjectImage
+from vulcano.view_counts import flush_view_counts
 from decimal import Decimal
 from datetime import date, timedelta
 
@@ -81,16 +83,17 @@ class HomeViewTest(TestCase):
     
     def test_home_view_featured_projects(self):
         """Verificar proyectos destacados"""
-        featured = Project.objects.create(
-            title='Featured',
-            description='Test',
-            category='residential',
-            status='completed',
-            location='Test',
-            arquitecto=self.arquitecto,
-            is_published=True,
-            is_featured=True
-        )
+        with self.captureOnCommitCallbacks(execute=True):
+            featured = Project.objects.create(
+                title='Featured',
+                description='Test',
+                category='residential',
+                status='completed',
+                location='Test',
+                arquitecto=self.arquitecto,
+                is_published=True,
+                is_featured=True
+            )
         
         response = self.client.get(reverse('vulcano:home'))
         self.assertIn('featured_projects', response.context)
@@ -102,6 +105,8 @@ class ProjectDetailViewTest(TestCase):
     
     def setUp(self):
         """Configuración inicial"""
+        # Los filtros de visitas únicas viven en caché y los IDs se reutilizan entre tests
+        cache.clear()
         self.client = Client()
         self.arquitecto = User.objects.create_user(
             username='arquitecto',
@@ -145,6 +150,7 @@ class ProjectDetailViewTest(TestCase):
         self.client.get(
             reverse('vulcano:project_detail', kwargs={'slug': self.project.slug})
         )
+        flush_view_counts()
         self.project.refresh_from_db()
         self.assertEqual(self.project.views_count, initial_views + 1)
     
@@ -0,0 +1,343 @@
+"""
+Caché en dos niveles: L1 en memoria del proceso delante de la caché compartida.
+
+Las claves calientes (proyectos destacados, conteos por categoría,
+estadísticas de usuario) se leen en cada petición; aun con la caché
+compartida de vulcano.sqlite_cache cada lectura es un viaje al archivo. Este
+backend guarda esas claves en un LRU local con TTL corto y delega todo lo
+demás en la caché configurada en LOCATION (el alias de CACHES del nivel 2).
+
+Cualquier escritura de una clave L1 (set, delete, add, incr...) se publica en
+un bus de invalidación; cada worker lo consulta como mucho cada
+POLL_INTERVAL segundos al leer y expulsa esas claves de su L1. Con el bus
+funcionando una lectura obsoleta dura como mucho POLL_INTERVAL; si el bus
+falla, como mucho L1_TIMEOUT.
+
+Buses disponibles (OPTIONS['BUS']):
+- 'sqlite': tabla de invalidaciones sondeada en un archivo SQLite (por
+  defecto el mismo archivo del nivel 2 si es SQLiteCache).
+- 'postgres': LISTEN/NOTIFY sobre una conexión dedicada (psycopg2).
+- None: sin bus; solo el TTL de L1 limita las lecturas obsoletas.
+
+Configuración:
+    CACHES = {
+        'default': {
+            'BACKEND': 'vulcano.tiered_cache.TieredCache',
+            'LOCATION': 'shared',
+            'OPTIONS': {'L1_KEYS': r'^featured_projects$', 'L1_TIMEOUT': 5, 'BUS': 'sqlite'},
+        },
+        'shared': {'BACKEND': 'vulcano.sqlite_cache.SQLiteCache', 'LOCATION': '...'},
+    }
+"""
+
+from collections import OrderedDict
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from .sqlite_cache import SQLiteCache, open_connection
+import logging
+import os
+import pickle
+import random
+import re
+import threading
+import time
+
+logger = logging.getLogger('vulcano')
+
+# Mensaje del bus que vacía el L1 completo (cache.clear())
+CLEAR_ALL = '*'
+
+BUS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_invalidation (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    key TEXT NOT NULL,
+    created REAL NOT NULL
+);
+"""
+
+
+class SQLiteInvalidationBus:
+    """Bus sondeado: cada invalidación es una fila; cada proceso lee las nuevas por id."""
+
+    # Las filas más antiguas que esto se purgan (debe superar L1_TIMEOUT)
+    RETENTION = 300
+
+    def __init__(self, path):
+        self._path = path
+        self._conn = None
+        self._pid = None
+        self._last_id = 0
+
+    def _connect(self):
+        if self._conn is None or self._pid != os.getpid():
+            self._conn = open_connection(self._path, BUS_SCHEMA, check_same_thread=False)
+            self._pid = os.getpid()
+            self._last_id = self._conn.execute(
+                'SELECT COALESCE(MAX(id), 0) FROM cache_invalidation'
+            ).fetchone()[0]
+        return self._conn
+
+    def publish(self, keys):
+        now = time.time()
+        conn = self._connect()
+        conn.executemany(
+            'INSERT INTO cache_invalidation (key, created) VALUES (?, ?)',
+            [(key, now) for key in keys]
+        )
+        if random.random() < 0.01:
+            conn.execute('DELETE FROM cache_invalidation WHERE created < ?', (now - self.RETENTION,))
+
+    def poll(self):
+        conn = self._connect()
+        rows = conn.execute(
+            'SELECT id, key FROM cache_invalidation WHERE id > ? ORDER BY id', (self._last_id,)
+        ).fetchall()
+        if rows:
+            self._last_id = rows[-1][0]
+        return [key for _, key in rows]
+
+
+class PostgresInvalidationBus:
+    """Bus por LISTEN/NOTIFY sobre una conexión dedicada en autocommit."""
+
+    CHANNEL = 'vulcano_cache'
+
+    def __init__(self, alias='default'):
+        self._alias = alias
+        self._conn = None
+        self._pid = None
+
+    def _connect(self):
+        if self._conn is None or self._pid != os.getpid():
+            from django.db import connections
+
+            wrapper = connections.create_connection(self._alias)
+            wrapper.ensure_connection()
+            self._conn = wrapper.connection
+            self._conn.autocommit = True
+            with self._conn.cursor() as cursor:
+                cursor.execute(f'LISTEN {self.CHANNEL}')
+            self._pid = os.getpid()
+        return self._conn
+
+    def publish(self, keys):
+        with self._connect().cursor() as cursor:
+            for key in keys:
+                cursor.execute('SELECT pg_notify(%s, %s)', [self.CHANNEL, key])
+
+    def poll(self):
+        conn = self._connect()
+        conn.poll()
+        keys = [notify.payload for notify in conn.notifies]
+        conn.notifies.clear()
+        return keys
+
+
+class LocalTier:
+    """Estado L1 compartido por todos los hilos de un proceso."""
+
+    def __init__(self, bus, max_entries, poll_interval):
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.bus = bus
+        self.max_entries = max_entries
+        self.poll_interval = poll_interval
+        self.last_poll = time.monotonic()
+        self.pid = os.getpid()
+
+    def get(self, key):
+        """Retorna (valor,) o None; cada lectura deserializa una copia propia."""
+        with self.lock:
+            item = self.entries.get(key)
+            if item is None:
+                return None
+            if item[1] <= time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+        return (pickle.loads(item[0]),)
+
+    def put(self, key, value, ttl):
+        data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        with self.lock:
+            self.entries[key] = (data, time.monotonic() + ttl)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def evict(self, keys):
+        with self.lock:
+            if CLEAR_ALL in keys:
+                self.entries.clear()
+                return
+            for key in keys:
+                self.entries.pop(key, None)
+
+    def sync(self):
+        """Aplica las invalidaciones publicadas por otros procesos."""
+        if self.bus is None or time.monotonic() - self.last_poll < self.poll_interval:
+            return
+        with self.lock:
+            if time.monotonic() - self.last_poll < self.poll_interval:
+                return
+            self.last_poll = time.monotonic()
+            try:
+                keys = self.bus.poll()
+            except Exception as e:
+                logger.error(f"Error al leer el bus de invalidación de caché: {str(e)}")
+                return
+        if keys:
+            self.evict(keys)
+
+    def publish(self, keys):
+        self.evict(keys)
+        if self.bus is None:
+            return
+        try:
+            with self.lock:
+                self.bus.publish(keys)
+        except Exception as e:
+            logger.error(f"Error al publicar en el bus de invalidación de caché: {str(e)}")
+
+
+# Un LocalTier por configuración y proceso (Django crea un backend por hilo)
+_tiers = {}
+_tiers_lock = threading.Lock()
+
+
+class TieredCache(BaseCache):
+    """Backend de Django: L1 local + bus de invalidación delante de otra caché."""
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self._l2_alias = location
+        self._l1_keys = re.compile(options.get('L1_KEYS', r'(?!)'))
+        self._l1_timeout = float(options.get('L1_TIMEOUT', 5))
+        self._max_entries = int(options.get('L1_MAX_ENTRIES', 1000))
+        self._poll_interval = float(options.get('POLL_INTERVAL', 0.1))
+        self._bus_name = options.get('BUS')
+        self._bus_location = options.get('BUS_LOCATION')
+
+    @property
+    def l2(self):
+        return caches[self._l2_alias]
+
+    @property
+    def tier(self):
+        name = (self._l2_alias, self._bus_name, self._bus_location)
+        tier = _tiers.get(name)
+        if tier is None or tier.pid != os.getpid():
+            with _tiers_lock:
+                tier = _tiers.get(name)
+                if tier is None or tier.pid != os.getpid():
+                    tier = LocalTier(self._make_bus(), self._max_entries, self._poll_interval)
+                    _tiers[name] = tier
+        return tier
+
+    def _make_bus(self):
+        if self._bus_name == 'sqlite':
+            path = self._bus_location
+            if path is None:
+                l2_settings = settings.CACHES[self._l2_alias]
+                if not isinstance(caches[self._l2_alias], SQLiteCache):
+                    raise ValueError("El bus 'sqlite' necesita BUS_LOCATION si el nivel 2 no es SQLiteCache")
+                path = l2_settings['LOCATION']
+            return SQLiteInvalidationBus(path)
+        if self._bus_name == 'postgres':
+            return PostgresInvalidationBus(self._bus_location or 'default')
+        return None
+
+    def _in_l1(self, key):
+        return self._l1_keys.search(key) is not None
+
+    def _changed(self, keys, version):
+        """Publica las claves L1 modificadas (las demás no pasan por L1)."""
+        keys = [self.make_and_validate_key(key, version=version) for key in keys if self._in_l1(key)]
+        if keys:
+            self.tier.publish(keys)
+
+    # ---------- Lecturas ----------
+
+    def get(self, key, default=None, version=None):
+        if not self._in_l1(key):
+            return self.l2.get(key, default, version=version)
+        tier = self.tier
+        tier.sync()
+        l1_key = self.make_and_validate_key(key, version=version)
+        item = tier.get(l1_key)
+        if item is not None:
+            return item[0]
+        sentinel = object()
+        value = self.l2.get(key, sentinel, version=version)
+        if value is sentinel:
+            return default
+        tier.put(l1_key, value, self._l1_timeout)
+        return value
+
+    def get_many(self, keys, version=None):
+        found = {}
+        missing = []
+        tier = self.tier
+        tier.sync()
+        for key in keys:
+            item = tier.get(self.make_and_validate_key(key, version=version)) if self._in_l1(key) else None
+            if item is not None:
+                found[key] = item[0]
+            else:
+                missing.append(key)
+        if missing:
+            fetched = self.l2.get_many(missing, version=version)
+            for key, value in fetched.items():
+                if self._in_l1(key):
+                    tier.put(self.make_and_validate_key(key, version=version), value, self._l1_timeout)
+            found.update(fetched)
+        return found
+
+    def has_key(self, key, version=None):
+        return self.l2.has_key(key, version=version)
+
+    # ---------- Escrituras (se propagan al bus) ----------
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.l2.set(key, value, timeout, version=version)
+        self._changed([key], version)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        failed = self.l2.set_many(data, timeout, version=version)
+        self._changed(list(data), version)
+        return failed
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        added = self.l2.add(key, value, timeout, version=version)
+        if added:
+            self._changed([key], version)
+        return added
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        return self.l2.touch(key, timeout, version=version)
+
+    def incr(self, key, delta=1, version=None):
+        value = self.l2.incr(key, delta, version=version)
+        self._changed([key], version)
+        return value
+
+    def decr(self, key, delta=1, version=None):
+        return self.incr(key, -delta, version=version)
+
+    def delete(self, key, version=None):
+        deleted = self.l2.delete(key, version=version)
+        self._changed([key], version)
+        return deleted
+
+    def delete_many(self, keys, version=None):
+        self.l2.delete_many(keys, version=version)
+        self._changed(list(keys), version)
+
+    def clear(self):
+        self.l2.clear()
+        self.tier.publish([CLEAR_ALL])
+
+    def close(self, **kwargs):
+        self.l2.close(**kwargs)
@@ -0,0 +1,143 @@
+"""
+Visitas únicas por proyecto sin usar la sesión.
+
+Cada visitante se identifica con un hash (HMAC con SECRET_KEY) de su IP,
+user-agent e idioma, que no se guarda en ningún sitio en claro. Por proyecto
+se mantiene en caché un filtro de Bloom por ventana de 24 horas; se consulta
+la ventana actual y la anterior, así que una misma visita se cuenta como
+máximo una vez cada 24-48 horas. Los bots conocidos no cuentan.
+
+Un filtro de Bloom no tiene falsos negativos (nunca se cuenta dos veces a
+un visitante dentro de la ventana) y con la capacidad configurada sus falsos
+positivos (visitas nuevas descartadas) rondan el 1%.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+import hashlib
+import hmac
+import math
+import re
+import time
+
+WINDOW_SECONDS = 60 * 60 * 24
+
+# Visitantes únicos esperados por proyecto y ventana, y tasa de falsos positivos
+BLOOM_CAPACITY = 5000
+BLOOM_ERROR_RATE = 0.01
+
+BOT_USER_AGENT_RE = re.compile(
+    r'bot|crawl|spider|slurp|scrap|facebookexternalhit|embedly|preview|'
+    r'headless|lighthouse|pingdom|curl|wget|python-requests|'
+    r'python-urllib|httpclient|go-http-client|okhttp|java/|libwww|axios',
+    re.IGNORECASE
+)
+
+
+class BloomFilter:
+    """
+    Filtro de Bloom sobre un bytearray, serializable como bytes.
+    Las posiciones se derivan de un SHA-256 por doble hashing.
+    """
+
+    def __init__(self, size_bits, hashes, bits=None):
+        self.size_bits = size_bits
+        self.hashes = hashes
+        self.bits = bytearray(bits) if bits else bytearray((size_bits + 7) // 8)
+
+    @classmethod
+    def for_capacity(cls, capacity, error_rate, bits=None):
+        """Dimensiona el filtro para `capacity` elementos con la tasa de error dada."""
+        size_bits = math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        hashes = max(1, round(size_bits / capacity * math.log(2)))
+        return cls(size_bits, hashes, bits)
+
+    def _positions(self, item):
+        digest = hashlib.sha256(item.encode()).digest()
+        first = int.from_bytes(digest[:8], 'big')
+        second = int.from_bytes(digest[8:16], 'big') | 1
+        return [(first + i * second) % self.size_bits for i in range(self.hashes)]
+
+    def __contains__(self, item):
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+    def add(self, item):
+        """
+        Añade un elemento.
+
+        Returns:
+            bool: True si el elemento no estaba (con probabilidad de falso positivo)
+        """
+        added = False
+        for pos in self._positions(item):
+            mask = 1 << (pos & 7)
+            if not self.bits[pos >> 3] & mask:
+                self.bits[pos >> 3] |= mask
+                added = True
+        return added
+
+    def to_bytes(self):
+        return bytes(self.bits)
+
+
+def new_filter(bits=None):
+    return BloomFilter.for_capacity(BLOOM_CAPACITY, BLOOM_ERROR_RATE, bits)
+
+
+def is_bot(request):
+    """Detecta crawlers y clientes automáticos por su user-agent."""
+    return bool(BOT_USER_AGENT_RE.search(request.META.get('HTTP_USER_AGENT', '')))
+
+
+def client_ip(request):
+    """
+    IP del cliente según TRUSTED_PROXY_COUNT: el salto de X-Forwarded-For que
+    añadió el proxy de confianza más externo. Los saltos anteriores los controla
+    el cliente; sin proxies o sin suficientes saltos se usa REMOTE_ADDR.
+    """
+    proxies = settings.TRUSTED_PROXY_COUNT
+    hops = [hop.strip() for hop in request.META.get('HTTP_X_FORWARDED_FOR', '').split(',') if hop.strip()]
+    if proxies > 0 and len(hops) >= proxies:
+        return hops[-proxies]
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def visitor_hash(request):
+    """Identificador anónimo y estable del visitante."""
+    raw = '|'.join((
+        client_ip(request),
+        request.META.get('HTTP_USER_AGENT', ''),
+        request.META.get('HTTP_ACCEPT_LANGUAGE', ''),
+    ))
+    return hmac.new(settings.SECRET_KEY.encode(), raw.encode(), hashlib.sha256).hexdigest()
+
+
+def filter_key(project_id, window):
+    return f"unique_views:{project_id}:{window}"
+
+
+def register_unique_view(request, project_id):
+    """
+    Marca al visitante como visto para el proyecto.
+
+    Returns:
+        bool: True si es una visita única que debe contarse
+    """
+    if is_bot(request):
+        return False
+
+    visitor = visitor_hash(request)
+    window = int(time.time() // WINDOW_SECONDS)
+    current_key = filter_key(project_id, window)
+    previous_key = filter_key(project_id, window - 1)
+    stored = cache.get_many([current_key, previous_key])
+
+    if previous_key in stored and visitor in new_filter(stored[previous_key]):
+        return False
+    current = new_filter(stored.get(current_key))
+    if not current.add(visitor):
+        return False
+    # Lectura-escritura sin bloqueo: dos visitas simultáneas pueden perder un
+    # bit y contar a un visitante dos veces, nunca perder una visita única
+    cache.set(current_key, current.to_bytes(), WINDOW_SECONDS * 2)
+    return True
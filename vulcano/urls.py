@@ -44,6 +44,7 @@ urlpatterns = [
     path('mensajes/<int:pk>/', views.message_detail, name='message_detail'),
     path('mensajes/nuevo/', views.message_compose, name='message_compose'),
     path('mensajes/<int:pk>/eliminar/', views.message_delete, name='message_delete'),
+    path('mensajes/conversacion/<int:pk>/', views.conversation_detail, name='conversation_detail'),
     
     # ==================== VISTAS AJAX ====================
     path(
@@ -56,6 +57,23 @@ urlpatterns = [
         views.ajax_project_toggle_featured,
         name='ajax_project_toggle_featured'
     ),
+    path(
+        'ajax/proyecto/<int:project_id>/visitas/',
+        views.ajax_project_view_history,
+        name='ajax_project_view_history'
+    ),
+    path(
+        'ajax/arquitecto/<int:user_id>/visitas/',
+        views.ajax_architect_view_history,
+        name='ajax_architect_view_history'
+    ),
+
+    # ==================== MÉTRICAS ====================
+    path('metrics', views.metrics_view, name='metrics'),
+
+    # ==================== PERFILADOR (STAFF) ====================
+    path('staff/perfiles/', views.profile_list, name='profile_list'),
+    path('staff/perfiles/<str:profile_id>/', views.profile_download, name='profile_download'),
 
     # ==================== GESTIÓN DE CONTRASEÑA ====================
     path(
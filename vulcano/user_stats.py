@@ -0,0 +1,403 @@
+"""
+Estadísticas por usuario para los portales (UserStats).
+
+Los contadores se mantienen por deltas con UPDATE ... SET campo = campo + n
+desde las señales de Project, Project.clients y Message, desde
+ProjectQuerySet.update/bulk_create y al consolidar visitas. Los conteos de
+valores distintos (clientes de un arquitecto, arquitectos de un cliente) no
+son sumables y se recalculan para los usuarios afectados, con una consulta
+agrupada. La fila se crea a cero al crear el usuario; las de usuarios
+anteriores, la primera vez que se leen (get_user_stats). Al recalcular, las
+filas se crean y bloquean antes de contar: un delta concurrente o ya está
+en el recálculo o espera a que termine, nunca se pierde.
+"""
+
+from collections import Counter, defaultdict
+from datetime import datetime
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+import logging
+
+logger = logging.getLogger('vulcano')
+
+# Estado de un proyecto que afecta a las estadísticas de sus usuarios
+PROJECT_STATE_FIELDS = ('arquitecto_id', 'status', 'is_published', 'is_featured', 'views_count')
+
+# Campos de Project cuyo cambio por queryset.update() obliga a recalcular.
+# views_count se excluye: solo lo actualiza view_counts, que aplica sus deltas.
+TRACKED_UPDATE_FIELDS = {'arquitecto', 'arquitecto_id', 'status', 'is_published', 'is_featured'}
+
+STATUS_FIELDS = {
+    'in_progress': ('projects_in_progress', 'assigned_in_progress'),
+    'completed': ('projects_completed', 'assigned_completed'),
+}
+
+
+def project_state(project):
+    """Tupla PROJECT_STATE_FIELDS de una instancia."""
+    return tuple(getattr(project, field) for field in PROJECT_STATE_FIELDS)
+
+
+def read_project_state(project_id):
+    """Estado actual de un proyecto en la base de datos (None si no existe)."""
+    from .models import Project
+
+    return Project.objects.filter(pk=project_id).values_list(*PROJECT_STATE_FIELDS).first()
+
+
+def tracks_update(update_fields):
+    """Indica si un guardado o update() puede cambiar las estadísticas."""
+    return update_fields is None or bool(set(update_fields) & TRACKED_UPDATE_FIELDS)
+
+
+def new_deltas():
+    return defaultdict(Counter)
+
+
+def add_architect_deltas(deltas, state, sign):
+    """Suma (sign=1) o resta (sign=-1) un proyecto a las estadísticas de su arquitecto."""
+    if state is None:
+        return
+    arquitecto_id, status, is_published, _, views_count = state
+    changes = deltas[arquitecto_id]
+    changes['projects_total'] += sign
+    changes['views_total'] += sign * views_count
+    if is_published:
+        changes['projects_published'] += sign
+    if status in STATUS_FIELDS:
+        changes[STATUS_FIELDS[status][0]] += sign
+
+
+def client_state(state):
+    """Parte del estado que afecta a los clientes: estado y destacado."""
+    _, status, _, is_featured, _ = state
+    return status, is_featured
+
+
+def add_client_deltas(deltas, state, client_ids, sign):
+    """Suma o resta un proyecto a las estadísticas de sus clientes."""
+    if state is None:
+        return
+    _, status, _, is_featured, _ = state
+    for client_id in client_ids:
+        changes = deltas[client_id]
+        changes['assigned_total'] += sign
+        if is_featured:
+            changes['assigned_featured'] += sign
+        if status in STATUS_FIELDS:
+            changes[STATUS_FIELDS[status][1]] += sign
+
+
+def apply_deltas(deltas):
+    """
+    Aplica variaciones con un UPDATE por usuario.
+
+    Args:
+        deltas: {user_id: Counter({campo: variación})}
+    """
+    from .models import UserStats
+
+    for user_id, changes in deltas.items():
+        changes = {field: delta for field, delta in changes.items() if delta}
+        if changes:
+            UserStats.objects.filter(pk=user_id).update(
+                **{field: F(field) + delta for field, delta in changes.items()}
+            )
+
+
+def created_this_month(created_at):
+    return bool(created_at) and timezone.localdate(created_at) >= timezone.localdate().replace(day=1)
+
+
+def count_new_project(arquitecto_id, sign=1):
+    """
+    Suma o resta un proyecto creado en el mes en curso. Si el contador es
+    de un mes anterior, primero se reinicia.
+    """
+    from .models import UserStats
+
+    month = timezone.localdate().replace(day=1)
+    stats = UserStats.objects.filter(pk=arquitecto_id)
+    stats.exclude(new_projects_month_start=month).update(new_projects_month_start=month, new_projects_month=0)
+    stats.update(new_projects_month=F('new_projects_month') + sign)
+
+
+def refresh_distinct_counts(architect_ids=(), client_ids=()):
+    """
+    Recalcula los conteos de valores distintos: clientes de cada arquitecto
+    y arquitectos de cada cliente (una consulta agrupada por lado).
+    """
+    from .models import Project, UserStats
+
+    Assignment = Project.clients.through
+    architect_ids = {pk for pk in architect_ids if pk}
+    client_ids = {pk for pk in client_ids if pk}
+
+    if architect_ids:
+        counts = dict(
+            Assignment.objects.filter(project__arquitecto_id__in=architect_ids)
+            .values_list('project__arquitecto_id')
+            .annotate(total=Count('user_id', distinct=True))
+        )
+        for user_id in architect_ids:
+            UserStats.objects.filter(pk=user_id).update(clients_total=counts.get(user_id, 0))
+
+    if client_ids:
+        counts = dict(
+            Assignment.objects.filter(user_id__in=client_ids)
+            .values_list('user_id')
+            .annotate(total=Count('project__arquitecto_id', distinct=True))
+        )
+        for user_id in client_ids:
+            UserStats.objects.filter(pk=user_id).update(assigned_architects=counts.get(user_id, 0))
+
+
+def project_users(project_ids):
+    """Arquitectos y clientes de un conjunto de proyectos."""
+    from .models import Project
+
+    architects = set(Project.objects.filter(pk__in=project_ids).values_list('arquitecto_id', flat=True))
+    clients = set(
+        Project.clients.through.objects.filter(project_id__in=project_ids).values_list('user_id', flat=True)
+    )
+    return architects | clients
+
+
+def record_project_change(project, previous, client_ids=None):
+    """
+    Aplica el cambio de un proyecto guardado.
+
+    Args:
+        project: Instancia ya guardada
+        previous: Estado anterior (None si es nuevo)
+        client_ids: IDs de clientes (se consultan si hacen falta)
+    """
+    current = project_state(project)
+    if previous == current:
+        return
+
+    deltas = new_deltas()
+    add_architect_deltas(deltas, previous, -1)
+    add_architect_deltas(deltas, current, 1)
+
+    if previous is not None and client_state(previous) != client_state(current):
+        if client_ids is None:
+            client_ids = list(project.clients.values_list('id', flat=True))
+        add_client_deltas(deltas, previous, client_ids, -1)
+        add_client_deltas(deltas, current, client_ids, 1)
+    apply_deltas(deltas)
+
+    if previous is None:
+        count_new_project(project.arquitecto_id)
+    elif previous[0] != current[0]:
+        # Cambio de arquitecto: los clientes distintos de ambos cambian
+        if created_this_month(project.created_at):
+            count_new_project(previous[0], -1)
+            count_new_project(current[0])
+        if client_ids is None:
+            client_ids = list(project.clients.values_list('id', flat=True))
+        refresh_distinct_counts(architect_ids=[previous[0], current[0]], client_ids=client_ids)
+
+
+def record_project_deleted(state, client_ids, created_at):
+    """Resta un proyecto eliminado de su arquitecto y sus clientes."""
+    if state is None:
+        return
+    deltas = new_deltas()
+    add_architect_deltas(deltas, state, -1)
+    add_client_deltas(deltas, state, client_ids, -1)
+    apply_deltas(deltas)
+
+    if created_this_month(created_at):
+        count_new_project(state[0], -1)
+    refresh_distinct_counts(architect_ids=[state[0]], client_ids=client_ids)
+
+
+def record_assignments(pairs, sign):
+    """
+    Aplica altas (sign=1) o bajas (sign=-1) de clientes en proyectos.
+
+    Args:
+        pairs: iterable de (project_id, client_id)
+    """
+    from .models import Project
+
+    pairs = list(pairs)
+    if not pairs:
+        return
+    states = {
+        row[0]: row[1:]
+        for row in Project.objects.filter(pk__in={project_id for project_id, _ in pairs})
+        .values_list('pk', *PROJECT_STATE_FIELDS)
+    }
+    deltas = new_deltas()
+    for project_id, client_id in pairs:
+        add_client_deltas(deltas, states.get(project_id), [client_id], sign)
+    apply_deltas(deltas)
+    refresh_distinct_counts(
+        architect_ids=[state[0] for state in states.values()],
+        client_ids=[client_id for _, client_id in pairs]
+    )
+
+
+def record_views(totals):
+    """
+    Suma visitas consolidadas a los arquitectos de los proyectos.
+
+    Args:
+        totals: {project_id: visitas}
+    """
+    from .models import Project
+
+    deltas = new_deltas()
+    for project_id, arquitecto_id in Project.objects.filter(pk__in=totals).values_list('pk', 'arquitecto_id'):
+        deltas[arquitecto_id]['views_total'] += totals[project_id]
+    apply_deltas(deltas)
+
+
+def record_message_change(previous, current):
+    """
+    Ajusta los mensajes sin leer.
+
+    Args:
+        previous, current: (recipient_id, is_read) antes y después, o None
+    """
+    if previous == current:
+        return
+    deltas = new_deltas()
+    if previous is not None and not previous[1]:
+        deltas[previous[0]]['unread_messages'] -= 1
+    if current is not None and not current[1]:
+        deltas[current[0]]['unread_messages'] += 1
+    apply_deltas(deltas)
+
+
+def compute_user_stats(user_ids):
+    """
+    Calcula desde cero las estadísticas de varios usuarios con consultas agrupadas.
+
+    Returns:
+        dict: {user_id: {campo: valor}}
+    """
+    from .models import Message, Project
+
+    user_ids = list(user_ids)
+    month = timezone.localdate().replace(day=1)
+    month_start = timezone.make_aware(datetime.combine(month, datetime.min.time()))
+    stats = {
+        user_id: {'new_projects_month_start': month}
+        for user_id in user_ids
+    }
+
+    owned = (
+        Project.objects.filter(arquitecto_id__in=user_ids).order_by()
+        .values('arquitecto_id')
+        .annotate(
+            projects_total=Count('id'),
+            projects_published=Count('id', filter=Q(is_published=True)),
+            projects_in_progress=Count('id', filter=Q(status='in_progress')),
+            projects_completed=Count('id', filter=Q(status='completed')),
+            views_total=Sum('views_count'),
+            new_projects_month=Count('id', filter=Q(created_at__gte=month_start)),
+        )
+    )
+    for row in owned:
+        user_id = row.pop('arquitecto_id')
+        row['views_total'] = row['views_total'] or 0
+        stats[user_id].update(row)
+
+    # Aparte: el join con clientes multiplicaría los conteos y la suma de visitas
+    clients = (
+        Project.clients.through.objects.filter(project__arquitecto_id__in=user_ids).order_by()
+        .values_list('project__arquitecto_id')
+        .annotate(total=Count('user_id', distinct=True))
+    )
+    for user_id, total in clients:
+        stats[user_id]['clients_total'] = total
+
+    assigned = (
+        Project.clients.through.objects.filter(user_id__in=user_ids).order_by()
+        .values('user_id')
+        .annotate(
+            assigned_total=Count('project_id'),
+            assigned_in_progress=Count('project_id', filter=Q(project__status='in_progress')),
+            assigned_completed=Count('project_id', filter=Q(project__status='completed')),
+            assigned_featured=Count('project_id', filter=Q(project__is_featured=True)),
+            assigned_architects=Count('project__arquitecto_id', distinct=True),
+        )
+    )
+    for row in assigned:
+        stats[row.pop('user_id')].update(row)
+
+    unread = (
+        Message.objects.filter(recipient_id__in=user_ids, is_read=False).order_by()
+        .values_list('recipient_id')
+        .annotate(total=Count('id'))
+    )
+    for user_id, total in unread:
+        stats[user_id]['unread_messages'] = total
+
+    return stats
+
+
+def create_user_stats(user_ids):
+    """Crea a cero las filas que no existen de los usuarios indicados."""
+    from .models import UserStats
+
+    month = timezone.localdate().replace(day=1)
+    UserStats.objects.bulk_create(
+        [UserStats(user_id=user_id, new_projects_month_start=month) for user_id in user_ids],
+        ignore_conflicts=True
+    )
+
+
+def rebuild_user_stats(user_ids=None):
+    """
+    Recalcula las estadísticas de los usuarios indicados (todos si es None).
+
+    Returns:
+        int: Filas recalculadas
+    """
+    from .models import UserStats
+    from django.contrib.auth.models import User
+
+    users = User.objects.all() if user_ids is None else User.objects.filter(pk__in=set(user_ids))
+    rows = UserStats.objects.all() if user_ids is None else UserStats.objects.filter(pk__in=set(user_ids))
+    fields = [
+        field.name for field in UserStats._meta.concrete_fields
+        if not field.primary_key and field.name != 'updated_at'
+    ]
+    defaults = {name: UserStats._meta.get_field(name).get_default() for name in fields}
+
+    with transaction.atomic():
+        user_ids = list(users.values_list('pk', flat=True))
+        create_user_stats(user_ids)
+        # Bloqueo antes de contar: los deltas de otras transacciones esperan
+        # a que se confirme el recálculo o ya están incluidos en él
+        list(rows.select_for_update().values_list('pk', flat=True))
+        stats = compute_user_stats(user_ids)
+        now = timezone.now()
+        UserStats.objects.bulk_update(
+            [
+                UserStats(user_id=user_id, updated_at=now, **{**defaults, **values})
+                for user_id, values in stats.items()
+            ],
+            fields + ['updated_at'],
+            batch_size=500
+        )
+    return len(stats)
+
+
+def get_user_stats(user):
+    """
+    Estadísticas de un usuario con una consulta por clave primaria.
+    Si el usuario es anterior a UserStats y no tiene fila, se calcula aquí.
+    """
+    from .models import UserStats
+
+    try:
+        return UserStats.objects.get(pk=user.pk)
+    except UserStats.DoesNotExist:
+        rebuild_user_stats([user.pk])
+        return UserStats.objects.get(pk=user.pk)
@@ -3,14 +3,26 @@ Funciones de utilidad para la aplicación Vulcano.
 Incluye helpers para imágenes, estadísticas y operaciones comunes.
 """
 
+from collections import Counter
+from django.conf import settings
 from django.core.cache import cache
-from django.db.models import Count, Q, Avg
 from django.utils import timezone
 from PIL import Image
 from io import BytesIO
 from django.core.files.uploadedfile import InMemoryUploadedFile
+from django.db import transaction
+from .cache_namespaces import bump, changed_since, current_clock, get_versions
+from . import metrics
+from .structured_logging import log_event
+import atexit
+import math
+import os
+import random
 import sys
 import logging
+import threading
+import time
+import uuid
 
 logger = logging.getLogger('vulcano')
 
@@ -58,10 +70,227 @@ def optimize_image(image_field, max_size=(1920, 1080), quality=85):
         return image_field
 
 
+# ==================== CACHÉ DE CÁLCULOS ====================
+
+# Eventos contabilizados por cached_computation
+COMPUTATION_EVENTS = ('hit', 'stale', 'miss', 'early', 'wait', 'recompute')
+# Los nombres se guardan en ranuras computation_stats:names:0, :1, ... creadas con add()
+COMPUTATION_NAMES_KEY = 'computation_stats:names'
+
+FEATURED_CACHE_KEY = 'featured_projects'
+FEATURED_CACHE_SIZE = 12
+
+
+def register_computation_name(name):
+    """
+    Añade un nombre a la lista compartida. Cada ranura se ocupa con add(),
+    que es atómico, así que dos workers nunca se pisan un nombre.
+    """
+    index = 0
+    while True:
+        slot = f"{COMPUTATION_NAMES_KEY}:{index}"
+        if cache.add(slot, name, None) or cache.get(slot) == name:
+            return
+        index += 1
+
+
+def registered_computation_names():
+    """Nombres de la lista compartida, en orden de registro."""
+    names = []
+    while True:
+        slots = [f"{COMPUTATION_NAMES_KEY}:{index}" for index in range(len(names), len(names) + 50)]
+        values = cache.get_many(slots)
+        for slot in slots:
+            if slot not in values:
+                return names
+            names.append(values[slot])
+
+
+class ComputationCounters:
+    """
+    Contadores de cached_computation del proceso. Un acierto solo suma en
+    memoria; cada COMPUTATION_STATS_FLUSH_INTERVAL segundos los deltas se
+    suman a la caché compartida (como metrics.Registry con sus muestras).
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pending = Counter()
+        self.last_flush = time.monotonic()
+        self.pid = os.getpid()
+
+    def _check_fork(self):
+        # Un worker recién creado no hereda lo pendiente del proceso padre
+        if self.pid != os.getpid():
+            self.pending.clear()
+            self.last_flush = time.monotonic()
+            self.pid = os.getpid()
+
+    def inc(self, name, event):
+        with self.lock:
+            self._check_fork()
+            self.pending[(name, event)] += 1
+            due = time.monotonic() - self.last_flush >= settings.COMPUTATION_STATS_FLUSH_INTERVAL
+        if due:
+            self.flush()
+
+    def flush(self):
+        """Suma lo pendiente a los contadores compartidos."""
+        with self.lock:
+            self._check_fork()
+            pending, self.pending = self.pending, Counter()
+            self.last_flush = time.monotonic()
+        if not pending:
+            return
+        try:
+            # Se comprueba en cada volcado: la caché puede haber expulsado alguna ranura
+            for name in {name for name, _ in pending} - set(registered_computation_names()):
+                register_computation_name(name)
+            for (name, event), delta in pending.items():
+                key = f"computation_stats:{name}:{event}"
+                cache.add(key, 0, None)
+                cache.incr(key, delta)
+        except Exception as e:
+            logger.error(f"Error al guardar contadores de cálculos: {str(e)}")
+
+
+computation_counters = ComputationCounters()
+atexit.register(computation_counters.flush)
+
+
+def record_computation_event(name, event):
+    """Cuenta un evento de cached_computation en memoria del proceso."""
+    computation_counters.inc(name, event)
+
+
+def get_computation_stats():
+    """
+    Contadores de cached_computation por nombre (lo pendiente de este
+    proceso se vuelca antes; el de otros workers llega en su próximo volcado).
+    
+    Returns:
+        dict {nombre: {evento: total}}
+    """
+    computation_counters.flush()
+    names = sorted(registered_computation_names())
+    keys = {f"computation_stats:{name}:{event}": (name, event) for name in names for event in COMPUTATION_EVENTS}
+    values = cache.get_many(list(keys))
+    stats = {name: dict.fromkeys(COMPUTATION_EVENTS, 0) for name in names}
+    for key, (name, event) in keys.items():
+        stats[name][event] = values.get(key, 0)
+    return stats
+
+
+def cached_computation(key, compute, timeout=300, name=None, stale_timeout=None,
+                       beta=1.0, lock_timeout=30, wait_timeout=2.0, depends_on=None):
+    """
+    Obtiene un valor calculado desde caché protegido contra estampidas.
+    
+    - Single-flight: al caducar, solo el proceso que obtiene el candado
+      (cache.add) recalcula; los demás sirven el valor anterior.
+    - Refresco anticipado probabilístico (XFetch): cuanto más caro es el
+      cálculo y más cerca está la caducidad, más probable es refrescarlo
+      antes de que caduque.
+    - Stale-while-revalidate: el valor caducado se conserva `stale_timeout`
+      segundos más para servirlo mientras otro proceso recalcula.
+    - Namespaces (vulcano.cache_namespaces): si se indica `depends_on`, el
+      valor caduca en cuanto se invalida cualquiera de sus namespaces.
+    
+    Args:
+        key: Clave de caché
+        compute: Función sin argumentos que calcula el valor
+        timeout: Segundos de validez del valor
+        name: Nombre para los contadores (por defecto, la clave)
+        stale_timeout: Segundos extra durante los que se sirve caducado (por defecto, timeout)
+        beta: Agresividad del refresco anticipado (0 lo desactiva)
+        lock_timeout: Vida máxima del candado de recálculo
+        wait_timeout: Espera máxima por el cálculo de otro proceso cuando no hay valor
+        depends_on: Namespaces del valor, o función que los obtiene del valor calculado
+    
+    Uso:
+        stats = cached_computation(f"user_stats_{user.id}", lambda: calcular(user), 300)
+    """
+    name = name or key
+    stale_timeout = timeout if stale_timeout is None else stale_timeout
+    lock_key = f"{key}:lock"
+    
+    start = time.perf_counter()
+    entry = cache.get(key)
+    now = time.time()
+    if entry is not None:
+        remaining = entry['expires_at'] - now
+        if entry.get('namespaces') and changed_since(entry['namespaces'], entry['clock']):
+            remaining = 0
+        # XFetch: margen aleatorio proporcional a lo que tardó el último cálculo
+        margin = -entry['delta'] * beta * math.log(1.0 - random.random())
+        if remaining > margin:
+            record_computation_event(name, 'hit')
+            metrics.record_cache('computation', True, time.perf_counter() - start)
+            return entry['value']
+        record_computation_event(name, 'early' if remaining > 0 else 'stale')
+    else:
+        record_computation_event(name, 'miss')
+    metrics.record_cache('computation', False, time.perf_counter() - start)
+    
+    token = uuid.uuid4().hex
+    if not cache.add(lock_key, token, lock_timeout):
+        if entry is not None:
+            # Otro proceso está recalculando: se sirve el valor anterior
+            return entry['value']
+        record_computation_event(name, 'wait')
+        deadline = time.monotonic() + wait_timeout
+        while time.monotonic() < deadline:
+            time.sleep(0.05)
+            entry = cache.get(key)
+            if entry is not None:
+                return entry['value']
+    
+    try:
+        clock = current_clock() if depends_on is not None else None
+        start = time.monotonic()
+        value = compute()
+        delta = time.monotonic() - start
+        record_computation_event(name, 'recompute')
+        namespaces = depends_on(value) if callable(depends_on) else depends_on
+        if namespaces:
+            # Crea las versiones que falten para que no se den por invalidadas al leer
+            get_versions(namespaces)
+        cache.set(key, {
+            'value': value,
+            'delta': delta,
+            'expires_at': time.time() + timeout,
+            'stale_timeout': stale_timeout,
+            'namespaces': sorted(set(namespaces or ())),
+            'clock': clock,
+        }, timeout + stale_timeout)
+    finally:
+        if cache.get(lock_key) == token:
+            cache.delete(lock_key)
+    return value
+
+
+def expire_computation(key):
+    """
+    Marca como caducado un valor de cached_computation sin borrarlo: la
+    siguiente lectura recalcula (una sola) mientras las concurrentes sirven
+    el valor anterior. Se repite al confirmar la transacción actual.
+    """
+    def expire():
+        entry = cache.get(key)
+        if entry is not None:
+            entry['expires_at'] = 0
+            cache.set(key, entry, entry['stale_timeout'])
+    
+    expire()
+    transaction.on_commit(expire)
+
+
 def get_user_statistics(user):
     """
     Obtiene estadísticas del usuario según su rol.
-    Utiliza caché para mejorar rendimiento.
+    Las estadísticas propias salen del modelo de lectura UserStats (una
+    consulta por clave primaria); los totales globales del administrador
+    se cachean 5 minutos con cached_computation.
     
     Args:
         user: Instancia de User
@@ -69,82 +298,68 @@ def get_user_statistics(user):
     Returns:
         dict con estadísticas relevantes
     """
-    cache_key = f"user_stats_{user.id}"
-    stats = cache.get(cache_key)
+    from .user_stats import get_user_stats
     
-    if stats is None:
-        from .models import Project, Message
-        
-        profile = user.profile
-        stats = {
-            'role': profile.get_role_display(),
-            'member_since': user.date_joined,
-        }
-        
-        if profile.is_admin():
-            stats.update({
+    profile = user.profile
+    user_stats = get_user_stats(user)
+    stats = {
+        'role': profile.get_role_display(),
+        'member_since': user.date_joined,
+        'unread_messages': user_stats.unread_messages,
+    }
+    
+    if profile.is_admin():
+        def compute_totals():
+            from .models import Message
+            from .facets import get_facet_counts
+            
+            facet_counts = get_facet_counts()
+            return {
                 'total_users': profile.__class__.objects.count(),
-                'total_projects': Project.objects.count(),
-                'published_projects': Project.objects.filter(is_published=True).count(),
+                'total_projects': sum(count for _, _, _, count in facet_counts),
+                'published_projects': sum(
+                    count for _, _, is_published, count in facet_counts if is_published
+                ),
                 'total_messages': Message.objects.count(),
-                'unread_messages': Message.objects.filter(
-                    recipient=user,
-                    is_read=False
-                ).count(),
-            })
-        elif profile.is_arquitecto():
-            # Obtener todos los proyectos del arquitecto
-            projects = Project.objects.filter(arquitecto=user)
-            
-            # Calcular estadísticas
-            stats.update({
-                'total_projects': projects.count(),
-                'published_projects': projects.filter(is_published=True).count(),
-                'draft_projects': projects.filter(is_published=False).count(),
-                'in_progress_projects': projects.filter(status='in_progress').count(),
-                'completed_projects': projects.filter(status='completed').count(),
-                'total_clients': projects.values('clients').distinct().count(),
-                'unread_messages': Message.objects.filter(
-                    recipient=user,
-                    is_read=False
-                ).count(),
-                'total_views': projects.aggregate(
-                    total=Count('views_count')
-                )['total'] or 0,
-                'new_projects_month': projects.filter(
-                    created_at__gte=timezone.now() - timezone.timedelta(days=30)
-                ).count()
-            })
-        elif profile.is_cliente():
-            stats.update({
-                'assigned_projects': user.assigned_projects.count(),
-                'completed_projects': user.assigned_projects.filter(
-                    status='completed'
-                ).count(),
-                'in_progress_projects': user.assigned_projects.filter(
-                    status='in_progress'
-                ).count(),
-                'unread_messages': Message.objects.filter(
-                    recipient=user,
-                    is_read=False
-                ).count(),
-            })
+            }
         
-        # Cachear por 5 minutos
-        cache.set(cache_key, stats, 300)
+        totals = cached_computation(
+            f"user_stats_{user.id}", compute_totals, 300,
+            name='user_stats', depends_on=[f"user:{user.id}"]
+        )
+        stats.update(totals)
+    elif profile.is_arquitecto():
+        stats.update({
+            'total_projects': user_stats.projects_total,
+            'published_projects': user_stats.projects_published,
+            'draft_projects': user_stats.projects_draft,
+            'in_progress_projects': user_stats.projects_in_progress,
+            'completed_projects': user_stats.projects_completed,
+            'total_clients': user_stats.clients_total,
+            'total_views': user_stats.views_total,
+            'new_projects_month': user_stats.projects_this_month,
+        })
+    elif profile.is_cliente():
+        stats.update({
+            'assigned_projects': user_stats.assigned_total,
+            'completed_projects': user_stats.assigned_completed,
+            'in_progress_projects': user_stats.assigned_in_progress,
+            'featured_projects': user_stats.assigned_featured,
+            'total_architects': user_stats.assigned_architects,
+        })
     
     return stats
 
 
 def clear_user_cache(user):
     """
-    Limpia el caché de estadísticas de un usuario.
+    Invalida el namespace del usuario: sus estadísticas cacheadas se
+    recalculan una sola vez en la siguiente lectura.
     
     Args:
         user: Instancia de User
     """
-    cache_key = f"user_stats_{user.id}"
-    cache.delete(cache_key)
+    bump(f"user:{user.id}")
 
 
 def get_recent_projects(limit=6, published_only=True):
@@ -160,7 +375,7 @@ def get_recent_projects(limit=6, published_only=True):
     """
     from .models import Project
     
-    queryset = Project.objects.select_related('arquitecto').prefetch_related('images')
+    queryset = Project.objects.select_related('arquitecto')
     
     if published_only:
         queryset = queryset.filter(is_published=True)
@@ -171,44 +386,50 @@ def get_recent_projects(limit=6, published_only=True):
 def get_featured_projects(limit=3):
     """
     Obtiene proyectos destacados.
+    Se cachean los FEATURED_CACHE_SIZE más recientes; la entrada depende del
+    namespace global y de los de cada proyecto y arquitecto mostrado.
     
     Args:
-        limit: Número de proyectos a retornar
+        limit: Número de proyectos a retornar (hasta FEATURED_CACHE_SIZE)
     
     Returns:
-        QuerySet de proyectos destacados
+        Lista de proyectos destacados
     """
     from .models import Project
     
-    return Project.objects.filter(
-        is_published=True,
-        is_featured=True
-    ).select_related('arquitecto').prefetch_related('images').order_by('-created_at')[:limit]
+    def compute():
+        return list(Project.objects.filter(
+            is_published=True,
+            is_featured=True
+        ).select_related('arquitecto').order_by('-created_at')[:FEATURED_CACHE_SIZE])
+    
+    def namespaces(projects):
+        return ['global'] + [
+            namespace
+            for project in projects
+            for namespace in (f"project:{project.pk}", f"user:{project.arquitecto_id}")
+        ]
+    
+    return cached_computation(
+        FEATURED_CACHE_KEY, compute, 300, name='featured_projects', depends_on=namespaces
+    )[:limit]
 
 
-def get_projects_by_category():
+def get_projects_by_category(published=True):
     """
     Obtiene conteo de proyectos por categoría.
+    Lee los contadores incrementales de vulcano.facets, servidos desde caché
+    con cached_computation.
+    
+    Args:
+        published: True/False para filtrar por publicación, None para todos
     
     Returns:
-        dict con categorías y conteos
+        lista de dicts con category, label y count, de mayor a menor
     """
-    from .models import Project
-    
-    cache_key = "projects_by_category"
-    data = cache.get(cache_key)
+    from .facets import get_category_counts
     
-    if data is None:
-        data = Project.objects.filter(
-            is_published=True
-        ).values('category').annotate(
-            count=Count('id')
-        ).order_by('-count')
-        
-        # Cachear por 10 minutos
-        cache.set(cache_key, list(data), 600)
-    
-    return data
+    return get_category_counts(published=published)
 
 
 def send_notification(user, message, notification_type='info'):
@@ -221,7 +442,7 @@ def send_notification(user, message, notification_type='info'):
         notification_type: Tipo de notificación (info, success, warning, error)
     """
     # TODO: Implementar sistema de notificaciones push o email
-    logger.info(f"Notificación [{notification_type}] para {user.username}: {message}")
+    log_event(logger, 'notification', user=user.username, type=notification_type, message=message)
 
 
 def format_currency(amount):
@@ -268,19 +489,25 @@ def calculate_project_progress(project):
     return int((elapsed_days / total_days) * 100)
 
 
-def log_user_activity(user, action, details=''):
+def log_user_activity(user, action, details='', project=None, request=None):
     """
-    Registra actividad del usuario en los logs.
+    Registra actividad del usuario en los logs y en el registro de auditoría
+    (ActivityEvent, escrito por lotes; ver vulcano.activity).
     
     Args:
         user: Usuario que realiza la acción
         action: Descripción de la acción
         details: Detalles adicionales
+        project: Proyecto relacionado (opcional)
+        request: Petición, para guardar la IP del cliente (opcional)
     """
-    logger.info(
-        f"Actividad de usuario | "
-        f"Usuario: {user.username} | "
-        f"Acción: {action} | "
-        f"Detalles: {details} | "
-        f"IP: {user.last_login}"
-    )
\ No newline at end of file
+    from .activity import record_activity
+    from .unique_views import client_ip
+    
+    ip_address = client_ip(request) if request is not None else None
+    log_event(
+        logger, 'user.activity',
+        user=user.username, action=action, details=details,
+        project=project.pk if project is not None else None, ip=ip_address
+    )
+    record_activity(user, action, details, project=project, ip_address=ip_address)
\ No newline at end of file
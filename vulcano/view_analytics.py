@@ -0,0 +1,175 @@
+"""
+Series temporales de visitas por proyecto (ProjectViewBucket).
+
+Las visitas del buffer (vulcano.view_counts) se suman por hora al
+consolidarse. `manage.py compact_view_buckets` agrupa las horas con más de
+HOUR_RETENTION en días y los días con más de DAY_RETENTION en meses, así
+que el histórico ocupa unas pocas filas por proyecto y nunca se recorren
+eventos individuales. view_history() responde con una sola consulta por
+rango sobre el índice (project, granularity, bucket_start); los periodos ya
+compactados se devuelven con su propia granularidad.
+"""
+
+from collections import Counter
+from datetime import timedelta
+from functools import reduce
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q, Sum
+from django.db.models.functions import TruncDay, TruncHour, TruncMonth
+from django.utils import timezone
+import logging
+import operator
+
+logger = logging.getLogger('vulcano')
+
+GRANULARITIES = ('hour', 'day', 'month')
+
+TRUNC_FUNCTIONS = {
+    'hour': TruncHour,
+    'day': TruncDay,
+    'month': TruncMonth,
+}
+
+# Antigüedad a partir de la cual cada nivel se agrupa en el siguiente
+HOUR_RETENTION = timedelta(days=7)
+DAY_RETENTION = timedelta(days=90)
+
+ROLLUPS = (
+    ('hour', 'day', HOUR_RETENTION),
+    ('day', 'month', DAY_RETENTION),
+)
+
+
+def period_start(value, granularity):
+    """Inicio (en la zona horaria actual) del periodo que contiene `value`."""
+    value = timezone.localtime(value).replace(minute=0, second=0, microsecond=0)
+    if granularity in ('day', 'month'):
+        value = value.replace(hour=0)
+    if granularity == 'month':
+        value = value.replace(day=1)
+    return value
+
+
+def add_to_buckets(counts, granularity='hour'):
+    """
+    Suma visitas con UPDATE ... SET count = count + n, creando los periodos nuevos.
+
+    Args:
+        counts: dict o Counter {(project_id, bucket_start): visitas}
+        granularity: 'hour', 'day' o 'month'
+    """
+    from .models import ProjectViewBucket
+
+    for (project_id, bucket_start), total in counts.items():
+        if not total:
+            continue
+        filters = {'project_id': project_id, 'granularity': granularity, 'bucket_start': bucket_start}
+        updated = ProjectViewBucket.objects.filter(**filters).update(count=F('count') + total)
+        if not updated:
+            try:
+                with transaction.atomic():
+                    ProjectViewBucket.objects.create(count=total, **filters)
+            except IntegrityError:
+                # Otra transacción creó el periodo entre el UPDATE y el INSERT
+                ProjectViewBucket.objects.filter(**filters).update(count=F('count') + total)
+
+
+def record_hits(hits):
+    """
+    Suma visitas del buffer a sus periodos horarios.
+
+    Args:
+        hits: iterable de (project_id, created_at)
+    """
+    add_to_buckets(Counter(
+        (project_id, period_start(created_at, 'hour')) for project_id, created_at in hits
+    ))
+
+
+def compact_view_buckets(now=None):
+    """
+    Agrupa horas antiguas en días y días antiguos en meses. Solo se agrupan
+    periodos completos: el corte se alinea al inicio del periodo destino.
+
+    Returns:
+        dict: {granularidad origen: filas agrupadas}
+    """
+    from .models import ProjectViewBucket
+
+    now = now or timezone.now()
+    compacted = {}
+    for source, target, retention in ROLLUPS:
+        cutoff = period_start(now - retention, target)
+        with transaction.atomic():
+            old = ProjectViewBucket.objects.filter(granularity=source, bucket_start__lt=cutoff)
+            totals = (
+                old.order_by()
+                .annotate(period=TRUNC_FUNCTIONS[target]('bucket_start'))
+                .values_list('project_id', 'period')
+                .annotate(total=Sum('count'))
+            )
+            add_to_buckets({(project_id, period): total for project_id, period, total in totals}, target)
+            compacted[source], _ = old.delete()
+    if any(compacted.values()):
+        logger.info(f"Periodos de visitas agrupados: {compacted}")
+    return compacted
+
+
+def view_history(granularity='day', start=None, end=None, project=None, arquitecto=None):
+    """
+    Histórico de visitas de un proyecto o de todos los proyectos de un arquitecto.
+
+    Lee todos los niveles y los agrega en SQL: los más finos que
+    `granularity` (horas aún sin agrupar incluidas) se suman a su periodo, y
+    los ya compactados en un nivel más grueso se devuelven a su propio
+    periodo (p. ej. meses antiguos al pedir días) en vez de desaparecer. El
+    periodo de salida que contiene `start` se devuelve completo.
+
+    Args:
+        granularity: 'hour', 'day' o 'month'
+        start, end: Rango [start, end) de datetimes con zona horaria
+        project: Project o ID (excluyente con arquitecto)
+        arquitecto: User o ID
+
+    Returns:
+        list: [{'bucket': datetime, 'granularity': str, 'views': int}] ordenada por periodo
+    """
+    from .models import ProjectViewBucket
+
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"Granularidad inválida: {granularity}")
+
+    queryset = ProjectViewBucket.objects.all()
+    if project is not None:
+        queryset = queryset.filter(project=project)
+    elif arquitecto is not None:
+        queryset = queryset.filter(project__arquitecto=arquitecto)
+    else:
+        raise ValueError("Se requiere un proyecto o un arquitecto")
+    # Periodo de salida de cada nivel: el pedido o el propio si es más grueso.
+    # Truncar el inicio de un periodo más grueso a uno más fino no lo cambia.
+    periods = {
+        level: GRANULARITIES[max(GRANULARITIES.index(level), GRANULARITIES.index(granularity))]
+        for level in GRANULARITIES
+    }
+    if start is not None:
+        queryset = queryset.filter(reduce(operator.or_, [
+            Q(granularity=level, bucket_start__gte=period_start(start, period))
+            for level, period in periods.items()
+        ]))
+    if end is not None:
+        queryset = queryset.filter(bucket_start__lt=end)
+
+    rows = (
+        queryset.order_by()
+        .annotate(bucket=TRUNC_FUNCTIONS[granularity]('bucket_start'))
+        .values_list('bucket', 'granularity')
+        .annotate(views=Sum('count'))
+    )
+    totals = Counter()
+    for bucket, level, views in rows:
+        totals[bucket, periods[level]] += views
+    return [
+        {'bucket': bucket, 'granularity': period, 'views': views}
+        for (bucket, period), views in sorted(totals.items(), key=lambda item: item[0])
+    ]
@@ -0,0 +1,91 @@
+"""
+Contador de visitas con escritura diferida (write-behind).
+
+Cada visita se inserta en ProjectViewHit, una tabla de solo inserción, en
+lugar de actualizar la fila del proyecto: la página de detalle nunca bloquea
+ni escribe vulcano_project. `manage.py flush_view_counts` (programado por
+cron cada minuto) suma las visitas pendientes por lotes con un único
+UPDATE ... SET views_count = views_count + CASE id WHEN ... END, y en la
+misma transacción las suma a los periodos horarios de vulcano.view_analytics.
+"""
+
+from collections import Counter
+from django.db import connection, transaction
+from django.db.models import Case, F, IntegerField, Value, When
+import logging
+
+logger = logging.getLogger('vulcano')
+
+FLUSH_BATCH_SIZE = 5000
+
+
+def record_view(project_id):
+    """Añade una visita al buffer. Solo inserta; nunca toca vulcano_project."""
+    from .models import ProjectViewHit
+
+    ProjectViewHit.objects.create(project_id=project_id)
+
+
+def pending_views(project_id=None):
+    """Visitas registradas que aún no se han sumado a views_count."""
+    from .models import ProjectViewHit
+
+    queryset = ProjectViewHit.objects.all()
+    if project_id is not None:
+        queryset = queryset.filter(project_id=project_id)
+    return queryset.count()
+
+
+def flush_batch(batch_size=FLUSH_BATCH_SIZE):
+    """
+    Consolida un lote de visitas pendientes en una transacción: lee las
+    filas más antiguas, las suma con un UPDATE por CASE, a sus periodos
+    horarios (ProjectViewBucket) y a sus arquitectos (UserStats) y las elimina.
+    En PostgreSQL las filas se bloquean con SKIP LOCKED, así que varios
+    procesos de consolidación no cuentan dos veces la misma visita.
+
+    Returns:
+        int: Visitas consolidadas (0 si no quedaban pendientes)
+    """
+    from .models import Project, ProjectViewHit
+    from .user_stats import record_views
+    from .view_analytics import record_hits
+
+    with transaction.atomic():
+        queryset = ProjectViewHit.objects.order_by('id')
+        if connection.features.has_select_for_update_skip_locked:
+            queryset = queryset.select_for_update(skip_locked=True)
+        hits = list(queryset.values_list('id', 'project_id', 'created_at')[:batch_size])
+        if not hits:
+            return 0
+
+        totals = Counter(project_id for _, project_id, _ in hits)
+        Project.objects.filter(pk__in=totals).update(
+            views_count=F('views_count') + Case(
+                *[When(pk=project_id, then=Value(total)) for project_id, total in totals.items()],
+                default=Value(0),
+                output_field=IntegerField()
+            )
+        )
+        record_hits((project_id, created_at) for _, project_id, created_at in hits)
+        record_views(totals)
+        ProjectViewHit.objects.filter(id__in=[hit_id for hit_id, _, _ in hits]).delete()
+    return len(hits)
+
+
+def flush_view_counts(batch_size=FLUSH_BATCH_SIZE):
+    """
+    Consolida todas las visitas pendientes, lote a lote.
+
+    Returns:
+        int: Total de visitas consolidadas
+    """
+    total = 0
+    while True:
+        flushed = flush_batch(batch_size)
+        total += flushed
+        if flushed < batch_size:
+            break
+    if total:
+        logger.info(f"Visitas consolidadas: {total}")
+    return total
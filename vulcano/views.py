@@ -4,6 +4,7 @@ Implementa toda la lógica de negocio para autenticación, proyectos y portales.
 """
 
 from django.shortcuts import render, redirect, get_object_or_404
+from django.template.loader import render_to_string
 from django.contrib.auth import (
     login, logout, authenticate,
     update_session_auth_hash
@@ -11,16 +12,22 @@ from django.contrib.auth import (
 from django.contrib.auth.forms import PasswordChangeForm
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.db.models import Q, Count, Prefetch
+from django.db.models import Q, Count
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
 from django.views.decorators.cache import cache_page
 from django.views.decorators.http import require_http_methods
-from django.http import JsonResponse, HttpResponseForbidden
+from django.http import HttpResponse, JsonResponse, HttpResponseForbidden, FileResponse, Http404
+from django.contrib.admin.views.decorators import staff_member_required
+from django.conf import settings
+from django.utils.crypto import constant_time_compare
 from django.utils import timezone
+from django.utils.dateparse import parse_date
 from django.contrib.auth.models import User
+from datetime import datetime, timedelta
+import hashlib
 import logging
 
-from .models import Project, ProjectImage, UserProfile, Message
+from .models import Project, ProjectImage, UserProfile, Message, ConversationParticipant
 from .forms import (
     CustomUserCreationForm, CustomAuthenticationForm, ProjectForm,
     ProjectImageForm, MultipleImageUploadForm, MessageForm, UserProfileForm
@@ -32,14 +39,40 @@ from .decorators import (
 from .utils import (
     get_user_statistics, clear_user_cache, get_recent_projects,
     get_featured_projects, optimize_image, log_user_activity,
-    calculate_project_progress
+    calculate_project_progress, get_projects_by_category
 )
+from .facets import get_status_counts
+from .search import search_projects, normalize_text
+from .pagination import CursorPaginator
+from .conversations import THREAD_PAGE_SIZE, mark_conversation_read
+from .cache_namespaces import versioned_key
+from .page_cache import anonymous_page_cache
+from .query_budget import query_budget
+from . import metrics, profiler
+from .structured_logging import log_event
+from .unique_views import register_unique_view
+from .view_analytics import GRANULARITIES, view_history
+from . import page_cache, view_counts
 
 logger = logging.getLogger('vulcano')
 
 
 # ==================== VISTAS PÚBLICAS ====================
 
+def render_category_filters(request):
+    """Barra de categorías con conteos; se refresca también en páginas cacheadas."""
+    return render_to_string('partials/_category_filters.html', {
+        'categories': get_projects_by_category(),
+        'current_category': request.GET.get('category', ''),
+    })
+
+
+@query_budget(8)
+@anonymous_page_cache(
+    'home',
+    params=('category', 'search', 'sort', 'cursor'),
+    refresh={'category_filters': render_category_filters},
+)
 def home(request):
     """
     Página principal pública con proyectos destacados y filtros.
@@ -50,53 +83,57 @@ def home(request):
     sort_by = request.GET.get('sort', '-created_at')
     
     # Base queryset de proyectos publicados
+    # La imagen principal está desnormalizada en Project, no hace falta prefetch
     projects = Project.objects.filter(
         is_published=True
-    ).select_related('arquitecto__profile').prefetch_related(
-        Prefetch('images', queryset=ProjectImage.objects.order_by('order'))
-    )
+    ).select_related('arquitecto__profile')
     
     # Aplicar filtros
     if category:
         projects = projects.filter(category=category)
     
     if search:
-        projects = projects.filter(
-            Q(title__icontains=search) |
-            Q(description__icontains=search) |
-            Q(location__icontains=search)
-        )
+        # Búsqueda de texto completo ordenada por relevancia
+        projects = search_projects(projects, search)
     
-    # Aplicar ordenamiento
+    # Ordenamiento: siempre termina en 'id' para que el cursor no tenga empates.
+    # Con búsqueda y sin orden explícito se mantiene la relevancia.
     valid_sorts = {
-        'newest': '-created_at',
-        'oldest': 'created_at',
-        'popular': '-views_count',
-        'title': 'title',
+        'newest': ('-created_at', '-id'),
+        'oldest': ('created_at', 'id'),
+        'popular': ('-views_count', '-id'),
+        'title': ('title', 'id'),
     }
-    sort_field = valid_sorts.get(sort_by, '-created_at')
-    projects = projects.order_by(sort_field)
-    
-    # Paginación
-    paginator = Paginator(projects, 12)
-    page = request.GET.get('page', 1)
+    # Valores que envía el selector de orden de home.html
+    sort_aliases = {'-created_at': 'newest', 'created_at': 'oldest'}
+    if search and 'sort' not in request.GET:
+        ordering = ('-search_rank', '-id')
+    else:
+        ordering = valid_sorts.get(sort_aliases.get(sort_by, sort_by), valid_sorts['newest'])
     
-    try:
-        projects_page = paginator.page(page)
-    except PageNotAnInteger:
-        projects_page = paginator.page(1)
-    except EmptyPage:
-        projects_page = paginator.page(paginator.num_pages)
+    # Paginación por cursor: coste constante a cualquier profundidad
+    count_key = versioned_key(
+        'home_count_' + hashlib.md5(f"{category}|{normalize_text(search)}".encode()).hexdigest(),
+        f"category:{category or 'all'}"
+    )
+    paginator = CursorPaginator(projects, 12, ordering, count_cache_key=count_key)
+    projects_page = paginator.page(request.GET.get('cursor'))
     
     # Proyectos destacados
     featured_projects = get_featured_projects(3)
     
-    # Categorías con conteo
-    categories = Project.objects.filter(
-        is_published=True
-    ).values('category').annotate(
-        count=Count('id')
-    ).order_by('-count')
+    # Categorías con conteo (contadores incrementales en caché)
+    categories = get_projects_by_category()
+    
+    # Etiquetas para invalidar la caché de página anónima
+    page_cache.add_tags(
+        request,
+        f"category:{category or 'all'}",
+        'global',
+        *page_cache.project_tags(projects_page),
+        *page_cache.project_tags(featured_projects),
+        *[f"user:{project.arquitecto_id}" for project in featured_projects],
+    )
     
     context = {
         'projects': projects_page,
@@ -105,12 +142,34 @@ def home(request):
         'current_category': category,
         'search_query': search,
         'current_sort': sort_by,
-        'total_projects': projects.count(),
+        'total_projects': paginator.count,
     }
     
     return render(request, 'home.html', context)
 
 
+def register_project_view(request, project_id):
+    """
+    Cuenta una visita única (ver unique_views) a un proyecto sin escribir
+    en la sesión. La visita va al buffer de view_counts; views_count se
+    actualiza al consolidarlo.
+    
+    Returns:
+        bool: True si la visita se contó
+    """
+    if not register_unique_view(request, project_id):
+        return False
+    view_counts.record_view(project_id)
+    return True
+
+
+def count_cached_project_view(request, meta):
+    """Cuenta la visita cuando el detalle se sirve desde la caché de página."""
+    register_project_view(request, meta['project_id'])
+
+
+@query_budget(12)
+@anonymous_page_cache('project_detail', on_hit=count_cached_project_view)
 def project_detail(request, slug):
     """
     Vista de detalle de proyecto con galería de imágenes.
@@ -138,10 +197,8 @@ def project_detail(request, slug):
             return redirect('vulcano:home')
     
     # Incrementar contador de vistas (solo para visitantes únicos por sesión)
-    session_key = f"viewed_project_{project.id}"
-    if not request.session.get(session_key):
-        project.increment_views()
-        request.session[session_key] = True
+    if register_project_view(request, project.id):
+        project.views_count += 1
     
     # Proyectos relacionados de la misma categoría
     related_projects = Project.objects.filter(
@@ -149,13 +206,23 @@ def project_detail(request, slug):
         is_published=True
     ).exclude(id=project.id).select_related(
         'arquitecto'
-    ).prefetch_related('images')[:3]
+    ).cached(300)[:3]
     
     # Calcular progreso si es proyecto activo
     progress = None
     if project.status == 'in_progress':
         progress = calculate_project_progress(project)
     
+    # Etiquetas para invalidar la caché de página anónima
+    page_cache.add_tags(
+        request,
+        f"project:{project.id}",
+        f"user:{project.arquitecto_id}",
+        f"category:{project.category}",
+        *page_cache.project_tags(related_projects),
+    )
+    request.page_cache_meta = {'project_id': project.id}
+    
     context = {
         'project': project,
         'project_images': project.images.all(),
@@ -186,7 +253,7 @@ def register_view(request):
                 request,
                 '¡Cuenta creada exitosamente! Por favor, inicia sesión para continuar.'
             )
-            log_user_activity(user, 'Registro', f'Nuevo usuario con rol {user.profile.role}')
+            log_user_activity(user, 'Registro', f'Nuevo usuario con rol {user.profile.role}', request=request)
             return redirect('vulcano:login')
     else:
         form = CustomUserCreationForm()
@@ -211,7 +278,7 @@ def login_view(request):
             if user is not None:
                 login(request, user)
                 messages.success(request, f'¡Bienvenido de nuevo, {user.get_full_name()}!')
-                log_user_activity(user, 'Inicio de sesión', 'Login exitoso')
+                log_user_activity(user, 'Inicio de sesión', 'Login exitoso', request=request)
                 
                 # Redirigir a la página solicitada o al dashboard
                 next_url = request.GET.get('next')
@@ -237,12 +304,13 @@ def logout_view(request):
     username = request.user.username
     logout(request)
     messages.info(request, 'Has cerrado sesión exitosamente.')
-    logger.info(f"Usuario {username} cerró sesión")
+    log_event(logger, 'auth.logout', user=username)
     return redirect('vulcano:home')
 
 
 # ==================== DASHBOARD Y PORTALES ====================
 
+@query_budget(6)
 @login_required
 def dashboard(request):
     """
@@ -250,19 +318,19 @@ def dashboard(request):
     """
     try:
         user_profile = request.user.profile
-        logger.info(f"Dashboard - Usuario: {request.user.username}, Rol: {user_profile.role}")
+        log_event(logger, 'dashboard.redirect', user=request.user.username, role=user_profile.role)
         
         if user_profile.is_admin() or user_profile.role == 'admin':
-            logger.info("Redirigiendo a portal_admin")
             return redirect('vulcano:portal_admin')
         elif user_profile.is_arquitecto():
-            logger.info("Redirigiendo a portal_arquitecto")
             return redirect('vulcano:portal_arquitecto')
         elif user_profile.is_cliente():
-            logger.info("Redirigiendo a portal_cliente")
             return redirect('vulcano:portal_cliente')
         
-        logger.warning(f"Rol de usuario no reconocido: {user_profile.role}")
+        log_event(
+            logger, 'dashboard.unknown_role', logging.WARNING,
+            user=request.user.username, role=user_profile.role
+        )
         messages.error(request, 'Rol de usuario no reconocido.')
         return redirect('vulcano:home')
     except Exception as e:
@@ -271,6 +339,7 @@ def dashboard(request):
         return redirect('vulcano:home')
 
 
+@query_budget(26)
 @login_required
 @admin_required
 def portal_admin(request):
@@ -282,7 +351,7 @@ def portal_admin(request):
     # Obtener datos recientes
     recent_projects = Project.objects.select_related(
         'arquitecto'
-    ).order_by('-created_at')[:5]
+    ).order_by('-created_at').cached(300)[:5]
     
     recent_users = User.objects.select_related(
         'profile'
@@ -290,18 +359,11 @@ def portal_admin(request):
     
     recent_messages = Message.objects.select_related(
         'sender', 'recipient'
-    ).order_by('-created_at')[:5]
-    
-    # Estadísticas por categoría
-    projects_by_status = Project.objects.values('status').annotate(
-        count=Count('id')
-    ).order_by('-count')
+    ).order_by('-created_at').cached(300)[:5]
     
-    projects_by_category = Project.objects.filter(
-        is_published=True
-    ).values('category').annotate(
-        count=Count('id')
-    ).order_by('-count')[:5]
+    # Estadísticas por categoría (contadores incrementales en caché)
+    projects_by_status = get_status_counts()
+    projects_by_category = get_projects_by_category()[:5]
     
     context = {
         'stats': stats,
@@ -315,25 +377,20 @@ def portal_admin(request):
     return render(request, 'dashboard/portal_admin.html', context)
 
 
+@query_budget(25)
 @login_required
 @role_required('arquitecto')
 def portal_arquitecto(request):
     """
     Portal de arquitecto con gestión de proyectos propios.
     """
-    # Debug log
-    logger.info(f"Usuario {request.user.username} accediendo al portal de arquitecto")
-    
     # Obtener estadísticas del usuario
     stats = get_user_statistics(request.user)
-    logger.info(f"Estadísticas: {stats}")
     
     # Obtener proyectos del arquitecto
     my_projects = Project.objects.filter(
         arquitecto=request.user
-    ).select_related('arquitecto').prefetch_related('images', 'clients').order_by('-created_at')
-    
-    logger.info(f"Total de proyectos encontrados: {my_projects.count()}")
+    ).select_related('arquitecto').prefetch_related('clients__profile').order_by('-created_at')
     
     # Filtros
     filter_type = request.GET.get('filter', 'all')
@@ -346,12 +403,6 @@ def portal_arquitecto(request):
     elif filter_type == 'completed':
         my_projects = my_projects.filter(status='completed')
     
-    # Conteos para las pestañas
-    published_count = my_projects.filter(is_published=True).count()
-    draft_count = my_projects.filter(is_published=False).count()
-    in_progress_count = my_projects.filter(status='in_progress').count()
-    completed_count = my_projects.filter(status='completed').count()
-    
     # Paginación
     paginator = Paginator(my_projects, 9)  # 9 proyectos por página
     page = request.GET.get('page', 1)
@@ -371,10 +422,10 @@ def portal_arquitecto(request):
         'projects': projects,  # La variable de la paginación
         'recent_messages': recent_messages,
         'filter': filter_type,
-        'published_projects': published_count,
-        'draft_projects': draft_count,
-        'in_progress_projects': in_progress_count,
-        'completed_projects': completed_count,
+        'published_projects': stats['published_projects'],
+        'draft_projects': stats['draft_projects'],
+        'in_progress_projects': stats['in_progress_projects'],
+        'completed_projects': stats['completed_projects'],
         'total_projects': stats['total_projects'],
         'total_views': stats['total_views'],
         'total_clients': stats['total_clients'],
@@ -382,11 +433,16 @@ def portal_arquitecto(request):
         'new_projects_month': stats.get('new_projects_month', 0)
     }
     
-    logger.info(f"Contexto final preparado: {context}")
+    log_event(
+        logger, 'portal_arquitecto.render',
+        user=request.user.username, filter=filter_type, page=projects.number,
+        total_projects=stats['total_projects'], unread_messages=context['unread_messages']
+    )
     
     return render(request, 'dashboard/portal_arquitecto.html', context)
 
 
+@query_budget(21)
 @login_required
 @role_required('cliente')
 def portal_cliente(request):
@@ -398,7 +454,7 @@ def portal_cliente(request):
     # Proyectos asignados al cliente
     assigned_projects = request.user.assigned_projects.select_related(
         'arquitecto__profile'
-    ).prefetch_related('images').order_by('-created_at')
+    ).order_by('-created_at')
     
     # Filtros
     status_filter = request.GET.get('status', '')
@@ -410,17 +466,12 @@ def portal_cliente(request):
         Q(sender=request.user) | Q(recipient=request.user)
     ).select_related('sender', 'recipient').order_by('-created_at')[:5]
     
-    # Conteos para estadísticas
-    my_projects_count = assigned_projects.count()
-    my_architects_count = assigned_projects.values('arquitecto').distinct().count()
-    favorites_count = assigned_projects.filter(is_featured=True).count()
-    
     context = {
         'stats': stats,
         'my_projects': assigned_projects,  # Cambiado a my_projects para coincidir con el template
-        'my_projects_count': my_projects_count,
-        'my_architects_count': my_architects_count,
-        'favorites_count': favorites_count,
+        'my_projects_count': stats['assigned_projects'],
+        'my_architects_count': stats['total_architects'],
+        'favorites_count': stats['featured_projects'],
         'unread_messages': stats.get('unread_messages', 0),
         'recent_messages': recent_messages,
         'status_filter': status_filter,
@@ -431,6 +482,7 @@ def portal_cliente(request):
 
 # ==================== CRUD DE PROYECTOS ====================
 
+@query_budget(32)
 @login_required
 @arquitecto_or_admin_required
 def project_create(request):
@@ -461,17 +513,14 @@ def project_create(request):
             
             # Procesar imágenes si se subieron
             if image_form.is_valid() and request.FILES.getlist('images'):
-                images = request.FILES.getlist('images')
-                for i, image in enumerate(images):
-                    ProjectImage.objects.create(
-                        project=project,
-                        image=image,
-                        is_main=(i == 0),  # Primera imagen como principal
-                        order=i
-                    )
+                # Primera imagen como principal
+                project.add_images(request.FILES.getlist('images'), main_first=True)
             
             messages.success(request, f'Proyecto "{project.title}" creado exitosamente.')
-            log_user_activity(request.user, 'Crear proyecto', f'Proyecto: {project.title}')
+            log_user_activity(
+                request.user, 'Crear proyecto', f'Proyecto: {project.title}',
+                project=project, request=request
+            )
             clear_user_cache(request.user)
             
             return redirect('vulcano:project_detail', slug=project.slug)
@@ -492,14 +541,13 @@ def project_create(request):
     return render(request, 'projects/project_form.html', context)
 
 
+@query_budget(12)
 @login_required
 @project_owner_required
-def project_edit(request, slug):
+def project_edit(request, slug, project):
     """
     Vista para editar un proyecto existente.
     """
-    project = get_object_or_404(Project, slug=slug)
-    
     if request.method == 'POST':
         form = ProjectForm(request.POST, instance=project)
         image_form = MultipleImageUploadForm(request.POST, request.FILES)
@@ -509,18 +557,13 @@ def project_edit(request, slug):
             
             # Procesar nuevas imágenes
             if image_form.is_valid() and request.FILES.getlist('images'):
-                images = request.FILES.getlist('images')
-                current_max_order = project.images.count()
-                
-                for i, image in enumerate(images):
-                    ProjectImage.objects.create(
-                        project=project,
-                        image=image,
-                        order=current_max_order + i
-                    )
+                project.add_images(request.FILES.getlist('images'))
             
             messages.success(request, f'Proyecto "{project.title}" actualizado exitosamente.')
-            log_user_activity(request.user, 'Editar proyecto', f'Proyecto: {project.title}')
+            log_user_activity(
+                request.user, 'Editar proyecto', f'Proyecto: {project.title}',
+                project=project, request=request
+            )
             clear_user_cache(request.user)
             
             return redirect('vulcano:project_detail', slug=project.slug)
@@ -540,17 +583,15 @@ def project_edit(request, slug):
 
 @login_required
 @project_owner_required
-def project_delete(request, slug):
+def project_delete(request, slug, project):
     """
     Vista para eliminar un proyecto.
     """
-    project = get_object_or_404(Project, slug=slug)
-    
     if request.method == 'POST':
         project_title = project.title
         project.delete()
         messages.success(request, f'Proyecto "{project_title}" eliminado exitosamente.')
-        log_user_activity(request.user, 'Eliminar proyecto', f'Proyecto: {project_title}')
+        log_user_activity(request.user, 'Eliminar proyecto', f'Proyecto: {project_title}', request=request)
         clear_user_cache(request.user)
         return redirect('vulcano:dashboard')
     
@@ -560,12 +601,11 @@ def project_delete(request, slug):
 
 @login_required
 @project_owner_required
-def project_image_delete(request, slug, image_id):
+def project_image_delete(request, slug, image_id, project):
     """
     Elimina una imagen específica de un proyecto (AJAX).
     """
     if request.method == 'POST':
-        project = get_object_or_404(Project, slug=slug)
         image = get_object_or_404(ProjectImage, id=image_id, project=project)
         
         image.delete()
@@ -578,55 +618,105 @@ def project_image_delete(request, slug, image_id):
 
 # ==================== MENSAJERÍA ====================
 
+@query_budget(11)
 @login_required
 def inbox(request):
     """
-    Vista de bandeja de entrada de mensajes.
+    Vista de bandeja de entrada: conversaciones ordenadas por su último mensaje.
     """
-    # Obtener mensajes según el filtro
     filter_type = request.GET.get('filter', 'all')
+    search_query = request.GET.get('search', '').strip()
     
-    if filter_type == 'sent':
-        messages_list = Message.objects.filter(
-            sender=request.user
-        ).select_related('recipient', 'project').order_by('-created_at')
-    else:
-        messages_list = Message.objects.filter(
-            recipient=request.user
-        ).select_related('sender', 'project').order_by('-created_at')
-    
-    # Aplicar filtros adicionales
-    if filter_type == 'unread':
-        messages_list = messages_list.filter(is_read=False)
-    elif filter_type == 'read':
-        messages_list = messages_list.filter(is_read=True)
+    # Una fila por conversación del usuario, sobre el índice (user, -last_message_at)
+    memberships = ConversationParticipant.objects.filter(user=request.user)
     
-    # Paginación
-    paginator = Paginator(messages_list, 20)
-    page = request.GET.get('page', 1)
+    # Totales por pestaña en una sola consulta agregada
+    totals = memberships.aggregate(
+        total=Count('id'),
+        sent=Count('id', filter=Q(conversation__last_sender=request.user)),
+        unread=Count('id', filter=Q(unread_count__gt=0)),
+    )
     
-    try:
-        messages_page = paginator.page(page)
-    except PageNotAnInteger:
-        messages_page = paginator.page(1)
-    except EmptyPage:
-        messages_page = paginator.page(paginator.num_pages)
+    # Recibidos: el último mensaje es del otro participante; enviados: es propio
+    if filter_type == 'received':
+        memberships = memberships.exclude(conversation__last_sender=request.user)
+    elif filter_type == 'sent':
+        memberships = memberships.filter(conversation__last_sender=request.user)
+    elif filter_type == 'unread':
+        memberships = memberships.filter(unread_count__gt=0)
+    
+    if search_query:
+        memberships = memberships.filter(
+            Q(conversation__last_subject__icontains=search_query) |
+            Q(conversation__last_snippet__icontains=search_query) |
+            Q(conversation__project__title__icontains=search_query)
+        )
     
-    # Contar mensajes no leídos
-    unread_count = Message.objects.filter(
-        recipient=request.user,
-        is_read=False
-    ).count()
+    memberships = memberships.select_related(
+        'conversation__project',
+        'conversation__user_low__profile',
+        'conversation__user_high__profile',
+    )
+    paginator = CursorPaginator(memberships, 20, ('-last_message_at', '-id'))
+    conversations_page = paginator.page(request.GET.get('cursor'))
+    for membership in conversations_page:
+        membership.other_user = membership.conversation.other_participant(request.user)
     
     context = {
-        'messages': messages_page,
-        'unread_count': unread_count,
-        'filter_type': filter_type,
+        'conversations': conversations_page,
+        'total_messages': totals['total'],
+        'received_messages': totals['total'] - totals['sent'],
+        'sent_messages': totals['sent'],
+        'unread_messages': totals['unread'],
+        'filter': filter_type,
+        'search_query': search_query,
     }
     
     return render(request, 'messaging/inbox.html', context)
 
 
+@query_budget(12)
+@login_required
+def conversation_detail(request, pk):
+    """
+    Hilo de una conversación. Los mensajes se cargan por cursor, de los más
+    recientes hacia atrás; con ?cursor= y la cabecera X-Requested-With se
+    devuelve solo el fragmento con los mensajes anteriores.
+    """
+    membership = get_object_or_404(
+        ConversationParticipant.objects.select_related(
+            'conversation__project',
+            'conversation__user_low__profile',
+            'conversation__user_high__profile',
+        ),
+        conversation_id=pk,
+        user=request.user
+    )
+    conversation = membership.conversation
+    
+    if membership.unread_count:
+        mark_conversation_read(conversation, request.user)
+    
+    paginator = CursorPaginator(
+        conversation.messages.select_related('sender'),
+        THREAD_PAGE_SIZE,
+        ('-created_at', '-id')
+    )
+    page = paginator.page(request.GET.get('cursor'))
+    
+    context = {
+        'conversation': conversation,
+        'other_user': conversation.other_participant(request.user),
+        'page': page,
+        # Orden cronológico para mostrar el hilo
+        'thread': list(reversed(page.object_list)),
+    }
+    if request.headers.get('x-requested-with') == 'XMLHttpRequest':
+        return render(request, 'messaging/_thread_messages.html', context)
+    return render(request, 'messaging/conversation.html', context)
+
+
+@query_budget(12)
 @login_required
 def message_detail(request, pk):
     """
@@ -655,6 +745,8 @@ def message_detail(request, pk):
     return render(request, 'messaging/message_detail.html', context)
 
 
+# El primer mensaje entre dos usuarios crea además su conversación
+@query_budget(20)
 @login_required
 def message_compose(request):
     """
@@ -672,7 +764,9 @@ def message_compose(request):
             log_user_activity(
                 request.user,
                 'Enviar mensaje',
-                f'A: {message.recipient.username}'
+                f'A: {message.recipient.username}',
+                project=message.project,
+                request=request
             )
             
             # Limpiar caché después de enviar mensaje
@@ -799,4 +893,110 @@ def ajax_project_toggle_featured(request, project_id):
             'is_featured': project.is_featured
         })
     
-    return JsonResponse({'success': False}, status=400)
\ No newline at end of file
+    return JsonResponse({'success': False}, status=400)
+
+
+def view_history_response(request, **target):
+    """
+    Respuesta JSON con el histórico de visitas de view_analytics.
+    Parámetros GET: granularity (hour, day, month), start y end (AAAA-MM-DD, end inclusivo).
+    Los periodos ya compactados en un nivel más grueso llevan su propia granularidad.
+    """
+    granularity = request.GET.get('granularity', 'day')
+    if granularity not in GRANULARITIES:
+        return JsonResponse({'success': False, 'error': 'Granularidad inválida'}, status=400)
+    
+    try:
+        end = parse_date(request.GET['end']) if 'end' in request.GET else timezone.localdate()
+        # Por defecto, los últimos 30 días
+        start = parse_date(request.GET['start']) if 'start' in request.GET else end - timedelta(days=29)
+    except (TypeError, ValueError):
+        start = end = None
+    if start is None or end is None:
+        return JsonResponse({'success': False, 'error': 'Fecha inválida'}, status=400)
+    
+    history = view_history(
+        granularity,
+        start=timezone.make_aware(datetime.combine(start, datetime.min.time())),
+        end=timezone.make_aware(datetime.combine(end + timedelta(days=1), datetime.min.time())),
+        **target
+    )
+    return JsonResponse({
+        'success': True,
+        'granularity': granularity,
+        'history': [
+            {'bucket': row['bucket'].isoformat(), 'granularity': row['granularity'], 'views': row['views']}
+            for row in history
+        ],
+    })
+
+
+@login_required
+def ajax_project_view_history(request, project_id):
+    """
+    Histórico de visitas de un proyecto (arquitecto dueño o admin).
+    """
+    project = get_object_or_404(Project, id=project_id)
+    if not (request.user.profile.is_admin() or project.arquitecto_id == request.user.id):
+        return JsonResponse({'success': False, 'error': 'Permisos insuficientes'}, status=403)
+    
+    return view_history_response(request, project=project)
+
+
+@login_required
+def ajax_architect_view_history(request, user_id):
+    """
+    Histórico de visitas sumadas de todos los proyectos de un arquitecto
+    (el propio arquitecto o admin).
+    """
+    if not (request.user.profile.is_admin() or request.user.id == user_id):
+        return JsonResponse({'success': False, 'error': 'Permisos insuficientes'}, status=403)
+    
+    arquitecto = get_object_or_404(User, id=user_id, profile__role='arquitecto')
+    return view_history_response(request, arquitecto=arquitecto)
+
+
+def metrics_view(request):
+    """
+    Métricas de todos los workers en formato de texto de Prometheus.
+    Requiere `Authorization: Bearer <METRICS_TOKEN>` o un usuario staff.
+    """
+    token = settings.METRICS_TOKEN
+    header = request.META.get('HTTP_AUTHORIZATION', '')
+    authorized = (
+        (token and constant_time_compare(header, f'Bearer {token}')) or
+        (request.user.is_authenticated and request.user.is_staff)
+    )
+    if not authorized:
+        return HttpResponseForbidden('Acceso denegado')
+    
+    return HttpResponse(metrics.render_metrics(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+# ==================== PERFILADOR ====================
+
+@staff_member_required
+def profile_list(request):
+    """
+    Perfiles guardados y un token nuevo para perfilar peticiones
+    (?_profile=<token> o cabecera X-Vulcano-Profile).
+    """
+    context = {
+        'profiles': profiler.list_profiles(),
+        'token': profiler.make_token(request.user),
+        'token_minutes': settings.PROFILER_TOKEN_MAX_AGE // 60,
+        'query_param': profiler.QUERY_PARAM,
+    }
+    return render(request, 'dashboard/profiles.html', context)
+
+
+@staff_member_required
+def profile_download(request, profile_id):
+    """Descarga el archivo de speedscope de un perfil."""
+    path = profiler.profile_path(profile_id)
+    if path is None:
+        raise Http404('Perfil no encontrado')
+    return FileResponse(
+        open(path, 'rb'), as_attachment=True,
+        filename=f'{profile_id}.speedscope.json', content_type='application/json'
+    )
@@ -43,6 +43,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     
     # Cloudinary (DEBE ir ANTES de las apps locales)
     'cloudinary_storage',
@@ -59,17 +60,26 @@ INSTALLED_APPS = [
 # MIDDLEWARE
 # ============================================================================
 MIDDLEWARE = [
+    'vulcano.middleware.MetricsMiddleware',
+    'vulcano.middleware.ProfilerMiddleware',
+    'vulcano.middleware.SamplerMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
+    'vulcano.middleware.QueryBudgetMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'vulcano.middleware.IdentityMapMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'vulcano.middleware.TestModeMiddleware',
+    'vulcano.middleware.InvalidationCollectorMiddleware',
 ]
 
+# Carga el perfil junto con el usuario (ver vulcano.identity_map)
+AUTHENTICATION_BACKENDS = ['vulcano.identity_map.ProfileModelBackend']
+
 ROOT_URLCONF = 'webVulcano.urls'
 
 # ============================================================================
@@ -77,7 +87,8 @@ ROOT_URLCONF = 'webVulcano.urls'
 # ============================================================================
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # DjangoTemplates que mide el renderizado para Server-Timing (vulcano.metrics)
+        'BACKEND': 'vulcano.metrics.TimedDjangoTemplates',
         'DIRS': [BASE_DIR / 'vulcano' / 'templates'],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -253,6 +264,9 @@ if DEBUG:
                 'format': '{levelname} {asctime} {module} {message}',
                 'style': '{',
             },
+            'json': {
+                '()': 'vulcano.structured_logging.JsonFormatter',
+            },
         },
         'handlers': {
             'file': {
@@ -261,7 +275,7 @@ if DEBUG:
                 'filename': BASE_DIR / 'logs' / 'vulcano.log',
                 'maxBytes': 1024 * 1024 * 10,
                 'backupCount': 5,
-                'formatter': 'verbose',
+                'formatter': 'json',
             },
             'console': {
                 'level': 'DEBUG',
@@ -280,16 +294,15 @@ else:
         'version': 1,
         'disable_existing_loggers': False,
         'formatters': {
-            'simple': {
-                'format': '{levelname} {asctime} {message}',
-                'style': '{',
+            'json': {
+                '()': 'vulcano.structured_logging.JsonFormatter',
             },
         },
         'handlers': {
             'console': {
                 'level': 'INFO',
                 'class': 'logging.StreamHandler',
-                'formatter': 'simple',
+                'formatter': 'json',
             },
         },
         'root': {
@@ -301,17 +314,134 @@ else:
 # ============================================================================
 # CACHÉ
 # ============================================================================
-CACHES = {
+# Entorno de tests: explícito, no deducido de la línea de comandos.
+# manage.py lo activa para `manage.py test`; otros runners deben exportar TESTING=True.
+TESTING = config('TESTING', default=False, cast=bool)
+
+# Los workers de gunicorn comparten la caché a través de un archivo SQLite
+# (vulcano.sqlite_cache): una invalidación se ve en todos los procesos del host.
+# Delante, vulcano.tiered_cache guarda las claves calientes en memoria de cada
+# worker (L1) y las invalida por un bus sondeado en el mismo archivo.
+# Los tests que la ejercitan la usan con override_settings sobre un archivo temporal.
+PRODUCTION_CACHES = {
     'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-        'LOCATION': 'vulcano-cache',
+        'BACKEND': 'vulcano.tiered_cache.TieredCache',
+        'LOCATION': 'shared',
+        'OPTIONS': {
+            'L1_KEYS': r'^(featured_projects|project_facet_counts|user_stats_\d+)$|^ns:(?!clock$)',
+            'L1_TIMEOUT': config('CACHE_L1_TIMEOUT', default=5, cast=float),
+            'POLL_INTERVAL': config('CACHE_POLL_INTERVAL', default=0.1, cast=float),
+            'BUS': config('CACHE_BUS', default='sqlite'),
+        }
+    },
+    'shared': {
+        'BACKEND': 'vulcano.sqlite_cache.SQLiteCache',
+        'LOCATION': config('CACHE_LOCATION', default=str(BASE_DIR / 'cache' / 'vulcano-cache.sqlite3')),
         'TIMEOUT': 300,
         'OPTIONS': {
-            'MAX_ENTRIES': 1000
+            'MAX_BYTES': config('CACHE_MAX_BYTES', default=64 * 1024 * 1024, cast=int)
+        }
+    }
+}
+
+# En tests, la caché en memoria del proceso
+if TESTING:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'vulcano-cache',
+            'TIMEOUT': 300,
+            'OPTIONS': {
+                'MAX_ENTRIES': 1000
+            }
         }
     }
+else:
+    CACHES = PRODUCTION_CACHES
+
+# Caché de página completa para visitantes anónimos (vulcano.page_cache).
+# Desactivada por defecto con TESTING: la caché en memoria persiste entre
+# tests y el rollback de cada test no dispara las señales de invalidación.
+PAGE_CACHE_ENABLED = config('PAGE_CACHE_ENABLED', default=not TESTING, cast=bool)
+
+# Los contadores de cached_computation se acumulan en memoria de cada worker
+# y se suman a la caché compartida cada tantos segundos
+COMPUTATION_STATS_FLUSH_INTERVAL = config('COMPUTATION_STATS_FLUSH_INTERVAL', default=30, cast=float)
+
+# ============================================================================
+# PRESUPUESTO DE CONSULTAS (vulcano.query_budget)
+# ============================================================================
+# En tests toda petición se mide y un exceso lanza QueryBudgetExceeded; en
+# producción se mide una muestra y los excesos solo se registran en el log.
+QUERY_BUDGET_MODE = config('QUERY_BUDGET_MODE', default='raise' if TESTING else 'log')
+QUERY_BUDGET_SAMPLE_RATE = config('QUERY_BUDGET_SAMPLE_RATE', default=1.0 if TESTING else 0.05, cast=float)
+QUERY_BUDGET_REPEAT_THRESHOLD = config('QUERY_BUDGET_REPEAT_THRESHOLD', default=5, cast=int)
+
+# ============================================================================
+# MÉTRICAS (vulcano.metrics)
+# ============================================================================
+# Registro compartido por los workers; en tests solo en memoria del proceso.
+METRICS_LOCATION = None if TESTING else config(
+    'METRICS_LOCATION', default=str(BASE_DIR / 'cache' / 'vulcano-metrics.sqlite3')
+)
+METRICS_FLUSH_INTERVAL = config('METRICS_FLUSH_INTERVAL', default=5, cast=float)
+# /metrics acepta `Authorization: Bearer <METRICS_TOKEN>` o un usuario staff
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+
+# ============================================================================
+# CONSULTAS LENTAS (vulcano.slow_queries)
+# ============================================================================
+SLOW_QUERY_THRESHOLD_MS = config('SLOW_QUERY_THRESHOLD_MS', default=200, cast=float)
+SLOW_QUERY_EXPLAIN_RATE = config('SLOW_QUERY_EXPLAIN_RATE', default=0.1, cast=float)
+SLOW_QUERY_RETENTION_DAYS = config('SLOW_QUERY_RETENTION_DAYS', default=7, cast=int)
+# En tests solo se registran en el log
+SLOW_QUERY_LOCATION = None if TESTING else config(
+    'SLOW_QUERY_LOCATION', default=str(BASE_DIR / 'cache' / 'vulcano-slow-queries.sqlite3')
+)
+
+# ============================================================================
+# PERFILADOR BAJO DEMANDA (vulcano.profiler)
+# ============================================================================
+PROFILER_DIRECTORY = config('PROFILER_DIRECTORY', default=str(BASE_DIR / 'cache' / 'profiles'))
+PROFILER_TOKEN_MAX_AGE = config('PROFILER_TOKEN_MAX_AGE', default=3600, cast=int)
+PROFILER_MAX_EVENTS = config('PROFILER_MAX_EVENTS', default=2000000, cast=int)
+PROFILER_KEEP = config('PROFILER_KEEP', default=50, cast=int)
+
+# ============================================================================
+# MUESTREO CONTINUO DE CPU (vulcano.sampler)
+# ============================================================================
+# Desactivado en tests: cada worker arranca un hilo muestreador
+SAMPLER_ENABLED = config('SAMPLER_ENABLED', default=not TESTING, cast=bool)
+SAMPLER_HZ = config('SAMPLER_HZ', default=10, cast=float)
+SAMPLER_DIRECTORY = config('SAMPLER_DIRECTORY', default=str(BASE_DIR / 'cache' / 'samples'))
+SAMPLER_FLUSH_INTERVAL = config('SAMPLER_FLUSH_INTERVAL', default=60, cast=float)
+SAMPLER_RETENTION_HOURS = config('SAMPLER_RETENTION_HOURS', default=48, cast=int)
+
+# ============================================================================
+# LOGGING ESTRUCTURADO (vulcano.structured_logging)
+# ============================================================================
+# Los handlers del logger raíz escriben desde un hilo propio (QueueListener)
+LOG_ASYNC = config('LOG_ASYNC', default=not TESTING, cast=bool)
+# Fracción de los eventos de log_event que se emiten (por defecto todos)
+LOG_SAMPLE_RATES = {
+    'dashboard.redirect': 0.1,
+    'portal_arquitecto.render': 0.05,
 }
 
+# ============================================================================
+# REGISTRO DE ACTIVIDAD (vulcano.activity)
+# ============================================================================
+# Los eventos se escriben por lotes desde un hilo; en tests, al momento
+ACTIVITY_ASYNC = config('ACTIVITY_ASYNC', default=not TESTING, cast=bool)
+ACTIVITY_BUFFER_SIZE = config('ACTIVITY_BUFFER_SIZE', default=100, cast=int)
+ACTIVITY_FLUSH_INTERVAL_MS = config('ACTIVITY_FLUSH_INTERVAL_MS', default=1000, cast=int)
+ACTIVITY_RETENTION_MONTHS = config('ACTIVITY_RETENTION_MONTHS', default=12, cast=int)
+
+# Proxies de confianza delante de la aplicación (nginx.conf: uno). La IP del
+# cliente es el salto de X-Forwarded-For que añadió el más externo; los saltos
+# anteriores los envía el cliente y no son fiables. Con 0 se usa REMOTE_ADDR.
+TRUSTED_PROXY_COUNT = config('TRUSTED_PROXY_COUNT', default=1, cast=int)
+
 # ============================================================================
 # SEGURIDAD - Solo en Producción
 # ============================================================================